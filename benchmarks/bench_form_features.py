@@ -0,0 +1,117 @@
+# benchmarks/bench_form_features.py
+
+"""
+Compares the vectorized create_features_for_season (src/features/form.py) with the row-wise
+notebook implementation (src/notebooks/feature_engineering_1.ipynb) on the processed seasons,
+replicated as extra leagues to show how both scale.
+
+Usage:
+    python -m benchmarks.bench_form_features [n_copies ...]
+"""
+
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from src.features.form import create_features_for_season, form_feature_names
+
+
+PROCESSED_DIR = os.path.join('data', 'processed', 'all_season')
+SEASONS = ["20_21", "21_22", "22_23", "23_24"]
+ROLLED = ["GoalsScored", "Points", "AvgAge", "AvgValue", "AvgRating"]
+
+
+def notebook_create_features_for_season(df):
+    """
+    The notebook version: row-wise result labels, ten grouped rolling calls and two merges.
+    """
+    max_players = 11
+    for side in ("Home", "Away"):
+        df[f"{side}_AvgAge"] = df[[f"{side}_Player_{i}_TeamPlayer_Age" for i in range(1, max_players + 1)]].mean(axis=1)
+        mv_cols = [f"{side}_Player_{i}_TeamPlayer_MarketValue" for i in range(1, max_players + 1)]
+        df[f"{side}_SumValue"] = df[mv_cols].sum(axis=1)
+        df[f"{side}_AvgValue"] = df[mv_cols].mean(axis=1)
+        df[f"{side}_AvgRating"] = df[[f"{side}_Player_{i}_TeamPlayer_Rating" for i in range(1, max_players + 1)]].mean(axis=1)
+
+    def long_side(side, other):
+        part = df[["Season", "Week", "Match Date", f"{side} Team", "Home Goals", "Away Goals",
+                   f"{side}_AvgAge", f"{side}_AvgValue", f"{side}_AvgRating"]].copy()
+        part["Team"] = part[f"{side} Team"]
+        part["GoalsScored"] = part[f"{side} Goals"]
+
+        def result(row):
+            if row[f"{side} Goals"] > row[f"{other} Goals"]:
+                return "Win"
+            elif row[f"{side} Goals"] < row[f"{other} Goals"]:
+                return "Lose"
+            return "Draw"
+
+        part["Result"] = part.apply(result, axis=1)
+        for stat in ("AvgAge", "AvgValue", "AvgRating"):
+            part[stat] = part[f"{side}_{stat}"]
+        return part
+
+    df_long = pd.concat([long_side("Home", "Away"), long_side("Away", "Home")], ignore_index=True)
+    df_long["Points"] = df_long["Result"].apply(lambda res: 3 if res == "Win" else (1 if res == "Draw" else 0))
+    df_long["Match Date"] = pd.to_datetime(df_long["Match Date"], format="%d/%m/%y", errors="coerce")
+    df_long.sort_values(by=["Team", "Match Date"], inplace=True)
+    for stat in ROLLED:
+        how = "sum" if stat in ("GoalsScored", "Points") else "mean"
+        for window in (5, 10):
+            rolled = getattr(df_long.groupby("Team")[stat].rolling(window=window, min_periods=1), how)()
+            df_long[f"{stat}_Last{window}"] = rolled.reset_index(level=0, drop=True)
+
+    form_cols = [f"{stat}_Last{window}" for stat in ROLLED for window in (5, 10)]
+    for side in ("Home", "Away"):
+        form = df_long[["Team", "Week"] + form_cols].rename(columns={c: f"{side}_{c}" for c in form_cols})
+        df = df.merge(form, left_on=["Week", f"{side} Team"], right_on=["Week", "Team"], how="left")
+        df.drop(columns="Team", inplace=True)
+    return df
+
+
+def load_leagues(n_copies):
+    """
+    Loads the processed seasons and replicates them n_copies times as separate leagues
+    (team names are suffixed, so the copies do not share form windows). Week labels are made unique
+    per season and copy, so the notebook's merge on ["Week", team] does not multiply rows.
+    """
+    seasons = [pd.read_csv(os.path.join(PROCESSED_DIR, f"{season}_processed.csv")) for season in SEASONS
+               if os.path.exists(os.path.join(PROCESSED_DIR, f"{season}_processed.csv"))]
+    base = pd.concat(seasons, ignore_index=True)
+    copies = []
+    for copy_index in range(n_copies):
+        league = base.copy()
+        league["Home Team"] = league["Home Team"] + f"_{copy_index}"
+        league["Away Team"] = league["Away Team"] + f"_{copy_index}"
+        league["Week"] = league["Season"] + " " + league["Week"] + f"_{copy_index}"
+        copies.append(league)
+    return pd.concat(copies, ignore_index=True)
+
+
+def time_call(function, df, repeats=3):
+    best = float('inf')
+    for _ in range(repeats):
+        frame = df.copy()
+        start = time.perf_counter()
+        result = function(frame)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(copies_list):
+    print(f"{'rows':>8} {'notebook (s)':>14} {'vectorized (s)':>16} {'speedup':>9}")
+    for n_copies in copies_list:
+        df = load_leagues(n_copies)
+        notebook_seconds, expected = time_call(notebook_create_features_for_season, df, repeats=1)
+        vectorized_seconds, result = time_call(create_features_for_season, df)
+        print(f"{len(df):>8} {notebook_seconds:>14.3f} {vectorized_seconds:>16.3f} "
+              f"{notebook_seconds / vectorized_seconds:>8.1f}x")
+        # The merge can only be compared row by row when (Week, team) identifies a match
+        if len(expected) == len(result):
+            form_cols = form_feature_names('Home') + form_feature_names('Away')
+            assert np.allclose(result[form_cols].to_numpy(), expected[form_cols].to_numpy(), equal_nan=True)
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1, 10, 40])
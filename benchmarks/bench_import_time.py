@@ -0,0 +1,104 @@
+# benchmarks/bench_import_time.py
+
+"""
+Measures the start-up import time of the entry points with 'python -X importtime' and checks it
+against a target.
+
+Every module is imported in a fresh interpreter. The summary lists the cumulative import time of
+the entry point and of the heaviest top-level packages it pulls in, and flags optional libraries
+(model libraries, plotting) that were imported although nothing was selected or plotted.
+
+Usage:
+    python -m benchmarks.bench_import_time [--target-ms 800] [--repeat 3] [module ...]
+
+The exit status is 1 when the median import time of 'main' exceeds the target or an optional
+library is imported eagerly.
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+
+DEFAULT_MODULES = ('main', 'src.pipeline.run_pipeline', 'src.serving.predictor')
+
+# Libraries that must only be imported when a model using them is selected or a figure is drawn
+OPTIONAL_LIBRARIES = ('catboost', 'xgboost', 'lightgbm', 'matplotlib', 'seaborn', 'optuna')
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def measure(module):
+    """
+    Imports a module in a fresh interpreter with -X importtime.
+
+    Args:
+        module (str): Dotted module name.
+
+    Returns:
+        list: (self microseconds, cumulative microseconds, depth, module name) per imported module.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True, env={**os.environ, 'PYTHONPATH': '.'})
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            entries.append((int(match.group(1)), int(match.group(2)), len(match.group(3)) // 2, match.group(4)))
+    return entries
+
+
+def summarise(entries, top_n=8):
+    """
+    Returns the cumulative time of the entry point and of its heaviest top-level packages.
+
+    A package's time is the cumulative time of its outermost imports, so nested imports are not counted twice.
+    """
+    total = next(cumulative for _, cumulative, depth, _ in reversed(entries) if depth == 0)
+    outermost = {}
+    packages = defaultdict(int)
+    for _, cumulative, depth, name in entries:
+        root = name.split('.')[0]
+        if root not in outermost or depth < outermost[root]:
+            outermost[root] = depth
+            packages[root] = 0
+        if depth == outermost[root]:
+            packages[root] += cumulative
+    packages.pop(entries[-1][3].split('.')[0], None)
+    heaviest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top_n]
+    return total, heaviest, {name.split('.')[0] for _, _, _, name in entries}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('modules', nargs='*', default=list(DEFAULT_MODULES))
+    parser.add_argument('--target-ms', type=float, default=800.0, help="Budget for 'import main'.")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module in args.modules:
+        runs = [summarise(measure(module)) for _ in range(args.repeat)]
+        total_ms = statistics.median(run[0] for run in runs) / 1000
+        _, heaviest, roots = runs[-1]
+        print(f"\n{module}: {total_ms:.0f} ms (median of {args.repeat})")
+        for package, cumulative in heaviest:
+            print(f"  {package:<24}{cumulative / 1000:>8.0f} ms")
+        eager = sorted(roots.intersection(OPTIONAL_LIBRARIES))
+        if eager:
+            print(f"  optional libraries imported eagerly: {', '.join(eager)}")
+            failed = True
+        if module == 'main' and total_ms > args.target_ms:
+            print(f"  over the target of {args.target_ms:.0f} ms")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
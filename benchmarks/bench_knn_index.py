@@ -0,0 +1,106 @@
+# benchmarks/bench_knn_index.py
+
+"""
+Compares the recall and query latency of IndexedKNeighborsClassifier (src/models/neighbors.py)
+with the exact brute-force KNeighborsClassifier on the cleaned data, replicated with jitter to
+emulate a larger feature store.
+
+For every configuration it reports the index build time, the recall of the exact neighbours, the
+agreement of the predicted outcomes, the latency of one fixture per call and of batched fixtures,
+and the size of the saved model.
+
+Usage:
+    python -m benchmarks.bench_knn_index [--copies 1 20] [--metric manhattan] [--queries 500]
+"""
+
+import argparse
+import os
+import pickle
+import time
+import numpy as np
+from sklearn.neighbors import KNeighborsClassifier
+from src.models.neighbors import IndexedKNeighborsClassifier
+from src.utils.feature_store import read_stage
+from src.utils.preprocess import split_data
+
+
+CLEANED_PATH = os.path.join('data', 'processed', 'final', 'cleaned')
+
+# (label, IndexedKNeighborsClassifier parameters)
+CONFIGURATIONS = (
+    ('kd_tree leaf 16', {'algorithm': 'kd_tree', 'leaf_size': 16}),
+    ('kd_tree leaf 40', {'algorithm': 'kd_tree', 'leaf_size': 40}),
+    ('ball_tree leaf 40', {'algorithm': 'ball_tree', 'leaf_size': 40}),
+    ('projected 12 x8', {'algorithm': 'kd_tree', 'leaf_size': 40, 'n_components': 12, 'candidates': 8}),
+    ('projected 16 x16', {'algorithm': 'kd_tree', 'leaf_size': 40, 'n_components': 16, 'candidates': 16}),
+)
+
+
+def load_data(n_copies, seed=0):
+    """
+    Returns the train/test split of the cleaned data, with the training rows replicated n_copies
+    times plus small Gaussian noise, so the replicas are distinct neighbours.
+    """
+    X_train, X_test, y_train, _ = split_data(read_stage(CLEANED_PATH))
+    X_train, X_test = X_train.to_numpy(float), X_test.to_numpy(float)
+    y_train = y_train.to_numpy()
+    rng = np.random.default_rng(seed)
+    scale = X_train.std(axis=0) * 0.25
+    copies = [X_train] + [X_train + rng.normal(size=X_train.shape) * scale for _ in range(n_copies - 1)]
+    return np.vstack(copies), np.tile(y_train, n_copies), X_test
+
+
+def latency_ms(model, X, single_queries):
+    """
+    Returns (milliseconds per fixture for one fixture per call, milliseconds per fixture in one batch).
+    """
+    start = time.perf_counter()
+    for row in X[:single_queries]:
+        model.predict_proba(row[None, :])
+    single = (time.perf_counter() - start) / single_queries * 1000
+    start = time.perf_counter()
+    model.predict_proba(X)
+    batched = (time.perf_counter() - start) / len(X) * 1000
+    return single, batched
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--copies', type=int, nargs='+', default=[1, 20])
+    parser.add_argument('--metric', choices=['euclidean', 'manhattan'], default='manhattan')
+    parser.add_argument('--n-neighbors', type=int, default=7)
+    parser.add_argument('--queries', type=int, default=200, help="Fixtures scored one per call.")
+    args = parser.parse_args(argv)
+
+    for n_copies in args.copies:
+        X_train, y_train, X_test = load_data(n_copies)
+        print(f"\n{len(X_train)} training rows, {X_train.shape[1]} features, {len(X_test)} test fixtures, "
+              f"{args.metric}, k={args.n_neighbors}")
+        print(f"{'model':<20}{'build s':>9}{'recall':>8}{'agree':>8}{'single ms':>11}{'batch ms':>10}{'MB':>7}")
+
+        exact = KNeighborsClassifier(args.n_neighbors, metric=args.metric, algorithm='brute')
+        start = time.perf_counter()
+        exact.fit(X_train, y_train)
+        build = time.perf_counter() - start
+        _, exact_indices = exact.kneighbors(X_test)
+        exact_labels = exact.predict(X_test)
+        single, batched = latency_ms(exact, X_test, args.queries)
+        size = len(pickle.dumps(exact)) / 1e6
+        print(f"{'exact brute':<20}{build:>9.3f}{1:>8.3f}{1:>8.3f}{single:>11.3f}{batched:>10.4f}{size:>7.1f}")
+
+        for label, params in CONFIGURATIONS:
+            model = IndexedKNeighborsClassifier(args.n_neighbors, metric=args.metric, **params)
+            start = time.perf_counter()
+            model.fit(X_train, y_train)
+            build = time.perf_counter() - start
+            _, indices = model.kneighbors(X_test)
+            recall = np.mean([len(np.intersect1d(found, truth)) / args.n_neighbors
+                              for found, truth in zip(indices, exact_indices)])
+            agree = np.mean(model.predict(X_test) == exact_labels)
+            single, batched = latency_ms(model, X_test, args.queries)
+            size = len(pickle.dumps(model)) / 1e6
+            print(f"{label:<20}{build:>9.3f}{recall:>8.3f}{agree:>8.3f}{single:>11.3f}{batched:>10.4f}{size:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# benchmarks/bench_player_join.py
+
+"""
+Compares the vectorized player-attribute join (src/features/player_join.py) with the notebook's
+loop of 22 sequential merges (src/notebooks/preprocessing.ipynb) on the raw seasons, measuring
+wall time and peak traced memory, optionally with every season replicated as extra leagues.
+
+Usage:
+    python -m benchmarks.bench_player_join [n_copies ...]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from src.features.player_join import (MAX_PLAYERS, attach_player_attributes, build_player_table, extract_surname,
+                                     modify_team_name)
+
+
+RAW_DIR = os.path.join('data', 'raw')
+SEASONS = ["20_21", "21_22", "22_23", "23_24"]
+
+
+def notebook_attach_player_attributes(matches, player_table):
+    """
+    The notebook version: row-wise lineup splitting, then one left merge (and rename) per lineup
+    slot, 22 in total.
+    """
+    df = matches.copy()
+    df['Home Team'] = df['Home Team'].apply(modify_team_name).str.strip()
+    df['Away Team'] = df['Away Team'].apply(modify_team_name).str.strip()
+    slot_cols = []
+    for side in ('Home', 'Away'):
+        players = df[f'{side} Players'].str.split('; ').apply(lambda names: [extract_surname(n) for n in names])
+        # The notebook ran on object columns, whose .str.lower is Python's str.lower
+        split = players.apply(lambda names: pd.Series(names[:MAX_PLAYERS])).astype(object)
+        for i in range(MAX_PLAYERS):
+            col = f'{side}_Player_{i + 1}_TeamPlayer'
+            names = split[i] if i in split.columns else pd.Series(np.nan, index=df.index, dtype=object)
+            df[col] = df[f'{side} Team'].astype(object) + '_' + names.str.lower().str.strip()
+            slot_cols.append(col)
+    df = df.drop(columns=['Home Players', 'Away Players'])
+
+    for col in slot_cols:
+        df = pd.merge(df, player_table, how="left", left_on=col, right_on="Team_Player", suffixes=("", f"_{col}"))
+        df.rename(columns={'Age': f"{col}_Age", 'Market Value': f"{col}_MarketValue",
+                           'Player Rating': f"{col}_Rating"}, inplace=True)
+        df.drop(columns="Team_Player", inplace=True)
+    return df.drop(columns=slot_cols)
+
+
+def load_season(season, n_copies):
+    """
+    Loads the raw matches and the player table of a season, with the matches replicated n_copies times.
+    """
+    season_dir = os.path.join(RAW_DIR, season)
+    matches = pd.read_csv(os.path.join(season_dir, f'{season}.csv'))
+    player_table = build_player_table(
+        pd.read_csv(os.path.join(season_dir, f'{season}_teams_and_players.csv')),
+        pd.read_csv(os.path.join(season_dir, f'{season}_marketvalue_and_age.csv'), encoding='utf-8-sig'))
+    return pd.concat([matches] * n_copies, ignore_index=True), player_table
+
+
+def measure(function, *args, repeats=3):
+    """
+    Returns (best seconds, peak traced MiB, result); memory is traced in a separate, untimed call.
+    """
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    function(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / 2 ** 20, result
+
+
+def main(copies_list):
+    print(f"{'season':>7} {'rows':>7} {'merges (s)':>11} {'vector (s)':>11} {'speedup':>8} "
+          f"{'merges MiB':>11} {'vector MiB':>11}")
+    for n_copies in copies_list:
+        for season in SEASONS:
+            if not os.path.isdir(os.path.join(RAW_DIR, season)):
+                continue
+            matches, player_table = load_season(season, n_copies)
+            merge_seconds, merge_peak, expected = measure(notebook_attach_player_attributes, matches, player_table)
+            vector_seconds, vector_peak, result = measure(attach_player_attributes, matches, player_table)
+            print(f"{season:>7} {len(matches):>7} {merge_seconds:>11.3f} {vector_seconds:>11.3f} "
+                  f"{merge_seconds / vector_seconds:>7.1f}x {merge_peak:>11.1f} {vector_peak:>11.1f}")
+
+            # build_player_table keeps one row per key, so the merges cannot multiply rows here
+            attributes = [column for column in result.columns if '_TeamPlayer_' in column]
+            assert list(expected.columns) == list(result.columns)
+            assert expected['Home Team'].equals(result['Home Team'])
+            assert np.allclose(expected[attributes].to_numpy(float), result[attributes].to_numpy(float),
+                               equal_nan=True)
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1, 10])
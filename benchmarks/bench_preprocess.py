@@ -0,0 +1,69 @@
+# benchmarks/bench_preprocess.py
+
+"""
+Compares preprocess_data with the single-pass preprocess_data_fast (src/utils/preprocess.py) on the
+combined data replicated as extra leagues, measuring wall time and peak traced memory.
+
+Usage:
+    python -m benchmarks.bench_preprocess [n_copies ...]
+"""
+
+import contextlib
+import io
+import os
+import sys
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from src.utils.preprocess import preprocess_data, preprocess_data_fast
+
+
+FINAL_PATH = os.path.join('data', 'processed', 'final', 'all_seasons_final.csv')
+
+
+def load_leagues(n_copies):
+    """
+    Loads the combined data and replicates it n_copies times, with team names suffixed per copy.
+    """
+    base = pd.read_csv(FINAL_PATH)
+    copies = []
+    for copy_index in range(n_copies):
+        league = base.copy()
+        league["Home Team"] = league["Home Team"] + f"_{copy_index}"
+        league["Away Team"] = league["Away Team"] + f"_{copy_index}"
+        copies.append(league)
+    return pd.concat(copies, ignore_index=True)
+
+
+def measure(function, df):
+    """
+    Returns (seconds, peak traced MiB, result) of one call on a fresh copy of df.
+    """
+    frame = df.copy()
+    tracemalloc.start()
+    start = time.perf_counter()
+    # preprocess_data prints a warning for every missing drop column
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = function(frame)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 2 ** 20, result
+
+
+def main(copies_list):
+    print(f"{'rows':>8} {'input MiB':>10} {'slow (s)':>9} {'fast (s)':>9} {'slow MiB':>9} {'fast MiB':>9}")
+    for n_copies in copies_list:
+        df = load_leagues(n_copies)
+        input_mb = df.memory_usage(deep=True).sum() / 2 ** 20
+        slow_seconds, slow_peak, expected = measure(preprocess_data, df)
+        fast_seconds, fast_peak, result = measure(preprocess_data_fast, df)
+        print(f"{len(df):>8} {input_mb:>10.1f} {slow_seconds:>9.3f} {fast_seconds:>9.3f} "
+              f"{slow_peak:>9.1f} {fast_peak:>9.1f}")
+        assert list(expected.columns) == list(result.columns)
+        assert np.allclose(expected.to_numpy(float), result.to_numpy(float), atol=1e-5)
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1, 40, 200])
@@ -0,0 +1,86 @@
+# benchmarks/bench_scrape_pool.py
+
+"""
+Measures how the throughput of the parallel scraper pool (src/data/scrape_pool.py) scales with the
+number of workers.
+
+The rounds of a scraped season are written as HTML snapshots and served on localhost, with a delay
+per page standing in for the browser's page load and rendering. Every worker count scrapes all the
+rounds into a fresh output directory and reports the rounds per minute and the speed-up over one
+worker. With '--driver chrome' each worker drives a headless Chrome instead of the static driver.
+
+Usage:
+    python -m benchmarks.bench_scrape_pool [--season-csv data/raw/23_24/23_24.csv] [--workers 1 2 4 8]
+                                           [--page-delay 0.5] [--driver static]
+"""
+
+import argparse
+import functools
+import os
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from benchmarks.snapshots import StaticPageDriver, save_round_snapshots, snapshot_round_scraper
+from src.data.scrape_pool import ScrapeWorkerPool
+
+
+class SnapshotHandler(SimpleHTTPRequestHandler):
+    page_delay = 0.0
+
+    def do_GET(self):
+        time.sleep(self.page_delay)
+        super().do_GET()
+
+    def log_message(self, *args):
+        pass
+
+
+def serve_snapshots(snapshot_dir, page_delay):
+    """
+    Serves snapshot_dir on a free localhost port; returns (server, base URL).
+    """
+    handler = type('Handler', (SnapshotHandler,), {'page_delay': page_delay})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(handler, directory=snapshot_dir))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def chrome_driver():
+    from src.data.sofascorescrapper import start_driver
+    return start_driver(headless=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--season-csv', default=os.path.join('data', 'raw', '23_24', '23_24.csv'))
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--page-delay', type=float, default=0.5, help="Seconds per page load.")
+    parser.add_argument('--driver', choices=['static', 'chrome'], default='static')
+    args = parser.parse_args()
+
+    driver_factory = StaticPageDriver if args.driver == 'static' else chrome_driver
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_dir = os.path.join(tmp, 'snapshots')
+        units = save_round_snapshots(args.season_csv, snapshot_dir)
+        server, base_url = serve_snapshots(snapshot_dir, args.page_delay)
+        print(f"Serving {len(units)} rounds at {base_url} with {args.page_delay}s per page.")
+
+        results = []
+        for n_workers in args.workers:
+            output_dir = os.path.join(tmp, f'out_{n_workers}')
+            pool = ScrapeWorkerPool(driver_factory, snapshot_round_scraper(base_url), n_workers=n_workers,
+                                    output_dir=output_dir)
+            stats = pool.run(units)
+            results.append((n_workers, stats))
+        server.shutdown()
+
+    print(f"\n{'workers':>8} {'rounds':>7} {'matches':>8} {'seconds':>8} {'rounds/min':>11} {'speed-up':>9}")
+    baseline = results[0][1]['rounds_per_minute']
+    for n_workers, stats in results:
+        print(f"{n_workers:>8} {stats['units']:>7} {stats['rows']:>8} {stats['seconds']:>8.2f} "
+              f"{stats['rounds_per_minute']:>11.1f} {stats['rounds_per_minute'] / baseline:>8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+# benchmarks/snapshots.py
+
+"""
+Round pages saved as static HTML, and a driver and unit scraper reading them, so that the scraper
+pool (src/data/scrape_pool.py) can be benchmarked and tested without the site or a browser.
+"""
+
+import os
+from html import escape
+import pandas as pd
+from src.data.scrape_pool import WorkUnit
+from src.data.sofascore_api import MATCH_HEADERS, sanitize_season
+
+
+class StaticPageDriver:
+    """
+    Minimal driver for static HTML snapshots: fetches pages over HTTP and finds elements by CSS
+    selector, without a browser. It implements the part of the WebDriver interface the snapshot
+    scraper uses (get, find_elements, quit), so the same scraper also runs in headless Chrome.
+    """
+
+    def __init__(self):
+        import requests
+        self.session = requests.Session()
+        self.page_source = ''
+        self._document = None
+
+    def get(self, url):
+        from bs4 import BeautifulSoup
+        response = self.session.get(url, timeout=30)
+        response.raise_for_status()
+        # Parsed from the bytes, so the page's meta charset applies when the server sends none
+        self._document = BeautifulSoup(response.content, 'html.parser')
+        self.page_source = str(self._document)
+
+    def find_elements(self, by, value):
+        if by != 'css selector':
+            raise ValueError(f"StaticPageDriver only supports CSS selectors, not '{by}'.")
+        return [StaticElement(node) for node in self._document.select(value)]
+
+    def quit(self):
+        self.session.close()
+
+
+class StaticElement:
+    """
+    Element of a StaticPageDriver page.
+    """
+
+    def __init__(self, node):
+        self.node = node
+
+    @property
+    def text(self):
+        return self.node.get_text(strip=True)
+
+    def get_attribute(self, name):
+        return self.node.get(name)
+
+    def find_elements(self, by, value):
+        return [StaticElement(node) for node in self.node.select(value)]
+
+
+def save_round_snapshots(season_csv, snapshot_dir):
+    """
+    Writes the matches of a scraped season CSV as round pages in the snapshot layout, e.g. to replay
+    a season through the pool without the site.
+
+    Returns:
+        list: WorkUnit of every round written.
+    """
+    matches = pd.read_csv(season_csv, dtype=str, keep_default_na=False)
+    units = []
+    for (season_name, week_name), week in matches.groupby(['Season', 'Week'], sort=False):
+        unit = WorkUnit(season_name, int(''.join(char for char in week_name if char.isdigit())))
+        events = ''.join(
+            '<div class="event">'
+            + ''.join(f'<span data-field="{escape(column)}">{escape(value)}</span>' for column, value in row.items())
+            + '</div>\n'
+            for _, row in week[MATCH_HEADERS].iterrows())
+        path = os.path.join(snapshot_dir, sanitize_season(season_name), f"round-{unit.round}.html")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(f"<html><head><meta charset='utf-8'></head><body><h1>{escape(week_name)}</h1>\n{events}</body></html>\n")
+        units.append(unit)
+    return units
+
+
+def snapshot_round_url(base_url, unit):
+    return f"{base_url.rstrip('/')}/{sanitize_season(unit.season)}/round-{unit.round}.html"
+
+
+def snapshot_round_scraper(base_url):
+    """
+    Returns a unit scraper for saved round pages ('<base_url>/<season>/round-<n>.html'), in which
+    every match is an element with class 'event' holding one element per raw column, marked with a
+    'data-field' attribute named after the column.
+    """
+    def scrape(driver, unit):
+        driver.get(snapshot_round_url(base_url, unit))
+        rows = []
+        for event in driver.find_elements('css selector', '.event'):
+            fields = {cell.get_attribute('data-field'): cell.text for cell in event.find_elements('css selector',
+                                                                                                  '[data-field]')}
+            rows.append([fields.get(column, '') for column in MATCH_HEADERS])
+        return rows
+    return scrape
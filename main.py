@@ -1,10 +1,211 @@
 # main.py
 
-from src.pipeline.run_pipeline import run_pipeline
+import argparse
+import os
+from src.pipeline.stages import STAGE_NAMES, build_pipeline
 
 
-def main():
-    run_pipeline()
+# Registered models whose estimators support partial_fit
+STREAMING_MODELS = ('mlp', 'naive_bayes', 'sgd_logistic_regression')
+
+
+def stream_train(source, model_names, chunk_size=50000, epochs=None, test_size=0.2):
+    """
+    Trains, evaluates and saves the given models in streaming mode (see BaseModel.train_streaming).
+    """
+    from src.models.registry import get_model
+    for model_name in model_names:
+        model = get_model(model_name)
+        model.train_streaming(source, chunk_size=chunk_size, epochs=epochs, test_size=test_size)
+        model.save_model()
+        model.save_hyperparameters()
+
+
+def parse_time_budget(value):
+    """
+    Parses a per-model time budget given as 'model=seconds'.
+    """
+    model_name, separator, seconds = value.partition('=')
+    try:
+        if not separator:
+            raise ValueError
+        return model_name, float(seconds)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected 'model=seconds', got '{value}'.")
+
+
+def parse_rounds(value):
+    """
+    Parses a round range given as 'first-last' (or a single round).
+    """
+    first, _, last = value.partition('-')
+    try:
+        rounds = range(int(first), int(last or first) + 1)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected 'first-last', got '{value}'.")
+    if not rounds:
+        raise argparse.ArgumentTypeError(f"Empty round range '{value}'.")
+    return rounds
+
+
+def scrape_rounds(seasons, rounds, n_workers, raw_dir, checkpoint=None, max_attempts=3):
+    """
+    Scrapes the given rounds of every season from the site with a pool of headless browsers.
+    """
+    from src.data.scrape_pool import ScrapeWorkerPool, WorkUnit
+    from src.data.sofascorescrapper import scrape_round, start_driver
+    pool = ScrapeWorkerPool(lambda: start_driver(headless=True), scrape_round, n_workers=n_workers,
+                            output_dir=raw_dir, checkpoint_path=checkpoint, max_attempts=max_attempts)
+    return pool.run([WorkUnit(season, number) for season in seasons for number in rounds])
+
+
+def parse_args(argv=None):
+    """
+    Parses the command line.
+
+    Without a command the training pipeline runs on the existing 'all_seasons_final.csv'.
+    'build' rebuilds only the out-of-date stages, from the raw season CSVs in data/raw/<season>/.
+    'serve' and 'predict' score fixtures with the saved models (see src/serving/).
+    'stream-train' trains the partial_fit models out of core from a preprocessed stage.
+    'backtest' runs a walk-forward, round-by-round backtest (see src/pipeline/backtest.py).
+    'ingest' fetches the raw files of seasons from the Sofascore API (see src/data/sofascore_api.py).
+    'scrape' scrapes rounds from the site with parallel headless browsers (see src/data/scrape_pool.py).
+    'transfermarkt' fetches the players' age and market value (see src/data/transfermarktScrapper_2.py).
+
+    '--models' selects registered models by name ('all' for every model in src/models); the names
+    are checked against the registry once the command runs.
+    """
+    parser = argparse.ArgumentParser(description="Süper Lig match outcome prediction pipeline.")
+    subparsers = parser.add_subparsers(dest='command')
+
+    build = subparsers.add_parser('build', help="Rebuild the out-of-date pipeline stages.")
+    build.add_argument('--until', choices=STAGE_NAMES, default=STAGE_NAMES[-1], help="Last stage to run.")
+    build.add_argument('--seasons', nargs='+', help="Seasons to build (default: all in data/raw).")
+    build.add_argument('--force', action='store_true', help="Rebuild every stage.")
+    build.add_argument('--jobs', type=int, default=None, help="Worker processes for per-season stages.")
+    build.add_argument('--data-dir', default='data', help="Root data directory.")
+
+    serve = subparsers.add_parser('serve', help="Serve predictions of the saved models over HTTP.")
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8000)
+    serve.add_argument('--models', nargs='+', help="Models to load (default: every saved model).")
+    serve.add_argument('--max-batch-size', type=int, default=256)
+    serve.add_argument('--max-wait-ms', type=float, default=2.0)
+
+    predict = subparsers.add_parser('predict', help="Score a CSV of fixtures with the saved models.")
+    predict.add_argument('input', help="CSV of fixtures in the all_seasons_final.csv layout.")
+    predict.add_argument('output', help="Destination CSV with H/D/A probabilities per model.")
+    predict.add_argument('--models', nargs='+', help="Models to use (default: every saved model).")
+
+    stream = subparsers.add_parser('stream-train', help="Train the partial_fit models chunk by chunk from disk.")
+    stream.add_argument('source', nargs='?', default=os.path.join('data', 'processed', 'final', 'cleaned'),
+                        help="Preprocessed stage (Feather, Parquet or CSV) with the target column.")
+    stream.add_argument('--models', nargs='+', choices=STREAMING_MODELS, default=list(STREAMING_MODELS))
+    stream.add_argument('--chunk-size', type=int, default=50000)
+    stream.add_argument('--epochs', type=int, help="Passes over the data (default: per model).")
+    stream.add_argument('--test-size', type=float, default=0.2)
+
+    backtest = subparsers.add_parser('backtest', help="Walk-forward backtest over seasons and rounds.")
+    backtest.add_argument('--min-train-rounds', type=int, default=38, help="Rounds in the first training window.")
+    backtest.add_argument('--rounds-per-fold', type=int, default=1)
+    backtest.add_argument('--mode', choices=['retrain', 'incremental'], default='retrain')
+    backtest.add_argument('--jobs', type=int, default=-1, help="Worker processes (-1 for all cores).")
+    backtest.add_argument('--no-cache', action='store_true', help="Do not reuse cached fold models.")
+    backtest.add_argument('--models', nargs='+', help="Models to backtest, or 'all' (default: the pipeline models).")
+
+    ingest = subparsers.add_parser('ingest', help="Fetch the raw season files from the Sofascore API.")
+    ingest.add_argument('seasons', nargs='+', help="Seasons as written in the data, e.g. 23/24.")
+    ingest.add_argument('--raw-dir', default=os.path.join('data', 'raw'))
+    ingest.add_argument('--workers', type=int, default=8, help="Concurrent requests.")
+    ingest.add_argument('--rate-limit', type=float, default=5.0, help="Requests per second (0: unlimited).")
+    ingest.add_argument('--retries', type=int, default=4)
+
+    scrape = subparsers.add_parser('scrape', help="Scrape rounds from the site with parallel headless browsers.")
+    scrape.add_argument('seasons', nargs='+', help="Seasons as listed on the site, e.g. 23/24.")
+    scrape.add_argument('--rounds', type=parse_rounds, default=range(1, 39), metavar='FIRST-LAST',
+                        help="Rounds to scrape (default: 1-38).")
+    scrape.add_argument('--workers', type=int, default=4, help="Browsers running in parallel.")
+    scrape.add_argument('--raw-dir', default=os.path.join('data', 'raw'))
+    scrape.add_argument('--checkpoint', help="Completed rounds file (default: <raw-dir>/.scrape_checkpoint.json).")
+    scrape.add_argument('--max-attempts', type=int, default=3, help="Attempts per round, each with a fresh browser.")
+
+    transfermarkt = subparsers.add_parser('transfermarkt', help="Fetch the players' age and market value.")
+    transfermarkt.add_argument('seasons', nargs='*', help="Season directories, e.g. 23_24 (default: every season).")
+    transfermarkt.add_argument('--raw-dir', default=os.path.join('data', 'raw'))
+    transfermarkt.add_argument('--workers', type=int, default=8, help="Concurrent searches.")
+    transfermarkt.add_argument('--ttl-days', type=float, default=30, help="Days before a cached player is searched again.")
+
+    for command in (parser, build):
+        command.add_argument('--search-strategy', choices=['grid', 'halving_grid', 'halving_random', 'optuna'])
+        command.add_argument('--max-fits', type=int)
+        command.add_argument('--time-budget', type=float)
+        command.add_argument('--no-cache', action='store_true', help="Do not reuse cached models.")
+        command.add_argument('--workers', type=int, help="Train all models together with this many workers.")
+        command.add_argument('--inner-threads', type=int, default=1)
+        command.add_argument('--warm-start', action='store_true')
+        command.add_argument('--no-plots', action='store_true', help="Skip the figures (e.g. on headless CI).")
+        command.add_argument('--models', nargs='+',
+                             help="Models to train and evaluate, or 'all' (default: the pipeline models).")
+        command.add_argument('--time-budgets', nargs='+', type=parse_time_budget, default=[], metavar='MODEL=SECONDS',
+                             help="Per-model search time budgets; they take precedence over --time-budget.")
+        command.add_argument('--compress-models', type=int, choices=range(10), default=0, metavar='LEVEL',
+                             help="zlib level of the saved joblib models (default 0: uncompressed, memory-mappable).")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == 'serve':
+        from src.serving.server import serve
+        serve(args.host, args.port, args.models, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms)
+        return
+    if args.command == 'predict':
+        from src.serving.predictor import predict_file
+        predict_file(args.input, args.output, args.models)
+        return
+    if args.command == 'backtest':
+        from src.pipeline.backtest import walk_forward_backtest
+        from src.pipeline.run_pipeline import FINAL_DATA_PATH, get_models
+        from src.utils.load_data import load_raw_data
+        walk_forward_backtest(load_raw_data(FINAL_DATA_PATH), get_models(args.models), min_train_rounds=args.min_train_rounds,
+                              rounds_per_fold=args.rounds_per_fold, mode=args.mode, n_jobs=args.jobs,
+                              use_cache=not args.no_cache)
+        return
+    if args.command == 'ingest':
+        from src.data.sofascore_api import SofascoreClient, ingest_season
+        with SofascoreClient(max_workers=args.workers, rate_limit=args.rate_limit, retries=args.retries) as client:
+            for season in args.seasons:
+                ingest_season(client, season, raw_dir=args.raw_dir)
+        return
+    if args.command == 'scrape':
+        scrape_rounds(args.seasons, args.rounds, args.workers, args.raw_dir, args.checkpoint, args.max_attempts)
+        return
+    if args.command == 'transfermarkt':
+        from src.data.transfermarktScrapper_2 import main as fetch_market_values
+        fetch_market_values(args.seasons, raw_dir=args.raw_dir, max_workers=args.workers, ttl_days=args.ttl_days)
+        return
+    if args.command == 'stream-train':
+        stream_train(args.source, args.models, args.chunk_size, args.epochs, args.test_size)
+        return
+
+    training_options = {
+        'search_strategy': args.search_strategy,
+        'max_fits': args.max_fits,
+        'time_budget': args.time_budget,
+        'use_cache': not args.no_cache,
+        'n_workers': args.workers,
+        'inner_threads': args.inner_threads,
+        'warm_start': args.warm_start,
+        'models': args.models,
+        'time_budgets': dict(args.time_budgets),
+        'compress': args.compress_models,
+    }
+    if args.command == 'build':
+        build_pipeline(data_dir=args.data_dir, seasons=args.seasons, until=args.until, force=args.force,
+                       n_jobs=args.jobs, training_options=training_options, plot=not args.no_plots)
+    else:
+        from src.pipeline.run_pipeline import run_pipeline
+        run_pipeline(**training_options, plot=not args.no_plots)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,153 @@
+# src/data/http_client.py
+
+"""
+Thread-safe HTTP client shared by the data sources fetched without a browser: a pooled
+requests.Session, a bound on in-flight requests, a global rate limit, and retries with exponential
+backoff. See src/data/sofascore_api.py and src/data/transfermarkt_lookup.py.
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# Responses worth retrying: rate limiting and server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class RateLimiter:
+    """
+    Token bucket shared by all threads: at most `rate` acquisitions per second on average, with
+    bursts of up to `burst`.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.rate:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class HttpClient:
+    """
+    Thread-safe HTTP client.
+
+    Attributes:
+        base_url (str): Root of the requested paths.
+        max_workers (int): Threads used by map(); also the size of the connection pool.
+        retries (int): Retries of a failed request (connection errors, timeouts, 429 and 5xx).
+        backoff (float): Base delay in seconds; retry n waits backoff * 2**n (with jitter), or the
+            server's Retry-After.
+        timeout (float): Timeout of a request in seconds.
+        requests_made (int): HTTP requests sent, including retries.
+    """
+
+    def __init__(self, base_url, max_workers=8, max_concurrency=None, rate_limit=5.0, retries=4, backoff=0.5,
+                 timeout=10.0, headers=None):
+        """
+        Args:
+            base_url (str): Root of the requested paths.
+            max_workers (int, optional): Worker threads. Defaults to 8.
+            max_concurrency (int, optional): Requests in flight at once. Defaults to max_workers.
+            rate_limit (float, optional): Requests per second across all threads; 0 disables the
+                limit. Defaults to 5.
+            retries (int, optional): Retries per request. Defaults to 4.
+            backoff (float, optional): Base retry delay in seconds. Defaults to 0.5.
+            timeout (float, optional): Request timeout in seconds. Defaults to 10.
+            headers (dict, optional): Headers sent with every request.
+        """
+        self.base_url = base_url.rstrip('/')
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.requests_made = 0
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'User-Agent': 'Mozilla/5.0', **(headers or {})})
+        self._in_flight = threading.BoundedSemaphore(max_concurrency or max_workers)
+        self._rate_limiter = RateLimiter(rate_limit, burst=max_concurrency or max_workers)
+        self._count_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def get(self, path):
+        """
+        Fetches one path.
+
+        Args:
+            path (str): Path below base_url, e.g. '/event/123/lineups'.
+
+        Returns:
+            requests.Response: The successful response, or None if the resource does not exist (404).
+
+        Raises:
+            requests.RequestException: If the request still fails after all retries.
+        """
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        for attempt in range(self.retries + 1):
+            self._rate_limiter.acquire()
+            retry_after = None
+            try:
+                with self._in_flight:
+                    with self._count_lock:
+                        self.requests_made += 1
+                    response = self.session.get(url, timeout=self.timeout)
+                if response.status_code == 404:
+                    return None
+                if response.status_code not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    return response
+                error = requests.HTTPError(f"{response.status_code} for {url}", response=response)
+                retry_after = response.headers.get('Retry-After')
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            if attempt == self.retries:
+                raise error
+            if retry_after is not None and retry_after.isdigit():
+                delay = float(retry_after)
+            else:
+                delay = self.backoff * 2 ** attempt * (0.5 + random.random())
+            time.sleep(delay)
+
+    def get_json(self, path):
+        """
+        Fetches one path and decodes its JSON body; None if the resource does not exist.
+        """
+        response = self.get(path)
+        return None if response is None else response.json()
+
+    def map(self, function, items):
+        """
+        Applies function to every item on the worker threads, keeping the order of items.
+        """
+        return list(self._executor.map(function, items))
+
+    def close(self):
+        self._executor.shutdown()
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,235 @@
+# src/data/locators.py
+
+"""
+Element-locator layer of the Selenium scrapers.
+
+Instead of one WebDriverWait and one or more WebDriver commands per field, a Locator reads a whole
+set of fields with one execute_script call: the fields are XPaths relative to a context element
+(or to every row matched by a rows XPath), and the script returns them as one JSON object (or one
+object per row). Waiting is done by polling that same call until the result is complete, with a
+polling interval that adapts to how long each kind of read usually takes. PageMetrics records the
+WebDriver round trips and time per page and per read.
+"""
+
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from selenium.common.exceptions import TimeoutException
+
+
+# Evaluates arguments[1] (name -> [xpath, kind]) relative to arguments[2] (default: document), or
+# relative to every node matched by the rows XPath arguments[0]. Kinds: 'text' (rendered text, as
+# WebElement.text), 'texts' (text of every match), 'after' (CSS ::after content) and 'attr:<name>'.
+READ_FIELDS_SCRIPT = """
+const [rowsXPath, fields, context] = arguments;
+function select(xpath, root) {
+    const result = document.evaluate(xpath, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const nodes = [];
+    for (let i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i));
+    return nodes;
+}
+function text(node) {
+    return (node.innerText === undefined ? node.textContent : node.innerText).trim();
+}
+function read(root) {
+    const values = {};
+    for (const [name, [xpath, kind]] of Object.entries(fields)) {
+        const nodes = select(xpath, root);
+        if (kind === 'texts') {
+            values[name] = nodes.map(text);
+        } else if (!nodes.length) {
+            values[name] = null;
+        } else if (kind === 'text') {
+            values[name] = text(nodes[0]);
+        } else if (kind === 'after') {
+            values[name] = window.getComputedStyle(nodes[0], '::after').getPropertyValue('content');
+        } else {
+            values[name] = nodes[0].getAttribute(kind.slice(5));
+        }
+    }
+    return values;
+}
+const root = context || document;
+return rowsXPath === null ? read(root) : select(rowsXPath, root).map(read);
+"""
+
+
+class PageMetrics:
+    """
+    WebDriver round trips and seconds spent per page, and per read label within the page.
+
+    Attributes:
+        pages (list): One dict per finished page: 'page', 'seconds', 'round_trips' and 'reads'
+            (label -> {'calls', 'round_trips', 'seconds'}).
+    """
+
+    def __init__(self):
+        self.pages = []
+        self._current = threading.local()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def page(self, name):
+        """
+        Times the block as one page; the reads made in it by the same thread are attributed to it.
+        """
+        entry = {'page': name, 'seconds': 0.0, 'round_trips': 0, 'reads': {}}
+        self._current.entry = entry
+        start = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            entry['seconds'] = time.perf_counter() - start
+            self._current.entry = None
+            with self._lock:
+                self.pages.append(entry)
+            print(f"Page '{name}': {entry['round_trips']} WebDriver round trips in {entry['seconds']:.2f}s.")
+
+    def record(self, label, round_trips, seconds):
+        entry = getattr(self._current, 'entry', None)
+        if entry is None:
+            return
+        reads = entry['reads'].setdefault(label, {'calls': 0, 'round_trips': 0, 'seconds': 0.0})
+        reads['calls'] += 1
+        reads['round_trips'] += round_trips
+        reads['seconds'] += seconds
+        entry['round_trips'] += round_trips
+
+    def summary(self):
+        """
+        Returns the totals over all pages: pages, seconds, round trips, and their per-page means.
+        """
+        with self._lock:
+            pages = list(self.pages)
+        seconds = sum(page['seconds'] for page in pages)
+        round_trips = sum(page['round_trips'] for page in pages)
+        return {
+            'pages': len(pages),
+            'seconds': seconds,
+            'round_trips': round_trips,
+            'seconds_per_page': seconds / len(pages) if pages else 0.0,
+            'round_trips_per_page': round_trips / len(pages) if pages else 0.0,
+        }
+
+
+class Locator:
+    """
+    Reads fields of the page of one driver with single execute_script calls.
+
+    wait_* methods poll a read until its result is ready. The first poll comes after a fraction of
+    the time the same label took to become ready before (an exponential moving average), and the
+    interval then grows by backoff up to max_poll, so a read that is usually ready immediately is
+    checked right away and a slow one does not flood the browser with calls.
+
+    Attributes:
+        driver (webdriver.Chrome): Selenium WebDriver instance.
+        timeout (float): Seconds a wait_* call waits before raising TimeoutException.
+        metrics (PageMetrics): Receives the round trips and time of every read.
+        min_poll (float): Shortest polling interval in seconds.
+        max_poll (float): Longest polling interval in seconds.
+        backoff (float): Growth of the interval after every poll that was not ready.
+    """
+
+    def __init__(self, driver, timeout=10, metrics=None, min_poll=0.05, max_poll=1.0, backoff=1.5):
+        self.driver = driver
+        self.timeout = timeout
+        self.metrics = metrics or PageMetrics()
+        self.min_poll = min_poll
+        self.max_poll = max_poll
+        self.backoff = backoff
+        self._ready_seconds = {}
+
+    def _script(self, rows_xpath, fields, context):
+        return self.driver.execute_script(READ_FIELDS_SCRIPT, rows_xpath,
+                                          {name: list(spec) for name, spec in fields.items()}, context)
+
+    def read(self, fields, context=None, label='read'):
+        """
+        Reads fields in one round trip.
+
+        Args:
+            fields (dict): Field name -> (XPath relative to context, kind); see READ_FIELDS_SCRIPT.
+            context (WebElement, optional): Element the XPaths are relative to. Defaults to the document.
+            label (str, optional): Name of the read in the metrics.
+
+        Returns:
+            dict: Field name -> value (None for a missing element, a list for 'texts').
+        """
+        start = time.perf_counter()
+        values = self._script(None, fields, context)
+        self.metrics.record(label, 1, time.perf_counter() - start)
+        return values
+
+    def read_rows(self, rows_xpath, fields, context=None, label='rows'):
+        """
+        Reads fields relative to every node matched by rows_xpath, in one round trip.
+
+        Returns:
+            list: One dict per row, in document order.
+        """
+        start = time.perf_counter()
+        rows = self._script(rows_xpath, fields, context)
+        self.metrics.record(label, 1, time.perf_counter() - start)
+        return rows
+
+    def poll(self, probe, ready, label):
+        """
+        Calls probe() until ready(result) is true and returns the result.
+
+        Raises:
+            TimeoutException: If the result is not ready within timeout seconds.
+        """
+        start = time.perf_counter()
+        deadline = start + self.timeout
+        typical = self._ready_seconds.get(label)
+        interval = max(self.min_poll, typical / 2) if typical else self.min_poll
+        round_trips = 0
+        while True:
+            result = probe()
+            round_trips += 1
+            now = time.perf_counter()
+            if ready(result):
+                elapsed = now - start
+                self._ready_seconds[label] = elapsed if typical is None else 0.7 * typical + 0.3 * elapsed
+                self.metrics.record(label, round_trips, elapsed)
+                return result
+            if now >= deadline:
+                self.metrics.record(label, round_trips, now - start)
+                raise TimeoutException(f"'{label}' was not ready within {self.timeout} seconds.")
+            time.sleep(min(interval, deadline - now))
+            interval = min(self.max_poll, interval * self.backoff)
+
+    def wait_for(self, fields, ready=None, context=None, label='read'):
+        """
+        Polls read() until ready(values) is true; by default until no field is missing or empty.
+        """
+        ready = ready or (lambda values: all(value not in (None, '', []) for value in values.values()))
+        return self.poll(lambda: self._script(None, fields, context), ready, label)
+
+    def wait_rows(self, rows_xpath, fields, ready=None, context=None, label='rows'):
+        """
+        Polls read_rows() until ready(rows) is true; by default until there is at least one row.
+        """
+        return self.poll(lambda: self._script(rows_xpath, fields, context), ready or bool, label)
+
+    def wait_element(self, xpath, label='element'):
+        """
+        Polls until an element matches xpath and returns the first one.
+        """
+        return self.poll(lambda: self.driver.find_elements('xpath', xpath), bool, label)[0]
+
+
+# One locator per driver, so that the learned polling intervals outlive a single page
+_locators = weakref.WeakKeyDictionary()
+_locators_lock = threading.Lock()
+
+
+def get_locator(driver, metrics=None):
+    """
+    Returns the Locator of a driver, created on first use.
+    """
+    with _locators_lock:
+        if driver not in _locators:
+            _locators[driver] = Locator(driver, metrics=metrics)
+        return _locators[driver]
@@ -0,0 +1,216 @@
+# src/data/scrape_pool.py
+
+"""
+Scrapes (season, round) work units in parallel, one browser per worker.
+
+Workers take units from a shared queue. A worker whose scrape fails restarts its driver and puts
+the unit back, until the unit has used max_attempts. The rows of a finished unit are deduplicated
+against everything written before (including earlier runs), written through a ScraperSink and
+recorded in a checkpoint, so an interrupted run resumes with the rounds that are still missing.
+
+The unit scraper is pluggable: sofascorescrapper.scrape_round drives the live site, and the
+benchmark and tests replay round pages saved as HTML (see benchmarks/snapshots.py).
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+import pandas as pd
+from src.data.sinks import ScraperSink
+from src.data.sofascore_api import MATCH_HEADERS, sanitize_season
+
+
+WorkUnit = namedtuple('WorkUnit', ['season', 'round'])
+
+# Columns identifying a match; a row whose key was already written is dropped
+MATCH_KEY = ("Season", "Week", "Home Team", "Away Team")
+
+
+class RoundCheckpoint:
+    """
+    JSON file recording the completed work units, rewritten atomically after every unit.
+
+    Attributes:
+        path (str): Checkpoint file.
+        completed (dict): 'season|round' to the completion time and row count.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.completed = {}
+        self._lock = threading.Lock()
+        if os.path.isfile(path):
+            with open(path, encoding='utf-8') as file:
+                self.completed = json.load(file)
+
+    @staticmethod
+    def key(unit):
+        return f"{unit.season}|{unit.round}"
+
+    def is_done(self, unit):
+        return self.key(unit) in self.completed
+
+    def mark_done(self, unit, rows):
+        with self._lock:
+            self.completed[self.key(unit)] = {'rows': rows, 'at': datetime.now().isoformat(timespec='seconds')}
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                json.dump(self.completed, file, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+
+
+class ScrapeWorkerPool:
+    """
+    Runs a unit scraper over (season, round) work units on n_workers drivers.
+
+    Attributes:
+        driver_factory (callable): Returns a new driver; called once per worker and on every restart.
+        scrape_unit (callable): scrape_unit(driver, unit) returning the unit's rows (lists in
+            MATCH_HEADERS order).
+        n_workers (int): Number of workers, each with its own driver.
+        output_dir (str): Rows go to '<output_dir>/<season>/<season>.csv'.
+        checkpoint (RoundCheckpoint): Completed units; units recorded in it are skipped.
+        max_attempts (int): Attempts per unit before it is reported as failed.
+    """
+
+    def __init__(self, driver_factory, scrape_unit, n_workers=4, output_dir=os.path.join('data', 'raw'),
+                 checkpoint_path=None, max_attempts=3):
+        self.driver_factory = driver_factory
+        self.scrape_unit = scrape_unit
+        self.n_workers = n_workers
+        self.output_dir = output_dir
+        self.checkpoint = RoundCheckpoint(checkpoint_path or os.path.join(output_dir, '.scrape_checkpoint.json'))
+        self.max_attempts = max_attempts
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def _output(self, season_name):
+        return os.path.join(self.output_dir, sanitize_season(season_name)), f"{sanitize_season(season_name)}.csv"
+
+    def _seen_keys(self, season_name):
+        """
+        Keys of the matches already in a season's output file, loaded once per season.
+        """
+        if season_name not in self._seen:
+            base_path, file_name = self._output(season_name)
+            path = os.path.join(base_path, file_name)
+            keys = set()
+            if os.path.isfile(path):
+                existing = pd.read_csv(path, usecols=list(MATCH_KEY), dtype=str)
+                keys = set(existing.itertuples(index=False, name=None))
+            self._seen[season_name] = keys
+        return self._seen[season_name]
+
+    def _write(self, sink, unit, rows):
+        """
+        Writes the rows of a finished unit that are not duplicates, then records the unit as done.
+
+        The keys of the rows count as written only once the flush succeeded. If it fails, the rows
+        still buffered are dropped and the season's keys are reloaded from its file on the next
+        attempt, so the retry writes exactly the rows that did not reach the disk.
+
+        Returns:
+            tuple: (rows written, duplicates dropped).
+        """
+        key_index = [MATCH_HEADERS.index(column) for column in MATCH_KEY]
+        with self._lock:
+            seen = self._seen_keys(unit.season)
+            new_keys = set()
+            try:
+                for row in rows:
+                    key = tuple(str(row[index]) for index in key_index)
+                    if key in seen or key in new_keys:
+                        continue
+                    new_keys.add(key)
+                    sink.write(*self._output(unit.season), MATCH_HEADERS, row)
+                # Rows are on disk before the checkpoint says the unit is done
+                sink.flush()
+            except Exception:
+                sink.discard()
+                del self._seen[unit.season]
+                raise
+            seen.update(new_keys)
+            self.checkpoint.mark_done(unit, len(new_keys))
+        return len(new_keys), len(rows) - len(new_keys)
+
+    def _worker(self, units, sink, stats):
+        driver = None
+        while True:
+            try:
+                unit, attempt = units.get(timeout=0.05)
+            except queue.Empty:
+                if stats['pending'] == 0:
+                    break
+                continue
+            try:
+                if driver is None:
+                    driver = self.driver_factory()
+                rows = self.scrape_unit(driver, unit)
+                written, duplicates = self._write(sink, unit, rows)
+                with self._lock:
+                    stats['units'] += 1
+                    stats['rows'] += written
+                    stats['duplicates'] += duplicates
+                    stats['pending'] -= 1
+            except Exception as e:
+                print(f"Worker failed on season '{unit.season}' round {unit.round} (attempt {attempt}):", str(e))
+                # The driver may be in any state after a crash; the next unit gets a fresh one
+                if driver is not None:
+                    try:
+                        driver.quit()
+                    except Exception:
+                        pass
+                    driver = None
+                with self._lock:
+                    stats['restarts'] += 1
+                    if attempt < self.max_attempts:
+                        units.put((unit, attempt + 1))
+                    else:
+                        stats['failed'].append(unit)
+                        stats['pending'] -= 1
+        if driver is not None:
+            driver.quit()
+
+    def run(self, units):
+        """
+        Scrapes every unit not yet in the checkpoint.
+
+        Args:
+            units (list): WorkUnit objects.
+
+        Returns:
+            dict: Units done, rows written, duplicates dropped, driver restarts, failed units,
+            units skipped from the checkpoint, seconds and rounds per minute.
+        """
+        pending = [unit for unit in units if not self.checkpoint.is_done(unit)]
+        work = queue.Queue()
+        for unit in pending:
+            work.put((unit, 1))
+        stats = {'units': 0, 'rows': 0, 'duplicates': 0, 'restarts': 0, 'failed': [], 'pending': len(pending),
+                 'skipped': len(units) - len(pending)}
+        print(f"Scraping {len(pending)} rounds on {self.n_workers} workers "
+              f"({stats['skipped']} already complete).")
+
+        start = time.perf_counter()
+        with ScraperSink(batch_size=500) as sink:
+            workers = [threading.Thread(target=self._worker, args=(work, sink, stats), daemon=True)
+                       for _ in range(min(self.n_workers, len(pending)))]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+        stats['seconds'] = time.perf_counter() - start
+        stats['rounds_per_minute'] = stats['units'] / stats['seconds'] * 60 if stats['seconds'] else 0.0
+        del stats['pending']
+        print(f"Scraped {stats['units']} rounds ({stats['rows']} matches, {stats['duplicates']} duplicates, "
+              f"{stats['restarts']} restarts, {len(stats['failed'])} failed) "
+              f"at {stats['rounds_per_minute']:.1f} rounds per minute.")
+        return stats
+
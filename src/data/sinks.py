@@ -0,0 +1,188 @@
+# src/data/sinks.py
+
+import atexit
+import csv
+import os
+import signal
+import threading
+import weakref
+import pandas as pd
+from src.utils.feature_store import FILE_EXTENSIONS, find_stage_file, read_stage, write_stage
+
+
+# Sinks with buffered rows, flushed at exit and on SIGINT/SIGTERM
+_open_sinks = weakref.WeakSet()
+_handlers_installed = False
+
+
+def flush_open_sinks():
+    """
+    Flushes every open sink; called at interpreter exit and on SIGINT/SIGTERM.
+    """
+    for sink in list(_open_sinks):
+        try:
+            sink.flush()
+        except Exception as e:
+            print("An error occurred while flushing scraped rows:", str(e))
+
+
+def _flush_on_signal(signum, frame, previous):
+    flush_open_sinks()
+    if callable(previous):
+        previous(signum, frame)
+    elif previous == signal.SIG_DFL:
+        # Terminate the way the signal would have without this handler
+        signal.signal(signum, signal.SIG_DFL)
+        os.kill(os.getpid(), signum)
+
+
+def _install_handlers():
+    global _handlers_installed
+    if _handlers_installed:
+        return
+    atexit.register(flush_open_sinks)
+    # Signal handlers can only be set from the main thread
+    if threading.current_thread() is threading.main_thread():
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            previous = signal.getsignal(signum)
+            signal.signal(signum, lambda number, frame, previous=previous: _flush_on_signal(number, frame, previous))
+    _handlers_installed = True
+
+
+class ScraperSink:
+    """
+    Buffers scraped rows per output file and writes them in batches.
+
+    In CSV mode every output file gets one append handle, opened (and its directory created) on the
+    first row; the header is written once for a new file. A flush writes all buffered rows of a file
+    with one writerows call and fsyncs it. In a columnar mode ('feather' or 'parquet') the rows go
+    straight to the feature store (see src/utils/feature_store.py): every flush writes the file's
+    previous rows plus the new ones to a temporary file and renames it over the old one, so a crash
+    never leaves a partial file.
+
+    Files are flushed when they hold batch_size rows, on flush() and close(), at interpreter exit and
+    on SIGINT/SIGTERM.
+
+    Attributes:
+        batch_size (int): Buffered rows per file that trigger a flush.
+        fmt (str): 'csv', 'feather' or 'parquet'.
+        overwrite (bool): Replace the files' earlier content instead of appending to it.
+        rows_written (int): Rows flushed so far.
+    """
+
+    def __init__(self, batch_size=200, fmt='csv', overwrite=False):
+        if fmt not in FILE_EXTENSIONS:
+            raise ValueError(f"Unknown sink format '{fmt}'. Choose one of {list(FILE_EXTENSIONS)}.")
+        self.batch_size = batch_size
+        self.fmt = fmt
+        self.overwrite = overwrite
+        self.rows_written = 0
+        self._buffers = {}
+        self._headers = {}
+        self._handles = {}
+        self._frames = {}
+        self._lock = threading.RLock()
+        _open_sinks.add(self)
+        _install_handlers()
+
+    def write(self, base_path, file_name, headers, row):
+        """
+        Buffers one row for '<base_path>/<file_name>'.
+
+        Args:
+            base_path (str): Output directory.
+            file_name (str): Output file name; in a columnar mode its extension is replaced.
+            headers (list): Column headers of the file.
+            row (list): Data row.
+        """
+        path = os.path.join(base_path, file_name)
+        with self._lock:
+            if path not in self._buffers:
+                self._buffers[path] = []
+                self._headers[path] = list(headers)
+            self._buffers[path].append(list(row))
+            if len(self._buffers[path]) >= self.batch_size:
+                self._flush_path(path)
+
+    def flush(self):
+        """
+        Writes the buffered rows of every file.
+        """
+        with self._lock:
+            for path in list(self._buffers):
+                self._flush_path(path)
+
+    def discard(self):
+        """
+        Drops the buffered rows of every file without writing them, e.g. after a failed flush whose
+        rows will be written again.
+        """
+        with self._lock:
+            for path in self._buffers:
+                self._buffers[path] = []
+
+    def _flush_path(self, path):
+        # Take the rows out of the buffer before writing them: a signal handler flushing during the
+        # write re-enters through the RLock and must not write the same rows again
+        rows, self._buffers[path] = self._buffers[path], []
+        if not rows:
+            return
+        try:
+            if self.fmt == 'csv':
+                self._append_csv(path, rows)
+            else:
+                self._rewrite_columnar(path, rows)
+        except BaseException:
+            self._buffers[path] = rows + self._buffers[path]
+            raise
+        self.rows_written += len(rows)
+
+    def _append_csv(self, path, rows):
+        if path not in self._handles:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            new_file = self.overwrite or not os.path.isfile(path) or os.path.getsize(path) == 0
+            handle = open(path, mode='w' if self.overwrite else 'a', newline='', encoding='utf-8')
+            if new_file:
+                csv.writer(handle).writerow(self._headers[path])
+            self._handles[path] = handle
+        handle = self._handles[path]
+        csv.writer(handle).writerows(rows)
+        handle.flush()
+        os.fsync(handle.fileno())
+
+    def _rewrite_columnar(self, path, rows):
+        stage = os.path.splitext(path)[0]
+        new_rows = pd.DataFrame(rows, columns=self._headers[path], dtype=object).astype('string')
+        if stage not in self._frames:
+            # Rows from an earlier run are kept; they are read once, not on every flush
+            self._frames[stage] = new_rows.iloc[:0]
+            if not self.overwrite:
+                try:
+                    find_stage_file(stage)
+                    self._frames[stage] = read_stage(stage, memory_map=False).astype('string')
+                except FileNotFoundError:
+                    pass
+        # Kept only once written, so rows of a failed write are not in the next one twice
+        frame = pd.concat([self._frames[stage], new_rows], ignore_index=True)
+        write_stage(frame, stage, fmt=self.fmt, downcast=False)
+        self._frames[stage] = frame
+
+    def close(self):
+        """
+        Flushes the buffered rows and closes the file handles.
+        """
+        with self._lock:
+            self.flush()
+            for handle in self._handles.values():
+                handle.close()
+            self._handles.clear()
+            self._frames.clear()
+        _open_sinks.discard(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,185 @@
+# src/data/sofascore_api.py
+
+"""
+Ingests Süper Lig match data from the Sofascore JSON API with plain HTTP requests, instead of
+driving a browser through the site (see sofascorescrapper.py).
+
+Rounds, lineups, player ratings and formations are fetched concurrently through an HttpClient
+(src/data/http_client.py): a thread pool sharing one pooled requests.Session, with a bound on
+in-flight requests, a global rate limit and retries with exponential backoff. The rows are
+written in the layout of the scraped raw files:
+
+    data/raw/<season>/<season>.csv                     (one row per match)
+    data/raw/<season>/<season>_teams_and_players.csv   (one row per player)
+"""
+
+import os
+from datetime import datetime
+from zoneinfo import ZoneInfo
+from src.data.http_client import HttpClient
+from src.data.sinks import ScraperSink
+
+
+API_URL = "https://api.sofascore.com/api/v1"
+SUPER_LIG_ID = 52
+RAW_DIR = os.path.join('data', 'raw')
+
+MATCH_HEADERS = [
+    "Season", "Week", "Match Date", "Home Team", "Away Team",
+    "Home Goals", "Away Goals",
+    "Home Performance", "Away Performance",
+    "Home Formation", "Away Formation",
+    "Home Players", "Away Players"
+]
+PLAYER_HEADERS = ["Season", "Team Name", "Player Name", "Player Rating"]
+
+# Match dates are written in Turkish local time, as shown on the site
+MATCH_TIMEZONE = ZoneInfo('Europe/Istanbul')
+
+
+class SofascoreClient(HttpClient):
+    """
+    Thread-safe JSON client for the Sofascore API (see HttpClient for the retries, rate limit and
+    concurrency bound).
+    """
+
+    def __init__(self, base_url=API_URL, max_workers=8, max_concurrency=None, rate_limit=5.0, retries=4,
+                 backoff=0.5, timeout=10.0):
+        super().__init__(base_url, max_workers=max_workers, max_concurrency=max_concurrency, rate_limit=rate_limit,
+                         retries=retries, backoff=backoff, timeout=timeout, headers={'Accept': 'application/json'})
+
+
+def sanitize_season(season_name):
+    """
+    Returns the directory and file name of a season ('23/24' -> '23_24'), as the scraper names them.
+    """
+    return season_name.replace('/', '_')
+
+
+def find_season_id(client, season_name, tournament_id=SUPER_LIG_ID):
+    """
+    Looks up the Sofascore id of a season ('23/24').
+
+    Raises:
+        ValueError: If the tournament has no such season.
+    """
+    seasons = (client.get_json(f"/unique-tournament/{tournament_id}/seasons") or {}).get('seasons', [])
+    for season in seasons:
+        if season.get('year') == season_name:
+            return season['id']
+    raise ValueError(f"Season '{season_name}' not found; available: {[season.get('year') for season in seasons]}.")
+
+
+def team_name(team):
+    return team.get('shortName') or team.get('name')
+
+
+def lineup_summary(lineup):
+    """
+    Summarises one side of an event's lineups like the scraped performance tab.
+
+    Args:
+        lineup (dict): 'home' or 'away' entry of the lineups response.
+
+    Returns:
+        tuple: (average rating of the players who were rated, formation, starting players as
+        '; '-separated short names with '(c) ' marking the captain).
+    """
+    if not lineup:
+        return None, None, ''
+    ratings = [player['statistics']['rating'] for player in lineup.get('players', [])
+               if player.get('statistics', {}).get('rating') is not None]
+    names = []
+    for player in lineup.get('players', []):
+        if player.get('substitute'):
+            continue
+        name = player['player'].get('shortName') or player['player'].get('name')
+        names.append(f"(c) {name}" if player.get('captain') else name)
+    performance = round(sum(ratings) / len(ratings), 2) if ratings else None
+    return performance, lineup.get('formation'), '; '.join(names)
+
+
+def match_row(season_name, event, lineups):
+    """
+    Builds the raw CSV row of a finished event and its lineups (see MATCH_HEADERS).
+    """
+    home_performance, home_formation, home_players = lineup_summary((lineups or {}).get('home'))
+    away_performance, away_formation, away_players = lineup_summary((lineups or {}).get('away'))
+    match_date = datetime.fromtimestamp(event['startTimestamp'], MATCH_TIMEZONE).strftime('%d/%m/%y')
+    return [
+        season_name,
+        f"Round {event['roundInfo']['round']}",
+        match_date,
+        team_name(event['homeTeam']),
+        team_name(event['awayTeam']),
+        event['homeScore'].get('current'),
+        event['awayScore'].get('current'),
+        home_performance,
+        away_performance,
+        home_formation,
+        away_formation,
+        home_players,
+        away_players,
+    ]
+
+
+def fetch_player_ratings(client, season_id, tournament_id=SUPER_LIG_ID, page_size=100):
+    """
+    Fetches the average season rating of every player.
+
+    Returns:
+        list: (team name, player name, rating) tuples.
+    """
+    path = (f"/unique-tournament/{tournament_id}/season/{season_id}/statistics"
+            f"?limit={page_size}&order=-rating&accumulation=average&fields=rating&offset={{offset}}")
+    first = client.get_json(path.format(offset=0)) or {}
+    pages = [first] + client.map(lambda page: client.get_json(path.format(offset=page * page_size)) or {},
+                                 range(1, first.get('pages', 1)))
+    return [(team_name(result['team']), result['player']['name'], result.get('rating', 0))
+            for page in pages for result in page.get('results', [])]
+
+
+def ingest_season(client, season_name, tournament_id=SUPER_LIG_ID, raw_dir=RAW_DIR, fmt='csv'):
+    """
+    Fetches every finished match of a season with its lineups, and the players' season ratings,
+    and writes them as the season's raw files.
+
+    Rounds are fetched concurrently, then the lineups of all finished events; postponed, cancelled
+    and abandoned events are skipped like in the scraper. Match rows are written in round and
+    kick-off order. Everything is fetched before the first row is written, and the season's files
+    are then replaced, so a failed run leaves the previous files untouched.
+
+    Args:
+        client (SofascoreClient): API client.
+        season_name (str): Season as written in the data, e.g. '23/24'.
+        tournament_id (int, optional): Sofascore unique tournament. Defaults to the Süper Lig.
+        raw_dir (str, optional): Root of the raw files. Defaults to 'data/raw'.
+        fmt (str, optional): Output format of the ScraperSink. Defaults to 'csv'.
+
+    Returns:
+        dict: Number of matches and players written.
+    """
+    season_id = find_season_id(client, season_name, tournament_id)
+    season_path = f"/unique-tournament/{tournament_id}/season/{season_id}"
+    rounds = [entry['round'] for entry in (client.get_json(f"{season_path}/rounds") or {}).get('rounds', [])]
+    print(f"Fetching {len(rounds)} rounds of season '{season_name}'...")
+
+    round_events = client.map(lambda number: (client.get_json(f"{season_path}/events/round/{number}") or {})
+                              .get('events', []), rounds)
+    events = [event for events in round_events for event in events
+              if event.get('status', {}).get('type') == 'finished']
+    events.sort(key=lambda event: (event['roundInfo']['round'], event['startTimestamp']))
+    lineups = client.map(lambda event: client.get_json(f"/event/{event['id']}/lineups"), events)
+    players = fetch_player_ratings(client, season_id, tournament_id)
+
+    base_path = os.path.join(raw_dir, sanitize_season(season_name))
+    with ScraperSink(batch_size=500, fmt=fmt, overwrite=True) as sink:
+        for event, event_lineups in zip(events, lineups):
+            sink.write(base_path, f"{sanitize_season(season_name)}.csv", MATCH_HEADERS,
+                       match_row(season_name, event, event_lineups))
+        for team, player, rating in players:
+            sink.write(base_path, f"{sanitize_season(season_name)}_teams_and_players.csv", PLAYER_HEADERS,
+                       [season_name, team, player, rating])
+    print(f"Saved {len(events)} matches and {len(players)} players of season '{season_name}' "
+          f"to '{base_path}' with {client.requests_made} requests.")
+    return {'matches': len(events), 'players': len(players)}
@@ -9,22 +9,88 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 
 import time
-import csv
 import os
 
+from src.data.locators import PageMetrics, get_locator
+from src.data.sinks import ScraperSink
+
+
+# Buffers the scraped rows and writes them in batches (see src/data/sinks.py). Created on first
+# use by get_scraper_sink(), so importing this module (e.g. in a pool worker or a test) does not
+# install the sink's signal handlers
+_scraper_sink = None
+
+# WebDriver round trips and time per scraped page (see src/data/locators.py)
+scraper_metrics = PageMetrics()
+
+
+
+def get_scraper_sink():
+    """
+    Returns the module's ScraperSink, created on first use. Create it with fmt='feather' to write
+    the raw files straight to the feature store format.
+    """
+    global _scraper_sink
+    if _scraper_sink is None:
+        _scraper_sink = ScraperSink(batch_size=200)
+    return _scraper_sink
+
+
+# Statuses shown instead of the kick-off time of matches that were not played
+SKIPPED_STATUSES = ("Postponed", "Abandoned")
+
+# Fields of a row of the matches list, relative to the row's <a> element
+MATCH_ROW_FIELDS = {
+    'status': ('./div/div/div[2]/div/span[1]/bdi', 'text'),
+    'match_date': ('./div/div/div[2]/bdi', 'text'),
+    'home_team': ('./div/div/div[4]/div/div[1]/div[1]/bdi', 'text'),
+    'away_team': ('./div/div/div[4]/div/div[1]/div[2]/bdi', 'text'),
+    'home_score': ('./div/div/div[4]/div/div[3]/div[1]/span[1]', 'text'),
+    'away_score': ('./div/div/div[4]/div/div[3]/div[2]/span[1]', 'text'),
+}
+
+# Fields of the lineups in the performance tab of a match
+LINEUP_XPATH = '//*[@id="__next"]/main/div/div[3]/div/div[1]/div[1]/div[3]/div[3]/div/div[2]/div/div[1]/div/div[2]/div[2]/div/div/div[1]/div'
+LINEUP_FIELDS = {
+    'home_performance': (f'{LINEUP_XPATH}/div[2]/div/div[1]/div/div/div/div/span/div', 'after'),
+    'away_performance': (f'{LINEUP_XPATH}/div[5]/div/div[1]/div/div/div/div/span/div', 'after'),
+    'home_formation': (f'{LINEUP_XPATH}/div[2]/div/div[2]/span', 'text'),
+    'away_formation': (f'{LINEUP_XPATH}/div[5]/div/div[2]/span', 'text'),
+    'home_players': (f'{LINEUP_XPATH}/div[3]/div[1]//span[@class="Text biiPGw"]', 'texts'),
+    'away_players': (f'{LINEUP_XPATH}/div[4]/div[1]//span[@class="Text biiPGw"]', 'texts'),
+}
+
+# Fields of a row of the player statistics table, relative to the row's <tr> element
+PLAYER_ROW_FIELDS = {
+    'team_name': ('./td[2]/a/img', 'attr:alt'),
+    'player_name': ('./td[3]', 'attr:title'),
+    'player_rating': ('./td[9]/div/div/span', 'attr:aria-valuenow'),
+}
+
+
+# Page of the league, on which every season and round is reachable
+SUPER_LIG_URL = "https://www.sofascore.com/tournament/football/turkey/trendyol-super-lig/52"
+
 
 # Chrome WebDriver initializer
-def start_driver():
+def start_driver(headless=False):
     """
     Initializes and returns a Chrome WebDriver instance with specified options.
 
+    Args:
+        headless (bool, optional): Run Chrome without a window, as the parallel workers do
+            (see src/data/scrape_pool.py). Defaults to False.
+
     Returns:
         webdriver.Chrome: Configured Chrome WebDriver.
     """
     options = webdriver.ChromeOptions()
     options.add_argument("--start-maximized")  # Launch browser in full screen
     options.add_argument("--disable-notifications")  # Disable browser notifications
-    # options.add_argument("--headless")  # Uncomment to run in headless mode
+    if headless:
+        options.add_argument("--headless=new")
+        # The page layout (and so the XPaths) depends on the window size
+        options.add_argument("--window-size=1920,1080")
 
     driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
     return driver
@@ -141,31 +207,22 @@ def sanitize_file_name(file_name):
     return file_name
 
 
-def create_or_append_csv(base_path, file_name, headers, data):
+def create_or_append_csv(base_path, file_name, headers, data, sink=None):
     """
-    Creates a new CSV file with headers or appends data to an existing CSV file.
+    Appends a data row to a CSV file, which is created with headers if it does not exist.
+
+    The row is buffered by the module's sink (see get_scraper_sink) and written with the other rows
+    of its batch; the file is opened once instead of once per row.
 
     Args:
         base_path (str): Directory where the CSV file will be saved.
         file_name (str): Name of the CSV file.
         headers (list): List of column headers for the CSV.
         data (list): Data row to append to the CSV.
+        sink (optional): Object with the ScraperSink write() method receiving the row instead of
+            the module's sink.
     """
-    # Create the full file path
-    file_path = os.path.join(base_path, file_name)
-    os.makedirs(base_path, exist_ok=True)  # Create directory if it doesn't exist
-
-    file_exists = os.path.isfile(file_path)
-
-    with open(file_path, mode='a', newline='', encoding='utf-8') as file:
-        writer = csv.writer(file)
-
-        # Write headers if the file is new
-        if not file_exists:
-            writer.writerow(headers)
-
-        # Append the data row
-        writer.writerow(data)
+    (sink or get_scraper_sink()).write(base_path, file_name, headers, data)
 
 
 def navigate_and_scrape_seasons(driver):
@@ -255,71 +312,55 @@ def scrape_team_and_player_data(driver, season_name):
     try:
         # Define the base directory path for saving data
         base_path = os.path.join(r"C:\Users\mbaki\Desktop\Proje\data\raw", sanitize_file_name(season_name))
-        os.makedirs(base_path, exist_ok=True)  # Create directory if it doesn't exist
 
         # Define CSV file name and headers
         csv_file_name = f"{sanitize_file_name(season_name)}_teams_and_players.csv"
         csv_headers = ["Season", "Team Name", "Player Name", "Player Rating"]
 
+        locator = get_locator(driver, scraper_metrics)
+        # XPath of the table rows containing team and player data
+        rows_xpath = '//*[@id="__next"]/main/div/div[3]/div/div[1]/div[1]/div[5]/div/div[4]/div/table/tbody/tr'
+        # XPath of the 'Next' button to navigate through table pages
+        next_button_xpath = '//*[@id="__next"]/main/div/div[3]/div/div[1]/div[1]/div[5]/div/div[4]/div/div/button[2]'
+
         page_number = 1
+        previous_first_row = None
         while True:
             try:
-                # XPath of the table body containing team and player data
-                table_xpath = '//*[@id="__next"]/main/div/div[3]/div/div[1]/div[1]/div[5]/div/div[4]/div/table/tbody'
-                table_element = WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.XPATH, table_xpath))
-                )
-                rows = table_element.find_elements(By.XPATH, './tr')  # All rows in the table
-
-                # Iterate through each row to extract data
-                for i, row in enumerate(rows, start=1):
-                    try:
-                        # Extract team name from the image alt attribute
-                        team_name_xpath = f'./td[2]/a/img'
-                        team_name_element = row.find_element(By.XPATH, team_name_xpath)
-                        team_name = team_name_element.get_attribute('alt')
-
-                        # Extract player name from the title attribute
-                        player_name_xpath = f'./td[3]'
-                        player_name_element = row.find_element(By.XPATH, player_name_xpath)
-                        player_name = player_name_element.get_attribute('title')
-
-                        # Extract player rating; default to "0" if not available
-                        try:
-                            rating_xpath = f'./td[9]/div/div/span'
-                            rating_element = row.find_element(By.XPATH, rating_xpath)
-                            player_rating = rating_element.get_attribute('aria-valuenow')
-                        except Exception:
-                            player_rating = "0"  # Set to 0 if rating is unavailable
-
-                        # Prepare the row data for CSV
-                        csv_row = [season_name, team_name, player_name, player_rating]
+                with scraper_metrics.page(f"{season_name} players page {page_number}"):
+                    # All rows of the page in one call, once the page differs from the previous one
+                    rows = locator.wait_rows(
+                        rows_xpath, PLAYER_ROW_FIELDS, label='player rows',
+                        ready=lambda rows: rows and rows[0] != previous_first_row
+                    )
+                    previous_first_row = rows[0]
+
+                    # Iterate through each row to extract data
+                    for i, row in enumerate(rows, start=1):
+                        if not row['team_name'] or not row['player_name']:
+                            print(f"Error extracting data from row {i}: team or player name not found.")
+                            continue
+                        # Player rating defaults to "0" if not available
+                        csv_row = [season_name, row['team_name'], row['player_name'], row['player_rating'] or "0"]
                         create_or_append_csv(base_path, csv_file_name, csv_headers, csv_row)
 
-                    except Exception as e:
-                        print(f"Error extracting data from row {i}:", str(e))
-
-                # XPath of the 'Next' button to navigate through table pages
-                next_button_xpath = '//*[@id="__next"]/main/div/div[3]/div/div[1]/div[1]/div[5]/div/div[4]/div/div/button[2]'
-                next_button = WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.XPATH, next_button_xpath))
-                )
-
-                # Check if the 'Next' button is disabled, indicating the last page
-                if next_button.get_attribute('disabled'):
-                    print("Reached the last page. Completed processing.")
-                    break
+                    # A disabled 'Next' button indicates the last page
+                    next_button = locator.wait_element(next_button_xpath, label='next button')
+                    if next_button.get_attribute('disabled'):
+                        print("Reached the last page. Completed processing.")
+                        break
 
-                # Click the 'Next' button to go to the next page
-                next_button.click()
-                print(f"Moved to page {page_number}.")
-                time.sleep(2)  # Wait for the next page to load
+                    # Click the 'Next' button to go to the next page
+                    next_button.click()
+                    print(f"Moved to page {page_number}.")
 
             except Exception as e:
                 print("An error occurred while processing the table or button:", str(e))
                 break
             page_number += 1
 
+        # Write the rows still buffered from the last pages
+        get_scraper_sink().flush()
         print(f"All data saved to '{csv_file_name}'.")
 
     except TimeoutException:
@@ -390,69 +431,42 @@ def get_matches(driver, match_table_xpath):
     return matches
 
 
-def get_basic_match_info(driver, matches_xpath, i):
+def get_matches_info(driver, matches_xpath, strict=False):
     """
-    Retrieves basic information about a specific match, skipping if the match is postponed or abandoned.
+    Retrieves the basic information of every match in the matches list with one JavaScript call,
+    once every row shows its teams.
 
     Args:
         driver (webdriver.Chrome): Selenium WebDriver instance.
-        matches_xpath (str): Base XPath for matches.
-        i (int): Index of the match to retrieve information for.
+        matches_xpath (str): XPath of the match rows.
+        strict (bool, optional): Raise on a match with incomplete information instead of skipping it.
+            Defaults to False.
 
     Returns:
-        tuple or None: Tuple containing match date, home team, away team, home score, and away score.
-                       Returns None if the match is postponed or abandoned.
-    """
-    try:
-        # XPath of the specific match
-        match_xpath = f"{matches_xpath}[{i}]"
-        match_element = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.XPATH, match_xpath))
-        )
-
-        # Check if the match is "Postponed" or "Abandoned"
-        postponed_xpath = f"{match_xpath}/div/div/div[2]/div/span[1]/bdi"
-        try:
-            postponed_element = match_element.find_element(By.XPATH, ".//div/div/div[2]/div/span[1]/bdi")
-            postponed_text = postponed_element.text.strip()
-            if postponed_text in ["Postponed", "Abandoned"]:
-                print(f"Match {i} is marked as '{postponed_text}', skipping.")
-                return None  # Skip postponed or abandoned matches
-        except Exception:
-            # If "Postponed" or "Abandoned" label is not present, continue
-            pass
-
-        # Extract match details
-        match_date_xpath = f"{match_xpath}/div/div/div[2]/bdi"
-        home_team_xpath = f"{match_xpath}/div/div/div[4]/div/div[1]/div[1]/bdi"
-        away_team_xpath = f"{match_xpath}/div/div/div[4]/div/div[1]/div[2]/bdi"
-        home_score_xpath = f"{match_xpath}/div/div/div[4]/div/div[3]/div[1]/span[1]"
-        away_score_xpath = f"{match_xpath}/div/div/div[4]/div/div[3]/div[2]/span[1]"
-
-        match_date = WebDriverWait(driver, 10).until(
-            EC.visibility_of_element_located((By.XPATH, match_date_xpath))
-        ).text.strip()
-        home_team = WebDriverWait(driver, 10).until(
-            EC.visibility_of_element_located((By.XPATH, home_team_xpath))
-        ).text.strip()
-        away_team = WebDriverWait(driver, 10).until(
-            EC.visibility_of_element_located((By.XPATH, away_team_xpath))
-        ).text.strip()
-        home_score = WebDriverWait(driver, 10).until(
-            EC.visibility_of_element_located((By.XPATH, home_score_xpath))
-        ).text.strip()
-        away_score = WebDriverWait(driver, 10).until(
-            EC.visibility_of_element_located((By.XPATH, away_score_xpath))
-        ).text.strip()
-
-        return match_date, home_team, away_team, home_score, away_score
+        list: For every row, a tuple of match date, home team, away team, home score and away score,
+              or None if the match is postponed or abandoned (or its information is incomplete).
 
-    except TimeoutException:
-        print(f"Match {i} information could not be retrieved (timeout).")
-        return None
-    except Exception as e:
-        print(f"An error occurred while retrieving match {i} information:", str(e))
-        return None
+    Raises:
+        ValueError: In strict mode, if the information of a played match is incomplete.
+    """
+    rows = get_locator(driver, scraper_metrics).wait_rows(
+        matches_xpath, MATCH_ROW_FIELDS, label='match rows',
+        ready=lambda rows: rows and all(row['home_team'] and row['away_team'] for row in rows)
+    )
+    infos = []
+    for i, row in enumerate(rows, start=1):
+        if row['status'] in SKIPPED_STATUSES:
+            print(f"Match {i} is marked as '{row['status']}', skipping.")
+            infos.append(None)
+            continue
+        info = tuple(row[field] for field in ('match_date', 'home_team', 'away_team', 'home_score', 'away_score'))
+        if not all(info):
+            if strict:
+                raise ValueError(f"Match {i} information could not be retrieved.")
+            print(f"Match {i} information could not be retrieved.")
+            info = None
+        infos.append(info)
+    return infos
 
 
 def navigate_to_performance_tab(driver):
@@ -467,105 +481,58 @@ def navigate_to_performance_tab(driver):
         EC.element_to_be_clickable((By.XPATH, performance_tab_xpath))
     )
     performance_tab.click()
-    time.sleep(1)  # Wait briefly for the tab to load
 
 
-def get_performance_values(driver):
+def get_performance_values(driver, strict=False):
     """
     Extracts performance metrics and player information from the performance tab.
 
+    Both lineups are scrolled into view with one action chain, then read with one JavaScript call
+    (see LINEUP_FIELDS), repeated until both formations and lineups have rendered.
+
     Args:
         driver (webdriver.Chrome): Selenium WebDriver instance.
+        strict (bool, optional): Raise if the lineups cannot be read instead of returning empty
+            values. Defaults to False.
 
     Returns:
         dict: Dictionary containing home and away performance metrics, formations, and player names.
     """
-    # Define XPaths for various performance metrics and elements
-    home_performance_xpath = '//*[@id="__next"]/main/div/div[3]/div/div[1]/div[1]/div[3]/div[3]/div/div[2]/div/div[1]/div/div[2]/div[2]/div/div/div[1]/div/div[2]/div/div[1]/div/div/div/div/span/div'
-    away_performance_xpath = '//*[@id="__next"]/main/div/div[3]/div/div[1]/div[1]/div[3]/div[3]/div/div[2]/div/div[1]/div/div[2]/div[2]/div/div/div[1]/div/div[5]/div/div[1]/div/div/div/div/span/div'
-    home_formation_xpath = '//*[@id="__next"]/main/div/div[3]/div/div[1]/div[1]/div[3]/div[3]/div/div[2]/div/div[1]/div/div[2]/div[2]/div/div/div[1]/div/div[2]/div/div[2]/span'
-    away_formation_xpath = '//*[@id="__next"]/main/div/div[3]/div/div[1]/div[1]/div[3]/div[3]/div/div[2]/div/div[1]/div/div[2]/div[2]/div/div/div[1]/div/div[5]/div/div[2]/span'
     scrollbar_xpath = '//*[@id="__next"]/main/div/div[3]/div/div[1]/div[1]/div[3]/div[3]/div/div[2]/div/div[3]/div'
 
-    def get_performance(driver, xpath):
+    def get_performance(content):
         """
-        Retrieves the performance value using JavaScript to access computed styles.
-
-        Args:
-            driver (webdriver.Chrome): Selenium WebDriver instance.
-            xpath (str): XPath of the element to retrieve the performance value from.
-
-        Returns:
-            float or None: Performance value as a float, or None if conversion fails.
+        Converts the CSS content of a rating badge (e.g. '"7.1"') to a float; None if it is not a number.
         """
-        script = (
-            "return window.getComputedStyle("
-            "document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue, "
-            "'::after'"
-            ").getPropertyValue('content');"
-        )
-        performance = driver.execute_script(script, xpath).strip('"')
         try:
-            return float(performance)
+            return float((content or '').strip('"'))
         except ValueError:
             return None  # Return None if conversion fails
 
     try:
-        # Wait for the scrollbar element and define the action chain
-        scrollbar = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.XPATH, scrollbar_xpath))
-        )
-        action = ActionChains(driver)
+        locator = get_locator(driver, scraper_metrics)
+        scrollbar = locator.wait_element(scrollbar_xpath, label='lineup scrollbar')
 
-        # Scroll the scrollbar 60 pixels down
-        action.click_and_hold(scrollbar).move_by_offset(0, 60).release().perform()
-        time.sleep(1)  # Wait for the scroll action to take effect
+        # Scroll the scrollbar 60 and then 150 pixels down, in one round trip
+        ActionChains(driver).click_and_hold(scrollbar).move_by_offset(0, 60).release() \
+            .click_and_hold(scrollbar).move_by_offset(0, 150).release().perform()
 
-        # Retrieve home team performance
-        home_performance = get_performance(driver, home_performance_xpath)
-
-        # Retrieve home team formation
-        home_formation = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.XPATH, home_formation_xpath))
-        ).text
-
-        # Extract home team players' names
-        home_players_xpath = '//*[@id="__next"]/main/div/div[3]/div/div[1]/div[1]/div[3]/div[3]/div/div[2]/div/div[1]/div/div[2]/div[2]/div/div/div[1]/div/div[3]/div[1]//span[@class="Text biiPGw"]'
-        home_players_elements = WebDriverWait(driver, 10).until(
-            EC.presence_of_all_elements_located((By.XPATH, home_players_xpath))
-        )
-        home_players = [player.text for player in home_players_elements]
-
-        # Scroll the scrollbar an additional 150 pixels down
-        action.click_and_hold(scrollbar).move_by_offset(0, 150).release().perform()
-        time.sleep(1)  # Wait for the scroll action to take effect
-
-        # Retrieve away team performance
-        away_performance = get_performance(driver, away_performance_xpath)
-
-        # Retrieve away team formation
-        away_formation = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.XPATH, away_formation_xpath))
-        ).text
-
-        # Extract away team players' names
-        away_players_xpath = '//*[@id="__next"]/main/div/div[3]/div/div[1]/div[1]/div[3]/div[3]/div/div[2]/div/div[1]/div/div[2]/div[2]/div/div/div[1]/div/div[4]/div[1]//span[@class="Text biiPGw"]'
-        away_players_elements = WebDriverWait(driver, 10).until(
-            EC.presence_of_all_elements_located((By.XPATH, away_players_xpath))
-        )
-        away_players = [player.text for player in away_players_elements]
+        values = locator.wait_for(LINEUP_FIELDS, label='lineup', ready=lambda values: all(
+            values[field] for field in ('home_formation', 'away_formation', 'home_players', 'away_players')))
 
         return {
-            'home_performance': home_performance,
-            'home_formation': home_formation,
-            'home_players': home_players,
-            'away_performance': away_performance,
-            'away_formation': away_formation,
-            'away_players': away_players
+            'home_performance': get_performance(values['home_performance']),
+            'home_formation': values['home_formation'],
+            'home_players': values['home_players'],
+            'away_performance': get_performance(values['away_performance']),
+            'away_formation': values['away_formation'],
+            'away_players': values['away_players']
         }
 
     except Exception as e:
         print("An error occurred while retrieving performance values:", str(e))
+        if strict:
+            raise
         return {
             'home_performance': None,
             'home_formation': None,
@@ -576,7 +543,7 @@ def get_performance_values(driver):
         }
 
 
-def scrape_data_from_week(driver, week_name, season_name):
+def scrape_data_from_week(driver, week_name, season_name, sink=None, strict=False):
     """
     Extracts match data from a specific week and saves it to the corresponding season's CSV file.
 
@@ -584,97 +551,214 @@ def scrape_data_from_week(driver, week_name, season_name):
         driver (webdriver.Chrome): Selenium WebDriver instance.
         week_name (str): Name of the current week being scraped.
         season_name (str): Name of the current season being scraped.
+        sink (optional): Receives the rows instead of the module's sink (see create_or_append_csv).
+        strict (bool, optional): Raise on the first match that cannot be scraped completely (including
+            its lineups) instead of skipping it, so that a partial week is never reported as done.
+            Defaults to False.
     """
-    try:
-        print(f"Starting data extraction for week '{week_name}' in season '{season_name}'.")
+    # Timed as one page; the reads of its matches and lineups are counted in scraper_metrics
+    with scraper_metrics.page(f"{season_name} {week_name}"):
+        try:
+            print(f"Starting data extraction for week '{week_name}' in season '{season_name}'.")
+
+            # XPath of the matches table
+            match_table_xpath = '//*[@id="__next"]/main/div/div[3]/div/div[1]/div[1]/div[3]/div[3]/div/div[1]/div/div[2]'
+
+            # Retrieve all match elements and their basic information
+            matches = get_matches(driver, match_table_xpath)
+            matches_info = get_matches_info(driver, f"{match_table_xpath}/a", strict=strict)
+
+            # Define the base directory path for saving data
+            base_path = os.path.join(r"C:\Users\mbaki\Desktop\Proje\data\raw", sanitize_file_name(season_name))
+
+            # Define CSV file name and headers
+            csv_file_name = f"{sanitize_file_name(season_name)}.csv"
+            csv_headers = [
+                "Season", "Week", "Match Date", "Home Team", "Away Team",
+                "Home Goals", "Away Goals",
+                "Home Performance", "Away Performance",
+                "Home Formation", "Away Formation",
+                "Home Players", "Away Players"
+            ]
+
+            for i, (match, basic_info) in enumerate(zip(matches, matches_info), start=1):
+                try:
+                    if basic_info is None:
+                        continue  # Skip matches that are postponed or abandoned
+
+                    match_date, home_team, away_team, home_score, away_score = basic_info
+
+                    # Click the match to open its detailed view
+                    match.click()
+
+                    # Navigate to the performance tab
+                    navigate_to_performance_tab(driver)
+
+                    # Extract performance metrics and player information
+                    performance_data = get_performance_values(driver, strict=strict)
+                    home_performance = performance_data.get('home_performance', None)
+                    away_performance = performance_data.get('away_performance', None)
+                    home_formation = performance_data.get('home_formation', None)
+                    away_formation = performance_data.get('away_formation', None)
+                    home_players = performance_data.get('home_players', [])
+                    away_players = performance_data.get('away_players', [])
+
+                    # Convert player lists to semicolon-separated strings for CSV
+                    home_players_str = "; ".join(home_players)
+                    away_players_str = "; ".join(away_players)
+
+                    # Prepare the row data for CSV
+                    csv_row = [
+                        season_name,
+                        week_name,
+                        match_date,
+                        home_team,
+                        away_team,
+                        home_score,
+                        away_score,
+                        home_performance,
+                        away_performance,
+                        home_formation,
+                        away_formation,
+                        home_players_str,
+                        away_players_str
+                    ]
+
+                    # Write the row to the CSV file
+                    create_or_append_csv(
+                        base_path,
+                        csv_file_name,
+                        csv_headers,
+                        csv_row,
+                        sink=sink
+                    )
+
+                    print(f"Successfully extracted and saved data for match {i}.")
+
+                except Exception as e:
+                    print(f"An error occurred while extracting data for match {i}:", str(e))
+                    if strict:
+                        raise
+
+            # One write per week; a finished week is on disk before the next one starts
+            (sink or get_scraper_sink()).flush()
+            print(f"Data for week '{week_name}' has been saved to '{csv_file_name}'.")
+
+        except TimeoutException:
+            print(f"Data for week '{week_name}' could not be found within the timeout period.")
+            if strict:
+                raise
+        except Exception as e:
+            print(f"An error occurred while extracting data for week '{week_name}':", str(e))
+            if strict:
+                raise
+
+
+class RowCollector:
+    """
+    Sink keeping the scraped match rows in memory, so a pool worker can return them.
+    """
+
+    def __init__(self):
+        self.rows = []
+
+    def write(self, base_path, file_name, headers, row):
+        self.rows.append(list(row))
+
+    def flush(self):
+        pass
+
+
+def select_season(driver, season_name):
+    """
+    Opens the season selection and clicks the given season.
 
-        # XPath of the matches table
-        match_table_xpath = '//*[@id="__next"]/main/div/div[3]/div/div[1]/div[1]/div[3]/div[3]/div/div[1]/div/div[2]'
+    Args:
+        driver (webdriver.Chrome): Selenium WebDriver instance on the league page.
+        season_name (str): Season as listed on the site, e.g. '23/24'.
 
-        # Retrieve all match elements
-        matches = get_matches(driver, match_table_xpath)
+    Raises:
+        ValueError: If the season is not listed.
+    """
+    button_xpath = '//*[@id="__next"]/main/div/div[3]/div/div[1]/div[1]/div[1]/div[1]/div[2]/div[2]/div[1]/div/div[2]/div/div/div/div/button'
+    list_xpath = '//*[@id="__next"]/main/div/div[3]/div/div[1]/div[1]/div[1]/div[1]/div[2]/div[2]/div[1]/div/div[2]/div/div/div/div/div/div/div/ul'
+    WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, button_xpath))).click()
+    season_items = WebDriverWait(driver, 10).until(
+        EC.presence_of_all_elements_located((By.XPATH, f'{list_xpath}/li'))
+    )
+    for season_element in season_items:
+        if season_element.text.strip() == season_name:
+            season_element.click()
+            print(f"Switched to season '{season_name}'.")
+            return
+    raise ValueError(f"Season '{season_name}' is not listed.")
 
-        # Define the base directory path for saving data
-        base_path = os.path.join(r"C:\Users\mbaki\Desktop\Proje\data\raw", sanitize_file_name(season_name))
-        os.makedirs(base_path, exist_ok=True)  # Create directory if it doesn't exist
 
-        # Define CSV file name and headers
-        csv_file_name = f"{sanitize_file_name(season_name)}.csv"
-        csv_headers = [
-            "Season", "Week", "Match Date", "Home Team", "Away Team",
-            "Home Goals", "Away Goals",
-            "Home Performance", "Away Performance",
-            "Home Formation", "Away Formation",
-            "Home Players", "Away Players"
-        ]
-
-        # Base XPath for individual matches
-        matches_xpath = f"{match_table_xpath}/a"
-        for i, match in enumerate(matches, start=1):
-            try:
-                # Retrieve basic match information
-                basic_info = get_basic_match_info(driver, matches_xpath, i)
-                if basic_info is None:
-                    continue  # Skip matches that are postponed or abandoned
-
-                match_date, home_team, away_team, home_score, away_score = basic_info
-
-                # Click the match to open its detailed view
-                match.click()
-
-                # Navigate to the performance tab
-                navigate_to_performance_tab(driver)
-
-                # Extract performance metrics and player information
-                performance_data = get_performance_values(driver)
-                home_performance = performance_data.get('home_performance', None)
-                away_performance = performance_data.get('away_performance', None)
-                home_formation = performance_data.get('home_formation', None)
-                away_formation = performance_data.get('away_formation', None)
-                home_players = performance_data.get('home_players', [])
-                away_players = performance_data.get('away_players', [])
-
-                # Convert player lists to semicolon-separated strings for CSV
-                home_players_str = "; ".join(home_players)
-                away_players_str = "; ".join(away_players)
-
-                # Prepare the row data for CSV
-                csv_row = [
-                    season_name,
-                    week_name,
-                    match_date,
-                    home_team,
-                    away_team,
-                    home_score,
-                    away_score,
-                    home_performance,
-                    away_performance,
-                    home_formation,
-                    away_formation,
-                    home_players_str,
-                    away_players_str
-                ]
-
-                # Write the row to the CSV file
-                create_or_append_csv(
-                    base_path,
-                    csv_file_name,
-                    csv_headers,
-                    csv_row
-                )
+def go_to_round(driver, round_number, max_clicks=45):
+    """
+    Steps the round navigation of the matches section to the given round.
 
-                print(f"Successfully extracted and saved data for match {i}.")
+    Args:
+        driver (webdriver.Chrome): Selenium WebDriver instance.
+        round_number (int): Round to show.
+        max_clicks (int, optional): Clicks before giving up. Defaults to 45.
 
-            except Exception as e:
-                print(f"An error occurred while extracting data for match {i}:", str(e))
-                # Additional error handling can be implemented here
+    Returns:
+        str: Name of the round as displayed, e.g. 'Round 5'.
 
-        print(f"Data for week '{week_name}' has been saved to '{csv_file_name}'.")
+    Raises:
+        TimeoutException: If the round is not reached.
+    """
+    previous_button_xpath = '//*[@id="__next"]/main/div/div[3]/div/div[1]/div[1]/div[3]/div[3]/div/div[1]/div/div[1]/button[1]'
+    next_button_xpath = '//*[@id="__next"]/main/div/div[3]/div/div[1]/div[1]/div[3]/div[3]/div/div[1]/div/div[1]/button[2]'
+    week_name_xpath = '//*[@id="__next"]/main/div/div[3]/div/div[1]/div[1]/div[3]/div[3]/div/div[1]/div/div[2]/span'
+    for _ in range(max_clicks):
+        week_name = WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.XPATH, week_name_xpath))
+        ).text
+        current = int(''.join(char for char in week_name if char.isdigit()) or 0)
+        if current == round_number:
+            return week_name
+        button_xpath = previous_button_xpath if current > round_number else next_button_xpath
+        WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, button_xpath))).click()
+        # Wait for the round name to change before reading it again
+        WebDriverWait(driver, 10).until(
+            lambda d: d.find_element(By.XPATH, week_name_xpath).text != week_name
+        )
+    raise TimeoutException(f"Round {round_number} was not reached in {max_clicks} clicks.")
 
-    except TimeoutException:
-        print(f"Data for week '{week_name}' could not be found within the timeout period.")
-    except Exception as e:
-        print(f"An error occurred while extracting data for week '{week_name}':", str(e))
+
+def scrape_round(driver, unit):
+    """
+    Unit scraper of the parallel worker pool (see src/data/scrape_pool.py): opens the league page,
+    selects the unit's season and round and returns the round's match rows.
+
+    Args:
+        driver (webdriver.Chrome): The worker's WebDriver instance.
+        unit (WorkUnit): Season and round number.
+
+    Returns:
+        list: Match rows in the layout of the season CSV.
+
+    Raises:
+        Exception: If any match of the round (or its lineups) could not be scraped, or none was
+            found, so that the pool retries the round with a fresh browser instead of recording a
+            partial round as done.
+    """
+    driver.get(SUPER_LIG_URL)
+    select_season(driver, unit.season)
+    time.sleep(3)
+    scroll_down(driver, 3500)
+    time.sleep(2)
+    handle_matches_popup(driver)
+    navigate_to_matches_section(driver)
+    week_name = go_to_round(driver, unit.round)
+
+    collector = RowCollector()
+    scrape_data_from_week(driver, week_name, unit.season, sink=collector, strict=True)
+    if not collector.rows:
+        raise RuntimeError(f"No matches scraped for '{week_name}' of season '{unit.season}'.")
+    return collector.rows
 
 
 if __name__ == "__main__":
@@ -687,5 +771,12 @@ if __name__ == "__main__":
     # Navigate through available seasons and scrape data
     navigate_and_scrape_seasons(driver)
 
+    # Write the remaining buffered rows and close the output files
+    get_scraper_sink().close()
+
+    summary = scraper_metrics.summary()
+    print(f"Scraped {summary['pages']} pages with {summary['round_trips_per_page']:.1f} WebDriver round trips "
+          f"and {summary['seconds_per_page']:.2f}s per page.")
+
     # Optionally, close the browser after scraping is complete (uncomment the line below)
     # driver.quit()
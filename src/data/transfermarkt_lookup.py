@@ -0,0 +1,201 @@
+# src/data/transfermarkt_lookup.py
+
+"""
+Looks up the age and market value of players on Transfermarkt with plain HTTP requests.
+
+Every lookup fetches the quick-search result page of the player's name and parses it with
+BeautifulSoup, reading the first row of the players table like the browser scraper did. Results
+are kept in a disk cache keyed by the normalized (team, player) pair, so a player listed in several
+seasons is looked up once per TTL. Cache misses are fetched concurrently through an HttpClient
+(src/data/http_client.py) with a rate limit and retries.
+"""
+
+import json
+import os
+import threading
+import time
+import unicodedata
+from urllib.parse import quote_plus
+from bs4 import BeautifulSoup
+import pandas as pd
+from src.data.http_client import HttpClient
+
+
+TRANSFERMARKT_URL = "https://www.transfermarkt.com.tr"
+SEARCH_PATH = "/schnellsuche/ergebnis/schnellsuche?query={query}"
+CACHE_PATH = os.path.join('data', 'cache', 'transfermarkt_players.json')
+
+OUTPUT_HEADERS = ['Team Name', 'Player Name', 'Age', 'Market Value']
+
+# Letters without an ASCII decomposition
+_TRANSLITERATIONS = str.maketrans({'ı': 'i', 'ø': 'o', 'đ': 'd', 'ł': 'l', 'ß': 'ss', 'æ': 'ae'})
+
+
+def normalize_name(name):
+    """
+    Normalizes a team or player name for cache keys: case, accents and whitespace are ignored
+    ('Beşiktaş ' and 'besiktas' are the same team).
+    """
+    name = unicodedata.normalize('NFKD', str(name).casefold().translate(_TRANSLITERATIONS))
+    name = ''.join(char for char in name if not unicodedata.combining(char))
+    return ' '.join(name.split())
+
+
+class PlayerCache:
+    """
+    Disk cache of player lookups, stored as one JSON file.
+
+    Entries expire after ttl_days. Players without a search result are cached too, but expire after
+    miss_ttl_days so that they are searched again sooner.
+
+    Attributes:
+        path (str): Cache file.
+        ttl_days (float): Lifetime of a found player.
+        miss_ttl_days (float): Lifetime of a player without a search result.
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups not in the cache or expired.
+    """
+
+    def __init__(self, path=CACHE_PATH, ttl_days=30, miss_ttl_days=7):
+        self.path = path
+        self.ttl_days = ttl_days
+        self.miss_ttl_days = miss_ttl_days
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+        if os.path.isfile(path):
+            with open(path, encoding='utf-8') as file:
+                self._entries = json.load(file)
+
+    @staticmethod
+    def key(team_name, player_name):
+        return f"{normalize_name(team_name)}|{normalize_name(player_name)}"
+
+    def get(self, team_name, player_name):
+        """
+        Returns the cached {'age', 'market_value'} of a player (None values for a player without a
+        search result), or None if the player is not cached or the entry has expired.
+        """
+        with self._lock:
+            entry = self._entries.get(self.key(team_name, player_name))
+            found = entry is not None and entry['age'] is not None
+            ttl_days = self.ttl_days if found else self.miss_ttl_days
+            if entry is None or time.time() - entry['fetched_at'] > ttl_days * 86400:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return {'age': entry['age'], 'market_value': entry['market_value']}
+
+    def put(self, team_name, player_name, age, market_value):
+        with self._lock:
+            self._entries[self.key(team_name, player_name)] = {
+                'age': age, 'market_value': market_value, 'fetched_at': time.time()
+            }
+
+    def save(self):
+        """
+        Writes the cache to a temporary file and renames it over the old one.
+        """
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                json.dump(self._entries, file, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def parse_search_results(html):
+    """
+    Reads the age and market value of the first player of a quick-search result page.
+
+    Returns:
+        tuple: (age, market value) as displayed, or None if the page lists no player.
+    """
+    document = BeautifulSoup(html, 'html.parser')
+    row = document.select_one('#yw0 > table > tbody > tr')
+    if row is None:
+        return None
+    # Cells of the row itself; the first one holds a nested table with the name and club
+    cells = row.find_all('td', recursive=False)
+    if len(cells) < 6:
+        return None
+    return cells[3].get_text(strip=True), cells[5].get_text(strip=True)
+
+
+def search_player(client, player_name):
+    """
+    Searches a player by name.
+
+    Returns:
+        tuple: (age, market value), or None if no player was found.
+    """
+    response = client.get(SEARCH_PATH.format(query=quote_plus(str(player_name))))
+    return None if response is None else parse_search_results(response.content)
+
+
+def lookup_players(players, client, cache):
+    """
+    Looks up the age and market value of players, from the cache where possible.
+
+    Every distinct (team, player) pair missing from the cache is searched once, concurrently on the
+    client's workers; the results are added to the cache, which is then saved. A pair whose search
+    fails (e.g. after all retries) is reported with 'N/A' values and not cached.
+
+    Args:
+        players (pd.DataFrame): 'Team Name' and 'Player Name' columns, e.g. a season's
+            '_teams_and_players.csv'.
+        client (HttpClient): Client for TRANSFERMARKT_URL.
+        cache (PlayerCache): Lookup cache.
+
+    Returns:
+        pd.DataFrame: One row per input row with the OUTPUT_HEADERS columns.
+    """
+    pairs = list(zip(players['Team Name'], players['Player Name']))
+    results = {}
+    missing = {}
+    for team_name, player_name in pairs:
+        key = cache.key(team_name, player_name)
+        if key in results or key in missing:
+            continue
+        cached = cache.get(team_name, player_name)
+        if cached is None:
+            missing[key] = (team_name, player_name)
+        else:
+            results[key] = (cached['age'] or 'N/A', cached['market_value'] or 'N/A')
+    print(f"{len(results)} of {len(results) + len(missing)} players found in the cache; "
+          f"searching the other {len(missing)}.")
+
+    def search(key):
+        team_name, player_name = missing[key]
+        try:
+            found = search_player(client, player_name)
+        except Exception as e:
+            print(f"Error: An error occurred while processing {player_name}. Error: {e}")
+            return key, ('N/A', 'N/A')
+        age, market_value = found or (None, None)
+        cache.put(team_name, player_name, age, market_value)
+        return key, (age or 'N/A', market_value or 'N/A')
+
+    results.update(client.map(search, list(missing)))
+    cache.save()
+    return pd.DataFrame([[team_name, player_name, *results[cache.key(team_name, player_name)]]
+                         for team_name, player_name in pairs], columns=OUTPUT_HEADERS)
+
+
+def transfermarkt_client(base_url=TRANSFERMARKT_URL, max_workers=8, rate_limit=4.0, retries=3):
+    """
+    Returns an HttpClient for Transfermarkt, which serves result pages only to browser-like requests.
+    """
+    headers = {
+        'User-Agent': ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+                       'Chrome/124.0 Safari/537.36'),
+        'Accept': 'text/html,application/xhtml+xml',
+        'Accept-Language': 'tr-TR,tr;q=0.9,en;q=0.8',
+    }
+    return HttpClient(base_url, max_workers=max_workers, rate_limit=rate_limit, retries=retries, headers=headers)
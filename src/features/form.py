@@ -0,0 +1,241 @@
+# src/features/form.py
+
+import warnings
+import numpy as np
+import pandas as pd
+from .player_join import MAX_PLAYERS
+
+
+# Rolling windows (in matches) of the form features
+FORM_WINDOWS = (5, 10)
+
+# Per-team match statistics that are rolled, and how they are aggregated over the window
+FORM_STATS = (
+    ('GoalsScored', 'sum'),
+    ('Points', 'sum'),
+    ('AvgAge', 'mean'),
+    ('AvgValue', 'mean'),
+    ('AvgRating', 'mean'),
+)
+
+# Points awarded for a loss, draw and win, indexed by sign(goals for - goals against) + 1
+POINTS_BY_SIGN = np.array([0, 1, 3])
+
+
+def player_columns(side, attribute, max_players=MAX_PLAYERS):
+    """
+    Returns the per-player attribute columns of one side, e.g. 'Home_Player_1_TeamPlayer_Age'.
+
+    Args:
+        side (str): 'Home' or 'Away'.
+        attribute (str): 'Age', 'MarketValue' or 'Rating'.
+        max_players (int, optional): Number of players in a lineup. Defaults to 11.
+
+    Returns:
+        list: Column names.
+    """
+    return [f"{side}_Player_{i}_TeamPlayer_{attribute}" for i in range(1, max_players + 1)]
+
+
+def form_feature_names(side):
+    """
+    Returns the names of the rolling form features of one side, in output order.
+
+    Args:
+        side (str): 'Home' or 'Away'.
+
+    Returns:
+        list: Column names such as 'Home_GoalsScored_Last5'.
+    """
+    return [f"{side}_{stat}_Last{window}" for stat, _ in FORM_STATS for window in FORM_WINDOWS]
+
+
+def add_team_aggregates(df, max_players=MAX_PLAYERS):
+    """
+    Adds team-level averages/totals of the lineup attributes, their differences and the home advantage.
+
+    Args:
+        df (pd.DataFrame): Processed season data with the per-player attribute columns.
+        max_players (int, optional): Number of players in a lineup. Defaults to 11.
+
+    Returns:
+        pd.DataFrame: The DataFrame with the aggregate columns added.
+    """
+    aggregates = {}
+    for side in ('Home', 'Away'):
+        ages = df[player_columns(side, 'Age', max_players)].to_numpy(dtype=float)
+        values = df[player_columns(side, 'MarketValue', max_players)].to_numpy(dtype=float)
+        ratings = df[player_columns(side, 'Rating', max_players)].to_numpy(dtype=float)
+        with warnings.catch_warnings():
+            # Lineups without any known attribute give NaN, like pandas' mean(axis=1)
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            aggregates[f"{side}_AvgAge"] = np.nanmean(ages, axis=1)
+            aggregates[f"{side}_SumValue"] = np.nansum(values, axis=1)
+            aggregates[f"{side}_AvgValue"] = np.nanmean(values, axis=1)
+            aggregates[f"{side}_AvgRating"] = np.nanmean(ratings, axis=1)
+
+    aggregates["Age_Diff"] = aggregates["Home_AvgAge"] - aggregates["Away_AvgAge"]
+    aggregates["Value_Diff"] = aggregates["Home_SumValue"] - aggregates["Away_SumValue"]
+    aggregates["Rating_Diff"] = aggregates["Home_AvgRating"] - aggregates["Away_AvgRating"]
+    aggregates["Home_Advantage"] = np.ones(len(df), dtype=np.int64)
+
+    return df.assign(**aggregates)
+
+
+def match_points(goals_for, goals_against):
+    """
+    Computes league points (3/1/0) from goals scored and conceded.
+
+    Args:
+        goals_for (np.ndarray): Goals scored.
+        goals_against (np.ndarray): Goals conceded.
+
+    Returns:
+        np.ndarray: Points per match.
+    """
+    return POINTS_BY_SIGN[np.sign(goals_for - goals_against).astype(np.int64) + 1]
+
+
+def parse_match_dates(dates):
+    """
+    Parses match dates written day first (e.g. '24/05/24' as scraped from Sofascore).
+
+    The scraped format is tried first, so the common case is parsed in one vectorized call; any
+    other representation falls back to pandas' element-wise day-first parsing.
+
+    Args:
+        dates (pd.Series): Match date strings.
+
+    Returns:
+        pd.Series: Parsed dates (NaT where unparseable).
+    """
+    parsed = pd.to_datetime(dates, format="%d/%m/%y", errors="coerce")
+    unparsed = parsed.isna() & dates.notna()
+    if unparsed.any():
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=UserWarning)
+            parsed[unparsed] = pd.to_datetime(dates[unparsed], dayfirst=True, errors="coerce")
+    return parsed
+
+
+def grouped_rolling(values, group_starts, window):
+    """
+    Computes trailing rolling sums and counts of non-missing values within sorted groups.
+
+    The rows must be sorted so that each group is contiguous; the window of a row covers the row
+    itself and up to window - 1 preceding rows of the same group (pandas rolling with min_periods=1).
+
+    Args:
+        values (np.ndarray): Array of shape (n_rows, n_stats), sorted by group.
+        group_starts (np.ndarray): For every row, the position of the first row of its group.
+        window (int): Window length in rows.
+
+    Returns:
+        tuple: (sums, counts), both of shape (n_rows, n_stats).
+    """
+    valid = ~np.isnan(values)
+    cum_values = np.zeros((len(values) + 1, values.shape[1]))
+    cum_counts = np.zeros((len(values) + 1, values.shape[1]))
+    np.cumsum(np.where(valid, values, 0.0), axis=0, out=cum_values[1:])
+    np.cumsum(valid, axis=0, out=cum_counts[1:])
+
+    positions = np.arange(len(values))
+    window_starts = np.maximum(positions - window + 1, group_starts)
+    sums = cum_values[positions + 1] - cum_values[window_starts]
+    counts = cum_counts[positions + 1] - cum_counts[window_starts]
+    return sums, counts
+
+
+def compute_form_features(df):
+    """
+    Computes the rolling Last5/Last10 form features of both teams of every match.
+
+    Every match contributes one row per team (a long format), the rows are sorted by team and match
+    date once, all windows and statistics are rolled in a single grouped pass over a NumPy array,
+    and the results are mapped back to the matches by row position. As in the original notebook,
+    the window of a match includes the match itself.
+
+    Args:
+        df (pd.DataFrame): Season data with 'Match Date', 'Home Team', 'Away Team', 'Home Goals',
+            'Away Goals' and the Home_/Away_ AvgAge, AvgValue and AvgRating columns.
+
+    Returns:
+        pd.DataFrame: Home_* and Away_* form features, indexed like df.
+    """
+    n_matches = len(df)
+    home_goals = df["Home Goals"].to_numpy(dtype=float)
+    away_goals = df["Away Goals"].to_numpy(dtype=float)
+
+    # Long format: rows [0, n) are the home sides, rows [n, 2n) the away sides
+    teams = np.concatenate([df["Home Team"].to_numpy(), df["Away Team"].to_numpy()])
+    team_codes, _ = pd.factorize(teams)
+    stats = {
+        'GoalsScored': np.concatenate([home_goals, away_goals]),
+        'Points': np.concatenate([match_points(home_goals, away_goals), match_points(away_goals, home_goals)]),
+        'AvgAge': np.concatenate([df["Home_AvgAge"].to_numpy(float), df["Away_AvgAge"].to_numpy(float)]),
+        'AvgValue': np.concatenate([df["Home_AvgValue"].to_numpy(float), df["Away_AvgValue"].to_numpy(float)]),
+        'AvgRating': np.concatenate([df["Home_AvgRating"].to_numpy(float), df["Away_AvgRating"].to_numpy(float)]),
+    }
+    values = np.column_stack([stats[stat] for stat, _ in FORM_STATS]).astype(float)
+
+    # Sort by team, then date (unparseable dates last), then original row order
+    dates = parse_match_dates(df["Match Date"])
+    date_keys = dates.to_numpy(dtype='datetime64[ns]').view(np.int64)
+    date_keys = np.where(dates.isna().to_numpy(), np.iinfo(np.int64).max, date_keys)
+    order = np.lexsort((np.arange(2 * n_matches), np.tile(date_keys, 2), team_codes))
+
+    sorted_teams = team_codes[order]
+    is_start = np.ones(len(order), dtype=bool)
+    is_start[1:] = sorted_teams[1:] != sorted_teams[:-1]
+    group_starts = np.maximum.accumulate(np.where(is_start, np.arange(len(order)), 0))
+
+    sorted_values = values[order]
+    is_mean = np.array([how == 'mean' for _, how in FORM_STATS])
+    features = np.empty((2 * n_matches, len(FORM_STATS) * len(FORM_WINDOWS)))
+    for window_index, window in enumerate(FORM_WINDOWS):
+        sums, counts = grouped_rolling(sorted_values, group_starts, window)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rolled = np.where(is_mean, sums / counts, sums)
+        rolled[counts == 0] = np.nan
+        # Output order is stat-major: <stat>_Last5, <stat>_Last10, <next stat>_Last5, ...
+        features[order, window_index::len(FORM_WINDOWS)] = rolled
+
+    home = pd.DataFrame(features[:n_matches], columns=form_feature_names('Home'), index=df.index)
+    away = pd.DataFrame(features[n_matches:], columns=form_feature_names('Away'), index=df.index)
+    return pd.concat([home, away], axis=1)
+
+
+def create_features_for_season(df, add_rolling_form=True, drop_player_columns=True, max_players=MAX_PLAYERS):
+    """
+    Creates feature-engineered data for a given season.
+
+    This is the importable, vectorized version of create_features_for_season from
+    src/notebooks/feature_engineering_1.ipynb. It adds:
+      1. Home & Away team-based (Total / Average) Age, MarketValue, Rating and their differences
+      2. Home advantage
+      3. (Optional) Form data: goals, points and average age/value/rating over the last 5 and 10 matches
+      4. Optionally drops the original 66 "Home_Player_X_TeamPlayer_*" and "Away_Player_X_TeamPlayer_*" columns.
+
+    Unlike the notebook, the form features are joined back by row position instead of merging on
+    ["Week", "Home Team"], so no Season_x/Season_y or Match Date_x/Match Date_y duplicates are created.
+
+    Args:
+        df (pd.DataFrame): The "processed" season data.
+        add_rolling_form (bool, optional): Add the Last5/Last10 form features. Defaults to True.
+        drop_player_columns (bool, optional): Drop the per-player attribute columns. Defaults to True.
+        max_players (int, optional): Number of players in a lineup. Defaults to 11.
+
+    Returns:
+        pd.DataFrame: The feature-engineered season data.
+    """
+    df = add_team_aggregates(df, max_players)
+
+    if add_rolling_form:
+        df = pd.concat([df, compute_form_features(df)], axis=1)
+
+    if drop_player_columns:
+        columns = [player_columns(side, attribute, max_players)
+                   for side in ('Home', 'Away') for attribute in ('Age', 'MarketValue', 'Rating')]
+        df = df.drop(columns=[column for group in columns for column in group])
+
+    return df
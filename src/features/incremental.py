@@ -0,0 +1,236 @@
+# src/features/incremental.py
+
+import csv
+import os
+from collections import deque
+import joblib
+import numpy as np
+import pandas as pd
+from .form import (FORM_STATS, FORM_WINDOWS, MAX_PLAYERS, add_team_aggregates, form_feature_names,
+                   match_points, parse_match_dates, player_columns)
+
+
+class IncrementalFormEngine:
+    """
+    Computes the rolling Last5/Last10 form features match by match, keeping per-team state.
+
+    For every team the engine keeps a ring buffer with the statistics (goals scored, points, average
+    age, value and rating) of its last max(FORM_WINDOWS) matches. Ingesting a new round only touches
+    the buffers of the teams that played, and emits the same feature rows a full recompute with
+    create_features_for_season would produce for those matches.
+
+    Like create_features_for_season, one engine covers one season: form windows do not carry over
+    from the previous season.
+
+    Attributes:
+        windows (tuple): Rolling window lengths in matches.
+        buffers (dict): Team name to a deque of per-match statistic tuples.
+        last_dates (dict): Team name to the date of its last ingested match.
+    """
+
+    def __init__(self, windows=FORM_WINDOWS):
+        """
+        Initializes an empty engine.
+
+        Args:
+            windows (tuple, optional): Rolling window lengths. Defaults to FORM_WINDOWS (5, 10).
+        """
+        self.windows = tuple(windows)
+        self.buffers = {}
+        self.last_dates = {}
+
+    def _team_form(self, team):
+        """
+        Returns the rolled statistics of a team over every window, in form_feature_names order.
+        """
+        history = np.array(self.buffers[team], dtype=float)
+        features = []
+        for index, (_, how) in enumerate(FORM_STATS):
+            for window in self.windows:
+                recent = history[-window:, index]
+                valid = recent[~np.isnan(recent)]
+                if len(valid) == 0:
+                    features.append(np.nan)
+                else:
+                    features.append(valid.sum() if how == 'sum' else valid.sum() / len(valid))
+        return features
+
+    def _push(self, team, date, stats):
+        if team not in self.buffers:
+            self.buffers[team] = deque(maxlen=max(self.windows))
+        elif date < self.last_dates[team]:
+            raise ValueError(f"Match of '{team}' on {date.date()} is older than its last ingested match "
+                             f"({self.last_dates[team].date()}); rebuild the engine for out-of-order data.")
+        self.buffers[team].append(stats)
+        self.last_dates[team] = date
+
+    def ingest(self, df_new, max_players=MAX_PLAYERS, drop_player_columns=True):
+        """
+        Ingests newly played matches and returns their feature rows.
+
+        Args:
+            df_new (pd.DataFrame): New matches in the "processed" layout (with the per-player columns).
+            max_players (int, optional): Number of players in a lineup. Defaults to 11.
+            drop_player_columns (bool, optional): Drop the per-player attribute columns from the output.
+                Defaults to True.
+
+        Returns:
+            pd.DataFrame: Feature rows for the new matches, with the same columns as
+            create_features_for_season produces, in the order of df_new.
+
+        Raises:
+            ValueError: If a match date cannot be parsed, or a match is older than the last ingested
+                match of one of its teams.
+        """
+        df = add_team_aggregates(df_new, max_players)
+        dates = parse_match_dates(df["Match Date"])
+        if dates.isna().any():
+            raise ValueError("All new matches need a parseable 'Match Date' for incremental feature updates.")
+
+        home_goals = df["Home Goals"].to_numpy(dtype=float)
+        away_goals = df["Away Goals"].to_numpy(dtype=float)
+        home_points = match_points(home_goals, away_goals)
+        away_points = match_points(away_goals, home_goals)
+        home_stats = np.column_stack([home_goals, home_points, df["Home_AvgAge"], df["Home_AvgValue"],
+                                      df["Home_AvgRating"]]).astype(float)
+        away_stats = np.column_stack([away_goals, away_points, df["Away_AvgAge"], df["Away_AvgValue"],
+                                      df["Away_AvgRating"]]).astype(float)
+
+        home_features = np.empty((len(df), len(FORM_STATS) * len(self.windows)))
+        away_features = np.empty_like(home_features)
+        home_teams = df["Home Team"].to_numpy()
+        away_teams = df["Away Team"].to_numpy()
+        # Process matches chronologically (stable for equal dates), as the full recompute does
+        for row in np.argsort(dates.to_numpy(), kind='stable'):
+            date = dates.iloc[row]
+            self._push(home_teams[row], date, tuple(home_stats[row]))
+            self._push(away_teams[row], date, tuple(away_stats[row]))
+            home_features[row] = self._team_form(home_teams[row])
+            away_features[row] = self._team_form(away_teams[row])
+
+        form = pd.concat([
+            pd.DataFrame(home_features, columns=form_feature_names('Home'), index=df.index),
+            pd.DataFrame(away_features, columns=form_feature_names('Away'), index=df.index),
+        ], axis=1)
+        df = pd.concat([df, form], axis=1)
+
+        if drop_player_columns:
+            columns = [player_columns(side, attribute, max_players)
+                       for side in ('Home', 'Away') for attribute in ('Age', 'MarketValue', 'Rating')]
+            df = df.drop(columns=[column for group in columns for column in group])
+        return df
+
+    def save(self, path):
+        """
+        Saves the engine state.
+
+        Args:
+            path (str): Destination file (joblib pickle).
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        joblib.dump(self, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads a saved engine state.
+
+        Args:
+            path (str): File written by save().
+
+        Returns:
+            IncrementalFormEngine: The restored engine.
+        """
+        return joblib.load(path)
+
+
+def read_header(path):
+    """
+    Returns the column names of a CSV file exactly as written (duplicates included).
+    """
+    with open(path, newline='', encoding='utf-8') as file:
+        return next(csv.reader(file), [])
+
+
+def append_rows(df, path):
+    """
+    Appends rows to a CSV file in the column order of its header, or creates it with df's columns.
+    Header columns that df does not have are written empty.
+    """
+    if not os.path.isfile(path):
+        df.to_csv(path, index=False)
+        return
+    header = read_header(path)
+    rows = pd.DataFrame({position: df[column] if column in df.columns else np.nan
+                         for position, column in enumerate(header)}, index=df.index)
+    rows.to_csv(path, mode='a', header=False, index=False)
+
+
+def to_notebook_layout(featured, header):
+    """
+    Fills the merge columns of featured files written by the notebooks (Season_x/Season_y,
+    Match Date_x/Match Date_y) for feature rows built from processed matches. In those files
+    'Match Date_x' holds the scraped date and 'Match Date' and 'Match Date_y' the ISO date.
+    """
+    if "Match Date_x" not in header and "Season_x" not in header:
+        return featured
+    iso_dates = parse_match_dates(featured["Match Date"]).dt.strftime('%Y-%m-%d')
+    merged = {
+        "Season_x": featured["Season"],
+        "Season_y": featured["Season"],
+        "Match Date_x": featured["Match Date"],
+        "Match Date_y": iso_dates,
+        "Match Date": iso_dates,
+    }
+    return featured.assign(**{column: values for column, values in merged.items() if column in header})
+
+
+def update_featured_season(df_new, featured_path, state_path, history=None, final_path=None):
+    """
+    Appends feature rows for newly played matches to a season's featured CSV, and optionally to the
+    combined 'all_seasons_final.csv'.
+
+    The engine state is loaded from state_path (or rebuilt from history, the season's processed
+    matches played so far, when no state exists yet), the new matches are ingested, their feature
+    rows are appended to featured_path and the updated state is saved again. Rows appended to an
+    existing file follow its header, including the merge columns of files written by the notebooks.
+    Rows appended to final_path carry the 'MatchOutcome' target, as combine_seasons writes them.
+
+    Args:
+        df_new (pd.DataFrame): New matches in the "processed" layout.
+        featured_path (str): The season's featured CSV (e.g. 'data/processed/featured/23_24_featured.csv').
+        state_path (str): File holding the engine state for the season.
+        history (pd.DataFrame, optional): Processed matches already in featured_path, used to build
+            the initial state.
+        final_path (str, optional): Combined data to refresh (e.g.
+            'data/processed/final/all_seasons_final.csv').
+
+    Returns:
+        pd.DataFrame: The appended feature rows.
+    """
+    # The pipeline's combine stage shapes the combined rows
+    from src.pipeline.stages import FINAL_LEADING_COLUMNS, add_match_outcome, drop_merge_suffixes
+
+    if os.path.isfile(state_path):
+        engine = IncrementalFormEngine.load(state_path)
+    else:
+        engine = IncrementalFormEngine()
+        if history is not None and len(history):
+            engine.ingest(history)
+
+    featured = engine.ingest(df_new)
+    if os.path.isfile(featured_path):
+        featured = to_notebook_layout(featured, read_header(featured_path))
+    append_rows(featured, featured_path)
+    print(f"Appended {len(featured)} feature rows to {featured_path}.")
+
+    if final_path is not None:
+        final = add_match_outcome(drop_merge_suffixes(featured.copy()))
+        leading = [column for column in FINAL_LEADING_COLUMNS if column in final.columns]
+        append_rows(final[leading + [column for column in final.columns if column not in leading]], final_path)
+        print(f"Appended {len(final)} rows to {final_path}.")
+
+    engine.save(state_path)
+    return featured
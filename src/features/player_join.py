@@ -0,0 +1,220 @@
+# src/features/player_join.py
+
+import os
+import numpy as np
+import pandas as pd
+
+
+# Lineup slots per team in the player attribute columns
+MAX_PLAYERS = 11
+
+# Sofascore team names whose first four letters do not identify the team
+TEAM_CODE_OVERRIDES = {
+    'karagümrük': 'fati',
+    'mke ankaragücü': 'anka',
+    'çaykur rizespor': 'rize',
+}
+
+# Attribute columns of the player table and the suffix they get in the match table
+PLAYER_ATTRIBUTES = (('Age', 'Age'), ('Market Value', 'MarketValue'), ('Player Rating', 'Rating'))
+
+
+def extract_surname(full_name):
+    """
+    Extracts the last word of a player name, ignoring the captain marker '(c)'.
+
+    Args:
+        full_name (str): Player name as scraped (e.g. '(c) E. Karaca').
+
+    Returns:
+        str: The surname (e.g. 'Karaca').
+    """
+    name = full_name.replace('(c)', '').strip()
+    parts = name.split(' ')
+    return parts[-1] if parts else name
+
+
+def modify_team_name(team_name):
+    """
+    Converts a team name into the short lowercase code used in the processed data.
+
+    Args:
+        team_name (str): Team name as scraped (e.g. 'Galatasaray').
+
+    Returns:
+        str: Team code (e.g. 'gala').
+    """
+    team_name_lower = team_name.lower()
+    return TEAM_CODE_OVERRIDES.get(team_name_lower, team_name_lower[:4])
+
+
+def team_codes(team_names):
+    """
+    Vectorized modify_team_name for a Series of team names.
+
+    Args:
+        team_names (pd.Series): Team names.
+
+    Returns:
+        pd.Series: Team codes.
+    """
+    # Converted per distinct team with Python's str.lower, for the same reason as in surnames
+    codes = {team: modify_team_name(team).strip() for team in team_names.dropna().unique()}
+    return team_names.map(codes)
+
+
+def surnames(player_names):
+    """
+    Vectorized extract_surname for a Series of player names, lowercased and stripped.
+
+    Every distinct name is converted once with Python's str methods (pandas' own string dtype
+    lowercases 'İ' differently from the object columns the processed data was built with).
+
+    Args:
+        player_names (pd.Series): Player names (missing values stay missing).
+
+    Returns:
+        pd.Series: Lowercase surnames, as an object Series indexed like player_names.
+    """
+    codes, uniques = pd.factorize(player_names)
+    converted = np.array([extract_surname(name).lower().strip() for name in uniques] + [None], dtype=object)
+    # factorize marks missing values with -1, which picks the trailing None
+    return pd.Series(converted[codes], index=player_names.index, dtype=object)
+
+
+def parse_market_values(values):
+    """
+    Converts Transfermarkt market values such as '1.80 mil. €' or '900 bin €' into numbers.
+
+    The conversion is the notebook's convert_market_value: the decimal point is dropped after the
+    unit is replaced, so '1.80 mil. €' becomes 180e6. The processed and featured data use this scale.
+
+    Args:
+        values (pd.Series): Market value strings ('-' or missing for unknown values).
+
+    Returns:
+        pd.Series: Market values in euros (NaN where unknown or unparseable).
+    """
+    cleaned = (values.astype('string')
+               .str.replace(' mil. €', 'e6', regex=False)
+               .str.replace(' bin €', 'e3', regex=False)
+               .str.replace('€', '', regex=False)
+               .str.replace('.', '', regex=False)
+               .str.replace(',', '.', regex=False))
+    return pd.to_numeric(cleaned, errors='coerce').astype(float)
+
+
+def build_player_table(teams_and_players, marketvalue_and_age):
+    """
+    Builds the player attribute table keyed by 'Team_Player' (e.g. 'gala_mertens').
+
+    Ratings from the Sofascore player list are joined with Transfermarkt age and market value, missing
+    ages and values are filled with the team average, and the key is built from the team code and the
+    lowercase surname, as in src/notebooks/preprocessing.ipynb.
+
+    Args:
+        teams_and_players (pd.DataFrame): '<season>_teams_and_players.csv' (Team Name, Player Name, Player Rating).
+        marketvalue_and_age (pd.DataFrame): '<season>_marketvalue_and_age.csv' (Team Name, Player Name, Age, Market Value).
+
+    Returns:
+        pd.DataFrame: Columns Team_Player, Age, Market Value and Player Rating, one row per key
+        (the first player wins when two players of a team share a surname).
+    """
+    values = marketvalue_and_age.copy()
+    # A '-' in either column marks the whole Transfermarkt entry as unknown
+    unknown = (values['Age'] == '-') | (values['Market Value'] == '-')
+    values.loc[unknown, ['Age', 'Market Value']] = np.nan
+    values['Age'] = pd.to_numeric(values['Age'], errors='coerce')
+    values['Market Value'] = parse_market_values(values['Market Value'])
+
+    players = teams_and_players.merge(values, on=['Team Name', 'Player Name'], how='left')
+    for column in ('Age', 'Market Value'):
+        players[column] = players[column].fillna(players.groupby('Team Name')[column].transform('mean'))
+
+    players['Team_Player'] = team_codes(players['Team Name']) + '_' + surnames(players['Player Name'])
+    table = players[['Team_Player', 'Age', 'Market Value', 'Player Rating']]
+    return table.drop_duplicates(subset='Team_Player', keep='first').reset_index(drop=True)
+
+
+def lineup_keys(matches, max_players=MAX_PLAYERS):
+    """
+    Builds the Team_Player keys of both lineups of every match.
+
+    Args:
+        matches (pd.DataFrame): Raw season matches with 'Home Team', 'Away Team', 'Home Players' and
+            'Away Players' ('; '-separated names).
+        max_players (int, optional): Number of lineup slots per side. Defaults to 11.
+
+    Returns:
+        np.ndarray: Object array of shape (n_matches, 2 * max_players) with the home keys followed by
+        the away keys (None for empty slots).
+    """
+    columns = []
+    for side in ('Home', 'Away'):
+        team = team_codes(matches[f'{side} Team']).to_numpy(dtype=object)
+        # One column per lineup slot, stacked into a single long Series so each string step runs once
+        slots = (matches[f'{side} Players'].str.split('; ', expand=True)
+                 .reindex(columns=range(max_players)).to_numpy(dtype=object))
+        names = pd.Series(slots.ravel(), dtype=object)
+        present = names.notna().to_numpy() & (names != '').to_numpy()
+        keys = np.full(len(names), None, dtype=object)
+        keys[present] = np.repeat(team, max_players)[present] + '_' + surnames(names[present]).to_numpy()
+        columns.append(keys.reshape(len(matches), max_players))
+    return np.hstack(columns)
+
+
+def attach_player_attributes(matches, player_table, max_players=MAX_PLAYERS):
+    """
+    Adds Age, MarketValue and Rating of every lineup slot to the matches with a single lookup.
+
+    All lineup keys are resolved at once with Index.get_indexer on the player table, and the three
+    attribute matrices are gathered with one take each, instead of one merge per lineup slot.
+
+    Args:
+        matches (pd.DataFrame): Raw season matches (see lineup_keys).
+        player_table (pd.DataFrame): Output of build_player_table.
+        max_players (int, optional): Number of lineup slots per side. Defaults to 11.
+
+    Returns:
+        pd.DataFrame: The matches without the player lists, with 'Home_Player_i_TeamPlayer_<attr>' and
+        'Away_Player_i_TeamPlayer_<attr>' columns (NaN for unknown players and empty slots).
+    """
+    keys = lineup_keys(matches, max_players)
+    positions = pd.Index(player_table['Team_Player']).get_indexer(keys.ravel())
+    found = positions >= 0
+
+    slot_names = [f'{side}_Player_{i}_TeamPlayer' for side in ('Home', 'Away') for i in range(1, max_players + 1)]
+    block = np.full((len(matches), len(slot_names), len(PLAYER_ATTRIBUTES)), np.nan)
+    for attr_index, (source, _) in enumerate(PLAYER_ATTRIBUTES):
+        values = np.full(positions.shape, np.nan)
+        values[found] = player_table[source].to_numpy(dtype=float)[positions[found]]
+        block[:, :, attr_index] = values.reshape(len(matches), len(slot_names))
+
+    # Interleave per slot (Age, MarketValue, Rating), as the notebook's merge loop did
+    columns = [f'{slot}_{suffix}' for slot in slot_names for _, suffix in PLAYER_ATTRIBUTES]
+    attributes = pd.DataFrame(block.reshape(len(matches), -1), columns=columns, index=matches.index)
+
+    base = matches.drop(columns=['Home Players', 'Away Players'])
+    base = base.assign(**{'Home Team': team_codes(base['Home Team']), 'Away Team': team_codes(base['Away Team'])})
+    return pd.concat([base, attributes], axis=1)
+
+
+def process_season(raw_dir, season, max_players=MAX_PLAYERS):
+    """
+    Builds the processed data of one season from its three raw CSV files.
+
+    Args:
+        raw_dir (str): Directory holding the season folders (e.g. 'data/raw').
+        season (str): Season folder name (e.g. '23_24').
+        max_players (int, optional): Number of lineup slots per side. Defaults to 11.
+
+    Returns:
+        pd.DataFrame: The processed season, in the layout of '<season>_processed.csv'.
+    """
+    season_dir = os.path.join(raw_dir, season)
+    matches = pd.read_csv(os.path.join(season_dir, f'{season}.csv'))
+    teams_and_players = pd.read_csv(os.path.join(season_dir, f'{season}_teams_and_players.csv'))
+    marketvalue_and_age = pd.read_csv(os.path.join(season_dir, f'{season}_marketvalue_and_age.csv'),
+                                      encoding='utf-8-sig')
+    player_table = build_player_table(teams_and_players, marketvalue_and_age)
+    return attach_player_attributes(matches, player_table, max_players)
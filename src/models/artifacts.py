@@ -0,0 +1,232 @@
+# src/models/artifacts.py
+
+import glob
+import json
+import os
+import time
+from datetime import datetime
+import joblib
+import numpy as np
+from .cache import library_versions
+
+
+MODELS_DIR = 'models'
+
+# Native model file of each booster library, by the estimator's root module
+NATIVE_FORMATS = {'catboost': '.cbm', 'xgboost': '.ubj', 'lightgbm': '.txt'}
+
+# Files in the models directory that are not model artifacts
+RESERVED_NAMES = ('preprocessor',)
+
+
+class LightGBMBooster:
+    """
+    Classifier interface over a LightGBM Booster loaded from its text model file.
+
+    LightGBM cannot rebuild an LGBMClassifier from a model file, so the evaluators get this thin
+    wrapper with the attributes they use instead.
+
+    Attributes:
+        booster (lightgbm.Booster): The loaded booster.
+        classes_ (np.ndarray): Class labels in the booster's output order.
+    """
+
+    def __init__(self, booster, classes):
+        self.booster = booster
+        self.classes_ = np.asarray(classes)
+
+    @property
+    def feature_importances_(self):
+        return self.booster.feature_importance()
+
+    def predict_proba(self, X):
+        probabilities = self.booster.predict(X)
+        if probabilities.ndim == 1:
+            probabilities = np.column_stack([1 - probabilities, probabilities])
+        return probabilities
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def manifest_path(model_name, models_dir=MODELS_DIR):
+    """
+    Returns the metadata file of a model artifact ('<models_dir>/<model_name>.json').
+    """
+    return os.path.join(models_dir, f"{model_name}.json")
+
+
+def _read_manifest(model_name, models_dir):
+    path = manifest_path(model_name, models_dir)
+    if not os.path.isfile(path):
+        return None
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def artifact_files(model_name, models_dir=MODELS_DIR):
+    """
+    Lists the files of a saved model: its metadata and model file, or the pickle of a model saved
+    before artifacts had metadata.
+
+    Args:
+        model_name (str): Model name.
+        models_dir (str, optional): Directory of the saved models. Defaults to 'models'.
+
+    Returns:
+        list: Existing file paths; empty if the model was never saved.
+    """
+    manifest = _read_manifest(model_name, models_dir)
+    if manifest is not None:
+        paths = [manifest_path(model_name, models_dir), os.path.join(models_dir, manifest['file'])]
+    else:
+        paths = [os.path.join(models_dir, f"{model_name}.pkl")]
+    return [path for path in paths if os.path.isfile(path)]
+
+
+def artifact_exists(model_name, models_dir=MODELS_DIR):
+    manifest = _read_manifest(model_name, models_dir)
+    return len(artifact_files(model_name, models_dir)) == (1 if manifest is None else 2)
+
+
+def list_artifacts(models_dir=MODELS_DIR):
+    """
+    Returns the names of the models saved in a directory.
+    """
+    paths = glob.glob(os.path.join(models_dir, '*.json')) + glob.glob(os.path.join(models_dir, '*.pkl'))
+    names = {os.path.splitext(os.path.basename(path))[0] for path in paths}
+    return sorted(name for name in names if name not in RESERVED_NAMES and artifact_exists(name, models_dir))
+
+
+def _artifact_format(estimator):
+    root_module = type(estimator).__module__.split('.')[0]
+    return root_module if root_module in NATIVE_FORMATS else 'joblib'
+
+
+def save_artifact(estimator, model_name, models_dir=MODELS_DIR, compress=0):
+    """
+    Saves a fitted estimator with metadata in '<models_dir>/<model_name>.json'.
+
+    CatBoost, XGBoost and LightGBM models are written in their native formats (.cbm, UBJSON .ubj
+    and LightGBM text .txt), which are smaller and faster to load than a pickle of the Python
+    wrapper. Every other estimator is written with joblib to '<model_name>.pkl': uncompressed by
+    default, so its NumPy arrays (e.g. KNN training data, support vectors) can be memory-mapped on
+    load, or compressed with zlib at the given level to save disk space.
+
+    The artifact is loaded back after saving to record its load time. Memory-mapping only pays off
+    for a few large arrays (a forest's hundreds of small node arrays load faster without it), so an
+    uncompressed joblib file is timed both ways and the faster mode is recorded for load_artifact.
+    The metadata also holds the format, the file size, the save time and the library versions. It
+    is written last, so an interrupted save leaves the previous artifact in place.
+
+    Args:
+        estimator: The fitted estimator.
+        model_name (str): Model name.
+        models_dir (str, optional): Destination directory. Defaults to 'models'.
+        compress (int, optional): zlib level 1-9 for joblib files; 0 stores them uncompressed and
+            memory-mappable. Native formats ignore it. Defaults to 0.
+
+    Returns:
+        dict: The artifact metadata.
+    """
+    os.makedirs(models_dir, exist_ok=True)
+    artifact_format = _artifact_format(estimator)
+    file_name = f"{model_name}{NATIVE_FORMATS.get(artifact_format, '.pkl')}"
+    path = os.path.join(models_dir, file_name)
+    tmp_path = os.path.join(models_dir, f".{file_name}.tmp{os.path.splitext(file_name)[1]}")
+
+    start = time.perf_counter()
+    classes = None
+    if artifact_format == 'catboost':
+        estimator.save_model(tmp_path, format='cbm')
+    elif artifact_format == 'xgboost':
+        estimator.save_model(tmp_path)
+    elif artifact_format == 'lightgbm':
+        estimator.booster_.save_model(tmp_path)
+        classes = np.asarray(estimator.classes_).tolist()
+    else:
+        joblib.dump(estimator, tmp_path, compress=compress)
+    os.replace(tmp_path, path)
+    save_seconds = time.perf_counter() - start
+
+    manifest = {
+        'model_name': model_name,
+        'format': artifact_format,
+        'file': file_name,
+        'compress': compress if artifact_format == 'joblib' else None,
+        'mmap': False,
+        'estimator': f"{type(estimator).__module__}.{type(estimator).__name__}",
+        'classes': classes,
+        'size_bytes': os.path.getsize(path),
+        'save_seconds': round(save_seconds, 4),
+        'versions': library_versions(estimator),
+        'saved_at': datetime.now().isoformat(timespec='seconds'),
+    }
+    modes = [False, True] if artifact_format == 'joblib' and not compress else [False]
+    load_seconds = {}
+    _load_file(manifest, models_dir)
+    for mmap in modes:
+        manifest['mmap'] = mmap
+        start = time.perf_counter()
+        _load_file(manifest, models_dir)
+        load_seconds[mmap] = time.perf_counter() - start
+    manifest['mmap'] = min(load_seconds, key=load_seconds.get)
+    manifest['load_seconds'] = round(load_seconds[manifest['mmap']], 4)
+
+    tmp_manifest = manifest_path(model_name, models_dir) + '.tmp'
+    with open(tmp_manifest, 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, indent=2)
+    os.replace(tmp_manifest, manifest_path(model_name, models_dir))
+    return manifest
+
+
+def _load_file(manifest, models_dir, mmap_mode='r'):
+    path = os.path.join(models_dir, manifest['file'])
+    artifact_format = manifest['format']
+    if artifact_format == 'catboost':
+        from catboost import CatBoostClassifier
+        return CatBoostClassifier().load_model(path, format='cbm')
+    if artifact_format == 'xgboost':
+        from xgboost import XGBClassifier
+        model = XGBClassifier()
+        model.load_model(path)
+        return model
+    if artifact_format == 'lightgbm':
+        import lightgbm
+        return LightGBMBooster(lightgbm.Booster(model_file=path), manifest['classes'])
+    return joblib.load(path, mmap_mode=mmap_mode if manifest['mmap'] else None)
+
+
+def load_artifact(model_name, models_dir=MODELS_DIR, mmap_mode='r'):
+    """
+    Loads a saved model.
+
+    Joblib artifacts recorded as faster memory-mapped are opened with mmap_mode: their arrays are
+    paged in from the file on use instead of being read and copied up front, and processes loading
+    the same model share the pages. Models saved before artifacts had metadata are read from their
+    pickle into memory.
+
+    Args:
+        model_name (str): Model name.
+        models_dir (str, optional): Directory of the saved models. Defaults to 'models'.
+        mmap_mode (str, optional): numpy memmap mode for memory-mappable joblib artifacts; None
+            reads them into memory. Defaults to 'r'.
+
+    Returns:
+        The fitted estimator.
+
+    Raises:
+        FileNotFoundError: If the model was never saved.
+        ImportError: If the model's library is not installed.
+    """
+    manifest = _read_manifest(model_name, models_dir)
+    if manifest is None:
+        return joblib.load(os.path.join(models_dir, f"{model_name}.pkl"))
+    return _load_file(manifest, models_dir, mmap_mode)
+
+
+def read_metadata(model_name, models_dir=MODELS_DIR):
+    """
+    Returns the metadata of a saved model, or None for a model saved without it.
+    """
+    return _read_manifest(model_name, models_dir)
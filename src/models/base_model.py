@@ -1,9 +1,13 @@
 # src/models/base_model.py
 
-from sklearn.model_selection import GridSearchCV
-import joblib
 import os
+from datetime import datetime
 import pandas as pd
+from .artifacts import save_artifact
+from .folds import default_fold_manager
+from .ledger import run_warm_start_search
+from .search import SearchResult, run_search
+from .streaming import STREAMING_CLASSES, as_chunk_source, evaluate_streaming, fit_streaming
 
 
 class BaseModel:
@@ -15,10 +19,17 @@ class BaseModel:
         model: The machine learning model to be trained.
         param_grid (dict): The grid of hyperparameters to search over.
         model_name (str): The name of the model, used for saving files.
-        grid_search (GridSearchCV, optional): The GridSearchCV instance after training.
+        search_strategy (str): Hyperparameter search strategy ('grid', 'halving_grid', 'halving_random' or 'optuna').
+        max_fits (int, optional): Maximum number of estimator fits the search may use.
+        time_budget (float, optional): Maximum wall-clock time in seconds the search may use.
+        streaming_epochs (int): Passes over the data in streaming mode (see train_streaming).
+        fold_manager (FoldManager): Source of the cross-validation folds, shared by all models by default.
+        grid_search (optional): The fitted search instance after training.
+        streaming_metrics (dict, optional): Holdout metrics of the last streaming run.
     """
 
-    def __init__(self, model, param_grid, model_name):
+    def __init__(self, model, param_grid, model_name, search_strategy='grid', max_fits=None, time_budget=None,
+                 streaming_epochs=5, fold_manager=None):
         """
         Initializes the BaseModel with a specific machine learning model, its hyperparameter grid,
         and a name for the model.
@@ -27,44 +38,157 @@ class BaseModel:
             model: The machine learning model to be trained (e.g., sklearn estimator).
             param_grid (dict): A dictionary specifying the hyperparameter grid for GridSearchCV.
             model_name (str): A name identifier for the model, used in saving files.
+            search_strategy (str, optional): Hyperparameter search strategy. Defaults to 'grid'.
+            max_fits (int, optional): Fit budget for the search. Defaults to no limit.
+            time_budget (float, optional): Wall-clock budget in seconds for the search. Defaults to no limit.
+            streaming_epochs (int, optional): Passes over the data in streaming mode. Defaults to 5.
+            fold_manager (FoldManager, optional): Fold source. Defaults to the shared default_fold_manager.
         """
         self.model = model
         self.param_grid = param_grid
         self.model_name = model_name
+        self.search_strategy = search_strategy
+        self.max_fits = max_fits
+        self.time_budget = time_budget
+        self.streaming_epochs = streaming_epochs
+        self.fold_manager = default_fold_manager if fold_manager is None else fold_manager
         self.grid_search = None
+        self.streaming_metrics = None
 
-    def train(self, X_train, y_train):
+    def configure_search(self, search_strategy=None, max_fits=None, time_budget=None):
         """
-        Trains the machine learning model using GridSearchCV to find the best hyperparameters.
+        Overrides the search strategy and budget, e.g. from the pipeline. Arguments left as None keep
+        the model's own settings.
+
+        Args:
+            search_strategy (str, optional): Hyperparameter search strategy.
+            max_fits (int, optional): Fit budget for the search.
+            time_budget (float, optional): Wall-clock budget in seconds for the search.
+        """
+        if search_strategy is not None:
+            self.search_strategy = search_strategy
+        if max_fits is not None:
+            self.max_fits = max_fits
+        if time_budget is not None:
+            self.time_budget = time_budget
+
+    def train(self, X_train, y_train, cache=None, warm_start=False):
+        """
+        Trains the machine learning model using the configured search strategy to find the best
+        hyperparameters, within the configured fit or time budget.
+
+        When a cache is given, the search is skipped if an identical training run (same data,
+        estimator configuration, grid, search settings and library versions) was cached before.
+        With warm_start, a grid search only evaluates the candidates missing from the model's CV
+        ledger ('outputs/reports/<model_name>_cv_ledger.csv') and merges the recorded scores back.
+        The 5 stratified folds come from the model's FoldManager, which computes and stores them once
+        per training set, so models trained on the same data fit on the same memory-mapped fold arrays.
 
         Args:
             X_train (pd.DataFrame or np.ndarray): Training feature data.
             y_train (pd.Series or np.ndarray): Training target data.
+            cache (TrainingCache, optional): Training cache to read from and write to.
+            warm_start (bool, optional): Reuse previously scored grid candidates. Defaults to False.
         """
-        self.grid_search = GridSearchCV(
-            estimator=self.model,
-            param_grid=self.param_grid,
-            cv=5,               # 5-fold cross-validation
-            n_jobs=-1,          # Utilize all available CPU cores
-            verbose=2,          # Verbosity level for logging
-            scoring='accuracy'  # Evaluation metric
-        )
-        self.grid_search.fit(X_train, y_train)
+        if cache is not None:
+            cache_key = cache.make_key(self, X_train, y_train)
+            cached_search = cache.load(cache_key)
+            if cached_search is not None:
+                self.grid_search = cached_search
+                print(f"Loaded {self.model_name} from the training cache ({cache_key[:12]}).")
+                print(f"Best hyperparameters for {self.model_name}: {self.grid_search.best_params_}")
+                return
+
+        if warm_start and self.search_strategy != 'grid':
+            print(f"Warm start only applies to the 'grid' strategy; running {self.search_strategy} from scratch.")
+
+        folds = self.fold_manager.get(X_train, y_train)
+        if warm_start and self.search_strategy == 'grid':
+            self.grid_search = run_warm_start_search(self, X_train, y_train, cv=folds, scoring='accuracy',
+                                                     n_jobs=-1, verbose=2)
+        else:
+            self.grid_search = run_search(
+                self.search_strategy,
+                self.model,
+                self.param_grid,
+                X_train,
+                y_train,
+                cv=folds,              # Shared, precomputed 5-fold cross-validation
+                n_jobs=-1,             # Utilize all available CPU cores
+                verbose=2,             # Verbosity level for logging
+                scoring='accuracy',    # Evaluation metric
+                max_fits=self.max_fits,
+                time_budget=self.time_budget
+            )
         print(f"Best hyperparameters for {self.model_name}: {self.grid_search.best_params_}")
 
-    def save_model(self):
+        if cache is not None:
+            cache.store(cache_key, self.grid_search, model_name=self.model_name)
+
+    def supports_streaming(self):
         """
-        Saves the best estimator from GridSearchCV to a pickle file in the 'models' directory.
+        Returns:
+            bool: True if the estimator can be trained chunk by chunk with train_streaming.
+        """
+        return hasattr(self.model, 'partial_fit')
+
+    def train_streaming(self, source, target_column='MatchOutcome', chunk_size=50000, epochs=None, test_size=0.2,
+                        classes=STREAMING_CLASSES):
+        """
+        Trains the model out of core, reading the data from disk in chunks.
+
+        The estimator is fitted with partial_fit behind a StandardScaler that is itself fitted
+        incrementally, and is evaluated on a hashed holdout of the rows in a further streaming pass.
+        Memory use is bounded by the chunk size, not by the size of the data. There is no
+        hyperparameter search in this mode; the estimator's own configuration is used.
+
+        Args:
+            source (str or callable): Feature store stage (Feather, Parquet or CSV) holding the
+                preprocessed features and the target, or a callable returning an iterator of DataFrame chunks.
+            target_column (str, optional): Name of the target column. Defaults to 'MatchOutcome'.
+            chunk_size (int, optional): Rows per chunk when reading a stage. Defaults to 50000.
+            epochs (int, optional): Passes over the training rows. Defaults to self.streaming_epochs.
+            test_size (float, optional): Fraction of rows held out for evaluation. Defaults to 0.2.
+            classes (tuple, optional): Encoded class labels. Defaults to (0, 1, 2).
+
+        Returns:
+            dict: Holdout accuracy, log loss, number of samples and confusion matrix.
+        """
+        chunk_source = as_chunk_source(source, chunk_size)
+        epochs = self.streaming_epochs if epochs is None else epochs
+        estimator = fit_streaming(self.model, chunk_source, target_column, epochs=epochs, test_size=test_size,
+                                  classes=classes)
+        self.streaming_metrics = evaluate_streaming(estimator, chunk_source, target_column, test_size=test_size,
+                                                    classes=classes)
+        params = self.model.get_params()
+        best_params = {name: params[name] for name in self.param_grid if name in params}
+        self.grid_search = SearchResult(estimator, best_params, self.streaming_metrics['accuracy'], {})
+        print(f"Streamed {self.model_name} for {epochs} epoch(s): holdout accuracy "
+              f"{self.streaming_metrics['accuracy']:.4f}, log loss {self.streaming_metrics['log_loss']:.4f} "
+              f"on {self.streaming_metrics['n_samples']} rows.")
+        return self.streaming_metrics
+
+    def save_model(self, compress=0):
+        """
+        Saves the best estimator found by the search as a model artifact in the 'models' directory
+        (see src/models/artifacts.py).
+
+        Args:
+            compress (int, optional): zlib level for joblib artifacts; 0 keeps them memory-mappable.
+                Defaults to 0.
         """
         models_dir = os.path.join('models')
-        os.makedirs(models_dir, exist_ok=True)  # Create 'models' directory if it doesn't exist
-        model_path = os.path.join(models_dir, f"{self.model_name}.pkl")
-        joblib.dump(self.grid_search.best_estimator_, model_path)
-        print(f"{self.model_name} model saved to {model_path}.")
+        metadata = save_artifact(self.grid_search.best_estimator_, self.model_name, models_dir, compress=compress)
+        print(f"{self.model_name} model saved to {os.path.join(models_dir, metadata['file'])} "
+              f"({metadata['size_bytes'] / 1e6:.2f} MB, loads in {metadata['load_seconds']:.3f} s).")
 
-    def save_hyperparameters(self):
+    def save_hyperparameters(self, append=False):
         """
-        Saves the best hyperparameters found by GridSearchCV to a CSV file in the 'outputs/reports' directory.
+        Saves the best hyperparameters found by the search to a CSV file in the 'outputs/reports' directory.
+
+        Args:
+            append (bool, optional): Append a timestamped row with the best score instead of overwriting
+                the file, keeping a history of the best candidates across runs. Defaults to False.
         """
         # Retrieve the best hyperparameters
         params = self.grid_search.best_params_
@@ -75,6 +199,12 @@ class BaseModel:
         os.makedirs(reports_dir, exist_ok=True)  # Create 'outputs/reports' directory if it doesn't exist
         # Define the file path for the CSV
         params_csv_path = os.path.join(reports_dir, f"{self.model_name}_best_hyperparameters.csv")
+        if append:
+            params_df.insert(0, 'best_score', self.grid_search.best_score_)
+            params_df.insert(0, 'recorded_at', datetime.now().isoformat(timespec='seconds'))
+            if os.path.isfile(params_csv_path):
+                # Concatenate instead of appending raw lines, since the grid's columns may have changed
+                params_df = pd.concat([pd.read_csv(params_csv_path), params_df], ignore_index=True)
         # Save the DataFrame to CSV
         params_df.to_csv(params_csv_path, index=False)
         print(f"Best hyperparameters saved to {params_csv_path}.")
@@ -0,0 +1,151 @@
+# src/models/cache.py
+
+import hashlib
+import importlib
+import json
+import os
+import joblib
+import numpy as np
+import pandas as pd
+from .search import SearchResult
+
+
+def hash_dataset(X, y=None):
+    """
+    Computes a content hash of a training matrix and its target.
+
+    Column names and dtypes are part of the hash, so renaming or retyping a feature changes it.
+
+    Args:
+        X (pd.DataFrame or np.ndarray): Feature data.
+        y (pd.Series or np.ndarray, optional): Target data.
+
+    Returns:
+        str: Hex digest identifying the data.
+    """
+    digest = hashlib.sha256()
+    if isinstance(X, pd.DataFrame):
+        digest.update(repr(list(X.columns)).encode('utf-8'))
+        digest.update(repr([str(dtype) for dtype in X.dtypes]).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(X, index=False).values.tobytes())
+    else:
+        X = np.ascontiguousarray(X)
+        digest.update(repr((X.shape, str(X.dtype))).encode('utf-8'))
+        digest.update(X.tobytes())
+    if y is not None:
+        digest.update(np.ascontiguousarray(np.asarray(y)).tobytes())
+    return digest.hexdigest()
+
+
+def library_versions(estimator):
+    """
+    Collects the versions of the libraries a fitted estimator depends on.
+
+    Args:
+        estimator: The estimator being trained.
+
+    Returns:
+        dict: Library name to version string.
+    """
+    import sklearn
+    versions = {'sklearn': sklearn.__version__, 'numpy': np.__version__, 'pandas': pd.__version__}
+    root_module = type(estimator).__module__.split('.')[0]
+    if root_module not in versions:
+        module = importlib.import_module(root_module)
+        versions[root_module] = getattr(module, '__version__', 'unknown')
+    return versions
+
+
+class TrainingCache:
+    """
+    A persistent, content-addressed cache of fitted searches.
+
+    Each entry is stored under '<cache_dir>/<hash>/' and holds the best estimator together with the
+    best parameters, best score and cv_results_ of the search. The hash covers the training data,
+    the estimator configuration, the parameter grid, the search settings and the library versions,
+    so an entry is only reused when retraining would produce the same model.
+
+    Attributes:
+        cache_dir (str): Directory holding the cache entries.
+    """
+
+    def __init__(self, cache_dir=os.path.join('models', 'cache')):
+        """
+        Initializes the cache.
+
+        Args:
+            cache_dir (str, optional): Directory holding the cache entries. Defaults to 'models/cache'.
+        """
+        self.cache_dir = cache_dir
+
+    def make_key(self, base_model, X_train, y_train):
+        """
+        Computes the cache key of a BaseModel trained on the given data.
+
+        Args:
+            base_model (BaseModel): The model about to be trained.
+            X_train (pd.DataFrame or np.ndarray): Training feature data.
+            y_train (pd.Series or np.ndarray): Training target data.
+
+        Returns:
+            str: Hex digest used as the entry directory name.
+        """
+        config = {
+            'data': hash_dataset(X_train, y_train),
+            'estimator': type(base_model.model).__qualname__,
+            'estimator_params': repr(sorted(base_model.model.get_params().items())),
+            'param_grid': repr(sorted(base_model.param_grid.items())),
+            'search_strategy': base_model.search_strategy,
+            'max_fits': base_model.max_fits,
+            'time_budget': base_model.time_budget,
+            'versions': library_versions(base_model.model),
+        }
+        return hashlib.sha256(json.dumps(config, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _entry_dir(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def load(self, key):
+        """
+        Loads a cached search.
+
+        Args:
+            key (str): Cache key from make_key.
+
+        Returns:
+            SearchResult or None: The cached search, or None on a cache miss.
+        """
+        entry_dir = self._entry_dir(key)
+        estimator_path = os.path.join(entry_dir, 'best_estimator.pkl')
+        search_path = os.path.join(entry_dir, 'search.pkl')
+        if not (os.path.isfile(estimator_path) and os.path.isfile(search_path)):
+            return None
+        try:
+            summary = joblib.load(search_path)
+            best_estimator = joblib.load(estimator_path)
+        except Exception as e:
+            print(f"Ignoring unreadable cache entry {entry_dir}: {e}")
+            return None
+        return SearchResult(best_estimator, summary['best_params_'], summary['best_score_'], summary['cv_results_'])
+
+    def store(self, key, search, model_name=None):
+        """
+        Stores a fitted search in the cache.
+
+        Args:
+            key (str): Cache key from make_key.
+            search: A fitted search exposing best_estimator_, best_params_, best_score_ and cv_results_.
+            model_name (str, optional): Model name recorded in the entry's metadata.
+        """
+        entry_dir = self._entry_dir(key)
+        os.makedirs(entry_dir, exist_ok=True)
+        summary = {
+            'best_params_': search.best_params_,
+            'best_score_': search.best_score_,
+            'cv_results_': search.cv_results_,
+        }
+        # Write the summary last: an entry only counts as complete once both files exist
+        joblib.dump(search.best_estimator_, os.path.join(entry_dir, 'best_estimator.pkl'))
+        joblib.dump(summary, os.path.join(entry_dir, 'search.pkl'))
+        with open(os.path.join(entry_dir, 'meta.json'), 'w', encoding='utf-8') as file:
+            json.dump({'model_name': model_name, 'best_params': repr(search.best_params_)}, file, indent=2)
@@ -1,9 +1,9 @@
 # src/models/catboost_model.py
 
-from catboost import CatBoostClassifier
 from .base_model import BaseModel
 
 def get_catboost_model():
+    from catboost import CatBoostClassifier
     model = CatBoostClassifier(random_state=42, verbose=0)
     param_grid = {
         'iterations': [100, 200, 300],
@@ -12,4 +12,4 @@ def get_catboost_model():
         'l2_leaf_reg': [1, 3, 5, 7]
     }
     model_name = 'catboost'
-    return BaseModel(model, param_grid, model_name)
+    return BaseModel(model, param_grid, model_name, search_strategy='halving_grid')
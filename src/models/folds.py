@@ -0,0 +1,331 @@
+# src/models/folds.py
+
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+import warnings
+import weakref
+from collections import Counter
+import numpy as np
+from joblib import Parallel, cpu_count, delayed
+from sklearn.base import clone
+from sklearn.exceptions import FitFailedWarning
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import ParameterGrid, ParameterSampler, check_cv
+from .cache import hash_dataset
+from .search import SearchResult
+
+
+FOLD_CACHE_DIR = os.path.join('models', 'cache', 'folds')
+
+# Names of the arrays stored for every fold, in the order FoldSet.fold returns them
+FOLD_ARRAYS = ('X_train', 'y_train', 'X_val', 'y_val')
+
+
+def _save_array(path, array):
+    """
+    Writes a .npy file under a temporary name and renames it, so readers never see a partial file.
+    """
+    tmp_path = path + '.tmp.npy'
+    np.save(tmp_path, np.ascontiguousarray(array))
+    os.replace(tmp_path, path)
+
+
+class FoldSet:
+    """
+    The cross-validation folds of one training set, materialised once on disk.
+
+    Every fold's training and validation rows are stored as contiguous .npy files and opened
+    memory-mapped, so fits read them without slicing the training data again, and joblib hands
+    them to worker processes by file reference instead of pickling them. A FoldSet can also be
+    passed as the cv argument of sklearn searches, since it implements split and get_n_splits.
+
+    Attributes:
+        dataset_hash (str): Hash of the training data (see hash_dataset).
+        directory (str): Directory holding the fold arrays.
+        splits (list): (train_idx, val_idx) index arrays of every fold.
+    """
+
+    def __init__(self, dataset_hash, directory, splits):
+        self.dataset_hash = dataset_hash
+        self.directory = directory
+        self.splits = splits
+
+    @property
+    def n_splits(self):
+        return len(self.splits)
+
+    def split(self, X=None, y=None, groups=None):
+        yield from self.splits
+
+    def get_n_splits(self, X=None, y=None, groups=None):
+        return self.n_splits
+
+    def fold(self, index):
+        """
+        Returns the arrays of one fold.
+
+        Args:
+            index (int): Fold number.
+
+        Returns:
+            tuple: Memory-mapped (X_train, y_train, X_val, y_val).
+        """
+        return tuple(np.load(os.path.join(self.directory, f"fold{index}_{name}.npy"), mmap_mode='r')
+                     for name in FOLD_ARRAYS)
+
+
+class FoldManager:
+    """
+    Computes stratified cross-validation folds once per training set and shares them between models.
+
+    Folds are keyed by the hashes of the training data and the splitter, so every model trained on
+    the same data reuses the same fold indices and fold arrays. The folds are the ones GridSearchCV
+    would use for the same cv argument, so scores do not change.
+
+    Without a cache_dir the arrays go to a temporary directory of the manager, removed with it (or
+    at exit); with one (e.g. FOLD_CACHE_DIR, see use_fold_cache) they are kept for later runs.
+
+    Attributes:
+        cv (int or splitter): Cross-validation strategy.
+        cache_dir (str, optional): Directory holding one sub-directory of fold arrays per training set.
+        max_datasets (int): Number of training sets kept on disk; older ones are removed.
+    """
+
+    def __init__(self, cv=5, cache_dir=None, max_datasets=4):
+        self.cv = cv
+        self.cache_dir = cache_dir
+        self.max_datasets = max_datasets
+        self._fold_sets = {}
+        self._tmp_dir = None
+
+    def _root(self):
+        """
+        Returns the directory the fold sets are written to, creating the temporary one on first use.
+        """
+        if self.cache_dir is not None:
+            return self.cache_dir
+        if self._tmp_dir is None:
+            self._tmp_dir = tempfile.mkdtemp(prefix='folds_')
+            weakref.finalize(self, shutil.rmtree, self._tmp_dir, ignore_errors=True)
+        return self._tmp_dir
+
+    def get(self, X, y):
+        """
+        Returns the folds of a training set, computing and storing them on first use.
+
+        Args:
+            X (pd.DataFrame or np.ndarray): Training feature data.
+            y (pd.Series or np.ndarray): Training target data.
+
+        Returns:
+            FoldSet: The folds of the data.
+        """
+        dataset_hash = hash_dataset(X, y)
+        splitter = check_cv(self.cv, y, classifier=True)
+        key = f"{dataset_hash[:16]}_{hashlib.sha256(repr(splitter).encode('utf-8')).hexdigest()[:8]}"
+        directory = os.path.abspath(os.path.join(self._root(), key))
+        splits_path = os.path.join(directory, 'splits.npz')
+        if directory in self._fold_sets and os.path.isfile(splits_path):
+            return self._fold_sets[directory]
+
+        if os.path.isfile(splits_path):
+            with np.load(splits_path) as stored:
+                n_splits = len(stored.files) // 2
+                splits = [(stored[f'train{fold}'], stored[f'val{fold}']) for fold in range(n_splits)]
+            os.utime(directory)
+        else:
+            splits = list(splitter.split(X, y))
+            os.makedirs(directory, exist_ok=True)
+            X_values = np.asarray(X)
+            y_values = np.asarray(y)
+            for fold, (train_idx, val_idx) in enumerate(splits):
+                arrays = (X_values[train_idx], y_values[train_idx], X_values[val_idx], y_values[val_idx])
+                for name, array in zip(FOLD_ARRAYS, arrays):
+                    _save_array(os.path.join(directory, f"fold{fold}_{name}.npy"), array)
+            # splits.npz marks the directory as complete, so it is written last
+            tmp_path = splits_path + '.tmp.npz'
+            np.savez(tmp_path, **{f'{kind}{fold}': indices for fold, split in enumerate(splits)
+                                  for kind, indices in zip(('train', 'val'), split)})
+            os.replace(tmp_path, splits_path)
+            self._prune()
+
+        self._fold_sets[directory] = FoldSet(dataset_hash, directory, splits)
+        return self._fold_sets[directory]
+
+    def _prune(self):
+        """
+        Removes the least recently used fold directories beyond max_datasets.
+        """
+        root = self._root()
+        directories = [os.path.join(root, name) for name in os.listdir(root)]
+        directories = sorted((path for path in directories if os.path.isdir(path)), key=os.path.getmtime,
+                             reverse=True)
+        for path in directories[self.max_datasets:]:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+# Shared by every BaseModel unless a model is given its own manager
+default_fold_manager = FoldManager()
+
+
+def use_fold_cache(cache_dir=FOLD_CACHE_DIR):
+    """
+    Makes default_fold_manager keep its fold arrays under cache_dir, so later runs on the same
+    training data reuse them.
+    """
+    default_fold_manager.cache_dir = cache_dir
+
+
+def fit_and_score_fold(estimator, params, X_train, y_train, X_val, y_val, scoring):
+    """
+    Fits one candidate on one fold's training arrays and scores it on the fold's validation arrays.
+
+    A fit that raises scores NaN, like GridSearchCV's default error_score; the error is returned so
+    that the caller can report the failures together (see check_fit_failures).
+
+    Returns:
+        tuple: (score, fit seconds, error message or None).
+    """
+    start = time.perf_counter()
+    model = clone(estimator).set_params(**params)
+    try:
+        model.fit(X_train, y_train)
+    except Exception as error:
+        return np.nan, time.perf_counter() - start, f"{type(error).__name__}: {error}"
+    fit_seconds = time.perf_counter() - start
+    return get_scorer(scoring)(model, X_val, y_val), fit_seconds, None
+
+
+def check_fit_failures(errors):
+    """
+    Reports failed fits the way GridSearchCV does with error_score=np.nan: a FitFailedWarning with
+    the distinct errors if some fits failed, a ValueError if all of them did.
+
+    Args:
+        errors (list): Error message (or None) of every fit.
+
+    Raises:
+        ValueError: If every fit failed.
+    """
+    failed = [error for error in errors if error is not None]
+    if not failed:
+        return
+    details = '\n'.join(f"{count} fits failed with the following error:\n{error}"
+                        for error, count in Counter(failed).most_common())
+    if len(failed) == len(errors):
+        raise ValueError(f"All the {len(errors)} fits failed.\n{details}")
+    warnings.warn(f"{len(failed)} fits failed out of a total of {len(errors)}. The score on these folds for "
+                  f"these parameters will be set to nan.\n{details}", FitFailedWarning)
+
+
+def select_candidates(param_grid, n_splits, max_fits=None, random_state=42):
+    """
+    Lists the grid candidates, sampled down to the fit budget the same way RandomizedSearchCV does.
+
+    Args:
+        param_grid (dict): Hyperparameter grid.
+        n_splits (int): Number of CV folds.
+        max_fits (int, optional): Maximum number of estimator fits.
+        random_state (int, optional): Seed of the sampling. Defaults to 42.
+
+    Returns:
+        list: Candidate hyperparameter dictionaries.
+    """
+    candidates = list(ParameterGrid(param_grid))
+    if max_fits is not None and len(candidates) * n_splits > max_fits:
+        n_iter = max(1, max_fits // n_splits)
+        print(f"Grid of {len(candidates)} candidates exceeds the budget of {max_fits} fits; "
+              f"sampling {n_iter} candidates instead.")
+        candidates = list(ParameterSampler(param_grid, n_iter=n_iter, random_state=random_state))
+    return candidates
+
+
+def score_candidates(estimator, candidates, fold_set, scoring='accuracy', n_jobs=-1, verbose=0, deadline=None):
+    """
+    Scores every candidate on every fold of a FoldSet in parallel.
+
+    With a deadline the candidates are dispatched n_jobs at a time, and no batch starts after the
+    deadline has passed (the first one always runs); only the candidates scored are returned.
+
+    Args:
+        estimator: The base estimator.
+        candidates (list): Candidate hyperparameter dictionaries.
+        fold_set (FoldSet): The folds to score on.
+        scoring (str, optional): Evaluation metric. Defaults to 'accuracy'.
+        n_jobs (int, optional): Number of parallel jobs. Defaults to -1.
+        verbose (int, optional): joblib verbosity level. Defaults to 0.
+        deadline (float, optional): time.perf_counter() value after which no candidate is dispatched.
+
+    Returns:
+        tuple: Scores and fit seconds, both of shape (n_scored_candidates, n_splits); the scored
+        candidates are the first ones of the list.
+
+    Raises:
+        ValueError: If every fit failed (see check_fit_failures).
+    """
+    n_splits = fold_set.n_splits
+    if verbose:
+        print(f"Fitting {n_splits} folds for each of {len(candidates)} candidates, "
+              f"totalling {len(candidates) * n_splits} fits")
+    folds = [fold_set.fold(fold) for fold in range(n_splits)]
+    batch_size = len(candidates)
+    if deadline is not None:
+        batch_size = cpu_count() if n_jobs is None or n_jobs < 0 else n_jobs
+    outputs = []
+    with Parallel(n_jobs=n_jobs, verbose=verbose) as parallel:
+        for start in range(0, len(candidates), max(1, batch_size)):
+            if outputs and time.perf_counter() >= deadline:
+                print(f"Time budget reached after {start} of {len(candidates)} candidates; "
+                      f"no more candidates are dispatched.")
+                break
+            outputs.extend(parallel(
+                delayed(fit_and_score_fold)(estimator, params, *folds[fold], scoring)
+                for params in candidates[start:start + batch_size] for fold in range(n_splits)
+            ))
+    check_fit_failures([error for _, _, error in outputs])
+    results = np.array([output[:2] for output in outputs], dtype=float).reshape(-1, n_splits, 2)
+    return results[:, :, 0], results[:, :, 1]
+
+
+def fold_grid_search(estimator, param_grid, fold_set, X_train, y_train, scoring='accuracy', n_jobs=-1,
+                     verbose=0, max_fits=None, random_state=42, deadline=None):
+    """
+    Grid search over precomputed folds; the counterpart of GridSearchCV (or RandomizedSearchCV when
+    the grid exceeds the fit budget) in run_search.
+
+    The best candidate is refitted on the original training data, so the saved estimator keeps the
+    feature names of a DataFrame input.
+
+    Args:
+        estimator: The sklearn estimator to tune.
+        param_grid (dict): Hyperparameter grid.
+        fold_set (FoldSet): Folds of X_train and y_train.
+        X_train (pd.DataFrame or np.ndarray): Training feature data.
+        y_train (pd.Series or np.ndarray): Training target data.
+        scoring (str, optional): Evaluation metric. Defaults to 'accuracy'.
+        n_jobs (int, optional): Number of parallel jobs. Defaults to -1.
+        verbose (int, optional): Verbosity level. Defaults to 0.
+        max_fits (int, optional): Maximum number of estimator fits.
+        random_state (int, optional): Seed of the candidate sampling. Defaults to 42.
+        deadline (float, optional): time.perf_counter() value after which no candidate is dispatched;
+            the best of the candidates scored by then is refitted.
+
+    Returns:
+        SearchResult: The fitted search.
+    """
+    from .ledger import build_cv_results
+
+    candidates = select_candidates(param_grid, fold_set.n_splits, max_fits, random_state)
+    scores, fit_times = score_candidates(estimator, candidates, fold_set, scoring, n_jobs, verbose, deadline)
+    candidates = candidates[:len(scores)]
+    cv_results = build_cv_results(candidates, scores)
+    cv_results['mean_fit_time'] = fit_times.mean(axis=1)
+    mean_scores = cv_results['mean_test_score']
+    # Failed candidates rank last; ties resolve to the first candidate, like GridSearchCV
+    best_index = int(np.argmax(np.where(np.isnan(mean_scores), -np.inf, mean_scores)))
+    best_params = candidates[best_index]
+    best_estimator = clone(estimator).set_params(**best_params).fit(X_train, y_train)
+    return SearchResult(best_estimator, best_params, float(mean_scores[best_index]), cv_results)
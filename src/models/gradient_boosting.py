@@ -1,9 +1,9 @@
 # src/models/gradient_boosting.py
 
-from sklearn.ensemble import GradientBoostingClassifier
 from .base_model import BaseModel
 
 def get_gradient_boosting_model():
+    from sklearn.ensemble import GradientBoostingClassifier
     model = GradientBoostingClassifier(random_state=42)
     param_grid = {
         'n_estimators': [100, 200, 300],
@@ -13,4 +13,4 @@ def get_gradient_boosting_model():
         'min_samples_leaf': [1, 2, 4]
     }
     model_name = 'gradient_boosting'
-    return BaseModel(model, param_grid, model_name)
+    return BaseModel(model, param_grid, model_name, search_strategy='halving_grid')
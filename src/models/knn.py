@@ -1,9 +1,9 @@
 # src/models/knn.py
 
-from sklearn.neighbors import KNeighborsClassifier
 from .base_model import BaseModel
 
 def get_knn_model():
+    from sklearn.neighbors import KNeighborsClassifier
     model = KNeighborsClassifier()
     param_grid = {
         'n_neighbors': [3, 5, 7, 9],
@@ -0,0 +1,15 @@
+# src/models/knn_index.py
+
+from .base_model import BaseModel
+
+def get_knn_index_model():
+    from .neighbors import IndexedKNeighborsClassifier
+    # Aynı grid knn ile; komşular KD-tree indeksinden, büyük verilerde izdüşüm + yeniden sıralama ile bulunur
+    model = IndexedKNeighborsClassifier(algorithm='kd_tree', leaf_size=40, n_components='auto', candidates=16)
+    param_grid = {
+        'n_neighbors': [3, 5, 7, 9],
+        'weights': ['uniform', 'distance'],
+        'metric': ['euclidean', 'manhattan']
+    }
+    model_name = 'knn_index'
+    return BaseModel(model, param_grid, model_name)
@@ -0,0 +1,255 @@
+# src/models/ledger.py
+
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from joblib import cpu_count
+from sklearn.model_selection import ParameterGrid, check_cv
+from .cache import hash_dataset
+from .folds import score_candidates
+from .search import DeadlineGridSearchCV, SearchResult, estimate_fits_for_time_budget
+
+
+# One row per candidate and fold, so runs with other grids or numbers of folds share the same columns
+LEDGER_COLUMNS = ['recorded_at', 'dataset_hash', 'split_hash', 'estimator_hash', 'params_key', 'fold', 'test_score']
+
+
+def params_key(params):
+    """
+    Returns a stable string key for a candidate's hyperparameters.
+
+    Args:
+        params (dict): Candidate hyperparameters.
+
+    Returns:
+        str: JSON representation with sorted keys (non-JSON values such as tuples use repr).
+    """
+    return json.dumps({name: repr(value) for name, value in params.items()}, sort_keys=True)
+
+
+def hash_splits(splits):
+    """
+    Computes a hash of the validation indices of a list of CV splits.
+
+    Args:
+        splits (list): List of (train_idx, test_idx) tuples.
+
+    Returns:
+        str: Hex digest identifying the fold assignment.
+    """
+    digest = hashlib.sha256()
+    for _, test_idx in splits:
+        digest.update(np.asarray(test_idx, dtype=np.int64).tobytes())
+        digest.update(b'|')
+    return digest.hexdigest()
+
+
+def hash_estimator_config(estimator, param_grid):
+    """
+    Computes a hash of the estimator's fixed configuration, i.e. the parameters that are not searched.
+
+    Args:
+        estimator: The base estimator.
+        param_grid (dict): Hyperparameter grid; its keys are left out of the hash.
+
+    Returns:
+        str: Hex digest identifying the estimator configuration.
+    """
+    fixed = {name: repr(value) for name, value in estimator.get_params().items() if name not in param_grid}
+    payload = json.dumps({'class': type(estimator).__qualname__, 'params': fixed}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class CVLedger:
+    """
+    An append-only ledger of cross-validated candidate scores for one model.
+
+    Each row records the score of one candidate on one fold, for one dataset (hash), one fold
+    assignment (hash) and one fixed estimator configuration (hash), in the LEDGER_COLUMNS layout.
+    A later search over a grown grid only needs to evaluate the candidates that have no rows yet.
+
+    Attributes:
+        model_name (str): The name of the model.
+        path (str): Location of the ledger CSV ('outputs/reports/<model_name>_cv_ledger.csv').
+    """
+
+    def __init__(self, model_name, reports_dir=os.path.join('outputs', 'reports')):
+        """
+        Initializes the ledger.
+
+        Args:
+            model_name (str): The name of the model.
+            reports_dir (str, optional): Directory holding the ledger CSV. Defaults to 'outputs/reports'.
+        """
+        self.model_name = model_name
+        self.path = os.path.join(reports_dir, f"{model_name}_cv_ledger.csv")
+
+    def load(self):
+        """
+        Loads the ledger.
+
+        Returns:
+            pd.DataFrame: All recorded rows in the LEDGER_COLUMNS layout (empty if the ledger does not
+            exist yet).
+        """
+        if not os.path.isfile(self.path):
+            return pd.DataFrame(columns=LEDGER_COLUMNS)
+        return pd.read_csv(self.path)
+
+    def lookup(self, dataset_hash, split_hash, estimator_hash, n_splits):
+        """
+        Returns the recorded fold scores for one dataset, fold assignment and estimator configuration.
+
+        Args:
+            dataset_hash (str): Hash of the training data.
+            split_hash (str): Hash of the fold assignment.
+            estimator_hash (str): Hash of the fixed estimator configuration.
+            n_splits (int): Number of folds.
+
+        Returns:
+            dict: Candidate key to an array of per-fold scores (the latest record of a fold wins).
+            Candidates without a score for every fold are left out.
+        """
+        ledger = self.load()
+        if ledger.empty:
+            return {}
+        rows = ledger[(ledger['dataset_hash'] == dataset_hash) &
+                      (ledger['split_hash'] == split_hash) &
+                      (ledger['estimator_hash'] == estimator_hash) &
+                      (ledger['fold'] < n_splits)]
+        scores = rows.drop_duplicates(['params_key', 'fold'], keep='last').pivot(
+            index='params_key', columns='fold', values='test_score').reindex(columns=range(n_splits))
+        # A failed fit is recorded as a NaN score; a missing fold has no row at all
+        recorded = rows.groupby('params_key')['fold'].nunique()
+        complete = recorded.index[recorded == n_splits]
+        return {key: scores.loc[key].to_numpy(dtype=float) for key in complete}
+
+    def append(self, dataset_hash, split_hash, estimator_hash, candidates, fold_scores):
+        """
+        Appends newly scored candidates to the ledger.
+
+        Args:
+            dataset_hash (str): Hash of the training data.
+            split_hash (str): Hash of the fold assignment.
+            estimator_hash (str): Hash of the fixed estimator configuration.
+            candidates (list): Candidate hyperparameter dictionaries.
+            fold_scores (np.ndarray): Scores of shape (n_candidates, n_splits).
+        """
+        if not candidates:
+            return
+        fold_scores = np.asarray(fold_scores, dtype=float)
+        n_splits = fold_scores.shape[1]
+        rows = pd.DataFrame({
+            'recorded_at': datetime.now().isoformat(timespec='seconds'),
+            'dataset_hash': dataset_hash,
+            'split_hash': split_hash,
+            'estimator_hash': estimator_hash,
+            'params_key': np.repeat([params_key(params) for params in candidates], n_splits),
+            'fold': np.tile(np.arange(n_splits), len(candidates)),
+            'test_score': fold_scores.ravel(),
+        }, columns=LEDGER_COLUMNS)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        rows.to_csv(self.path, mode='a', index=False, header=not os.path.isfile(self.path))
+
+
+def build_cv_results(candidates, fold_scores):
+    """
+    Builds a GridSearchCV-style cv_results_ dictionary from per-fold scores.
+
+    Args:
+        candidates (list): Candidate hyperparameter dictionaries.
+        fold_scores (np.ndarray): Scores of shape (n_candidates, n_splits).
+
+    Returns:
+        dict: cv_results_ with params, per-split, mean, std and rank entries.
+    """
+    results = {'params': candidates}
+    for fold in range(fold_scores.shape[1]):
+        results[f'split{fold}_test_score'] = fold_scores[:, fold]
+    results['mean_test_score'] = fold_scores.mean(axis=1)
+    results['std_test_score'] = fold_scores.std(axis=1)
+    # Failed candidates (NaN) rank last, as in GridSearchCV
+    results['rank_test_score'] = (pd.Series(-results['mean_test_score']).rank(method='min', na_option='bottom')
+                                  .astype(int).to_numpy())
+    return results
+
+
+def run_warm_start_search(base_model, X_train, y_train, cv=5, scoring='accuracy', n_jobs=-1, verbose=2):
+    """
+    Runs a grid search that only evaluates candidates missing from the model's CV ledger.
+
+    Previously scored candidates (same data, folds and fixed estimator configuration) are read back
+    from the ledger, the missing ones are scored with GridSearchCV and appended, and the best
+    candidate over the merged results is refitted on the full training data.
+
+    The model's budget only applies to the missing candidates: a time budget is turned into a fit
+    budget with one probe fit (as in run_search) and enforced as a deadline, after which no more
+    candidates are dispatched; the ones left unscored are evaluated by a later run.
+
+    Args:
+        base_model (BaseModel): The model to train; its param_grid, max_fits and time_budget are used.
+        X_train (pd.DataFrame or np.ndarray): Training feature data.
+        y_train (pd.Series or np.ndarray): Training target data.
+        cv (int, splitter or FoldSet): Cross-validation strategy.
+        scoring (str): Evaluation metric.
+        n_jobs (int): Number of parallel jobs.
+        verbose (int): Verbosity level.
+
+    Returns:
+        SearchResult: The merged search result.
+    """
+    splitter = check_cv(cv, y_train, classifier=True)
+    splits = list(splitter.split(X_train, y_train))
+    ledger = CVLedger(base_model.model_name)
+    dataset_hash = getattr(splitter, 'dataset_hash', None) or hash_dataset(X_train, y_train)
+    hashes = (dataset_hash, hash_splits(splits),
+              hash_estimator_config(base_model.model, base_model.param_grid))
+
+    candidates = list(ParameterGrid(base_model.param_grid))
+    known = ledger.lookup(*hashes, n_splits=len(splits))
+    missing = [params for params in candidates if params_key(params) not in known]
+    deadline = None
+    max_fits = base_model.max_fits
+    if missing and base_model.time_budget is not None:
+        deadline = time.perf_counter() + base_model.time_budget
+        budget_fits = estimate_fits_for_time_budget(base_model.model, X_train, y_train, splitter,
+                                                    base_model.time_budget, n_jobs)
+        max_fits = budget_fits if max_fits is None else min(max_fits, budget_fits)
+    if max_fits is not None and len(missing) * len(splits) > max_fits:
+        missing = missing[:max(1, max_fits // len(splits))]
+        print(f"Fit budget allows {len(missing)} new candidates for {base_model.model_name} in this run.")
+    print(f"{base_model.model_name}: {len(candidates) - len(missing)} candidates reused from the ledger, "
+          f"{len(missing)} to evaluate.")
+
+    if missing and hasattr(splitter, 'fold'):
+        # Precomputed folds (FoldSet): fit on the materialised fold arrays
+        new_scores, _ = score_candidates(base_model.model, missing, splitter, scoring, n_jobs, verbose,
+                                         deadline=deadline)
+        # With a deadline only the first candidates may have been scored
+        ledger.append(*hashes, missing[:len(new_scores)], new_scores)
+        known.update({params_key(params): scores for params, scores in zip(missing, new_scores)})
+    elif missing:
+        search = DeadlineGridSearchCV(base_model.model, param_grid=[{name: [value] for name, value in params.items()}
+                                                                    for params in missing],
+                                      cv=splits, scoring=scoring, n_jobs=n_jobs, verbose=verbose, refit=False)
+        search.deadline = deadline
+        search.batch_size = cpu_count() if n_jobs is None or n_jobs < 0 else n_jobs
+        search.fit(X_train, y_train)
+        new_scores = np.column_stack([search.cv_results_[f'split{fold}_test_score'] for fold in range(len(splits))])
+        ledger.append(*hashes, search.cv_results_['params'], new_scores)
+        known.update({params_key(params): scores
+                      for params, scores in zip(search.cv_results_['params'], new_scores)})
+
+    scored = [params for params in candidates if params_key(params) in known]
+    fold_scores = np.vstack([known[params_key(params)] for params in scored])
+    cv_results = build_cv_results(scored, fold_scores)
+    mean_scores = cv_results['mean_test_score']
+    best_index = int(np.argmax(np.where(np.isnan(mean_scores), -np.inf, mean_scores)))
+    best_params = scored[best_index]
+    best_estimator = clone(base_model.model).set_params(**best_params).fit(X_train, y_train)
+    return SearchResult(best_estimator, best_params, float(cv_results['mean_test_score'][best_index]), cv_results)
@@ -1,9 +1,9 @@
 # src/models/lightgbm_model.py
 
-from lightgbm import LGBMClassifier
 from .base_model import BaseModel
 
 def get_lightgbm_model():
+    from lightgbm import LGBMClassifier
     model = LGBMClassifier(random_state=42)
     param_grid = {
         'n_estimators': [100, 200, 300],
@@ -13,4 +13,4 @@ def get_lightgbm_model():
         'subsample': [0.7, 0.8, 1.0]
     }
     model_name = 'lightgbm'
-    return BaseModel(model, param_grid, model_name)
+    return BaseModel(model, param_grid, model_name, search_strategy='halving_grid')
@@ -1,9 +1,9 @@
 # src/models/logistic_regression.py
 
-from sklearn.linear_model import LogisticRegression
 from .base_model import BaseModel
 
 def get_logistic_regression_model():
+    from sklearn.linear_model import LogisticRegression
     model = LogisticRegression(multi_class='multinomial', solver='lbfgs', random_state=42, max_iter=1000)
     param_grid = {
         'C': [0.01, 0.1, 1, 10, 100],
@@ -1,9 +1,9 @@
 # src/models/mlp.py
 
-from sklearn.neural_network import MLPClassifier
 from .base_model import BaseModel
 
 def get_mlp_model():
+    from sklearn.neural_network import MLPClassifier
     model = MLPClassifier(random_state=42, max_iter=500)
     param_grid = {
         'hidden_layer_sizes': [(50,), (100,), (100, 50)],
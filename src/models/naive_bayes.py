@@ -1,9 +1,9 @@
 # src/models/naive_bayes.py
 
-from sklearn.naive_bayes import GaussianNB
 from .base_model import BaseModel
 
 def get_naive_bayes_model():
+    from sklearn.naive_bayes import GaussianNB
     model = GaussianNB()
     param_grid = {
         # GaussianNB için hiperparametreler sınırlıdır
@@ -11,4 +11,5 @@ def get_naive_bayes_model():
         'priors': [None]  # Varsayılan olarak sınıf oranları kullanılır
     }
     model_name = 'naive_bayes'
-    return BaseModel(model, param_grid, model_name)
+    # partial_fit yalnızca sınıf istatistiklerini biriktirir; tek geçiş yeterlidir
+    return BaseModel(model, param_grid, model_name, streaming_epochs=1)
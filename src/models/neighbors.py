@@ -0,0 +1,146 @@
+# src/models/neighbors.py
+
+import numpy as np
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.neighbors import BallTree, KDTree
+from sklearn.utils.validation import check_is_fitted
+
+
+TREES = {'kd_tree': KDTree, 'ball_tree': BallTree}
+
+# Minkowski power of each supported metric
+METRIC_POWERS = {'euclidean': 2, 'manhattan': 1}
+
+# Training rows used to find the projection axes
+PROJECTION_SAMPLE = 20000
+
+# With n_components='auto', training sets of at least this many rows are indexed in AUTO_COMPONENTS
+# projected dimensions; smaller ones are indexed exactly
+AUTO_PROJECTION_ROWS = 50000
+AUTO_COMPONENTS = 16
+
+
+class IndexedKNeighborsClassifier(ClassifierMixin, BaseEstimator):
+    """
+    k-nearest-neighbours classifier that answers queries from a prebuilt KDTree or BallTree.
+
+    With n_components set, the tree is built on the projection of the training data onto its first
+    n_components principal axes, where trees stay efficient; every query fetches n_neighbors *
+    candidates neighbours from the projected index and reranks them by their exact distance in the
+    original space. Without it the tree is built on the original features and the neighbours are
+    exact. See benchmarks/bench_knn_index.py for the recall and latency of both.
+
+    The index is part of the fitted estimator, so it is saved and loaded with the model artifact
+    instead of being rebuilt. Queries run in batches of batch_size rows.
+
+    Args:
+        n_neighbors (int, optional): Number of neighbours that vote. Defaults to 5.
+        weights (str, optional): 'uniform' or 'distance' (inverse-distance votes). Defaults to 'uniform'.
+        metric (str, optional): 'euclidean' or 'manhattan'. Defaults to 'euclidean'.
+        algorithm (str, optional): 'kd_tree' or 'ball_tree'. Defaults to 'kd_tree'.
+        leaf_size (int, optional): Leaf size of the tree. Defaults to 40.
+        n_components (int or str, optional): Dimensions of the projection; None indexes the original
+            features, 'auto' projects to AUTO_COMPONENTS dimensions from AUTO_PROJECTION_ROWS rows on.
+        candidates (int, optional): Projected neighbours fetched per returned neighbour. Defaults to 4.
+        batch_size (int, optional): Query rows per batch. Defaults to 1024.
+        random_state (int, optional): Seed of the rows sampled for the projection. Defaults to 42.
+    """
+
+    def __init__(self, n_neighbors=5, weights='uniform', metric='euclidean', algorithm='kd_tree', leaf_size=40,
+                 n_components=None, candidates=4, batch_size=1024, random_state=42):
+        self.n_neighbors = n_neighbors
+        self.weights = weights
+        self.metric = metric
+        self.algorithm = algorithm
+        self.leaf_size = leaf_size
+        self.n_components = n_components
+        self.candidates = candidates
+        self.batch_size = batch_size
+        self.random_state = random_state
+
+    def _as_array(self, X):
+        if hasattr(X, 'columns'):
+            X = X.to_numpy()
+        return np.ascontiguousarray(X, dtype=np.float64)
+
+    def fit(self, X, y):
+        if hasattr(X, 'columns'):
+            self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+        X = self._as_array(X)
+        self.classes_, self._y = np.unique(np.asarray(y), return_inverse=True)
+        self.n_features_in_ = X.shape[1]
+        self._fit_X = X
+        n_components = self.n_components
+        if n_components == 'auto':
+            n_components = AUTO_COMPONENTS if len(X) >= AUTO_PROJECTION_ROWS else None
+        if n_components is not None and n_components < X.shape[1]:
+            # Principal axes of (a sample of) the training data; an orthonormal projection never
+            # lengthens euclidean distances, so near points stay near in the index
+            rng = np.random.default_rng(self.random_state)
+            sample = X[rng.choice(len(X), size=min(len(X), PROJECTION_SAMPLE), replace=False)]
+            _, _, components = np.linalg.svd(sample - sample.mean(axis=0), full_matrices=False)
+            self.projection_ = np.ascontiguousarray(components[:n_components].T)
+            indexed = X @ self.projection_
+        else:
+            self.projection_ = None
+            indexed = X
+        self.index_ = TREES[self.algorithm](indexed, leaf_size=self.leaf_size, metric=self.metric)
+        return self
+
+    def kneighbors(self, X, n_neighbors=None):
+        """
+        Finds the neighbours of every query row.
+
+        Args:
+            X (pd.DataFrame or np.ndarray): Query rows.
+            n_neighbors (int, optional): Neighbours per row. Defaults to self.n_neighbors.
+
+        Returns:
+            tuple: (distances, indices) of shape (n_queries, n_neighbors), nearest first.
+        """
+        check_is_fitted(self, 'index_')
+        X = self._as_array(X)
+        k = min(n_neighbors or self.n_neighbors, len(self._fit_X))
+        distances = np.empty((len(X), k))
+        indices = np.empty((len(X), k), dtype=np.intp)
+        for start in range(0, len(X), self.batch_size):
+            batch = slice(start, start + self.batch_size)
+            distances[batch], indices[batch] = self._query(X[batch], k)
+        return distances, indices
+
+    def _query(self, X, k):
+        if self.projection_ is None:
+            return self.index_.query(X, k=k)
+        n_candidates = min(k * self.candidates, len(self._fit_X))
+        _, candidates = self.index_.query(X @ self.projection_, k=n_candidates)
+        differences = np.abs(self._fit_X[candidates] - X[:, None, :])
+        if METRIC_POWERS[self.metric] == 1:
+            exact = differences.sum(axis=2)
+        else:
+            exact = np.sqrt(np.einsum('qcd,qcd->qc', differences, differences))
+        nearest = np.argpartition(exact, k - 1, axis=1)[:, :k] if k < n_candidates else np.arange(k)[None, :]
+        nearest = np.broadcast_to(nearest, (len(X), k))
+        nearest_distances = np.take_along_axis(exact, nearest, axis=1)
+        order = np.argsort(nearest_distances, axis=1, kind='stable')
+        return (np.take_along_axis(nearest_distances, order, axis=1),
+                np.take_along_axis(np.take_along_axis(candidates, nearest, axis=1), order, axis=1))
+
+    def predict_proba(self, X):
+        distances, indices = self.kneighbors(X)
+        labels = self._y[indices]
+        if self.weights == 'distance':
+            with np.errstate(divide='ignore'):
+                weights = 1.0 / distances
+            # Queries matching training rows exactly are decided by those rows only, as in sklearn
+            exact_match = np.isinf(weights)
+            weights = np.where(exact_match.any(axis=1, keepdims=True), exact_match.astype(float), weights)
+        else:
+            weights = np.ones_like(distances)
+        n_classes = len(self.classes_)
+        cells = (np.arange(len(labels))[:, None] * n_classes + labels).ravel()
+        votes = np.bincount(cells, weights=weights.ravel(), minlength=len(labels) * n_classes)
+        votes = votes.reshape(len(labels), n_classes)
+        return votes / votes.sum(axis=1, keepdims=True)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
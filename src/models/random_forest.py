@@ -1,9 +1,9 @@
 # src/models/random_forest.py
 
-from sklearn.ensemble import RandomForestClassifier
 from .base_model import BaseModel
 
 def get_random_forest_model():
+    from sklearn.ensemble import RandomForestClassifier
     model = RandomForestClassifier(random_state=42)
     param_grid = {
         'n_estimators': [100, 200, 300],
@@ -13,4 +13,4 @@ def get_random_forest_model():
         'bootstrap': [True, False]
     }
     model_name = 'random_forest'
-    return BaseModel(model, param_grid, model_name)
+    return BaseModel(model, param_grid, model_name, search_strategy='halving_grid')
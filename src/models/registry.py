@@ -0,0 +1,117 @@
+# src/models/registry.py
+
+import importlib
+import inspect
+import os
+import pkgutil
+import re
+
+
+# Models trained when no selection is given, in training order
+DEFAULT_MODELS = ('random_forest', 'svm', 'catboost', 'knn', 'logistic_regression', 'mlp', 'naive_bayes')
+
+FACTORY_NAME = re.compile(r'^get_(\w+)_model$')
+
+_factories = None
+
+
+def discover_factories():
+    """
+    Finds the 'get_<name>_model' factories of every module in src/models.
+
+    The model modules only import their estimator library inside the factory, so discovering them
+    does not import CatBoost, XGBoost or LightGBM.
+
+    Returns:
+        dict: Model name to factory function, sorted by name.
+    """
+    global _factories
+    if _factories is None:
+        factories = {}
+        for module_info in pkgutil.iter_modules([os.path.dirname(__file__)]):
+            module = importlib.import_module(f"{__package__}.{module_info.name}")
+            for function_name, function in inspect.getmembers(module, inspect.isfunction):
+                match = FACTORY_NAME.match(function_name)
+                if match and function.__module__ == module.__name__:
+                    factories[match.group(1)] = function
+        _factories = dict(sorted(factories.items()))
+    return _factories
+
+
+def available_models():
+    """
+    Returns:
+        list: Names of every registered model.
+    """
+    return list(discover_factories())
+
+
+def resolve_model_names(model_names=None):
+    """
+    Expands a model selection into model names, without building the models.
+
+    Args:
+        model_names (list, optional): Model names, or ['all'] for every registered model.
+            Defaults to DEFAULT_MODELS.
+
+    Returns:
+        list: Model names in selection order.
+
+    Raises:
+        ValueError: If a name is not registered.
+    """
+    if model_names is None:
+        return list(DEFAULT_MODELS)
+    if list(model_names) == ['all']:
+        return available_models()
+    unknown = [name for name in model_names if name not in discover_factories()]
+    if unknown:
+        raise ValueError(f"Unknown models {unknown}. Choose from {available_models()} or 'all'.")
+    return list(dict.fromkeys(model_names))
+
+
+def get_model(model_name):
+    """
+    Builds a registered model.
+
+    Args:
+        model_name (str): Registered model name.
+
+    Returns:
+        BaseModel: The model.
+    """
+    return discover_factories()[resolve_model_names([model_name])[0]]()
+
+
+def get_models(model_names=None, time_budgets=None):
+    """
+    Builds the selected models.
+
+    With 'all', models whose library is not installed are skipped; models named explicitly must be
+    importable.
+
+    Args:
+        model_names (list, optional): Model names, or ['all']. Defaults to DEFAULT_MODELS.
+        time_budgets (dict, optional): Model name to search time budget in seconds.
+
+    Returns:
+        list: BaseModel instances.
+
+    Raises:
+        ValueError: If a selected or budgeted model is not registered.
+    """
+    names = resolve_model_names(model_names)
+    resolve_model_names(list(time_budgets or {}))
+    models = []
+    for name in names:
+        try:
+            model = get_model(name)
+        except ImportError as error:
+            if model_names is not None and list(model_names) != ['all']:
+                raise
+            print(f"Skipping {name}: {error}")
+            continue
+        if time_budgets and name in time_budgets:
+            model.configure_search(time_budget=time_budgets[name])
+        models.append(model)
+    return models
@@ -0,0 +1,391 @@
+# src/models/search.py
+
+import time
+import numpy as np
+from joblib import cpu_count
+from sklearn.base import clone
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import (GridSearchCV, HalvingGridSearchCV, HalvingRandomSearchCV, RandomizedSearchCV,
+                                     ParameterGrid, check_cv)
+
+
+# Names accepted by BaseModel(search_strategy=...) and run_pipeline(search_strategy=...)
+SEARCH_STRATEGIES = ('grid', 'halving_grid', 'halving_random', 'optuna')
+
+
+class SearchResult:
+    """
+    A lightweight stand-in for a fitted sklearn search object.
+
+    It exposes the attributes that the rest of the project reads from a search
+    (best_estimator_, best_params_, best_score_, cv_results_), so searches that are not
+    backed by a sklearn SearchCV instance can still be saved and reported by BaseModel.
+
+    Attributes:
+        best_estimator_: The estimator refitted on the full training data with the best parameters.
+        best_params_ (dict): The best hyperparameters found.
+        best_score_ (float): Mean cross-validated score of the best candidate.
+        cv_results_ (dict): Per-candidate results in the same layout as GridSearchCV.cv_results_.
+    """
+
+    def __init__(self, best_estimator_, best_params_, best_score_, cv_results_):
+        self.best_estimator_ = best_estimator_
+        self.best_params_ = best_params_
+        self.best_score_ = best_score_
+        self.cv_results_ = cv_results_
+
+
+def count_candidates(param_grid):
+    """
+    Counts the number of hyperparameter combinations in a parameter grid.
+
+    Args:
+        param_grid (dict or list): A GridSearchCV-style parameter grid.
+
+    Returns:
+        int: Number of candidate combinations.
+    """
+    return len(ParameterGrid(param_grid))
+
+
+def take_rows(X, indices):
+    """
+    Selects rows from a DataFrame, Series or NumPy array by position.
+
+    Args:
+        X (pd.DataFrame, pd.Series or np.ndarray): Input data.
+        indices (np.ndarray): Row positions to select.
+
+    Returns:
+        Same type as X: The selected rows.
+    """
+    if hasattr(X, 'iloc'):
+        return X.iloc[indices]
+    return X[indices]
+
+
+def estimate_fits_for_time_budget(estimator, X, y, cv, time_budget, n_jobs):
+    """
+    Converts a wall-clock budget into a number of fits by timing a single probe fit.
+
+    The estimator is fitted once on the training part of the first CV split with its default
+    parameters; the budget is then divided by that duration and multiplied by the number of
+    parallel workers.
+
+    Args:
+        estimator: The sklearn estimator to probe.
+        X (pd.DataFrame or np.ndarray): Training feature data.
+        y (pd.Series or np.ndarray): Training target data.
+        cv: Cross-validation splitter (already checked with check_cv).
+        time_budget (float): Budget in seconds.
+        n_jobs (int): Number of parallel jobs used by the search (-1 for all cores).
+
+    Returns:
+        int: Estimated number of fits that fit into the budget (at least 1).
+    """
+    train_idx, _ = next(iter(cv.split(X, y)))
+    start = time.perf_counter()
+    clone(estimator).fit(take_rows(X, train_idx), take_rows(y, train_idx))
+    fit_seconds = max(time.perf_counter() - start, 1e-3)
+    workers = cpu_count() if n_jobs is None or n_jobs < 0 else n_jobs
+    return max(1, int(time_budget / fit_seconds * workers))
+
+
+def _halving_candidates_for_budget(max_fits, n_splits, factor):
+    """
+    Returns how many initial candidates successive halving can start with for a fit budget.
+
+    With a reduction factor f, successive halving evaluates roughly n * f / (f - 1) candidates
+    in total, each of them on every CV split. Fewer than f candidates means the budget is too
+    small for halving.
+    """
+    return int(max_fits * (factor - 1) / (factor * n_splits))
+
+
+class _DeadlineReached(Exception):
+    pass
+
+
+class DeadlineSearchMixin:
+    """
+    Makes a sklearn search stop dispatching candidates once a wall-clock deadline has passed.
+
+    The candidates of every evaluation (all of them for a grid or random search, one iteration for
+    successive halving) are dispatched batch_size at a time, and no batch starts after the deadline.
+    The best candidate is then chosen among the ones evaluated so far (for halving, among those of
+    the last iteration reached) and refitted as usual. The first batch always runs.
+
+    Attributes:
+        deadline (float, optional): time.perf_counter() value after which no batch is dispatched.
+        batch_size (int): Candidates per batch, typically the number of parallel workers.
+        stopped_early_ (bool): Whether the deadline cut the search short.
+    """
+
+    deadline = None
+    batch_size = 1
+
+    def _run_search(self, evaluate_candidates, *, callback_ctx=None):
+        # Newer sklearn versions pass a callback context; older ones do not accept one
+        context = {} if callback_ctx is None else {'callback_ctx': callback_ctx}
+        self.stopped_early_ = False
+        if self.deadline is None:
+            return super()._run_search(evaluate_candidates, **context)
+
+        def evaluate_in_batches(candidate_params, *args, more_results=None, **kwargs):
+            candidate_params = list(candidate_params)
+            results = None
+            for start in range(0, len(candidate_params), self.batch_size):
+                if self._dispatched and time.perf_counter() >= self.deadline:
+                    raise _DeadlineReached
+                stop = start + self.batch_size
+                batch_results = None if more_results is None else {
+                    name: values[start:stop] for name, values in more_results.items()}
+                results = evaluate_candidates(candidate_params[start:stop], *args, more_results=batch_results,
+                                              **kwargs)
+                self._dispatched = True
+                # A callback context numbers its fits from 0 on every call, so it can only see one batch
+                kwargs.pop('callback_ctx', None)
+            return results
+
+        self._dispatched = False
+        try:
+            super()._run_search(evaluate_in_batches, **context)
+        except _DeadlineReached:
+            self.stopped_early_ = True
+            print("Time budget reached; no more candidates are dispatched.")
+
+
+class DeadlineGridSearchCV(DeadlineSearchMixin, GridSearchCV):
+    pass
+
+
+class DeadlineRandomizedSearchCV(DeadlineSearchMixin, RandomizedSearchCV):
+    pass
+
+
+class DeadlineHalvingGridSearchCV(DeadlineSearchMixin, HalvingGridSearchCV):
+    pass
+
+
+class DeadlineHalvingRandomSearchCV(DeadlineSearchMixin, HalvingRandomSearchCV):
+    pass
+
+
+class OptunaSearch:
+    """
+    Hyperparameter search over a GridSearchCV-style grid using Optuna's TPE sampler
+    with median pruning on the per-fold scores.
+
+    Every trial picks one value per hyperparameter from the grid, evaluates the folds one by one
+    and reports the running mean score after each fold, so clearly bad candidates are pruned
+    before all folds have been fitted. The best candidate is refitted on the full training data.
+
+    Attributes:
+        estimator: The sklearn estimator to tune.
+        param_grid (dict): Hyperparameter grid; each list is used as a categorical distribution.
+        cv (int or splitter): Cross-validation strategy.
+        scoring (str): Scorer name understood by sklearn.metrics.get_scorer.
+        n_trials (int, optional): Maximum number of trials; never more than the grid has candidates.
+        timeout (float, optional): Wall-clock budget in seconds for the whole study.
+        n_jobs (int): Number of trials run in parallel threads.
+        random_state (int): Seed of the TPE sampler.
+        verbose (int): Verbosity level; Optuna's own logging is silenced below 2.
+    """
+
+    def __init__(self, estimator, param_grid, cv=5, scoring='accuracy', n_trials=None,
+                 timeout=None, n_jobs=1, random_state=42, verbose=0):
+        self.estimator = estimator
+        self.param_grid = param_grid
+        self.cv = cv
+        self.scoring = scoring
+        self.n_trials = n_trials
+        self.timeout = timeout
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+        self.verbose = verbose
+
+    def fit(self, X, y):
+        """
+        Runs the Optuna study and refits the best candidate on the full data.
+
+        Args:
+            X (pd.DataFrame or np.ndarray): Training feature data.
+            y (pd.Series or np.ndarray): Training target data.
+
+        Returns:
+            OptunaSearch: The fitted search.
+        """
+        import optuna
+        from sklearn.metrics import get_scorer
+
+        if self.verbose < 2:
+            optuna.logging.set_verbosity(optuna.logging.WARNING)
+
+        cv = check_cv(self.cv, y, classifier=True)
+        splits = list(cv.split(X, y))
+        scorer = get_scorer(self.scoring)
+        choices = {name: list(values) for name, values in self.param_grid.items()}
+        # TPE proposes a candidate again once it has little left to explore, so a study limited only by
+        # its timeout would spin on repeats; it never needs more trials than the grid has candidates
+        n_candidates = count_candidates(self.param_grid)
+        n_trials = n_candidates if self.n_trials is None else min(self.n_trials, n_candidates)
+
+        # Identical candidates can be proposed again by TPE; score them only once
+        scored = {}
+
+        def objective(trial):
+            positions = {name: trial.suggest_categorical(name, list(range(len(values))))
+                         for name, values in choices.items()}
+            key = tuple(sorted(positions.items()))
+            if key in scored:
+                return scored[key]
+
+            params = {name: choices[name][pos] for name, pos in positions.items()}
+            trial.set_user_attr('params', params)
+            fold_scores = []
+            for fold, (train_idx, test_idx) in enumerate(splits):
+                model = clone(self.estimator).set_params(**params)
+                model.fit(take_rows(X, train_idx), take_rows(y, train_idx))
+                fold_scores.append(scorer(model, take_rows(X, test_idx), take_rows(y, test_idx)))
+                trial.set_user_attr('fold_scores', fold_scores)
+                trial.report(float(np.mean(fold_scores)), step=fold)
+                if trial.should_prune():
+                    raise optuna.TrialPruned()
+
+            scored[key] = float(np.mean(fold_scores))
+            return scored[key]
+
+        self.study_ = optuna.create_study(
+            direction='maximize',
+            sampler=optuna.samplers.TPESampler(seed=self.random_state),
+            pruner=optuna.pruners.MedianPruner(n_warmup_steps=1),
+        )
+        self.study_.optimize(objective, n_trials=n_trials, timeout=self.timeout, n_jobs=self.n_jobs)
+
+        self.cv_results_ = self._build_cv_results(len(splits))
+        best_trial = self.study_.best_trial
+        self.best_params_ = {name: choices[name][pos] for name, pos in best_trial.params.items()}
+        self.best_score_ = best_trial.value
+        self.best_estimator_ = clone(self.estimator).set_params(**self.best_params_)
+        self.best_estimator_.fit(X, y)
+        return self
+
+    def _build_cv_results(self, n_splits):
+        """
+        Collects the trials of the study into a GridSearchCV-style cv_results_ dictionary.
+        Pruned trials keep the scores of the folds that were evaluated (NaN for the rest).
+        """
+        trials = [t for t in self.study_.trials if 'params' in t.user_attrs]
+        results = {'params': [t.user_attrs['params'] for t in trials],
+                   'state': [t.state.name for t in trials]}
+        scores = np.full((len(trials), n_splits), np.nan)
+        for row, trial in enumerate(trials):
+            fold_scores = trial.user_attrs.get('fold_scores', [])
+            scores[row, :len(fold_scores)] = fold_scores
+        for fold in range(n_splits):
+            results[f'split{fold}_test_score'] = scores[:, fold]
+        results['mean_test_score'] = np.nanmean(scores, axis=1) if len(trials) else np.array([])
+        results['std_test_score'] = np.nanstd(scores, axis=1) if len(trials) else np.array([])
+        return results
+
+
+def run_search(strategy, estimator, param_grid, X_train, y_train, cv=5, scoring='accuracy',
+               n_jobs=-1, verbose=2, max_fits=None, time_budget=None, random_state=42):
+    """
+    Builds and fits a hyperparameter search with the requested strategy and budget.
+
+    Strategies:
+        'grid': Exhaustive GridSearchCV. When the grid needs more fits than the budget allows,
+                a RandomizedSearchCV over the same grid is used with as many candidates as fit.
+        'halving_grid': HalvingGridSearchCV (successive halving on the number of samples).
+                When the grid is too large for the budget, HalvingRandomSearchCV is used instead.
+        'halving_random': HalvingRandomSearchCV sized to the budget.
+        'optuna': OptunaSearch (TPE sampler with median pruning).
+
+    The budget is given either as a number of fits (max_fits) or in seconds (time_budget).
+    A time budget is passed to Optuna directly as the study timeout; the study still runs at most
+    one trial per candidate (and max_fits // n_splits trials with a fit budget). For the other strategies it
+    sizes the search (one probe fit is timed to convert it into a fit budget) and is enforced as a
+    deadline: once it has passed, no more candidates are dispatched and the best candidate found
+    so far is refitted (see DeadlineSearchMixin). A fit budget too small for successive halving
+    falls back to a random search with as many candidates as fit.
+
+    Args:
+        strategy (str): One of SEARCH_STRATEGIES.
+        estimator: The sklearn estimator to tune.
+        param_grid (dict): Hyperparameter grid.
+        X_train (pd.DataFrame or np.ndarray): Training feature data.
+        y_train (pd.Series or np.ndarray): Training target data.
+        cv (int, splitter or FoldSet): Cross-validation strategy. A FoldSet makes the 'grid'
+            strategy fit on its materialised fold arrays.
+        scoring (str): Evaluation metric.
+        n_jobs (int): Number of parallel jobs (-1 uses all cores).
+        verbose (int): Verbosity level.
+        max_fits (int, optional): Maximum number of estimator fits.
+        time_budget (float, optional): Maximum wall-clock time in seconds.
+        random_state (int): Seed for the randomized strategies.
+
+    Returns:
+        A fitted search object exposing best_estimator_, best_params_, best_score_ and cv_results_.
+    """
+    if strategy not in SEARCH_STRATEGIES:
+        raise ValueError(f"Unknown search strategy '{strategy}'. Choose one of {SEARCH_STRATEGIES}.")
+
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    splitter = check_cv(cv, y_train, classifier=True)
+    n_splits = splitter.get_n_splits(X_train, y_train)
+    n_candidates = count_candidates(param_grid)
+
+    if strategy == 'optuna':
+        n_trials = n_candidates if max_fits is None else min(n_candidates, max(1, max_fits // n_splits))
+        search = OptunaSearch(estimator, param_grid, cv=splitter, scoring=scoring, n_trials=n_trials,
+                              timeout=time_budget, n_jobs=n_jobs, random_state=random_state,
+                              verbose=verbose)
+        return search.fit(X_train, y_train)
+
+    if time_budget is not None:
+        budget_fits = estimate_fits_for_time_budget(estimator, X_train, y_train, splitter, time_budget, n_jobs)
+        max_fits = budget_fits if max_fits is None else min(max_fits, budget_fits)
+
+    common = dict(cv=splitter, n_jobs=n_jobs, verbose=verbose, scoring=scoring)
+    batch_size = cpu_count() if n_jobs is None or n_jobs < 0 else n_jobs
+
+    if strategy == 'grid' and hasattr(splitter, 'fold'):
+        # Precomputed folds (FoldSet): fit on the materialised fold arrays instead of re-slicing X
+        from .folds import fold_grid_search
+        return fold_grid_search(estimator, param_grid, splitter, X_train, y_train, scoring=scoring, n_jobs=n_jobs,
+                                verbose=verbose, max_fits=max_fits, random_state=random_state, deadline=deadline)
+
+    factor = 3
+    if strategy != 'grid' and max_fits is not None and _halving_candidates_for_budget(max_fits, n_splits,
+                                                                                       factor) < factor:
+        print(f"A budget of {max_fits} fits is too small for successive halving; "
+              f"using the 'grid' strategy within it instead.")
+        strategy = 'grid'
+
+    if strategy == 'grid':
+        if max_fits is not None and n_candidates * n_splits > max_fits:
+            n_iter = max(1, max_fits // n_splits)
+            print(f"Grid of {n_candidates} candidates exceeds the budget of {max_fits} fits; "
+                  f"sampling {n_iter} candidates instead.")
+            search = DeadlineRandomizedSearchCV(estimator, param_distributions=param_grid, n_iter=n_iter,
+                                                random_state=random_state, **common)
+        else:
+            search = DeadlineGridSearchCV(estimator, param_grid=param_grid, **common)
+    else:
+        budget_candidates = None
+        if max_fits is not None:
+            budget_candidates = _halving_candidates_for_budget(max_fits, n_splits, factor)
+
+        if strategy == 'halving_grid' and (budget_candidates is None or n_candidates <= budget_candidates):
+            search = DeadlineHalvingGridSearchCV(estimator, param_grid=param_grid, factor=factor,
+                                                 random_state=random_state, **common)
+        else:
+            n_start = n_candidates if budget_candidates is None else min(n_candidates, budget_candidates)
+            search = DeadlineHalvingRandomSearchCV(estimator, param_distributions=param_grid, n_candidates=n_start,
+                                                   factor=factor, random_state=random_state, **common)
+
+    search.deadline = deadline
+    search.batch_size = batch_size
+    search.fit(X_train, y_train)
+    return search
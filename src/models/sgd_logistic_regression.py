@@ -0,0 +1,14 @@
+# src/models/sgd_logistic_regression.py
+
+from .base_model import BaseModel
+
+def get_sgd_logistic_regression_model():
+    from sklearn.linear_model import SGDClassifier
+    # Logistic regression fitted with SGD, so it can also be trained chunk by chunk (train_streaming)
+    model = SGDClassifier(loss='log_loss', learning_rate='adaptive', eta0=0.01, random_state=42, max_iter=1000, tol=1e-3)
+    param_grid = {
+        'alpha': [0.00001, 0.0001, 0.001, 0.01],
+        'penalty': ['l2', 'elasticnet']
+    }
+    model_name = 'sgd_logistic_regression'
+    return BaseModel(model, param_grid, model_name)
@@ -0,0 +1,184 @@
+# src/models/streaming.py
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from src.utils.feature_store import iter_stage_chunks
+
+
+# Encoded match outcomes (H, D, A); partial_fit needs every class up front
+STREAMING_CLASSES = (0, 1, 2)
+
+# Probabilities are clipped like sklearn's log_loss before taking the logarithm
+LOG_LOSS_EPS = np.finfo(np.float64).eps
+
+
+def holdout_mask(start, n_rows, test_size, seed=42):
+    """
+    Assigns rows to the holdout set from their global row number.
+
+    The assignment is a hash of the row number, so it does not depend on the chunk size and every
+    pass over the data sees the same split without storing it.
+
+    Args:
+        start (int): Row number of the first row of the chunk.
+        n_rows (int): Number of rows in the chunk.
+        test_size (float): Fraction of rows held out.
+        seed (int, optional): Seed of the hash. Defaults to 42.
+
+    Returns:
+        np.ndarray: Boolean mask, True for holdout rows.
+    """
+    # splitmix64 finaliser; uint64 arithmetic wraps around
+    z = np.arange(start, start + n_rows, dtype=np.uint64) + np.uint64(seed) + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    z = z ^ (z >> np.uint64(31))
+    return (z >> np.uint64(11)).astype(np.float64) / float(1 << 53) < test_size
+
+
+def iter_labelled_chunks(chunk_source, target_column, test_size, holdout=False):
+    """
+    Yields the training (or holdout) rows of every chunk as features and labels.
+
+    Args:
+        chunk_source (callable): Returns a fresh iterator of DataFrame chunks.
+        target_column (str): Name of the label column.
+        test_size (float): Fraction of rows held out.
+        holdout (bool, optional): Yield the holdout rows instead of the training rows. Defaults to False.
+
+    Yields:
+        tuple: (X, y) with X a DataFrame and y an integer array.
+    """
+    start = 0
+    for chunk in chunk_source():
+        mask = holdout_mask(start, len(chunk), test_size)
+        start += len(chunk)
+        if not holdout:
+            mask = ~mask
+        if not mask.any():
+            continue
+        rows = chunk[mask]
+        yield rows.drop(columns=[target_column]), rows[target_column].to_numpy(dtype=np.int64)
+
+
+class StreamingMetrics:
+    """
+    Accumulates accuracy, log loss and the confusion matrix over chunks of predictions.
+
+    Only the confusion matrix and two running sums are kept, so memory does not grow with the data.
+    """
+
+    def __init__(self, classes=STREAMING_CLASSES):
+        self.classes = np.asarray(classes)
+        self.confusion = np.zeros((len(self.classes), len(self.classes)), dtype=np.int64)
+        self.log_loss_sum = 0.0
+        self.n_samples = 0
+
+    def update(self, y_true, probabilities):
+        """
+        Adds a chunk of predictions.
+
+        Args:
+            y_true (np.ndarray): True labels.
+            probabilities (np.ndarray): Predicted probabilities, one column per class in self.classes.
+        """
+        true_index = np.searchsorted(self.classes, y_true)
+        np.add.at(self.confusion, (true_index, probabilities.argmax(axis=1)), 1)
+        true_probability = probabilities[np.arange(len(true_index)), true_index]
+        self.log_loss_sum -= np.log(np.clip(true_probability, LOG_LOSS_EPS, 1.0)).sum()
+        self.n_samples += len(true_index)
+
+    def result(self):
+        """
+        Returns:
+            dict: accuracy, log_loss, n_samples and the confusion matrix (rows are true classes).
+        """
+        if self.n_samples == 0:
+            return {'accuracy': None, 'log_loss': None, 'n_samples': 0, 'confusion_matrix': self.confusion.tolist()}
+        return {
+            'accuracy': float(np.trace(self.confusion) / self.n_samples),
+            'log_loss': float(self.log_loss_sum / self.n_samples),
+            'n_samples': int(self.n_samples),
+            'confusion_matrix': self.confusion.tolist(),
+        }
+
+
+def as_chunk_source(source, chunk_size=50000):
+    """
+    Turns a stage path into a callable returning a fresh chunk iterator; callables are returned as is.
+
+    Args:
+        source (str or callable): Feature store stage (Feather, Parquet or CSV) or chunk factory.
+        chunk_size (int, optional): Rows per chunk when reading a stage. Defaults to 50000.
+
+    Returns:
+        callable: Chunk factory.
+    """
+    if callable(source):
+        return source
+    return lambda: iter_stage_chunks(source, chunk_size=chunk_size)
+
+
+def evaluate_streaming(estimator, chunk_source, target_column, test_size=0.2, holdout=True,
+                       classes=STREAMING_CLASSES):
+    """
+    Evaluates a fitted estimator chunk by chunk.
+
+    Args:
+        estimator: Fitted estimator with predict_proba.
+        chunk_source (callable): Returns a fresh iterator of DataFrame chunks.
+        target_column (str): Name of the label column.
+        test_size (float, optional): Fraction of rows held out during training. Defaults to 0.2.
+        holdout (bool, optional): Score the holdout rows (True) or the training rows. Defaults to True.
+        classes (tuple, optional): Class labels. Defaults to STREAMING_CLASSES.
+
+    Returns:
+        dict: See StreamingMetrics.result.
+    """
+    metrics = StreamingMetrics(classes)
+    positions = np.searchsorted(metrics.classes, estimator.classes_)
+    for X, y in iter_labelled_chunks(chunk_source, target_column, test_size, holdout=holdout):
+        probabilities = np.zeros((len(y), len(metrics.classes)))
+        probabilities[:, positions] = estimator.predict_proba(X)
+        metrics.update(y, probabilities)
+    return metrics.result()
+
+
+def fit_streaming(model, chunk_source, target_column, epochs=5, test_size=0.2, classes=STREAMING_CLASSES,
+                  random_state=42):
+    """
+    Fits an estimator with partial_fit, one chunk at a time.
+
+    A first pass fits a StandardScaler incrementally on the training rows; every epoch then feeds
+    the scaled chunks, shuffled within the chunk, to partial_fit. Only one chunk is in memory at a time.
+
+    Args:
+        model: Unfitted estimator supporting partial_fit.
+        chunk_source (callable): Returns a fresh iterator of DataFrame chunks.
+        target_column (str): Name of the label column.
+        epochs (int, optional): Passes over the training rows. Defaults to 5.
+        test_size (float, optional): Fraction of rows held out. Defaults to 0.2.
+        classes (tuple, optional): Class labels. Defaults to STREAMING_CLASSES.
+        random_state (int, optional): Seed of the within-chunk shuffling. Defaults to 42.
+
+    Returns:
+        Pipeline: The fitted scaler and estimator.
+    """
+    if not hasattr(model, 'partial_fit'):
+        raise TypeError(f"{type(model).__name__} does not support partial_fit and cannot be trained in streaming mode.")
+
+    scaler = StandardScaler()
+    for X, _ in iter_labelled_chunks(chunk_source, target_column, test_size):
+        scaler.partial_fit(X)
+    if not hasattr(scaler, 'mean_'):
+        raise ValueError("The chunk source yielded no training rows.")
+
+    estimator = clone(model)
+    rng = np.random.default_rng(random_state)
+    for _ in range(epochs):
+        for X, y in iter_labelled_chunks(chunk_source, target_column, test_size):
+            order = rng.permutation(len(y))
+            estimator.partial_fit(scaler.transform(X)[order], y[order], classes=np.asarray(classes))
+    return Pipeline([('scaler', scaler), ('model', estimator)])
@@ -1,9 +1,9 @@
 # src/models/svm.py
 
-from sklearn.svm import SVC
 from .base_model import BaseModel
 
 def get_svm_model():
+    from sklearn.svm import SVC
     model = SVC(random_state=42)
     param_grid = {
         'C': [0.1, 1, 10, 100],
@@ -1,9 +1,9 @@
 # src/models/xgboost_model.py
 
-from xgboost import XGBClassifier
 from .base_model import BaseModel
 
 def get_xgboost_model():
+    from xgboost import XGBClassifier
     model = XGBClassifier(random_state=42, use_label_encoder=False, eval_metric='mlogloss')
     param_grid = {
         'n_estimators': [100, 200, 300],
@@ -13,4 +13,4 @@ def get_xgboost_model():
         'colsample_bytree': [0.7, 0.8, 1.0]
     }
     model_name = 'xgboost'
-    return BaseModel(model, param_grid, model_name)
+    return BaseModel(model, param_grid, model_name, search_strategy='halving_grid')
@@ -0,0 +1,361 @@
+# src/pipeline/backtest.py
+
+import ast
+import hashlib
+import json
+import os
+import time
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from joblib import Parallel, delayed, cpu_count
+from sklearn.base import clone
+from threadpoolctl import threadpool_limits
+from src.models.cache import hash_dataset
+from src.models.streaming import LOG_LOSS_EPS
+from src.pipeline.scheduler import limit_estimator_threads
+from src.utils.preprocess import TARGET_MAPPING, Preprocessor
+
+
+BACKTEST_CACHE_DIR = os.path.join('models', 'cache', 'backtest')
+REPORTS_DIR = os.path.join('outputs', 'reports')
+BACKTEST_MODES = ('retrain', 'incremental')
+
+
+def round_steps(df, season_column='Season', week_column='Week'):
+    """
+    Orders the matches in time by season and round.
+
+    Args:
+        df (pd.DataFrame): Matches with 'Season' (e.g. '20/21') and 'Week' (e.g. 'Round 7') columns.
+        season_column (str, optional): Season column. Defaults to 'Season'.
+        week_column (str, optional): Round column. Defaults to 'Week'.
+
+    Returns:
+        np.ndarray: One integer per row, season start year * 100 + round number.
+    """
+    season_start = df[season_column].astype(str).str.split('/').str[0].astype(int)
+    week = df[week_column].astype(str).str.extract(r'(\d+)', expand=False).astype(int)
+    return (season_start * 100 + week).to_numpy()
+
+
+def walk_forward_folds(steps, min_train_rounds=38, rounds_per_fold=1):
+    """
+    Splits the rounds into walk-forward folds: every fold tests on the next block of rounds and
+    trains on all rounds before it (an expanding window).
+
+    Args:
+        steps (np.ndarray): Round step of every row (see round_steps).
+        min_train_rounds (int, optional): Rounds in the first training window. Defaults to 38 (a season).
+        rounds_per_fold (int, optional): Rounds tested per fold. Defaults to 1.
+
+    Returns:
+        list: (first test step, test steps) per fold, in time order.
+    """
+    unique_steps = np.unique(steps)
+    return [(unique_steps[start], unique_steps[start:start + rounds_per_fold])
+            for start in range(min_train_rounds, len(unique_steps), rounds_per_fold)]
+
+
+def _parse_param(value):
+    """
+    Restores a hyperparameter value read back from a best-hyperparameters CSV.
+    """
+    if isinstance(value, str):
+        try:
+            return ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            return value
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def load_best_params(model_name, reports_dir=REPORTS_DIR):
+    """
+    Reads the latest best hyperparameters saved by BaseModel.save_hyperparameters.
+
+    Args:
+        model_name (str): Model name.
+        reports_dir (str, optional): Directory of the reports. Defaults to 'outputs/reports'.
+
+    Returns:
+        dict: Hyperparameters, empty if the model has not been tuned yet.
+    """
+    path = os.path.join(reports_dir, f"{model_name}_best_hyperparameters.csv")
+    if not os.path.isfile(path):
+        return {}
+    row = pd.read_csv(path).iloc[-1].drop(['recorded_at', 'best_score'], errors='ignore')
+    return {name: _parse_param(value) for name, value in row.items()}
+
+
+def backtest_estimators(models, use_best_params=True):
+    """
+    Builds the estimators to backtest from BaseModel instances.
+
+    Backtests refit every model many times, so the hyperparameter search is not repeated: the best
+    hyperparameters saved by the last training run are used (or the estimator defaults). Estimators
+    with a 'probability' switch (SVC) get it enabled, so every model reports a log loss.
+
+    Args:
+        models (list): BaseModel instances.
+        use_best_params (bool, optional): Apply the saved best hyperparameters. Defaults to True.
+
+    Returns:
+        dict: Model name to unfitted estimator.
+    """
+    estimators = {}
+    for model in models:
+        estimator = clone(model.model)
+        params = estimator.get_params(deep=False)
+        if use_best_params:
+            estimator.set_params(**{name: value for name, value in load_best_params(model.model_name).items()
+                                    if name in params})
+        if 'probability' in params:
+            estimator.set_params(probability=True)
+        estimators[model.model_name] = estimator
+    return estimators
+
+
+def fold_cache_key(dataset_hash, estimator, test_step, mode):
+    """
+    Returns the cache key of a model fitted for one fold.
+
+    Args:
+        dataset_hash (str): Hash of the backtested data.
+        estimator: The unfitted estimator.
+        test_step (int): First round step of the fold.
+        mode (str): Backtest mode, with the walk settings for incremental runs.
+
+    Returns:
+        str: Hex digest.
+    """
+    payload = json.dumps({
+        'data': dataset_hash,
+        'class': type(estimator).__qualname__,
+        'params': {name: repr(value) for name, value in estimator.get_params().items()},
+        'step': int(test_step),
+        'mode': mode,
+        'sklearn': sklearn.__version__,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _class_probabilities(estimator, X):
+    """
+    Returns H/D/A probabilities in target-code order; models without predict_proba give one-hot rows.
+    """
+    probabilities = np.zeros((len(X), len(TARGET_MAPPING)))
+    if hasattr(estimator, 'predict_proba'):
+        probabilities[:, np.asarray(estimator.classes_, dtype=int)] = estimator.predict_proba(X)
+    else:
+        probabilities[np.arange(len(X)), np.asarray(estimator.predict(X), dtype=int)] = 1.0
+    return probabilities
+
+
+def _load_or_fit(estimator, X, y, cache_path):
+    if cache_path is not None and os.path.isfile(cache_path):
+        return joblib.load(cache_path)
+    fitted = clone(estimator).fit(X, y)
+    if cache_path is not None:
+        joblib.dump(fitted, cache_path)
+    return fitted
+
+
+def _split_fold(df, steps, test_steps, target_column, preprocessor=None):
+    """
+    Fits the preprocessing on the rows before the fold (unless given) and transforms both parts.
+    """
+    train_mask = steps < test_steps[0]
+    test_mask = np.isin(steps, test_steps)
+    if preprocessor is None:
+        preprocessor = Preprocessor(target_column=target_column).fit(df[train_mask])
+    y = df[target_column].map(TARGET_MAPPING).to_numpy()
+    return (preprocessor.transform(df[train_mask]), y[train_mask], preprocessor.transform(df[test_mask]),
+            y[test_mask], np.flatnonzero(test_mask))
+
+
+def _run_retrain_fold(df, steps, test_steps, estimators, target_column, cache_paths, inner_threads):
+    """
+    Fits every model on the rows before the fold and predicts the fold. Runs inside a worker process.
+    """
+    start = time.perf_counter()
+    X_train, y_train, X_test, _, rows = _split_fold(df, steps, test_steps, target_column)
+    probabilities = {}
+    with threadpool_limits(limits=inner_threads):
+        for name, estimator in estimators.items():
+            estimator = limit_estimator_threads(clone(estimator), inner_threads)
+            probabilities[name] = _class_probabilities(_load_or_fit(estimator, X_train, y_train, cache_paths[name]),
+                                                       X_test)
+    return rows, probabilities, time.perf_counter() - start
+
+
+def _run_incremental_model(df, steps, folds, estimator, target_column, cache_paths, inner_threads):
+    """
+    Walks one model through all folds, updating it with partial_fit on every new round instead of
+    refitting. Estimators without partial_fit are refitted per fold. The preprocessing is fitted
+    once on the first training window. Runs inside a worker process.
+    """
+    start = time.perf_counter()
+    first_train = steps < folds[0][0]
+    preprocessor = Preprocessor(target_column=target_column).fit(df[first_train])
+    classes = np.arange(len(TARGET_MAPPING))
+    fitted = None
+    results = []
+    with threadpool_limits(limits=inner_threads):
+        estimator = limit_estimator_threads(clone(estimator), inner_threads)
+        incremental = hasattr(estimator, 'partial_fit')
+        for index, (test_step, test_steps) in enumerate(folds):
+            X_train, y_train, X_test, _, rows = _split_fold(df, steps, test_steps, target_column, preprocessor)
+            cache_path = cache_paths[index]
+            if cache_path is not None and os.path.isfile(cache_path):
+                fitted = joblib.load(cache_path)
+            elif not incremental:
+                fitted = _load_or_fit(estimator, X_train, y_train, cache_path)
+            else:
+                if fitted is None:
+                    fitted = clone(estimator)
+                    fitted.partial_fit(X_train, y_train, classes=classes)
+                else:
+                    # Only the rounds added since the previous fold
+                    new_rows = steps[steps < test_step] >= folds[index - 1][0]
+                    fitted.partial_fit(X_train[new_rows], y_train[new_rows], classes=classes)
+                if cache_path is not None:
+                    joblib.dump(fitted, cache_path)
+            results.append((rows, _class_probabilities(fitted, X_test)))
+    return results, time.perf_counter() - start
+
+
+def round_metrics(predictions, by=('Season', 'Week')):
+    """
+    Computes accuracy and log loss per model (and round) from the backtest predictions.
+
+    Args:
+        predictions (pd.DataFrame): One row per (model, match) with 'Model', 'Step', 'Season', 'Week',
+            'y_true' and 'P_H', 'P_D', 'P_A' columns.
+        by (tuple, optional): Columns to group by besides the model; () gives one row per model.
+            Defaults to ('Season', 'Week').
+
+    Returns:
+        pd.DataFrame: Model, the grouping columns, Matches, Accuracy and LogLoss, in time order.
+    """
+    probabilities = predictions[['P_H', 'P_D', 'P_A']].to_numpy()
+    y_true = predictions['y_true'].to_numpy()
+    true_probability = probabilities[np.arange(len(y_true)), y_true]
+    keys = ['Model', 'Step', *by] if by else ['Model']
+    scored = predictions[keys].assign(
+        Correct=(probabilities.argmax(axis=1) == y_true).astype(float),
+        Loss=-np.log(np.clip(true_probability, LOG_LOSS_EPS, 1.0)),
+    )
+    metrics = scored.groupby(keys, sort=True).agg(
+        Matches=('Correct', 'size'), Accuracy=('Correct', 'mean'), LogLoss=('Loss', 'mean')).reset_index()
+    return metrics.drop(columns='Step', errors='ignore')
+
+
+def walk_forward_backtest(df, models, min_train_rounds=38, rounds_per_fold=1, mode='retrain', n_jobs=-1,
+                          inner_threads=1, use_cache=True, cache_dir=BACKTEST_CACHE_DIR,
+                          target_column='MatchOutcome', use_best_params=True, reports_dir=REPORTS_DIR):
+    """
+    Backtests models the way they are deployed: every round is predicted by models trained only on
+    the rounds before it.
+
+    Unlike the random train_test_split of run_pipeline, no later round (and none of its Last5/Last10
+    form features) reaches the training data of an earlier one. The preprocessing is fitted on each
+    training window as well.
+
+    Modes:
+        'retrain': Every fold refits every model from scratch. Folds are independent and run in
+            parallel, each fold training all models on one transformed copy of its data.
+        'incremental': Models with partial_fit (naive Bayes, SGD logistic regression, MLP) are updated
+            with each new round instead of refitted; the models run in parallel.
+
+    Every fitted fold model is cached under cache_dir, so an interrupted or repeated backtest only fits
+    what is missing.
+
+    Args:
+        df (pd.DataFrame): Combined data in the 'all_seasons_final.csv' layout (with Season and Week).
+        models (list): BaseModel instances to backtest.
+        min_train_rounds (int, optional): Rounds in the first training window. Defaults to 38.
+        rounds_per_fold (int, optional): Rounds predicted per fold. Defaults to 1.
+        mode (str, optional): 'retrain' or 'incremental'. Defaults to 'retrain'.
+        n_jobs (int, optional): Worker processes (-1 for all cores). Defaults to -1.
+        inner_threads (int, optional): Threads each worker's estimators may use. Defaults to 1.
+        use_cache (bool, optional): Reuse and store fitted fold models. Defaults to True.
+        cache_dir (str, optional): Fold model cache. Defaults to 'models/cache/backtest'.
+        target_column (str, optional): Target column. Defaults to 'MatchOutcome'.
+        use_best_params (bool, optional): Use the saved best hyperparameters. Defaults to True.
+        reports_dir (str, optional): Where the reports are written (None to skip). Defaults to 'outputs/reports'.
+
+    Returns:
+        tuple: (per-round metrics, per-model summary) DataFrames.
+    """
+    if mode not in BACKTEST_MODES:
+        raise ValueError(f"Unknown backtest mode '{mode}'. Choose one of {BACKTEST_MODES}.")
+    df = df.reset_index(drop=True)
+    steps = round_steps(df)
+    folds = walk_forward_folds(steps, min_train_rounds, rounds_per_fold)
+    if not folds:
+        raise ValueError(f"Only {len(np.unique(steps))} rounds available; need more than {min_train_rounds}.")
+    estimators = backtest_estimators(models, use_best_params)
+    n_jobs = cpu_count() if n_jobs is None or n_jobs < 0 else n_jobs
+
+    dataset_hash = hash_dataset(df)
+    if use_cache:
+        os.makedirs(cache_dir, exist_ok=True)
+
+    # Incremental models also depend on where the walk started and how the rounds were grouped
+    cache_mode = mode if mode == 'retrain' else f"{mode}:{min_train_rounds}:{rounds_per_fold}"
+
+    def cache_path(estimator, test_step):
+        if not use_cache:
+            return None
+        return os.path.join(cache_dir, f"{fold_cache_key(dataset_hash, estimator, test_step, cache_mode)}.pkl")
+
+    print(f"Backtesting {len(estimators)} models over {len(folds)} folds ({mode}) on {n_jobs} workers.")
+    start = time.perf_counter()
+    # Each entry: (model name, row positions, probabilities)
+    predicted = []
+    if mode == 'retrain':
+        outputs = Parallel(n_jobs=n_jobs)(
+            delayed(_run_retrain_fold)(df, steps, test_steps, estimators, target_column,
+                                       {name: cache_path(estimator, test_step) for name, estimator in estimators.items()},
+                                       inner_threads)
+            for test_step, test_steps in folds
+        )
+        busy = sum(output[2] for output in outputs)
+        for rows, probabilities, _ in outputs:
+            predicted.extend((name, rows, result) for name, result in probabilities.items())
+    else:
+        outputs = Parallel(n_jobs=min(n_jobs, len(estimators)))(
+            delayed(_run_incremental_model)(df, steps, folds, estimator, target_column,
+                                            [cache_path(estimator, test_step) for test_step, _ in folds], inner_threads)
+            for estimator in estimators.values()
+        )
+        busy = sum(output[1] for output in outputs)
+        for name, (results, _) in zip(estimators, outputs):
+            predicted.extend((name, rows, result) for rows, result in results)
+    elapsed = time.perf_counter() - start
+
+    rows = np.concatenate([rows for _, rows, _ in predicted])
+    probabilities = np.vstack([result for _, _, result in predicted])
+    predictions = pd.DataFrame({
+        'Model': np.repeat([name for name, _, _ in predicted], [len(r) for _, r, _ in predicted]),
+        'Season': df['Season'].to_numpy()[rows],
+        'Week': df['Week'].to_numpy()[rows],
+        'Step': steps[rows],
+        'y_true': df[target_column].map(TARGET_MAPPING).to_numpy()[rows],
+        'P_H': probabilities[:, 0], 'P_D': probabilities[:, 1], 'P_A': probabilities[:, 2],
+    })
+    per_round = round_metrics(predictions)
+    summary = round_metrics(predictions, by=())
+    summary['Rounds'] = per_round.groupby('Model').size().reindex(summary['Model']).to_numpy()
+
+    print(summary.to_string(index=False))
+    print(f"Backtest finished in {elapsed:.1f}s (sum of worker time: {busy:.1f}s).")
+    if reports_dir is not None:
+        os.makedirs(reports_dir, exist_ok=True)
+        per_round.to_csv(os.path.join(reports_dir, 'backtest_rounds.csv'), index=False)
+        summary.to_csv(os.path.join(reports_dir, 'backtest_summary.csv'), index=False)
+        print(f"Backtest reports saved to {reports_dir}/backtest_rounds.csv and backtest_summary.csv.")
+    return per_round, summary
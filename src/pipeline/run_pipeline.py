@@ -3,80 +3,155 @@
 import os
 import pandas as pd
 from src.utils.load_data import load_raw_data
-from src.utils.preprocess import preprocess_data
-from src.models.random_forest import get_random_forest_model
-from src.models.svm import get_svm_model
-from src.models.gradient_boosting import get_gradient_boosting_model
-from src.models.xgboost_model import get_xgboost_model
-from src.models.lightgbm_model import get_lightgbm_model
-from src.models.catboost_model import get_catboost_model
-from src.models.knn import get_knn_model
-from src.models.logistic_regression import get_logistic_regression_model
-from src.models.mlp import get_mlp_model
-from src.models.naive_bayes import get_naive_bayes_model
-from src.utils.evaluate_model import evaluate_models
+from src.utils.preprocess import fit_preprocessing, split_data
+from src.models import registry
+from src.models.cache import TrainingCache
+from src.models.folds import use_fold_cache
+from src.pipeline.scheduler import TrainingScheduler
+from src.utils.evaluation import evaluate_saved_models
 from src.utils.compare_models import compare_models
 from src.utils.feature_importance import feature_importance_analysis
-from sklearn.model_selection import train_test_split
+from src.utils.feature_store import write_stage
 
 
-def run_pipeline():
+TARGET_COLUMN = 'MatchOutcome'
+FINAL_DATA_PATH = os.path.join('data', 'processed', 'final', 'all_seasons_final.csv')
+CLEANED_DATA_PATH = os.path.join('data', 'processed', 'final', 'cleaned')
+
+
+def get_models(model_names=None, time_budgets=None):
+    """
+    Returns the models trained by the pipeline, from the model registry (see src/models/registry.py).
+
+    Args:
+        model_names (list, optional): Models to build, or ['all']. Defaults to registry.DEFAULT_MODELS.
+        time_budgets (dict, optional): Model name to search time budget in seconds.
+
+    Returns:
+        list: BaseModel instances.
+    """
+    return registry.get_models(model_names, time_budgets)
+
+
+def train_models(models, X_train, y_train, use_cache=True, n_workers=None, inner_threads=1, warm_start=False,
+                 compress=0):
+    """
+    Trains and saves the given models, either one after another or together with the TrainingScheduler.
+
+    Args:
+        models (list): BaseModel instances.
+        X_train (pd.DataFrame): Training features.
+        y_train (pd.Series): Training labels.
+        use_cache (bool, optional): Reuse models and CV folds cached under 'models/cache'. Defaults to True.
+        n_workers (int, optional): Train with the TrainingScheduler using this many workers.
+        inner_threads (int, optional): Threads each scheduled task may use. Defaults to 1.
+        warm_start (bool, optional): Resume each model's search from its CV ledger. Defaults to False.
+        compress (int, optional): zlib level of the saved joblib artifacts. Defaults to 0 (uncompressed).
+    """
+    cache = TrainingCache() if use_cache else None
+    if use_cache:
+        use_fold_cache()
+    if n_workers is not None:
+        scheduler = TrainingScheduler(n_workers=n_workers, inner_threads=inner_threads, warm_start=warm_start)
+        scheduler.run(models, X_train, y_train, cache=cache)
+        for model in models:
+            model.save_model(compress=compress)
+            model.save_hyperparameters(append=warm_start)
+        print("All models trained and saved.\n")
+    else:
+        for model in models:
+            print(f"Training {model.model_name} model...")
+            model.train(X_train, y_train, cache=cache, warm_start=warm_start)
+            model.save_model(compress=compress)
+            model.save_hyperparameters(append=warm_start)
+            print(f"{model.model_name} model trained and saved.\n")
+
+
+def report_models(model_names, X_test, y_test, plot=True):
+    """
+    Evaluates the saved models on the test set, compares them and analyses their feature importance.
+
+    Args:
+        model_names (list): Names of the saved models.
+        X_test (pd.DataFrame): Test features.
+        y_test (pd.Series): Test labels.
+        plot (bool, optional): Draw the figures; without them matplotlib is never imported. Defaults to True.
+    """
+    # Model Evaluation
+    print("Evaluating models...")
+    evaluate_saved_models(model_names, X_test, y_test, plot=plot)
+    print("Model evaluation completed.")
+
+    # Model Comparison
+    print("Comparing models...")
+    compare_models(model_names, plot=plot)
+    print("Model comparison completed.")
+
+    if not plot:
+        return
+
+    # Feature Importance Analysis
+    print("Performing feature importance analysis...")
+    feature_importance_analysis(model_names)
+    print("Feature importance analysis completed.")
+
+
+def run_pipeline(search_strategy=None, max_fits=None, time_budget=None, use_cache=True,
+                 n_workers=None, inner_threads=1, warm_start=False, plot=True, models=None, time_budgets=None,
+                 compress=0):
     """
     Executes the machine learning pipeline, which includes data loading, preprocessing,
     model training with hyperparameter tuning, evaluation, comparison, and feature importance analysis.
+
+    The data is read from the combined 'all_seasons_final.csv'; see src/pipeline/stages.py to rebuild
+    it from the raw season files.
+
+    Args:
+        search_strategy (str, optional): Overrides every model's hyperparameter search strategy
+            ('grid', 'halving_grid', 'halving_random' or 'optuna'). Defaults to each model's own setting.
+        max_fits (int, optional): Fit budget applied to every model's search.
+        time_budget (float, optional): Wall-clock budget in seconds applied to every model's search.
+        use_cache (bool, optional): Reuse models cached under 'models/cache' when the training data and
+            configuration are unchanged. Defaults to True.
+        n_workers (int, optional): When set, all models are trained together by the TrainingScheduler
+            with this many workers (-1 for all cores) instead of one after another.
+        inner_threads (int, optional): Threads each scheduled task may use. Defaults to 1.
+        warm_start (bool, optional): Only evaluate grid candidates missing from each model's CV ledger,
+            and append the best hyperparameters to the reports instead of overwriting them.
+        plot (bool, optional): Draw the evaluation figures. Defaults to True.
+        models (list, optional): Registered models to train and evaluate, or ['all']. Defaults to
+            registry.DEFAULT_MODELS.
+        time_budgets (dict, optional): Per-model search time budgets in seconds; they take precedence
+            over time_budget.
+        compress (int, optional): zlib level of the saved joblib artifacts; 0 keeps them uncompressed
+            and memory-mappable. Defaults to 0.
     """
+    # Unknown model names fail before any data is loaded
+    registry.resolve_model_names(models)
+    registry.resolve_model_names(list(time_budgets or {}))
+
     # 1. Data Loading
-    raw_data_path = r"C:\Users\mbaki\Desktop\Proje\data\processed\final\all_seasons_final.csv"
-    df_raw = load_raw_data(raw_data_path)
+    df_raw = load_raw_data(FINAL_DATA_PATH)
     print("Raw data loaded successfully.")
 
-    # 2. Data Preprocessing
-    df_processed = preprocess_data(df_raw, target_column='MatchOutcome')
-    processed_data_path = r"C:\Users\mbaki\Desktop\Proje\data\processed\final\cleaned.csv"
-    df_processed.to_csv(processed_data_path, index=False)
+    # 2. Data Preprocessing (fitted on the training split, saved with the models)
+    df_processed = fit_preprocessing(df_raw)
+    write_stage(df_processed, CLEANED_DATA_PATH)
     print("Data preprocessing completed and saved.")
 
     # 3. Data Splitting
-    X = df_processed.drop('MatchOutcome', axis=1)
-    y = df_processed['MatchOutcome']
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42, stratify=y
-    )
+    X_train, X_test, y_train, y_test = split_data(df_processed)
     print("Data split into training and testing sets.")
 
     # 4. Model Definition
-    models = [
-        get_random_forest_model(),
-        get_svm_model(),
-        get_catboost_model(),
-        get_knn_model(),
-        get_logistic_regression_model(),
-        get_mlp_model(),
-        get_naive_bayes_model(),
-    ]
+    models = get_models(models)
+    for model in models:
+        model.configure_search(search_strategy, max_fits, (time_budgets or {}).get(model.model_name, time_budget))
     print("Models have been defined.")
 
     # 5. Model Training and Saving
-    for model in models:
-        print(f"Training {model.model_name} model...")
-        model.train(X_train, y_train)
-        model.save_model()
-        model.save_hyperparameters()
-        print(f"{model.model_name} model trained and saved.\n")
-
-    # 6. Model Evaluation
-    print("Evaluating models...")
-    model_names = [model.model_name for model in models]
-    evaluate_models(X_test, y_test, model_names)
-    print("Model evaluation completed.")
-
-    # 7. Model Comparison
-    print("Comparing models...")
-    compare_models()
-    print("Model comparison completed.")
-
-    # 8. Feature Importance Analysis
-    print("Performing feature importance analysis...")
-    feature_importance_analysis()
-    print("Feature importance analysis completed.")
+    train_models(models, X_train, y_train, use_cache=use_cache, n_workers=n_workers,
+                 inner_threads=inner_threads, warm_start=warm_start, compress=compress)
 
+    # 6-8. Model Evaluation, Comparison and Feature Importance Analysis
+    report_models([model.model_name for model in models], X_test, y_test, plot=plot)
@@ -0,0 +1,380 @@
+# src/pipeline/scheduler.py
+
+import os
+import time
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, cpu_count, parallel_config
+from sklearn.base import clone
+from sklearn.model_selection import ParameterGrid, ParameterSampler
+from threadpoolctl import threadpool_limits
+from src.models.folds import FoldManager, check_fit_failures, default_fold_manager, fit_and_score_fold
+from src.models.ledger import CVLedger, build_cv_results, hash_estimator_config, hash_splits, params_key
+from src.models.search import SearchResult, estimate_fits_for_time_budget, run_search
+
+
+# Estimator parameters that control a library's own thread pool
+THREAD_PARAMS = ('n_jobs', 'thread_count', 'nthread')
+
+# Thread parameters of estimators whose get_params() only lists the parameters passed explicitly
+# (CatBoost), so a default thread count would not be found and capped; threadpoolctl does not
+# govern these libraries' own pools
+ESTIMATOR_THREAD_PARAMS = {
+    'CatBoostClassifier': 'thread_count',
+}
+
+# Relative cost of a single fit, used only to order the task queue (most expensive first)
+COST_WEIGHTS = {
+    'CatBoostClassifier': 6.0,
+    'GradientBoostingClassifier': 6.0,
+    'SVC': 4.0,
+    'MLPClassifier': 4.0,
+    'XGBClassifier': 3.0,
+    'LGBMClassifier': 2.0,
+    'RandomForestClassifier': 2.0,
+    'LogisticRegression': 1.0,
+    'KNeighborsClassifier': 0.5,
+    'GaussianNB': 0.1,
+}
+
+
+def limit_estimator_threads(estimator, n_threads):
+    """
+    Sets the thread-count parameters an estimator exposes (n_jobs, thread_count, nthread), and the
+    one of ESTIMATOR_THREAD_PARAMS for its class even when get_params() does not list it.
+
+    Args:
+        estimator: The estimator to configure (modified in place).
+        n_threads (int): Number of threads the estimator may use.
+
+    Returns:
+        The same estimator.
+    """
+    params = estimator.get_params(deep=False)
+    names = {name for name in THREAD_PARAMS if name in params}
+    if type(estimator).__name__ in ESTIMATOR_THREAD_PARAMS:
+        names.add(ESTIMATOR_THREAD_PARAMS[type(estimator).__name__])
+    estimator.set_params(**{name: n_threads for name in names})
+    return estimator
+
+
+def estimate_fit_cost(estimator, params):
+    """
+    Estimates the relative cost of fitting an estimator with the given parameters.
+
+    Args:
+        estimator: The base estimator.
+        params (dict): Candidate hyperparameters.
+
+    Returns:
+        float: Relative cost (only meaningful for ordering tasks).
+    """
+    weight = COST_WEIGHTS.get(type(estimator).__name__, 1.0)
+    merged = {**estimator.get_params(deep=False), **params}
+    n_rounds = merged.get('n_estimators') or merged.get('iterations') or 100
+    return weight * n_rounds / 100
+
+
+def allocate_search_threads(search_costs, other_cost, n_workers):
+    """
+    Splits the worker budget between adaptive searches in proportion to their estimated cost.
+
+    Every search gets at least one thread; the others go to the most expensive searches first,
+    without giving out more than n_workers in total (unless there are more searches than workers).
+
+    Args:
+        search_costs (list): Estimated cost of every adaptive search.
+        other_cost (float): Estimated cost of all other tasks (grid folds), which keep their share.
+        n_workers (int): Total number of workers.
+
+    Returns:
+        list: Threads of every search, in the order of search_costs.
+    """
+    total = sum(search_costs) + other_cost
+    threads = [max(1, int(n_workers * cost / total)) if total > 0 else 1 for cost in search_costs]
+    # Rounding up small searches to one thread can exceed the budget; take it back from the largest
+    while sum(threads) > max(n_workers, len(threads)):
+        threads[int(np.argmax(threads))] -= 1
+    return threads
+
+
+def _fit_and_score(estimator, params, fold_arrays, scoring, inner_threads):
+    """
+    Fits one candidate on one fold's (memory-mapped) arrays and scores it on the held-out part.
+    Runs inside a worker process.
+    """
+    with threadpool_limits(limits=inner_threads):
+        return fit_and_score_fold(limit_estimator_threads(clone(estimator), inner_threads), params, *fold_arrays,
+                                  scoring)
+
+
+def _refit(estimator, params, X, y, inner_threads):
+    """
+    Fits the best candidate on the full training data. Runs inside a worker process.
+    """
+    start = time.perf_counter()
+    with threadpool_limits(limits=inner_threads):
+        model = limit_estimator_threads(clone(estimator).set_params(**params), inner_threads)
+        model.fit(X, y)
+    return model, time.perf_counter() - start
+
+
+def _run_whole_search(base_model, X, y, cv, scoring, inner_threads, n_threads=1):
+    """
+    Runs an adaptive search (halving or Optuna) as a single task. Runs inside a worker process.
+
+    The search fits n_threads candidates at a time on threads of the worker (every fit keeps the
+    inner_threads limit), so a search holding a large share of the budget is not held to one core.
+    """
+    start = time.perf_counter()
+    with threadpool_limits(limits=inner_threads), parallel_config(backend='threading'):
+        estimator = limit_estimator_threads(clone(base_model.model), inner_threads)
+        search = run_search(base_model.search_strategy, estimator, base_model.param_grid, X, y, cv=cv,
+                            n_jobs=n_threads, verbose=0, scoring=scoring, max_fits=base_model.max_fits,
+                            time_budget=base_model.time_budget)
+    result = SearchResult(search.best_estimator_, search.best_params_, search.best_score_, search.cv_results_)
+    return result, time.perf_counter() - start
+
+
+class TrainingScheduler:
+    """
+    Trains several BaseModel instances as one pool of tasks under a single worker budget.
+
+    Models using the 'grid' strategy are split into (model, candidate, fold) tasks; adaptive
+    strategies (halving, Optuna) cannot be split up front and run as one task each, which evaluates
+    its candidates on a share of the worker budget proportional to its estimated cost (see
+    allocate_search_threads). The pool shrinks by the extra threads these searches hold. All tasks are
+    queued most expensive first, so long CatBoost/SVM fits start early and cheap fits fill the gaps
+    at the end. Library thread pools inside every task are capped to avoid oversubscription, and the
+    refits of the best candidates also run in the pool instead of one after another.
+
+    A grid model's time budget sizes its grid with a probe fit (as in run_search) and is enforced as
+    a deadline while the pool runs: tasks are handed to the workers as they free up, and once the
+    deadline has passed no new candidate of that model is dispatched (its first candidate always
+    runs). Candidates already dispatched finish all their folds, and the best candidate is chosen
+    among the scored ones.
+
+    With warm_start, grid candidates already recorded in a model's CV ledger for the same data, folds
+    and estimator configuration are not queued again; their ledger scores are merged back instead.
+
+    Attributes:
+        n_workers (int): Number of worker processes (-1 uses all cores).
+        inner_threads (int): Threads each task may use inside BLAS/OpenMP and the estimator itself.
+        cv (int or splitter): Cross-validation strategy.
+        scoring (str): Evaluation metric.
+        verbose (int): joblib verbosity level.
+        warm_start (bool): Reuse scores from the models' CV ledgers.
+        fold_manager (FoldManager): Source of the folds; fold tasks read the fold arrays it materialises.
+        report (pd.DataFrame, optional): Per-model timings of the last run.
+    """
+
+    def __init__(self, n_workers=-1, inner_threads=1, cv=5, scoring='accuracy', verbose=0, warm_start=False,
+                 fold_manager=None):
+        self.n_workers = cpu_count() if n_workers is None or n_workers < 0 else n_workers
+        self.inner_threads = inner_threads
+        self.cv = cv
+        self.scoring = scoring
+        self.verbose = verbose
+        self.warm_start = warm_start
+        if fold_manager is None:
+            fold_manager = default_fold_manager if cv == default_fold_manager.cv else FoldManager(cv=cv)
+        self.fold_manager = fold_manager
+        self.report = None
+
+    def _grid_candidates(self, base_model, X, y, splitter):
+        """
+        Returns the candidates of a grid-strategy model, sampled down to the model's fit budget
+        the same way run_search does.
+        """
+        n_splits = splitter.get_n_splits(X, y)
+        max_fits = base_model.max_fits
+        if base_model.time_budget is not None:
+            budget_fits = estimate_fits_for_time_budget(base_model.model, X, y, splitter,
+                                                        base_model.time_budget, self.n_workers)
+            max_fits = budget_fits if max_fits is None else min(max_fits, budget_fits)
+
+        candidates = list(ParameterGrid(base_model.param_grid))
+        if max_fits is not None and len(candidates) * n_splits > max_fits:
+            n_iter = max(1, max_fits // n_splits)
+            candidates = list(ParameterSampler(base_model.param_grid, n_iter=n_iter, random_state=42))
+        return candidates
+
+    def run(self, models, X_train, y_train, cache=None):
+        """
+        Trains all models and stores the fitted search on each model's grid_search attribute.
+
+        Args:
+            models (list): BaseModel instances to train.
+            X_train (pd.DataFrame or np.ndarray): Training feature data.
+            y_train (pd.Series or np.ndarray): Training target data.
+            cache (TrainingCache, optional): Training cache to read from and write to.
+
+        Returns:
+            pd.DataFrame: Per-model task counts and busy time, also saved to
+            'outputs/reports/training_schedule.csv'.
+        """
+        # The folds are computed and written once; tasks get the memory-mapped fold arrays by reference
+        splitter = self.fold_manager.get(X_train, y_train)
+        splits = splitter.splits
+        fold_arrays = [splitter.fold(fold) for fold in range(len(splits))]
+
+        cache_keys = {}
+        pending = []
+        for model in models:
+            if cache is not None:
+                cache_keys[model.model_name] = cache.make_key(model, X_train, y_train)
+                cached_search = cache.load(cache_keys[model.model_name])
+                if cached_search is not None:
+                    model.grid_search = cached_search
+                    print(f"Loaded {model.model_name} from the training cache.")
+                    continue
+            pending.append(model)
+
+        # Build the task queue: (cost, model index, kind, payload)
+        tasks = []
+        candidates = {}
+        scores = {}
+        ledger_hashes = {}
+        deadlines = {}
+        for index, model in enumerate(pending):
+            if model.search_strategy == 'grid':
+                if model.time_budget is not None:
+                    deadlines[index] = time.perf_counter() + model.time_budget
+                candidates[index] = self._grid_candidates(model, X_train, y_train, splitter)
+                scores[index] = np.full((len(candidates[index]), len(splits)), np.nan)
+                known = {}
+                if self.warm_start:
+                    ledger_hashes[index] = (splitter.dataset_hash, hash_splits(splits),
+                                            hash_estimator_config(model.model, model.param_grid))
+                    known = CVLedger(model.model_name).lookup(*ledger_hashes[index], n_splits=len(splits))
+                for cand_index, params in enumerate(candidates[index]):
+                    if params_key(params) in known:
+                        scores[index][cand_index] = known[params_key(params)]
+                        continue
+                    cost = estimate_fit_cost(model.model, params)
+                    for fold in range(len(splits)):
+                        tasks.append((cost, index, 'fold', (cand_index, fold, params)))
+            else:
+                max_fits = model.max_fits or len(ParameterGrid(model.param_grid)) * len(splits)
+                cost = estimate_fit_cost(model.model, {}) * max_fits
+                tasks.append((cost, index, 'search', None))
+        tasks.sort(key=lambda task: task[0], reverse=True)
+
+        # Searches are queued first (they are the most expensive tasks); the pool leaves room for the
+        # threads they hold beyond their own worker
+        searches = [task for task in tasks if task[2] == 'search']
+        threads = dict(zip([task[1] for task in searches], allocate_search_threads(
+            [task[0] for task in searches], sum(task[0] for task in tasks if task[2] == 'fold'), self.n_workers)))
+        n_jobs = max(1, self.n_workers - sum(n - 1 for n in threads.values()))
+
+        # Tasks are pulled from this generator as workers free up, so the deadline of a model is checked
+        # when its next candidate would be dispatched
+        dispatched = []
+        started = {index: set() for index in candidates}
+        skipped = {index: set() for index in candidates}
+
+        def dispatch():
+            for task in tasks:
+                _, index, kind, payload = task
+                if kind == 'fold' and index in deadlines and payload[0] not in started[index]:
+                    if started[index] and time.perf_counter() >= deadlines[index]:
+                        skipped[index].add(payload[0])
+                        continue
+                    started[index].add(payload[0])
+                dispatched.append(task)
+                if kind == 'fold':
+                    yield delayed(_fit_and_score)(pending[index].model, payload[2], fold_arrays[payload[1]],
+                                                  self.scoring, self.inner_threads)
+                else:
+                    yield delayed(_run_whole_search)(pending[index], X_train, y_train, splitter, self.scoring,
+                                                     self.inner_threads, threads[index])
+
+        print(f"Scheduling {len(tasks)} tasks for {len(pending)} models on {self.n_workers} workers.")
+        start = time.perf_counter()
+        outputs = Parallel(n_jobs=n_jobs, verbose=self.verbose,
+                           pre_dispatch='n_jobs' if deadlines else '2*n_jobs')(dispatch())
+
+        # Drop the candidates the deadline kept from being dispatched
+        for index, cand_indices in skipped.items():
+            if not cand_indices:
+                continue
+            print(f"Time budget of {pending[index].model_name} reached; {len(cand_indices)} of "
+                  f"{len(candidates[index])} candidates were not dispatched.")
+            keep = [cand_index for cand_index in range(len(candidates[index])) if cand_index not in cand_indices]
+            renumber = {old: new for new, old in enumerate(keep)}
+            candidates[index] = [candidates[index][cand_index] for cand_index in keep]
+            scores[index] = scores[index][keep]
+            dispatched = [(cost, task_index, kind, (renumber[payload[0]],) + payload[1:])
+                          if kind == 'fold' and task_index == index else (cost, task_index, kind, payload)
+                          for cost, task_index, kind, payload in dispatched]
+
+        busy = {index: 0.0 for index in range(len(pending))}
+        n_tasks = {index: 0 for index in range(len(pending))}
+        fit_times = {index: np.zeros((len(cands), len(splits))) for index, cands in candidates.items()}
+        # Fits taken from the ledger count as successful
+        fit_errors = {index: [None] * int(np.count_nonzero(~np.isnan(scores[index]))) for index in candidates}
+        for (_, index, kind, payload), output in zip(dispatched, outputs):
+            busy[index] += output[1]
+            n_tasks[index] += 1
+            if kind == 'fold':
+                cand_index, fold = payload[0], payload[1]
+                scores[index][cand_index, fold] = output[0]
+                fit_times[index][cand_index, fold] = output[1]
+                fit_errors[index].append(output[2])
+            else:
+                pending[index].grid_search = output[0]
+        for errors in fit_errors.values():
+            check_fit_failures(errors)
+
+        for index, hashes in ledger_hashes.items():
+            # Candidates scored in this run are the ones with recorded fit times
+            new_rows = [cand_index for cand_index in range(len(candidates[index])) if fit_times[index][cand_index].any()]
+            CVLedger(pending[index].model_name).append(*hashes, [candidates[index][i] for i in new_rows],
+                                                       scores[index][new_rows])
+
+        # Refit the best candidate of every grid model, again as one pool, most expensive first
+        best = {}
+        for index, cands in candidates.items():
+            mean_scores = scores[index].mean(axis=1)
+            # Failed candidates rank last; ties resolve to the first candidate, like GridSearchCV
+            best_index = int(np.argmax(np.where(np.isnan(mean_scores), -np.inf, mean_scores)))
+            best[index] = (best_index, cands[best_index])
+        refit_order = sorted(best, key=lambda i: estimate_fit_cost(pending[i].model, best[i][1]), reverse=True)
+        refits = Parallel(n_jobs=self.n_workers, verbose=self.verbose)(
+            delayed(_refit)(pending[index].model, best[index][1], X_train, y_train, self.inner_threads)
+            for index in refit_order
+        )
+        makespan = time.perf_counter() - start
+
+        refit_seconds = {index: 0.0 for index in range(len(pending))}
+        for index, (estimator, seconds) in zip(refit_order, refits):
+            refit_seconds[index] = seconds
+            best_index, best_params = best[index]
+            cv_results = build_cv_results(candidates[index], scores[index])
+            cv_results['mean_fit_time'] = fit_times[index].mean(axis=1)
+            pending[index].grid_search = SearchResult(estimator, best_params,
+                                                      float(cv_results['mean_test_score'][best_index]), cv_results)
+
+        for model in pending:
+            print(f"Best hyperparameters for {model.model_name}: {model.grid_search.best_params_}")
+            if cache is not None:
+                cache.store(cache_keys[model.model_name], model.grid_search, model_name=model.model_name)
+
+        self.report = pd.DataFrame({
+            'Model': [model.model_name for model in pending],
+            'Tasks': [n_tasks[index] for index in range(len(pending))],
+            'SearchThreads': [threads.get(index, 1) for index in range(len(pending))],
+            'BusySeconds': [busy[index] + refit_seconds[index] for index in range(len(pending))],
+            'RefitSeconds': [refit_seconds[index] for index in range(len(pending))],
+        })
+        sequential_estimate = self.report['BusySeconds'].sum()
+        print(self.report.to_string(index=False))
+        print(f"Makespan: {makespan:.1f}s on {self.n_workers} workers "
+              f"(sum of task times, i.e. a single-worker run: {sequential_estimate:.1f}s).")
+
+        reports_dir = os.path.join('outputs', 'reports')
+        os.makedirs(reports_dir, exist_ok=True)
+        report_path = os.path.join(reports_dir, 'training_schedule.csv')
+        self.report.assign(MakespanSeconds=makespan).to_csv(report_path, index=False)
+        print(f"Training schedule report saved to {report_path}.")
+        return self.report
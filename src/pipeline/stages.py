@@ -0,0 +1,434 @@
+# src/pipeline/stages.py
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from src.features.form import create_features_for_season
+from src.features.player_join import process_season
+from src.utils.feature_store import FILE_EXTENSIONS, pyarrow_available, read_stage, write_stage
+
+
+# Stages in execution order; ingest, player-join and feature run once per season
+STAGE_NAMES = ('ingest', 'player-join', 'feature', 'combine', 'preprocess', 'train', 'evaluate')
+
+# Raw files of a season, relative to data/raw/<season>/
+RAW_FILES = ('{season}.csv', '{season}_teams_and_players.csv', '{season}_marketvalue_and_age.csv')
+RAW_COLUMNS = (
+    ('Season', 'Week', 'Match Date', 'Home Team', 'Away Team', 'Home Goals', 'Away Goals',
+     'Home Players', 'Away Players'),
+    ('Team Name', 'Player Name', 'Player Rating'),
+    ('Team Name', 'Player Name', 'Age', 'Market Value'),
+)
+
+# Leading columns of the combined data, as in src/notebooks/feature_engineering_2.ipynb
+FINAL_LEADING_COLUMNS = ["Season", "Week", "Match Date", "Home Team", "Away Team", "Home Goals", "Away Goals",
+                         "MatchOutcome"]
+
+
+class Stage:
+    """
+    One step of the data pipeline, with the files it reads and the files it writes.
+
+    Attributes:
+        name (str): Stage name (one of STAGE_NAMES).
+        func (callable): Module-level function called as func(inputs, outputs, **options).
+        inputs (list): Input file paths.
+        outputs (list): Output file paths.
+        season (str): Season of a per-season stage, None otherwise.
+        options (dict): Extra keyword arguments for func.
+    """
+
+    def __init__(self, name, func, inputs, outputs, season=None, options=None):
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.season = season
+        self.options = options or {}
+
+    @property
+    def key(self):
+        """
+        Unique identifier of the stage, e.g. 'feature:23_24'.
+        """
+        return f"{self.name}:{self.season}" if self.season else self.name
+
+    @property
+    def options_hash(self):
+        """
+        SHA-256 of the stage's options (e.g. the search settings of the train stage).
+        """
+        payload = json.dumps(self.options, sort_keys=True, default=repr)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def run(self):
+        for path in self.outputs:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self.func(self.inputs, self.outputs, **self.options)
+
+
+def file_hash(path):
+    """
+    Computes the SHA-256 of a file's content.
+
+    Args:
+        path (str): File path.
+
+    Returns:
+        str: Hex digest.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def stage_file(path):
+    """
+    Returns the file write_stage produces for a stage path in this environment.
+    """
+    return path + FILE_EXTENSIONS['feather' if pyarrow_available() else 'csv']
+
+
+def discover_seasons(raw_dir, files=RAW_FILES):
+    """
+    Lists the seasons under raw_dir that have all three raw files.
+
+    Args:
+        raw_dir (str): Raw data directory (e.g. 'data/raw').
+        files (tuple, optional): File names required in a season directory, formatted with the
+            season. Defaults to RAW_FILES.
+
+    Returns:
+        list: Sorted season names (e.g. ['20_21', '21_22']).
+    """
+    if not os.path.isdir(raw_dir):
+        return []
+    seasons = []
+    for season in sorted(os.listdir(raw_dir)):
+        season_dir = os.path.join(raw_dir, season)
+        if all(os.path.isfile(os.path.join(season_dir, name.format(season=season))) for name in files):
+            seasons.append(season)
+    return seasons
+
+
+# --- Stage functions ---------------------------------------------------------------------------
+
+def ingest_season(inputs, outputs):
+    """
+    Validates the raw files of a season and writes a manifest with their columns, row counts and hashes.
+    """
+    manifest = {}
+    for path, required in zip(inputs, RAW_COLUMNS):
+        header = pd.read_csv(path, nrows=0, encoding='utf-8-sig').columns
+        missing = [column for column in required if column not in header]
+        if missing:
+            raise ValueError(f"{path} is missing the columns {missing}.")
+        with open(path, 'rb') as file:
+            rows = sum(1 for _ in file) - 1
+        manifest[os.path.basename(path)] = {'rows': rows, 'columns': list(header), 'sha256': file_hash(path)}
+    with open(outputs[0], 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, indent=2)
+
+
+def join_season(inputs, outputs, raw_dir, season):
+    """
+    Builds '<season>_processed.csv' from the raw files (see src/features/player_join.py).
+    """
+    process_season(raw_dir, season).to_csv(outputs[0], index=False)
+
+
+def feature_season(inputs, outputs):
+    """
+    Builds '<season>_featured.csv' from the processed season (see src/features/form.py).
+    """
+    create_features_for_season(pd.read_csv(inputs[0])).to_csv(outputs[0], index=False)
+
+
+def drop_merge_suffixes(df):
+    """
+    Removes the Season_x/Season_y and Match Date_x/Match Date_y merge columns of featured files written
+    by the notebooks. A suffixed column is dropped when the unsuffixed one exists; otherwise the '_x'
+    column is renamed to it.
+    """
+    for column in ("Season", "Match Date"):
+        if column in df.columns:
+            df = df.drop(columns=[name for name in (f"{column}_x", f"{column}_y") if name in df.columns])
+        else:
+            df = df.rename(columns={f"{column}_x": column})
+            df = df.drop(columns=[name for name in (f"{column}_y",) if name in df.columns])
+    return df
+
+
+def add_match_outcome(df):
+    """
+    Adds the 3-class 'MatchOutcome' target (H/D/A) from the goals.
+    """
+    home_goals, away_goals = df["Home Goals"], df["Away Goals"]
+    df["MatchOutcome"] = np.select([home_goals > away_goals, home_goals < away_goals], ["H", "A"], default="D")
+    return df
+
+
+def combine_seasons(inputs, outputs):
+    """
+    Concatenates the featured seasons and adds the 3-class 'MatchOutcome' target (H/D/A).
+    """
+    frames = []
+    for path in inputs:
+        # Featured files written by the notebooks carry merge suffixes
+        frames.append(add_match_outcome(drop_merge_suffixes(pd.read_csv(path))))
+
+    df_all = pd.concat(frames, ignore_index=True, sort=False)
+    leading = [column for column in FINAL_LEADING_COLUMNS if column in df_all.columns]
+    df_all = df_all[leading + [column for column in df_all.columns if column not in leading]]
+    df_all.to_csv(outputs[0], index=False)
+    print(f"Combined {len(inputs)} seasons into {outputs[0]} ({len(df_all)} rows).")
+
+
+def preprocess_stage(inputs, outputs, cleaned_path):
+    """
+    Fits the Preprocessor on the training split, saves it and writes the cleaned data to the feature store.
+    """
+    from src.utils.preprocess import fit_preprocessing
+
+    write_stage(fit_preprocessing(pd.read_csv(inputs[0]), preprocessor_path=outputs[1]), cleaned_path)
+
+
+def train_stage(inputs, outputs, cleaned_path, search_strategy=None, max_fits=None, time_budget=None,
+                use_cache=True, n_workers=None, inner_threads=1, warm_start=False, models=None, time_budgets=None,
+                compress=0):
+    """
+    Trains and saves the selected pipeline models on the training split of the cleaned data.
+    """
+    from src.pipeline.run_pipeline import get_models, train_models
+    from src.utils.preprocess import split_data
+
+    X_train, _, y_train, _ = split_data(read_stage(cleaned_path))
+    models = get_models(models)
+    for model in models:
+        model.configure_search(search_strategy, max_fits, (time_budgets or {}).get(model.model_name, time_budget))
+    train_models(models, X_train, y_train, use_cache=use_cache, n_workers=n_workers,
+                 inner_threads=inner_threads, warm_start=warm_start, compress=compress)
+
+
+def evaluate_stage(inputs, outputs, cleaned_path, model_names, plot=True):
+    """
+    Evaluates the saved models on the test split of the cleaned data.
+    """
+    from src.pipeline.run_pipeline import report_models
+    from src.utils.preprocess import split_data
+
+    _, X_test, _, y_test = split_data(read_stage(cleaned_path))
+    report_models(model_names, X_test, y_test, plot=plot)
+
+
+# --- Graph and runner ----------------------------------------------------------------------------
+
+def build_stages(data_dir='data', seasons=None, until=None, training_options=None, plot=True):
+    """
+    Builds the stage graph from the raw season files up to a stage (by default the evaluation reports).
+
+    Args:
+        data_dir (str, optional): Root data directory with 'raw/' and 'processed/'. Defaults to 'data'.
+        seasons (list, optional): Seasons to build. Defaults to every complete season in '<data_dir>/raw'.
+        until (str, optional): Last stage of the graph (one of STAGE_NAMES). Defaults to 'evaluate'.
+        training_options (dict, optional): Keyword arguments for the train stage (search_strategy,
+            max_fits, time_budget, use_cache, n_workers, inner_threads, warm_start, models, time_budgets,
+            compress).
+            'models' also selects the models the evaluate stage reports on.
+        plot (bool, optional): Draw the evaluation figures. Defaults to True.
+
+    Returns:
+        list: Stage objects in execution order.
+    """
+    # sklearn is only imported once a graph is built, not when the CLI starts
+    from src.utils.preprocess import PREPROCESSOR_PATH
+
+    until = until or STAGE_NAMES[-1]
+    if until not in STAGE_NAMES:
+        raise ValueError(f"Unknown stage '{until}'. Choose one of {list(STAGE_NAMES)}.")
+    raw_dir = os.path.join(data_dir, 'raw')
+    processed_dir = os.path.join(data_dir, 'processed')
+    seasons = discover_seasons(raw_dir) if seasons is None else list(seasons)
+
+    stages = []
+    featured_paths = []
+    for season in seasons:
+        raw_paths = [os.path.join(raw_dir, season, name.format(season=season)) for name in RAW_FILES]
+        manifest_path = os.path.join(processed_dir, 'ingested', f"{season}.json")
+        processed_path = os.path.join(processed_dir, 'all_season', f"{season}_processed.csv")
+        featured_path = os.path.join(processed_dir, 'featured', f"{season}_featured.csv")
+        stages.append(Stage('ingest', ingest_season, raw_paths, [manifest_path], season=season))
+        stages.append(Stage('player-join', join_season, raw_paths + [manifest_path], [processed_path],
+                            season=season, options={'raw_dir': raw_dir, 'season': season}))
+        stages.append(Stage('feature', feature_season, [processed_path], [featured_path], season=season))
+        featured_paths.append(featured_path)
+
+    final_path = os.path.join(processed_dir, 'final', 'all_seasons_final.csv')
+    cleaned_path = os.path.join(processed_dir, 'final', 'cleaned')
+    stages.append(Stage('combine', combine_seasons, featured_paths, [final_path]))
+    stages.append(Stage('preprocess', preprocess_stage, [final_path], [stage_file(cleaned_path), PREPROCESSOR_PATH],
+                        options={'cleaned_path': cleaned_path}))
+
+    if STAGE_NAMES.index(until) >= STAGE_NAMES.index('train'):
+        # The registry resolves the names without importing the model libraries
+        from src.models.artifacts import manifest_path
+        from src.models.registry import resolve_model_names
+
+        model_names = resolve_model_names((training_options or {}).get('models'))
+        model_paths = [manifest_path(name) for name in model_names]
+        stages.append(Stage('train', train_stage, [stage_file(cleaned_path)], model_paths,
+                            options={'cleaned_path': cleaned_path, **(training_options or {})}))
+        stages.append(Stage('evaluate', evaluate_stage, [stage_file(cleaned_path)] + model_paths,
+                            [os.path.join('outputs', 'reports', name)
+                             for name in ('model_metrics.csv', 'model_accuracy_comparison.csv')],
+                            options={'cleaned_path': cleaned_path, 'model_names': model_names, 'plot': plot}))
+
+    # Stable sort by stage, so the seasons of one per-season stage are adjacent and run together
+    last = STAGE_NAMES.index(until)
+    stages = sorted(stages, key=lambda stage: STAGE_NAMES.index(stage.name))
+    return [stage for stage in stages if STAGE_NAMES.index(stage.name) <= last]
+
+
+def load_state(state_path):
+    if os.path.isfile(state_path):
+        with open(state_path, encoding='utf-8') as file:
+            return json.load(file)
+    return {}
+
+
+def save_state(state, state_path):
+    directory = os.path.dirname(state_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = state_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        json.dump(state, file, indent=2, sort_keys=True)
+    os.replace(tmp_path, state_path)
+
+
+def stage_status(stage, state):
+    """
+    Decides whether a stage has to run.
+
+    A stage is up to date when all its outputs exist and are newer than all its inputs. Outputs older
+    than an input are still up to date when the inputs have the same content hashes as on the stage's
+    last run (e.g. an upstream stage rewrote an identical file, or a file was only touched). A stage
+    whose options differ from its last run (e.g. another search strategy or model selection) is
+    stale whatever the files.
+
+    Args:
+        stage (Stage): The stage.
+        state (dict): Stage key to {'inputs': {path: sha256}, 'options': sha256} from the previous runs.
+
+    Returns:
+        str: Reason to run the stage, or None if it is up to date.
+    """
+    missing_inputs = [path for path in stage.inputs if not os.path.exists(path)]
+    if missing_inputs:
+        raise FileNotFoundError(f"Stage '{stage.key}' is missing its inputs {missing_inputs}.")
+    if any(not os.path.exists(path) for path in stage.outputs):
+        return 'missing outputs'
+
+    if stage.key in state and state[stage.key].get('options') != stage.options_hash:
+        return 'options changed'
+    recorded = state.get(stage.key, {}).get('inputs')
+    if recorded is not None and set(recorded) != set(stage.inputs):
+        return 'input set changed'
+    if not stage.inputs:
+        return None
+    newest_input = max(os.path.getmtime(path) for path in stage.inputs)
+    oldest_output = min(os.path.getmtime(path) for path in stage.outputs)
+    if oldest_output >= newest_input:
+        return None
+    if recorded is not None and all(recorded[path] == file_hash(path) for path in stage.inputs):
+        return None
+    return 'inputs changed'
+
+
+def _run_stage(stage):
+    stage.run()
+    return stage.key
+
+
+def run_stages(stages, state_path=None, force=False, n_jobs=None):
+    """
+    Runs the stages whose outputs are missing or out of date, in order.
+
+    Consecutive stages with the same name (the per-season stages) are independent and run in a
+    process pool.
+
+    Args:
+        stages (list): Stage objects in execution order (see build_stages).
+        state_path (str, optional): JSON file with the input and option hashes of previous runs.
+            Defaults to 'data/processed/.pipeline_state.json'.
+        force (bool, optional): Run every stage regardless of its state. Defaults to False.
+        n_jobs (int, optional): Worker processes for per-season stages. Defaults to the number of
+            CPUs; 1 runs them in the current process.
+
+    Returns:
+        dict: Stage key to 'ran' or 'skipped'.
+    """
+    state_path = state_path or os.path.join('data', 'processed', '.pipeline_state.json')
+    state = load_state(state_path)
+    results = {}
+
+    index = 0
+    while index < len(stages):
+        # Group consecutive stages of the same kind into one level
+        level = [stages[index]]
+        while index + len(level) < len(stages) and stages[index + len(level)].name == stages[index].name:
+            level.append(stages[index + len(level)])
+        index += len(level)
+
+        pending = []
+        for stage in level:
+            reason = 'forced' if force else stage_status(stage, state)
+            if reason is None:
+                print(f"[{stage.key}] up to date, skipped.")
+                results[stage.key] = 'skipped'
+            else:
+                print(f"[{stage.key}] running ({reason}).")
+                pending.append(stage)
+
+        if len(pending) > 1 and n_jobs != 1:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                list(executor.map(_run_stage, pending))
+        else:
+            for stage in pending:
+                _run_stage(stage)
+
+        for stage in pending:
+            state[stage.key] = {'inputs': {path: file_hash(path) for path in stage.inputs},
+                                'options': stage.options_hash}
+            results[stage.key] = 'ran'
+        if pending:
+            save_state(state, state_path)
+    return results
+
+
+def build_pipeline(data_dir='data', seasons=None, until=None, force=False, n_jobs=None, training_options=None,
+                   plot=True):
+    """
+    Rebuilds the pipeline outputs that are out of date, from the raw season files up to a stage.
+
+    Args:
+        data_dir (str, optional): Root data directory. Defaults to 'data'.
+        seasons (list, optional): Seasons to build. Defaults to every complete season in '<data_dir>/raw'.
+        until (str, optional): Last stage to run (one of STAGE_NAMES). Defaults to 'evaluate'.
+        force (bool, optional): Rebuild every stage. Defaults to False.
+        n_jobs (int, optional): Worker processes for per-season stages.
+        training_options (dict, optional): Keyword arguments for the train stage.
+        plot (bool, optional): Draw the evaluation figures. Defaults to True.
+
+    Returns:
+        dict: Stage key to 'ran' or 'skipped'.
+    """
+    stages = build_stages(data_dir, seasons, until, training_options, plot)
+    return run_stages(stages, os.path.join(data_dir, 'processed', '.pipeline_state.json'), force, n_jobs)
@@ -0,0 +1,331 @@
+# src/serving/predictor.py
+
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+import numpy as np
+import pandas as pd
+from src.models.artifacts import list_artifacts, load_artifact
+from src.utils.load_data import load_raw_data
+from src.utils.preprocess import Preprocessor
+
+
+# Class index of each encoded outcome (see encode_target_variable)
+OUTCOME_LABELS = ('H', 'D', 'A')
+
+REFERENCE_DATA_PATH = os.path.join('data', 'processed', 'final', 'all_seasons_final.csv')
+
+# Columns every fixture record must have; predictions are reported under them
+REQUIRED_FIXTURE_COLUMNS = ('Home Team', 'Away Team')
+
+
+class ModelPredictor:
+    """
+    Holds the saved models and the fitted preprocessing in memory and scores fixtures with all of them.
+
+    Attributes:
+        models (dict): Model name to fitted estimator.
+        preprocessing (Preprocessor): Fitted transform applied to raw fixtures.
+    """
+
+    def __init__(self, model_names=None, models_dir='models', reference_path=REFERENCE_DATA_PATH):
+        """
+        Loads the models and their preprocessing.
+
+        The Preprocessor saved with the models ('preprocessor.pkl') is used when present. Models trained
+        before it existed were preprocessed by preprocess_data on the whole combined data; for them a
+        Preprocessor is fitted on reference_path, which reproduces that transform exactly.
+
+        Args:
+            model_names (list, optional): Models to load. Defaults to every model saved in models_dir
+                whose libraries are installed.
+            models_dir (str, optional): Directory of the saved models. Defaults to 'models'.
+            reference_path (str, optional): Data the models were preprocessed from, used without a
+                saved Preprocessor. Defaults to 'data/processed/final/all_seasons_final.csv'.
+        """
+        if model_names is None:
+            model_names = list_artifacts(models_dir)
+            explicit = False
+        else:
+            explicit = True
+
+        self.models = {}
+        for model_name in model_names:
+            try:
+                self.models[model_name] = load_artifact(model_name, models_dir)
+            except (ImportError, FileNotFoundError) as error:
+                if explicit:
+                    raise
+                print(f"Skipping {model_name}: {error}")
+        if not self.models:
+            raise FileNotFoundError(f"No loadable models found in '{models_dir}'.")
+
+        preprocessor_path = os.path.join(models_dir, 'preprocessor.pkl')
+        if os.path.isfile(preprocessor_path):
+            self.preprocessing = Preprocessor.load(preprocessor_path)
+        else:
+            self.preprocessing = Preprocessor().fit(load_raw_data(reference_path))
+        self.preprocessing.set_output(transform='pandas')
+        print(f"Loaded models: {', '.join(self.models)}.")
+
+    def predict_proba(self, fixtures, model_names=None):
+        """
+        Computes H/D/A probabilities of every fixture with every model.
+
+        Models without predict_proba (e.g. an SVC trained without probability=True) give one-hot
+        probabilities of their predicted class.
+
+        Args:
+            fixtures (pd.DataFrame): Raw fixture rows.
+            model_names (list, optional): Subset of the loaded models. Defaults to all of them.
+
+        Returns:
+            dict: Model name to an array of shape (n_fixtures, 3) with columns H, D, A.
+        """
+        X = self.preprocessing.transform(fixtures)
+        probabilities = {}
+        for model_name in model_names or self.models:
+            model = self.models[model_name]
+            result = np.zeros((len(X), len(OUTCOME_LABELS)))
+            classes = np.asarray(model.classes_, dtype=int)
+            if hasattr(model, 'predict_proba'):
+                result[:, classes] = model.predict_proba(X)
+            else:
+                result[np.arange(len(X)), np.asarray(model.predict(X), dtype=int)] = 1.0
+            probabilities[model_name] = result
+        return probabilities
+
+
+class LatencyTracker:
+    """
+    Keeps the most recent latencies and reports their percentiles.
+    """
+
+    def __init__(self, window=10000):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def record(self, seconds):
+        with self.lock:
+            self.samples.append(seconds)
+            self.count += 1
+
+    def summary(self):
+        """
+        Returns:
+            dict: Number of samples and p50/p99/max latency in milliseconds.
+        """
+        with self.lock:
+            samples = np.array(self.samples) * 1000.0
+            count = self.count
+        if len(samples) == 0:
+            return {'count': count, 'p50_ms': None, 'p99_ms': None, 'max_ms': None}
+        return {'count': count, 'p50_ms': float(np.percentile(samples, 50)),
+                'p99_ms': float(np.percentile(samples, 99)), 'max_ms': float(samples.max())}
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent prediction requests into one model call.
+
+    Requests are queued; a worker thread takes the first one, waits up to max_wait_ms for more (or
+    until max_batch_size fixtures are collected), scores them together and hands every request its
+    own rows of the result.
+    """
+
+    def __init__(self, predictor, max_batch_size=256, max_wait_ms=2.0):
+        self.predictor = predictor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.batch_latency = LatencyTracker()
+        self.batch_sizes = deque(maxlen=10000)
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(self, fixtures):
+        """
+        Queues fixtures for scoring.
+
+        Args:
+            fixtures (pd.DataFrame): Raw fixture rows.
+
+        Returns:
+            Future: Resolves to the predict_proba result for these fixtures.
+        """
+        future = Future()
+        self._queue.put((fixtures, future))
+        return future
+
+    def close(self):
+        self._queue.put(None)
+        self._worker.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            size = len(item[0])
+            deadline = time.perf_counter() + self.max_wait
+            while size < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)
+                    break
+                batch.append(item)
+                size += len(item[0])
+            self._score(batch)
+
+    def _score(self, batch):
+        start = time.perf_counter()
+        try:
+            fixtures = pd.concat([frame for frame, _ in batch], ignore_index=True)
+            probabilities = self.predictor.predict_proba(fixtures)
+        except Exception as error:
+            for _, future in batch:
+                future.set_exception(error)
+            return
+        self.batch_latency.record(time.perf_counter() - start)
+        self.batch_sizes.append(len(fixtures))
+
+        offset = 0
+        for frame, future in batch:
+            rows = slice(offset, offset + len(frame))
+            future.set_result({name: result[rows] for name, result in probabilities.items()})
+            offset += len(frame)
+
+
+class PredictionService:
+    """
+    Entry point of the server and the predict CLI: raw fixture records in, H/D/A probabilities out.
+    """
+
+    def __init__(self, predictor, batching=True, max_batch_size=256, max_wait_ms=2.0):
+        self.predictor = predictor
+        self.batcher = MicroBatcher(predictor, max_batch_size, max_wait_ms) if batching else None
+        self.request_latency = LatencyTracker()
+
+    def validate(self, records, model_names=None):
+        """
+        Checks a request before any inference: the models are loaded, every record is an object with
+        the REQUIRED_FIXTURE_COLUMNS, and every feature value has the type the preprocessing expects
+        (a number or null for numerical columns, a string, number or null for the others).
+
+        Args:
+            records (list): Fixture dicts.
+            model_names (list, optional): Requested models.
+
+        Raises:
+            KeyError: If a requested model is not loaded.
+            TypeError: If records is not a list of dicts, or a feature value has the wrong type.
+            ValueError: If a record lacks a required column.
+        """
+        unknown = [name for name in model_names or [] if name not in self.predictor.models]
+        if unknown:
+            raise KeyError(f"Models not loaded: {unknown}")
+        if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+            raise TypeError("Fixtures must be a list of objects.")
+        preprocessing = self.predictor.preprocessing
+        numerical = set(preprocessing.numerical_columns_)
+        categorical = set(preprocessing.categorical_columns_)
+        for row, record in enumerate(records):
+            missing = [column for column in REQUIRED_FIXTURE_COLUMNS if column not in record]
+            if missing:
+                raise ValueError(f"Fixture {row} has no {missing}.")
+            for column, value in record.items():
+                if value is None:
+                    continue
+                if column in numerical and (isinstance(value, bool) or not isinstance(value, (int, float))):
+                    raise TypeError(f"Fixture {row}: '{column}' must be a number, got {value!r}.")
+                if column in categorical and not isinstance(value, (str, int, float)):
+                    raise TypeError(f"Fixture {row}: '{column}' must be a string, got {value!r}.")
+
+    def predict(self, records, model_names=None):
+        """
+        Scores fixture records.
+
+        The request is checked with validate() first, so a malformed request is rejected on its own
+        rather than in the batch, where it would fail its neighbours.
+
+        Args:
+            records (list): Fixture dicts (e.g. {'Home Team': 'gala', 'Away Team': 'fene', ...}).
+            model_names (list, optional): Models to report. Defaults to all loaded models.
+
+        Raises:
+            KeyError, TypeError, ValueError: If the request is invalid (see validate).
+
+        Returns:
+            list: One {'Home Team', 'Away Team', 'probabilities': {model: {'H', 'D', 'A'}}} per record.
+        """
+        start = time.perf_counter()
+        self.validate(records, model_names)
+        fixtures = pd.DataFrame.from_records(records)
+        if self.batcher is not None:
+            probabilities = self.batcher.submit(fixtures).result()
+        else:
+            probabilities = self.predictor.predict_proba(fixtures)
+        names = model_names or list(probabilities)
+
+        predictions = []
+        for row, record in enumerate(records):
+            predictions.append({
+                'Home Team': record.get('Home Team'),
+                'Away Team': record.get('Away Team'),
+                'probabilities': {name: dict(zip(OUTCOME_LABELS, probabilities[name][row].round(6).tolist()))
+                                  for name in names},
+            })
+        self.request_latency.record(time.perf_counter() - start)
+        return predictions
+
+    def metrics(self):
+        """
+        Returns:
+            dict: Request and batch latency percentiles and the mean batch size.
+        """
+        metrics = {'models': list(self.predictor.models), 'requests': self.request_latency.summary()}
+        if self.batcher is not None:
+            sizes = list(self.batcher.batch_sizes)
+            metrics['batches'] = self.batcher.batch_latency.summary()
+            metrics['mean_batch_size'] = float(np.mean(sizes)) if sizes else None
+        return metrics
+
+    def close(self):
+        if self.batcher is not None:
+            self.batcher.close()
+
+
+def predict_file(input_path, output_path, model_names=None, models_dir='models'):
+    """
+    Scores every fixture of a CSV file and writes the probabilities of every model next to it.
+
+    Args:
+        input_path (str): CSV of raw fixtures.
+        output_path (str): Destination CSV with '<model>_H', '<model>_D' and '<model>_A' columns added.
+        model_names (list, optional): Models to use. Defaults to every loadable model.
+        models_dir (str, optional): Directory of the saved models. Defaults to 'models'.
+
+    Returns:
+        pd.DataFrame: The fixtures with the probability columns.
+    """
+    predictor = ModelPredictor(model_names, models_dir)
+    fixtures = pd.read_csv(input_path)
+    start = time.perf_counter()
+    probabilities = predictor.predict_proba(fixtures)
+    elapsed = time.perf_counter() - start
+    columns = {f"{name}_{label}": result[:, index] for name, result in probabilities.items()
+               for index, label in enumerate(OUTCOME_LABELS)}
+    output = pd.concat([fixtures, pd.DataFrame(columns, index=fixtures.index)], axis=1)
+    output.to_csv(output_path, index=False)
+    print(f"Scored {len(fixtures)} fixtures with {len(probabilities)} models in {elapsed * 1000:.1f} ms; "
+          f"saved to {output_path}.")
+    return output
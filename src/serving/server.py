@@ -0,0 +1,93 @@
+# src/serving/server.py
+
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.serving.predictor import ModelPredictor, PredictionService
+
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    """
+    Routes:
+        POST /predict  {"fixtures": [{...}, ...], "models": [...]}  ->  {"predictions": [...]}
+        GET  /metrics  ->  request/batch latency percentiles
+        GET  /health   ->  {"status": "ok"}
+    """
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/metrics':
+            self._send_json(200, self.server.service.metrics())
+        elif self.path == '/health':
+            self._send_json(200, {'status': 'ok'})
+        else:
+            self._send_json(404, {'error': f"Unknown path '{self.path}'."})
+
+    def do_POST(self):
+        if self.path != '/predict':
+            self._send_json(404, {'error': f"Unknown path '{self.path}'."})
+            return
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            fixtures = payload['fixtures'] if isinstance(payload, dict) else payload
+            model_names = payload.get('models') if isinstance(payload, dict) else None
+        except (ValueError, KeyError) as error:
+            self._send_json(400, {'error': f"Invalid request: {error}"})
+            return
+        try:
+            self.server.service.validate(fixtures, model_names)
+        except (KeyError, ValueError, TypeError) as error:
+            self._send_json(400, {'error': f"Invalid fixtures: {error}"})
+            return
+        # The request is valid, so anything failing from here on is a server error
+        try:
+            predictions = self.server.service.predict(fixtures, model_names)
+        except Exception as error:
+            self._send_json(500, {'error': f"Prediction failed: {error}"})
+            return
+        self._send_json(200, {'predictions': predictions})
+
+    def log_message(self, format, *args):
+        # Keep request logging off the hot path; latencies are available under /metrics
+        pass
+
+
+def make_server(service, host='127.0.0.1', port=8000):
+    """
+    Creates the HTTP server (one thread per connection; requests are batched by the service).
+
+    Args:
+        service (PredictionService): The warm prediction service.
+        host (str, optional): Interface to bind. Defaults to '127.0.0.1'.
+        port (int, optional): Port to bind (0 picks a free one). Defaults to 8000.
+
+    Returns:
+        ThreadingHTTPServer: The server, not yet serving.
+    """
+    server = ThreadingHTTPServer((host, port), PredictionHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def serve(host='127.0.0.1', port=8000, model_names=None, models_dir='models', max_batch_size=256, max_wait_ms=2.0):
+    """
+    Loads the models once and serves predictions until interrupted.
+    """
+    service = PredictionService(ModelPredictor(model_names, models_dir), max_batch_size=max_batch_size,
+                                max_wait_ms=max_wait_ms)
+    server = make_server(service, host, port)
+    print(f"Serving predictions on http://{host}:{server.server_address[1]} (POST /predict, GET /metrics).")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
@@ -1,55 +1,34 @@
 # src/models/compare_models.py
 
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import os
+from src.models.registry import resolve_model_names
+from src.utils.evaluation import METRICS_FILE
 
 
-def load_classification_report(model_name):
-    """
-    Loads the classification report from a CSV file and retrieves the accuracy score.
-
-    Parameters:
-        model_name (str): The name of the model.
-
-    Returns:
-        float: The accuracy score.
-    """
-    # Construct the path to the classification report CSV file
-    report_path = os.path.join('outputs', 'reports', f"{model_name}_classification_report.csv")
-
-    # Read the classification report into a DataFrame, setting the first column as the index
-    report_df = pd.read_csv(report_path, index_col=0)
-
-    # Retrieve the 'precision' value from the 'accuracy' row as the accuracy score
-    accuracy = report_df.loc['accuracy', 'precision']
-    return accuracy
-
-
-def compare_models():
+def compare_models(model_names=None, plot=True):
     """
     Compares the accuracy scores of different models and saves the results to a CSV file.
     Additionally, it visualizes the comparison using a bar plot.
-    """
-    # List of model names to compare
-    models = [
-        'random_forest', 'svm',
-        'catboost',
-        'knn', 'logistic_regression', 'mlp', 'naive_bayes'
-    ]
-    accuracy = []
 
-    # Iterate over each model to load and collect its accuracy score
-    for model in models:
-        acc = load_classification_report(model)
-        accuracy.append(acc)
+    The accuracies are taken from the consolidated metrics table written by evaluate_saved_models.
 
-    # Create a DataFrame to hold the comparison of models and their accuracy scores
-    comparison_df = pd.DataFrame({
-        'Model': models,
-        'Accuracy': accuracy
-    })
+    Args:
+        model_names (list, optional): Models to compare, or ['all']. Defaults to the models in the
+            metrics table.
+        plot (bool, optional): Draw the bar plot. Defaults to True.
+
+    Raises:
+        FileNotFoundError: If the models have not been evaluated yet.
+    """
+    metrics_path = os.path.join('outputs', 'reports', METRICS_FILE)
+    if not os.path.isfile(metrics_path):
+        raise FileNotFoundError(f"No metrics table at {metrics_path}; evaluate the models first "
+                                f"(see src/utils/evaluation.py).")
+    comparison_df = pd.read_csv(metrics_path)[['Model', 'Accuracy']]
+    if model_names is not None:
+        selected = resolve_model_names(model_names)
+        comparison_df = comparison_df[comparison_df['Model'].isin(selected)].reset_index(drop=True)
 
     # Define the directory path for saving the comparison CSV
     reports_dir = os.path.join('outputs', 'reports')
@@ -61,6 +40,12 @@ def compare_models():
     # Save the comparison DataFrame to a CSV file
     comparison_df.to_csv(comparison_csv_path, index=False)
     print(f"Model accuracy scores saved to {comparison_csv_path}.")
+    if not plot:
+        return
+
+    # Plotting libraries are only imported when a plot is drawn
+    import matplotlib.pyplot as plt
+    import seaborn as sns
 
     # Visualization: Create a bar plot comparing the accuracy scores of the models
     plt.figure(figsize=(12, 8))
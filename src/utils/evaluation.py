@@ -0,0 +1,226 @@
+# src/utils/evaluation.py
+
+import hashlib
+import os
+import numpy as np
+import pandas as pd
+from src.models.artifacts import artifact_exists, artifact_files, load_artifact
+from src.models.cache import hash_dataset
+from src.models.streaming import LOG_LOSS_EPS
+
+
+REPORTS_DIR = os.path.join('outputs', 'reports')
+FIGURES_DIR = os.path.join('outputs', 'figures')
+PREDICTION_CACHE_DIR = os.path.join('models', 'cache', 'predictions')
+METRICS_FILE = 'model_metrics.csv'
+CONFUSION_FILE = 'model_confusion_matrices.csv'
+CLASSES = (0, 1, 2)
+CLASS_LABELS = ('H', 'D', 'A')
+
+
+class PredictionMatrix:
+    """
+    Predictions of several models on the same samples.
+
+    Attributes:
+        model_names (list): Model name of every row.
+        labels (np.ndarray): Predicted class, shape (n_models, n_samples).
+        probabilities (np.ndarray): Class probabilities, shape (n_models, n_samples, n_classes); models
+            without predict_proba get one-hot rows of their predicted class.
+    """
+
+    def __init__(self, model_names, labels, probabilities):
+        self.model_names = list(model_names)
+        self.labels = labels
+        self.probabilities = probabilities
+
+    def save(self, path):
+        tmp_path = path + '.tmp.npz'
+        np.savez(tmp_path, model_names=np.array(self.model_names), labels=self.labels,
+                 probabilities=self.probabilities)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as stored:
+            return cls(stored['model_names'].tolist(), stored['labels'], stored['probabilities'])
+
+
+def predict_models(models, X, classes=CLASSES):
+    """
+    Predicts every model once on X.
+
+    Args:
+        models (dict): Model name to fitted estimator.
+        X (pd.DataFrame or np.ndarray): Feature data.
+        classes (tuple, optional): Encoded class labels. Defaults to (0, 1, 2).
+
+    Returns:
+        PredictionMatrix: Labels and probabilities of every model.
+    """
+    classes = np.asarray(classes)
+    labels = np.empty((len(models), len(X)), dtype=np.int64)
+    probabilities = np.zeros((len(models), len(X), len(classes)))
+    for row, model in enumerate(models.values()):
+        if hasattr(model, 'predict_proba'):
+            columns = np.searchsorted(classes, np.asarray(model.classes_, dtype=np.int64))
+            probabilities[row][:, columns] = model.predict_proba(X)
+            # argmax of the probabilities is predict() for every model with predict_proba except SVC
+            labels[row] = np.asarray(model.predict(X), dtype=np.int64).ravel()
+        else:
+            labels[row] = np.asarray(model.predict(X), dtype=np.int64).ravel()
+            probabilities[row, np.arange(len(X)), np.searchsorted(classes, labels[row])] = 1.0
+    return PredictionMatrix(list(models), labels, probabilities)
+
+
+def compute_metrics(y_true, predictions, classes=CLASSES):
+    """
+    Computes the metrics of every model at once from a prediction matrix.
+
+    Args:
+        y_true (pd.Series or np.ndarray): True labels.
+        predictions (PredictionMatrix): Predictions of the models on the same samples.
+        classes (tuple, optional): Encoded class labels. Defaults to (0, 1, 2).
+
+    Returns:
+        tuple: (metrics DataFrame with Model, Accuracy, MacroF1, LogLoss and Brier columns,
+        confusion matrices of shape (n_models, n_classes, n_classes) with true classes as rows).
+    """
+    classes = np.asarray(classes)
+    n_models, n_samples = predictions.labels.shape
+    n_classes = len(classes)
+    true_index = np.searchsorted(classes, np.asarray(y_true, dtype=np.int64))
+    predicted_index = np.searchsorted(classes, predictions.labels)
+
+    # All confusion matrices from one bincount over (model, true, predicted) cells
+    cells = (np.arange(n_models)[:, None] * n_classes + true_index[None, :]) * n_classes + predicted_index
+    confusion = np.bincount(cells.ravel(), minlength=n_models * n_classes * n_classes).reshape(
+        n_models, n_classes, n_classes)
+
+    true_positives = np.diagonal(confusion, axis1=1, axis2=2).astype(float)
+    predicted_totals = confusion.sum(axis=1)
+    actual_totals = confusion.sum(axis=2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        precision = np.where(predicted_totals > 0, true_positives / predicted_totals, 0.0)
+        recall = np.where(actual_totals > 0, true_positives / actual_totals, 0.0)
+        f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+
+    one_hot = np.eye(n_classes)[true_index]
+    true_probability = np.take_along_axis(predictions.probabilities, true_index[None, :, None], axis=2)[:, :, 0]
+    metrics = pd.DataFrame({
+        'Model': predictions.model_names,
+        'Accuracy': true_positives.sum(axis=1) / n_samples,
+        # Macro average over the classes present in y_true or in the predictions, as in sklearn
+        'MacroF1': f1.sum(axis=1) / np.maximum(((predicted_totals + actual_totals) > 0).sum(axis=1), 1),
+        'LogLoss': -np.log(np.clip(true_probability, LOG_LOSS_EPS, 1.0)).mean(axis=1),
+        'Brier': ((predictions.probabilities - one_hot[None]) ** 2).sum(axis=2).mean(axis=1),
+    })
+    return metrics, confusion
+
+
+def _prediction_cache_path(model_files, X, y, cache_dir):
+    """
+    Returns the cache file of a prediction matrix; it changes with the data or any saved model file.
+    """
+    digest = hashlib.sha256(hash_dataset(X, y).encode('utf-8'))
+    for path in model_files:
+        stat = os.stat(path)
+        digest.update(f"{path}|{stat.st_size}|{stat.st_mtime_ns}".encode('utf-8'))
+    return os.path.join(cache_dir, f"{digest.hexdigest()}.npz")
+
+
+def evaluate_saved_models(model_names, X_test, y_test, models_dir='models', reports_dir=REPORTS_DIR,
+                          use_cache=True, cache_dir=PREDICTION_CACHE_DIR, plot=False):
+    """
+    Evaluates the saved models in one batch and writes one consolidated metrics table.
+
+    Every model is loaded once from its artifact (memory-mapped where possible, see
+    src/models/artifacts.py) and predicted into a prediction matrix (cached until the data or a
+    model file changes); accuracy, macro F1, log loss, Brier score and the confusion matrices are
+    then computed for all models together. The results are written to 'model_metrics.csv' and
+    'model_confusion_matrices.csv'. Plots are only drawn with plot=True; matplotlib is not imported
+    otherwise.
+
+    Args:
+        model_names (list): Names of the saved models.
+        X_test (pd.DataFrame): Test features.
+        y_test (pd.Series or np.ndarray): Encoded test labels.
+        models_dir (str, optional): Directory of the saved models. Defaults to 'models'.
+        reports_dir (str, optional): Directory of the reports. Defaults to 'outputs/reports'.
+        use_cache (bool, optional): Reuse a cached prediction matrix. Defaults to True.
+        cache_dir (str, optional): Prediction matrix cache. Defaults to 'models/cache/predictions'.
+        plot (bool, optional): Draw the confusion matrices. Defaults to False.
+
+    Returns:
+        pd.DataFrame: One row of metrics per model.
+    """
+    saved = []
+    for model_name in model_names:
+        if artifact_exists(model_name, models_dir):
+            saved.append(model_name)
+        else:
+            print(f"Error: Model file for {model_name} not found in the '{models_dir}' directory.")
+
+    cache_path = None
+    predictions = None
+    if use_cache and saved:
+        model_files = [path for model_name in saved for path in artifact_files(model_name, models_dir)]
+        cache_path = _prediction_cache_path(model_files, X_test, y_test, cache_dir)
+        if os.path.isfile(cache_path):
+            predictions = PredictionMatrix.load(cache_path)
+            print(f"Loaded cached predictions of {len(saved)} models.")
+    if predictions is None:
+        models = {}
+        for model_name in saved:
+            try:
+                models[model_name] = load_artifact(model_name, models_dir)
+            except ImportError as error:
+                print(f"Skipping {model_name}: {error}")
+        predictions = predict_models(models, X_test)
+        if cache_path is not None and len(models) == len(saved):
+            os.makedirs(cache_dir, exist_ok=True)
+            predictions.save(cache_path)
+
+    metrics, confusion = compute_metrics(y_test, predictions)
+    os.makedirs(reports_dir, exist_ok=True)
+    metrics_path = os.path.join(reports_dir, METRICS_FILE)
+    metrics.to_csv(metrics_path, index=False)
+    cells = pd.DataFrame({
+        'Model': np.repeat(predictions.model_names, len(CLASSES) ** 2),
+        'True': np.tile(np.repeat(CLASS_LABELS, len(CLASSES)), len(predictions.model_names)),
+        'Predicted': np.tile(CLASS_LABELS, len(CLASSES) * len(predictions.model_names)),
+        'Count': confusion.ravel(),
+    })
+    cells.to_csv(os.path.join(reports_dir, CONFUSION_FILE), index=False)
+    print(metrics.to_string(index=False, float_format=lambda value: f"{value:.4f}"))
+    print(f"Model metrics saved to {metrics_path}.")
+
+    if plot:
+        plot_confusion_matrices(predictions.model_names, confusion)
+    return metrics
+
+
+def plot_confusion_matrices(model_names, confusion, figures_dir=FIGURES_DIR):
+    """
+    Draws one confusion matrix heatmap per model ('confusion_matrix_<model>.png').
+
+    Args:
+        model_names (list): Model names.
+        confusion (np.ndarray): Confusion matrices of shape (n_models, n_classes, n_classes).
+        figures_dir (str, optional): Output directory. Defaults to 'outputs/figures'.
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    os.makedirs(figures_dir, exist_ok=True)
+    for model_name, matrix in zip(model_names, confusion):
+        plt.figure(figsize=(8, 6))
+        sns.heatmap(matrix, annot=True, fmt='d', cmap='Blues', cbar=False,
+                    xticklabels=CLASS_LABELS, yticklabels=CLASS_LABELS)
+        plt.title(f'{model_name} Confusion Matrix')
+        plt.xlabel('Predicted Labels')
+        plt.ylabel('True Labels')
+        cm_path = os.path.join(figures_dir, f"confusion_matrix_{model_name}.png")
+        plt.savefig(cm_path)
+        plt.close()
+        print(f"Confusion matrix plot saved to {cm_path}.")
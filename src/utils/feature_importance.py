@@ -1,27 +1,24 @@
 # src/models/feature_importance.py
 
 import pandas as pd
-import joblib
-import matplotlib.pyplot as plt
-import seaborn as sns
 import os
+from src.models.artifacts import load_artifact
+from src.models.registry import resolve_model_names
+from src.utils.feature_store import read_stage_columns
 
 
 def load_model(model_name):
     """
-    Loads a trained machine learning model from a pickle file.
+    Loads a trained machine learning model from its artifact in the 'models' directory.
 
     Args:
-        model_name (str): The name of the model to load. The corresponding file should be named '{model_name}.pkl'.
+        model_name (str): The name of the model to load.
 
     Returns:
         model: The loaded machine learning model.
     """
-    # Construct the path to the model's pickle file
-    model_path = os.path.join('models', f"{model_name}.pkl")
-
-    # Load the model using joblib
-    model = joblib.load(model_path)
+    # Tree boosters come back from their native files, the other models from joblib
+    model = load_artifact(model_name, 'models')
     print(f"{model_name} model loaded successfully.")
     return model
 
@@ -52,6 +49,9 @@ def plot_feature_importance(model, model_name, X_columns, top_n=10):
         X_columns (list): List of feature names.
         top_n (int): Number of top features to display.
     """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     if model_name in ['random_forest', 'gradient_boosting', 'xgboost', 'lightgbm', 'catboost']:
         # Extract feature importances from tree-based models
         importances = model.feature_importances_
@@ -125,29 +125,25 @@ def plot_feature_importance(model, model_name, X_columns, top_n=10):
         print(f"No direct feature importance available for {model_name}.")
 
 
-def feature_importance_analysis():
+def feature_importance_analysis(model_names=None):
     """
     Performs feature importance analysis for multiple models and visualizes the top features.
+
+    Args:
+        model_names (list, optional): Models to analyze, or ['all']. Defaults to registry.DEFAULT_MODELS.
     """
     # Define the path to the processed data
-    processed_data_path = os.path.join('data', 'processed', 'cleaned_data.csv')
-
-    # Load the processed data
-    df = load_processed_data(processed_data_path)
+    processed_data_path = os.path.join('data', 'processed', 'final', 'cleaned')
 
-    # Get the feature names by excluding the target column
-    X_columns = df.drop('MatchOutcome', axis=1).columns.tolist()
+    # Get the feature names by excluding the target column; only the schema is read, not the data
+    X_columns = [column for column in read_stage_columns(processed_data_path) if column != 'MatchOutcome']
 
     # List of models to analyze
-    models = [
-        'random_forest', 'svm',
-        'catboost',
-        'knn', 'logistic_regression', 'mlp', 'naive_bayes'
-    ]
+    models = resolve_model_names(model_names)
 
     for model_name in models:
         # Only perform feature importance analysis for models that support it
-        if model_name in ['random_forest', 'catboost',
+        if model_name in ['random_forest', 'gradient_boosting', 'xgboost', 'lightgbm', 'catboost',
                           'logistic_regression', 'svm']:
             try:
                 # Load the trained model
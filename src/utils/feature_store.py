@@ -0,0 +1,253 @@
+# src/utils/feature_store.py
+
+import json
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+
+# Store formats in the order the reader looks for them; CSV is the fallback
+STORE_FORMATS = ('feather', 'parquet')
+FILE_EXTENSIONS = {'feather': '.feather', 'parquet': '.parquet', 'csv': '.csv'}
+
+
+def _stage_base(path):
+    """
+    Strips a known file extension from a stage path, so 'cleaned.csv' and 'cleaned' name the same stage.
+    """
+    root, extension = os.path.splitext(path)
+    return root if extension in FILE_EXTENSIONS.values() else path
+
+
+def _schema_path(base):
+    return f"{base}.schema.json"
+
+
+def pyarrow_available():
+    """
+    Checks whether pyarrow (needed for Feather/Parquet) is installed.
+
+    Returns:
+        bool: True if pyarrow can be imported.
+    """
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def downcast_frame(df, max_category_ratio=0.5):
+    """
+    Downcasts the columns of a DataFrame to compact dtypes.
+
+    float64 columns become float32, integer columns the smallest integer type that holds their
+    values, and text columns with few distinct values (team codes, formations, seasons) become
+    categoricals.
+
+    Args:
+        df (pd.DataFrame): Input DataFrame.
+        max_category_ratio (float, optional): Maximum ratio of distinct values to rows for a text
+            column to be stored as a categorical. Defaults to 0.5.
+
+    Returns:
+        pd.DataFrame: DataFrame with downcast columns.
+    """
+    columns = {}
+    for column in df.columns:
+        series = df[column]
+        if pd.api.types.is_float_dtype(series) and series.dtype != np.float32:
+            series = series.astype(np.float32)
+        elif pd.api.types.is_integer_dtype(series):
+            series = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            if len(series) and series.nunique(dropna=True) / len(series) <= max_category_ratio:
+                series = series.astype('category')
+        columns[column] = series
+    return pd.DataFrame(columns, index=df.index)
+
+
+def write_stage(df, path, fmt='feather', downcast=True):
+    """
+    Writes a pipeline stage to the feature store.
+
+    The frame is written as uncompressed Feather (memory-mappable without decoding) or as Parquet,
+    together with a '<stage>.schema.json' file listing the column dtypes. The file is written to a
+    temporary name and renamed, so readers never see a partially written stage. If pyarrow is not
+    installed, the stage is written as CSV instead.
+
+    Args:
+        df (pd.DataFrame): The stage data.
+        path (str): Stage path, with or without extension (e.g. 'data/processed/final/cleaned').
+        fmt (str, optional): 'feather', 'parquet' or 'csv'. Defaults to 'feather'.
+        downcast (bool, optional): Apply downcast_frame before writing. Defaults to True.
+
+    Returns:
+        str: The path of the written file.
+    """
+    if fmt not in FILE_EXTENSIONS:
+        raise ValueError(f"Unknown feature store format '{fmt}'. Choose one of {list(FILE_EXTENSIONS)}.")
+    if fmt != 'csv' and not pyarrow_available():
+        print(f"pyarrow is not installed; writing {path} as CSV instead of {fmt}.")
+        fmt = 'csv'
+
+    base = _stage_base(path)
+    directory = os.path.dirname(base)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if downcast:
+        df = downcast_frame(df)
+    # Columnar formats need unique, string column names
+    df = df.reset_index(drop=True)
+    df.columns = [str(column) for column in df.columns]
+
+    file_path = base + FILE_EXTENSIONS[fmt]
+    tmp_path = file_path + '.tmp'
+    if fmt == 'feather':
+        df.to_feather(tmp_path, compression='uncompressed')
+    elif fmt == 'parquet':
+        df.to_parquet(tmp_path, index=False)
+    else:
+        df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, file_path)
+
+    schema = {'format': fmt, 'rows': len(df), 'columns': {column: str(dtype) for column, dtype in df.dtypes.items()}}
+    with open(_schema_path(base), 'w', encoding='utf-8') as file:
+        json.dump(schema, file, indent=2)
+    return file_path
+
+
+def find_stage_file(path):
+    """
+    Locates the file backing a stage, preferring the columnar formats over an older CSV.
+
+    Args:
+        path (str): Stage path, with or without extension.
+
+    Returns:
+        tuple: (file path, format) of the stage.
+
+    Raises:
+        FileNotFoundError: If no file exists for the stage.
+    """
+    base = _stage_base(path)
+    csv_path = base + FILE_EXTENSIONS['csv'] if os.path.isfile(base + FILE_EXTENSIONS['csv']) else path
+    csv_mtime = os.path.getmtime(csv_path) if os.path.isfile(csv_path) else None
+    formats = STORE_FORMATS if pyarrow_available() else ()
+    for fmt in formats:
+        file_path = base + FILE_EXTENSIONS[fmt]
+        # A CSV rewritten after the columnar copy (e.g. by a notebook) takes precedence
+        if os.path.isfile(file_path) and (csv_mtime is None or os.path.getmtime(file_path) >= csv_mtime):
+            return file_path, fmt
+    if csv_mtime is not None:
+        return csv_path, 'csv'
+    raise FileNotFoundError(f"No feature store file or CSV found for stage '{path}'.")
+
+
+def read_stage(path, columns=None, memory_map=True):
+    """
+    Reads a pipeline stage from the feature store, falling back to CSV.
+
+    Feather files are memory-mapped, so only the projected columns are paged in; Parquet files only
+    decode the projected columns. CSV files are parsed with usecols.
+
+    Args:
+        path (str): Stage path, with or without extension.
+        columns (list, optional): Columns to load. Defaults to all columns.
+        memory_map (bool, optional): Memory-map Feather/Parquet files. Defaults to True.
+
+    Returns:
+        pd.DataFrame: The stage data.
+    """
+    file_path, fmt = find_stage_file(path)
+    if fmt == 'feather':
+        import pyarrow.feather as feather
+        table = feather.read_table(file_path, columns=columns, memory_map=memory_map)
+        return table.to_pandas()
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        return pq.read_table(file_path, columns=columns, memory_map=memory_map).to_pandas()
+    return pd.read_csv(file_path, usecols=columns)
+
+
+def iter_stage_chunks(path, chunk_size=50000, columns=None):
+    """
+    Reads a pipeline stage in chunks of rows, so stages larger than memory can be streamed.
+
+    Feather files are memory-mapped and sliced into record batches without copying, Parquet files
+    are decoded one batch at a time and CSV files are parsed with chunksize. At most one chunk is
+    materialised as a DataFrame at a time.
+
+    Args:
+        path (str): Stage path, with or without extension.
+        chunk_size (int, optional): Maximum number of rows per chunk. Defaults to 50000.
+        columns (list, optional): Columns to load. Defaults to all columns.
+
+    Yields:
+        pd.DataFrame: Consecutive chunks of the stage.
+    """
+    file_path, fmt = find_stage_file(path)
+    if fmt == 'feather':
+        import pyarrow.feather as feather
+        table = feather.read_table(file_path, columns=columns, memory_map=True)
+        for batch in table.to_batches(max_chunksize=chunk_size):
+            yield batch.to_pandas()
+    elif fmt == 'parquet':
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(file_path, memory_map=True).iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        with pd.read_csv(file_path, usecols=columns, chunksize=chunk_size) as reader:
+            yield from reader
+
+
+def read_stage_columns(path):
+    """
+    Returns the column names of a stage without loading its data.
+
+    Args:
+        path (str): Stage path, with or without extension.
+
+    Returns:
+        list: Column names.
+    """
+    file_path, fmt = find_stage_file(path)
+    schema_path = _schema_path(_stage_base(path))
+    if fmt != 'csv' and os.path.isfile(schema_path):
+        with open(schema_path, encoding='utf-8') as file:
+            return list(json.load(file)['columns'])
+    if fmt == 'feather':
+        import pyarrow.feather as feather
+        return feather.read_table(file_path, memory_map=True).schema.names
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        return pq.read_schema(file_path).names
+    return pd.read_csv(file_path, nrows=0).columns.tolist()
+
+
+def convert_csv_stages(directory, fmt='feather'):
+    """
+    Converts every CSV file below a directory into a feature store stage next to it.
+
+    Args:
+        directory (str): Root directory to scan (e.g. 'data/processed').
+        fmt (str, optional): Target format. Defaults to 'feather'.
+
+    Returns:
+        list: Paths of the written files.
+    """
+    written = []
+    for root, _, files in os.walk(directory):
+        for name in sorted(files):
+            if name.endswith('.csv'):
+                csv_path = os.path.join(root, name)
+                written.append(write_stage(pd.read_csv(csv_path), csv_path, fmt=fmt))
+                print(f"Converted {csv_path} -> {written[-1]}")
+    return written
+
+
+if __name__ == "__main__":
+    # Usage: python -m src.utils.feature_store [directory] [feather|parquet]
+    convert_csv_stages(sys.argv[1] if len(sys.argv) > 1 else os.path.join('data', 'processed'),
+                       fmt=sys.argv[2] if len(sys.argv) > 2 else 'feather')
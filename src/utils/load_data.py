@@ -1,21 +1,25 @@
 # src/data/load_data.py
 
 import pandas as pd
+from src.utils.feature_store import read_stage
 
 
 def load_raw_data(filepath):
     """
-    Loads raw data from a CSV file into a pandas DataFrame.
+    Loads raw data into a pandas DataFrame.
+
+    A Feather/Parquet copy of the file in the feature store is preferred when it is at least as new
+    as the CSV; otherwise the CSV itself is parsed.
 
     Args:
-        filepath (str): The file path to the CSV file.
+        filepath (str): The file path to the CSV file (or its feature store stage).
 
     Returns:
         pd.DataFrame: A DataFrame containing the loaded raw data.
     """
     try:
-        # Load the CSV file into a pandas DataFrame
-        df = pd.read_csv(filepath)
+        # Load the stage (columnar copy or CSV) into a pandas DataFrame
+        df = read_stage(filepath)
         print(f"Data successfully loaded from {filepath}.")
         return df
     except FileNotFoundError:
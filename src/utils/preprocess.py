@@ -1,7 +1,22 @@
 # src/data/preprocess.py
 
+import os
+import tracemalloc
+import joblib
+import numpy as np
 import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder, StandardScaler
+from sklearn.utils.validation import check_is_fitted
+
+
+# Columns that are not known before a match (or identify it) and are never used as features
+COLUMNS_TO_DROP = ['Season', 'Season.1', 'Week', 'Match Date', 'Match Date.1', 'Home Goals', 'Away Goals',
+                   'Home Performance', 'Away Performance']
+CATEGORICAL_COLUMNS = ['Home Team', 'Away Team', 'Home Formation', 'Away Formation']
+TARGET_MAPPING = {'H': 0, 'D': 1, 'A': 2}
+PREPROCESSOR_PATH = os.path.join('models', 'preprocessor.pkl')
 
 
 def remove_duplicate_columns(df):
@@ -41,6 +56,7 @@ def handle_missing_values(df):
     Fills missing values in the DataFrame.
 
     Numerical columns are filled with their median, and categorical columns are filled with their mode.
+    Downcast dtypes from the feature store (float32, small integers, categoricals) are handled as well.
 
     Args:
         df (pd.DataFrame): Input DataFrame.
@@ -48,8 +64,8 @@ def handle_missing_values(df):
     Returns:
         pd.DataFrame: DataFrame with missing values handled.
     """
-    numerical_cols = df.select_dtypes(include=['int64', 'float64']).columns
-    categorical_cols = df.select_dtypes(include=['object']).columns
+    numerical_cols = df.select_dtypes(include='number').columns
+    categorical_cols = df.select_dtypes(include=['object', 'category']).columns
 
     df[numerical_cols] = df[numerical_cols].fillna(df[numerical_cols].median())
     df[categorical_cols] = df[categorical_cols].fillna(df[categorical_cols].mode().iloc[0])
@@ -90,7 +106,7 @@ def scale_numerical_features(df, target_column, exclude_columns=None):
         pd.DataFrame: DataFrame with scaled numerical features.
     """
     scaler = StandardScaler()
-    numerical_features = df.select_dtypes(include=['int64', 'float64']).columns.tolist()
+    numerical_features = df.select_dtypes(include='number').columns.tolist()
 
     # Exclude the target column and specified columns from scaling
     columns_to_exclude = [target_column]
@@ -115,7 +131,8 @@ def encode_target_variable(df, target_column):
     Returns:
         pd.DataFrame: DataFrame with the target variable encoded.
     """
-    df[target_column] = df[target_column].map({'H': 0, 'D': 1, 'A': 2})
+    # Go through object dtype so a categorical target does not stay categorical after mapping
+    df[target_column] = df[target_column].astype(object).map(TARGET_MAPPING)
     return df
 
 
@@ -142,8 +159,7 @@ def preprocess_data(df, target_column='MatchOutcome'):
     df = remove_duplicate_columns(df)
 
     # Step 2: Drop unwanted columns
-    columns_to_drop = ['Season', 'Season.1', 'Week', 'Match Date', 'Match Date.1', 'Home Goals', 'Away Goals', 'Home Performance', 'Away Performance']
-    df = drop_columns(df, columns_to_drop)
+    df = drop_columns(df, COLUMNS_TO_DROP)
 
     # Step 3: Handle missing values
     df = handle_missing_values(df)
@@ -152,10 +168,307 @@ def preprocess_data(df, target_column='MatchOutcome'):
     df = scale_numerical_features(df, target_column, exclude_columns=['Home_Advantage'])
 
     # Step 5: Encode specified categorical columns
-    columns_to_encode = ['Home Team', 'Away Team', 'Home Formation', 'Away Formation']
-    df = encode_categorical_features(df, columns_to_encode)
+    df = encode_categorical_features(df, CATEGORICAL_COLUMNS)
 
     # Step 6: Encode the target variable
     df = encode_target_variable(df, target_column)
 
     return df
+
+
+def preprocess_data_fast(df, target_column='MatchOutcome', dtype=np.float32, report_memory=False):
+    """
+    Single-pass, memory-lean equivalent of preprocess_data.
+
+    Column deduplication and dropping only select column positions, and every remaining feature is
+    imputed, scaled or label-encoded one column at a time straight into one preallocated,
+    column-major block of dtype (float32 by default), which becomes the DataFrame's only feature
+    block without a copy. Statistics are computed in float64, so the values match preprocess_data up
+    to the output precision. Every non-numeric feature column is label-encoded (preprocess_data only
+    encodes CATEGORICAL_COLUMNS, which are the only text columns of the pipeline data).
+
+    Peak memory is roughly the input plus the output block plus one float64 column, instead of
+    several copies of the whole frame.
+
+    Args:
+        df (pd.DataFrame): Original DataFrame (not modified).
+        target_column (str, optional): Name of the target variable column. Defaults to 'MatchOutcome'.
+        dtype (np.dtype, optional): dtype of the feature block. Defaults to np.float32.
+        report_memory (bool, optional): Trace the call with tracemalloc and print its peak memory,
+            which is also stored in the result's attrs['peak_memory_mb']. Defaults to False. A trace
+            the caller already started is left running; the peak is then measured from the memory
+            traced on entry and can include an earlier peak of the caller.
+
+    Returns:
+        pd.DataFrame: Preprocessed DataFrame with the columns of preprocess_data.
+    """
+    # Only a trace started here is stopped here
+    start_trace = report_memory and not tracemalloc.is_tracing()
+    if start_trace:
+        tracemalloc.start()
+    traced_on_entry = tracemalloc.get_traced_memory()[0] if report_memory else 0
+    try:
+        ignored = set(COLUMNS_TO_DROP)
+        positions = [index for index, (column, duplicate) in enumerate(zip(df.columns, df.columns.duplicated()))
+                     if not duplicate and column not in ignored]
+        feature_positions = [index for index in positions if df.columns[index] != target_column]
+        feature_names = [df.columns[index] for index in feature_positions]
+
+        out = np.empty((len(df), len(feature_positions)), dtype=dtype, order='F')
+        for out_index, position in enumerate(feature_positions):
+            column = df.iloc[:, position]
+            if pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column):
+                values = column.to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+                missing = np.isnan(values)
+                if missing.any() and not missing.all():
+                    values[missing] = np.median(values[~missing])
+                if df.columns[position] != 'Home_Advantage':
+                    # StandardScaler: population standard deviation, constant columns left unscaled
+                    scale = values.std()
+                    values -= values.mean()
+                    if scale > 0:
+                        values /= scale
+                out[:, out_index] = values
+            else:
+                codes, categories = pd.factorize(column, sort=True)
+                missing = codes < 0
+                if missing.any() and len(categories):
+                    # Mode of the column (smallest category among the most frequent ones)
+                    codes[missing] = np.bincount(codes[~missing], minlength=len(categories)).argmax()
+                out[:, out_index] = codes
+
+        result = pd.DataFrame(out, columns=feature_names, index=df.index, copy=False)
+        kept_names = [df.columns[index] for index in positions]
+        if target_column in kept_names:
+            insert_at = kept_names.index(target_column)
+            target = df.iloc[:, positions[insert_at]]
+            result.insert(insert_at, target_column, target.astype(object).map(TARGET_MAPPING).to_numpy())
+    finally:
+        if report_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            peak = max(0, peak - traced_on_entry)
+        if start_trace:
+            tracemalloc.stop()
+    if report_memory:
+        result.attrs['peak_memory_mb'] = peak / 2 ** 20
+        print(f"preprocess_data_fast: {len(result)} rows, peak memory {peak / 2 ** 20:.1f} MiB.")
+    return result
+
+
+class Preprocessor(TransformerMixin, BaseEstimator):
+    """
+    Fitted, reusable version of preprocess_data for the feature columns.
+
+    fit learns the medians and modes used to fill missing values, the StandardScaler mean and scale
+    of the numerical columns (except the unscaled ones) and the label codes of the categorical
+    columns. transform applies them with NumPy only, so it never refits and gives the same result
+    for a single fixture as for the whole data set. Fitted on all rows, it reproduces
+    preprocess_data; the pipeline fits it on the training split only.
+
+    Categories not seen during fit (e.g. a promoted team) are encoded like the column's mode.
+    Follows the scikit-learn transformer API (get_feature_names_out, set_output), so it can be used
+    inside a ColumnTransformer or Pipeline.
+
+    Attributes:
+        feature_names_out_ (np.ndarray): Output columns, in input order.
+        numerical_columns_ (list): Numerical feature columns.
+        categorical_columns_ (list): Label-encoded feature columns.
+        medians_ (np.ndarray): Fill values of the numerical columns.
+        modes_ (dict): Fill values of the categorical columns.
+        scaled_ (np.ndarray): Positions (within numerical_columns_) of the scaled columns.
+        mean_ (np.ndarray): Scaler means of the scaled columns.
+        scale_ (np.ndarray): Scaler standard deviations of the scaled columns.
+        categories_ (dict): Sorted categories of each categorical column (the label codes).
+    """
+
+    def __init__(self, columns_to_drop=tuple(COLUMNS_TO_DROP), unscaled_columns=('Home_Advantage',),
+                 target_column='MatchOutcome', chunk_size=None):
+        """
+        Args:
+            columns_to_drop (tuple, optional): Columns ignored if present. Defaults to COLUMNS_TO_DROP.
+            unscaled_columns (tuple, optional): Numerical columns that are not scaled.
+                Defaults to ('Home_Advantage',).
+            target_column (str, optional): Target column, ignored if present. Defaults to 'MatchOutcome'.
+            chunk_size (int, optional): Rows transformed at a time, to bound the temporary memory of
+                large inputs. Defaults to all rows at once.
+        """
+        self.columns_to_drop = columns_to_drop
+        self.unscaled_columns = unscaled_columns
+        self.target_column = target_column
+        self.chunk_size = chunk_size
+
+    def fit(self, X, y=None):
+        """
+        Learns the fill values, scaler statistics and category codes.
+
+        Args:
+            X (pd.DataFrame): Feature data in the 'all_seasons_final.csv' layout.
+            y (ignored): Present for scikit-learn compatibility.
+
+        Returns:
+            Preprocessor: The fitted transformer.
+        """
+        ignored = set(self.columns_to_drop) | {self.target_column}
+        df = remove_duplicate_columns(X)
+        df = df[[column for column in df.columns if column not in ignored]]
+
+        self.feature_names_in_ = np.asarray(df.columns, dtype=object)
+        self.n_features_in_ = len(df.columns)
+        self.feature_names_out_ = self.feature_names_in_.copy()
+        self.numerical_columns_ = df.select_dtypes(include='number').columns.tolist()
+        self.categorical_columns_ = [column for column in df.columns if column not in self.numerical_columns_]
+
+        numerical = df[self.numerical_columns_].to_numpy(dtype=np.float64)
+        self.medians_ = df[self.numerical_columns_].median().to_numpy(dtype=np.float64)
+        numerical = np.where(np.isnan(numerical), self.medians_, numerical)
+
+        self.scaled_ = np.array([index for index, column in enumerate(self.numerical_columns_)
+                                 if column not in self.unscaled_columns], dtype=np.intp)
+        scaler = StandardScaler().fit(numerical[:, self.scaled_])
+        self.mean_, self.scale_ = scaler.mean_, scaler.scale_
+
+        self.modes_, self.categories_ = {}, {}
+        for column in self.categorical_columns_:
+            self.modes_[column] = str(df[column].mode().iloc[0])
+            values = df[column].astype(object).where(df[column].notna(), self.modes_[column])
+            self.categories_[column] = np.unique(values.astype(str).to_numpy())
+
+        positions = {column: index for index, column in enumerate(self.feature_names_out_)}
+        self._numerical_positions = np.array([positions[column] for column in self.numerical_columns_], dtype=np.intp)
+        self._categorical_positions = [positions[column] for column in self.categorical_columns_]
+        return self
+
+    def _transform_block(self, numerical, categorical, out):
+        """
+        Transforms one block of rows into out (float64, shape (n_rows, n_features)).
+        """
+        numerical = np.where(np.isnan(numerical), self.medians_, numerical)
+        numerical[:, self.scaled_] -= self.mean_
+        numerical[:, self.scaled_] /= self.scale_
+        out[:, self._numerical_positions] = numerical
+
+        for index, column in enumerate(self.categorical_columns_):
+            categories = self.categories_[column]
+            values = categorical[:, index]
+            missing = pd.isna(values)
+            values = np.where(missing, self.modes_[column], values).astype(str)
+            codes = np.searchsorted(categories, values)
+            codes = np.minimum(codes, len(categories) - 1)
+            unknown = categories[codes] != values
+            if unknown.any():
+                codes[unknown] = np.searchsorted(categories, self.modes_[column])
+            out[:, self._categorical_positions[index]] = codes
+
+    def transform(self, X):
+        """
+        Transforms feature data with the fitted statistics.
+
+        Args:
+            X (pd.DataFrame): Feature data; missing feature columns are treated as missing values and
+                extra columns (dropped columns, the target) are ignored.
+
+        Returns:
+            np.ndarray: float64 array of shape (n_rows, n_features), or a DataFrame with the
+            get_feature_names_out columns after set_output(transform='pandas').
+        """
+        check_is_fitted(self, 'feature_names_out_')
+        df = remove_duplicate_columns(X)
+        try:
+            numerical = df.reindex(columns=self.numerical_columns_).to_numpy(dtype=np.float64)
+        except (TypeError, ValueError):
+            numerical = (df.reindex(columns=self.numerical_columns_).apply(pd.to_numeric, errors='coerce')
+                         .to_numpy(dtype=np.float64))
+        categorical = df.reindex(columns=self.categorical_columns_).to_numpy(dtype=object)
+
+        out = np.empty((len(df), len(self.feature_names_out_)), dtype=np.float64)
+        step = self.chunk_size or max(len(df), 1)
+        for start in range(0, len(df), step):
+            rows = slice(start, start + step)
+            self._transform_block(numerical[rows], categorical[rows], out[rows])
+        return out
+
+    def iter_transform(self, chunks):
+        """
+        Transforms an iterable of DataFrames (e.g. pd.read_csv(..., chunksize=n)) chunk by chunk.
+
+        Args:
+            chunks (iterable): DataFrames in the training layout.
+
+        Yields:
+            pd.DataFrame: The transformed chunk, indexed like the input chunk.
+        """
+        for chunk in chunks:
+            yield pd.DataFrame(np.asarray(self.transform(chunk)), columns=self.get_feature_names_out(),
+                               index=chunk.index)
+
+    def get_feature_names_out(self, input_features=None):
+        check_is_fitted(self, 'feature_names_out_')
+        return self.feature_names_out_.copy()
+
+    def save(self, path=PREPROCESSOR_PATH):
+        """
+        Saves the fitted transformer next to the models.
+
+        Args:
+            path (str, optional): Destination file. Defaults to 'models/preprocessor.pkl'.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        joblib.dump(self, path)
+        print(f"Preprocessor saved to {path}.")
+
+    @staticmethod
+    def load(path=PREPROCESSOR_PATH):
+        """
+        Loads a transformer saved by save().
+
+        Args:
+            path (str, optional): File to load. Defaults to 'models/preprocessor.pkl'.
+
+        Returns:
+            Preprocessor: The fitted transformer.
+        """
+        return joblib.load(path)
+
+
+def split_data(df_processed, target_column='MatchOutcome'):
+    """
+    Splits the cleaned data into stratified training and testing sets (80/20, random_state=42).
+
+    Args:
+        df_processed (pd.DataFrame): The preprocessed data.
+        target_column (str, optional): The target column. Defaults to 'MatchOutcome'.
+
+    Returns:
+        tuple: (X_train, X_test, y_train, y_test)
+    """
+    X = df_processed.drop(target_column, axis=1)
+    y = df_processed[target_column]
+    return train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+
+
+def fit_preprocessing(df_raw, target_column='MatchOutcome', preprocessor_path=PREPROCESSOR_PATH):
+    """
+    Fits the Preprocessor on the training split only and transforms all rows with it.
+
+    The fitted Preprocessor is saved next to the models, so predictions on new fixtures use exactly
+    the transform the models were trained with.
+
+    Args:
+        df_raw (pd.DataFrame): The combined data ('all_seasons_final.csv').
+        target_column (str, optional): The target column. Defaults to 'MatchOutcome'.
+        preprocessor_path (str, optional): Where to save the Preprocessor. Defaults to 'models/preprocessor.pkl'.
+
+    Returns:
+        pd.DataFrame: The cleaned data (features and encoded target), row-aligned with df_raw.
+    """
+    df = encode_target_variable(remove_duplicate_columns(df_raw).copy(), target_column)
+    # Same rows as split_data on the cleaned data: the split only depends on the target and row order
+    X_train_raw, _, _, _ = split_data(df, target_column)
+    preprocessor = Preprocessor(target_column=target_column).set_output(transform='pandas').fit(X_train_raw)
+    preprocessor.save(preprocessor_path)
+
+    df_cleaned = preprocessor.transform(df.drop(columns=target_column))
+    df_cleaned[target_column] = df[target_column].to_numpy()
+    return df_cleaned
@@ -0,0 +1,52 @@
+# tests/test_artifacts.py
+
+import json
+import os
+import joblib
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.neighbors import KNeighborsClassifier
+from src.models.artifacts import artifact_files, list_artifacts, load_artifact, save_artifact
+from src.serving.predictor import ModelPredictor
+
+
+@pytest.fixture
+def data():
+    return make_classification(n_samples=3000, n_features=20, n_informative=8, n_classes=3, random_state=0)
+
+
+def test_joblib_artifacts_round_trip(data, tmp_path):
+    X, y = data
+    knn = KNeighborsClassifier().fit(X, y)
+    metadata = save_artifact(knn, 'knn', str(tmp_path))
+    assert metadata['format'] == 'joblib' and metadata['file'] == 'knn.pkl'
+    assert metadata['size_bytes'] == os.path.getsize(tmp_path / 'knn.pkl')
+    assert metadata['load_seconds'] >= 0 and 'sklearn' in metadata['versions']
+    with open(tmp_path / 'knn.json', encoding='utf-8') as file:
+        assert json.load(file) == metadata
+
+    loaded = load_artifact('knn', str(tmp_path))
+    np.testing.assert_array_equal(loaded.predict_proba(X[:200]), knn.predict_proba(X[:200]))
+    if metadata['mmap']:
+        assert isinstance(loaded._fit_X, np.memmap)
+
+    forest = RandomForestClassifier(n_estimators=20, random_state=0).fit(X, y)
+    compressed = save_artifact(forest, 'random_forest', str(tmp_path), compress=3)
+    assert not compressed['mmap'] and compressed['compress'] == 3
+    joblib.dump(forest, tmp_path / 'uncompressed.pkl')
+    assert compressed['size_bytes'] < os.path.getsize(tmp_path / 'uncompressed.pkl')
+    np.testing.assert_array_equal(load_artifact('random_forest', str(tmp_path)).predict(X), forest.predict(X))
+
+
+def test_models_saved_without_metadata_still_load(data, tmp_path):
+    X, y = data
+    joblib.dump(KNeighborsClassifier().fit(X, y), tmp_path / 'legacy.pkl')
+    joblib.dump({'not': 'a model'}, tmp_path / 'preprocessor.pkl')
+    save_artifact(KNeighborsClassifier().fit(X, y), 'knn', str(tmp_path))
+    assert list_artifacts(str(tmp_path)) == ['knn', 'legacy']
+    assert artifact_files('legacy', str(tmp_path)) == [str(tmp_path / 'legacy.pkl')]
+    assert load_artifact('legacy', str(tmp_path)).predict(X[:5]).shape == (5,)
+    with pytest.raises(FileNotFoundError):
+        ModelPredictor(['missing'], models_dir=str(tmp_path))
@@ -0,0 +1,45 @@
+# tests/test_backtest.py
+
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from src.models.naive_bayes import get_naive_bayes_model
+from src.models.sgd_logistic_regression import get_sgd_logistic_regression_model
+from src.pipeline.backtest import round_steps, walk_forward_backtest, walk_forward_folds
+from src.utils.load_data import load_raw_data
+
+
+FINAL_PATH = os.path.join('data', 'processed', 'final', 'all_seasons_final.csv')
+
+
+def test_folds_walk_forward_through_seasons():
+    df = pd.DataFrame({'Season': ['21/22', '20/21', '20/21', '21/22'],
+                       'Week': ['Round 1', 'Round 10', 'Round 2', 'Round 2']})
+    steps = round_steps(df)
+    assert list(steps) == [2101, 2010, 2002, 2102]
+    folds = walk_forward_folds(steps, min_train_rounds=2, rounds_per_fold=1)
+    assert [int(first) for first, _ in folds] == [2101, 2102]
+
+
+@pytest.mark.skipif(not os.path.isfile(FINAL_PATH), reason="combined data not available")
+@pytest.mark.parametrize('mode', ['retrain', 'incremental'])
+def test_backtest_reports_every_round(tmp_path, mode):
+    df = load_raw_data(FINAL_PATH)
+    n_rounds = len(np.unique(round_steps(df.loc[:, ~df.columns.duplicated()])))
+    models = [get_naive_bayes_model(), get_sgd_logistic_regression_model()]
+    options = dict(min_train_rounds=n_rounds - 4, rounds_per_fold=2, mode=mode, n_jobs=1,
+                   cache_dir=str(tmp_path / 'cache'), reports_dir=str(tmp_path / 'reports'))
+
+    per_round, summary = walk_forward_backtest(df, models, **options)
+    assert list(per_round.columns) == ['Model', 'Season', 'Week', 'Matches', 'Accuracy', 'LogLoss']
+    assert len(per_round) == 2 * 4
+    assert set(per_round['Season']) == {'23/24'}
+    assert (summary['Rounds'] == 4).all()
+    assert per_round['Accuracy'].between(0, 1).all()
+    assert os.path.isfile(tmp_path / 'reports' / 'backtest_rounds.csv')
+    assert len(os.listdir(tmp_path / 'cache')) == 2 * 2
+
+    # The second run reads every fold model from the cache and gives the same results
+    cached_round, _ = walk_forward_backtest(df, models, **options)
+    pd.testing.assert_frame_equal(cached_round, per_round)
@@ -0,0 +1,67 @@
+# tests/test_evaluation.py
+
+import os
+import subprocess
+import sys
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.metrics import accuracy_score, confusion_matrix, f1_score, log_loss
+from sklearn.naive_bayes import GaussianNB
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.svm import SVC
+from src.utils.evaluation import compute_metrics, evaluate_saved_models, predict_models
+
+
+@pytest.fixture
+def fitted():
+    X, y = make_classification(n_samples=400, n_features=6, n_informative=4, n_classes=3, random_state=0)
+    X = pd.DataFrame(X, columns=[f'f{i}' for i in range(6)])
+    models = {name: model.fit(X[:300], y[:300]) for name, model in
+              [('naive_bayes', GaussianNB()), ('svm', SVC()), ('knn', KNeighborsClassifier())]}
+    return models, X[300:], y[300:]
+
+
+def test_metrics_match_sklearn(fitted):
+    models, X_test, y_test = fitted
+    predictions = predict_models(models, X_test)
+    metrics, confusion = compute_metrics(y_test, predictions)
+    for row, (name, model) in enumerate(models.items()):
+        y_pred = model.predict(X_test)
+        assert metrics.loc[row, 'Accuracy'] == pytest.approx(accuracy_score(y_test, y_pred))
+        assert metrics.loc[row, 'MacroF1'] == pytest.approx(f1_score(y_test, y_pred, average='macro'))
+        assert metrics.loc[row, 'LogLoss'] == pytest.approx(
+            log_loss(y_test, predictions.probabilities[row], labels=[0, 1, 2]))
+        np.testing.assert_array_equal(confusion[row], confusion_matrix(y_test, y_pred))
+    # SVC has no predict_proba: its probabilities are one-hot, so its Brier score is 2 * error rate
+    assert metrics.loc[1, 'Brier'] == pytest.approx(2 * (1 - metrics.loc[1, 'Accuracy']))
+
+
+def test_evaluate_saved_models_writes_one_table(fitted, tmp_path, monkeypatch):
+    models, X_test, y_test = fitted
+    for name, model in models.items():
+        joblib.dump(model, tmp_path / f"{name}.pkl")
+    options = dict(models_dir=str(tmp_path), reports_dir=str(tmp_path / 'reports'),
+                   cache_dir=str(tmp_path / 'cache'))
+
+    metrics = evaluate_saved_models(list(models) + ['missing'], X_test, y_test, **options)
+    assert list(metrics['Model']) == list(models)
+    table = pd.read_csv(tmp_path / 'reports' / 'model_metrics.csv')
+    assert list(table.columns) == ['Model', 'Accuracy', 'MacroF1', 'LogLoss', 'Brier']
+    cells = pd.read_csv(tmp_path / 'reports' / 'model_confusion_matrices.csv')
+    assert cells.groupby('Model')['Count'].sum().eq(len(y_test)).all()
+
+    # The prediction matrix is cached; the second evaluation does not load any model
+    def fail(path):
+        raise AssertionError(f"{path} was loaded")
+    monkeypatch.setattr(joblib, 'load', fail)
+    cached = evaluate_saved_models(list(models), X_test, y_test, **options)
+    pd.testing.assert_frame_equal(cached, metrics)
+
+
+def test_evaluation_does_not_import_matplotlib():
+    code = ("import sys, src.utils.evaluation, src.utils.compare_models, src.utils.feature_importance; "
+            "sys.exit('matplotlib' in sys.modules)")
+    assert subprocess.run([sys.executable, '-c', code], env={**os.environ, 'PYTHONPATH': '.'}).returncode == 0
@@ -0,0 +1,82 @@
+# tests/test_feature_store.py
+
+import os
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from src.utils.feature_store import (convert_csv_stages, find_stage_file, iter_stage_chunks, read_stage,
+                                     read_stage_columns, write_stage)
+
+
+pytest.importorskip('pyarrow')
+
+
+@pytest.fixture
+def stage():
+    return pd.DataFrame({
+        'Home Team': ['gala', 'fene', 'besi', 'gala'] * 5,
+        'Home Form': np.linspace(0.0, 1.0, 20),
+        'Week': np.arange(1, 21, dtype=np.int64),
+        'Player': [f"player {i}" for i in range(20)],
+    })
+
+
+@pytest.mark.parametrize('fmt', ['feather', 'parquet'])
+def test_roundtrip_downcasts_dtypes(stage, tmp_path, fmt):
+    path = write_stage(stage, str(tmp_path / 'cleaned.csv'), fmt=fmt)
+    assert path == str(tmp_path / f'cleaned.{fmt}')
+
+    result = read_stage(str(tmp_path / 'cleaned'))
+    assert result['Home Form'].dtype == np.float32
+    assert result['Week'].dtype == np.int8
+    # Few distinct teams become a categorical whose codes map back to the same values
+    assert isinstance(result['Home Team'].dtype, pd.CategoricalDtype)
+    assert list(result['Home Team'].cat.categories[result['Home Team'].cat.codes]) == list(stage['Home Team'])
+    # A column with a distinct value per row stays text
+    assert not isinstance(result['Player'].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(result.astype({'Home Team': object, 'Home Form': np.float64, 'Week': np.int64,
+                                                 'Player': object}), stage, check_dtype=False)
+
+
+def test_columns_are_projected(stage, tmp_path):
+    write_stage(stage, str(tmp_path / 'cleaned'))
+    assert read_stage_columns(str(tmp_path / 'cleaned')) == list(stage.columns)
+
+    projected = read_stage(str(tmp_path / 'cleaned'), columns=['Week', 'Home Form'])
+    assert list(projected.columns) == ['Week', 'Home Form']
+    chunks = list(iter_stage_chunks(str(tmp_path / 'cleaned'), chunk_size=8, columns=['Week']))
+    assert [len(chunk) for chunk in chunks] == [8, 8, 4]
+    assert pd.concat(chunks)['Week'].tolist() == list(range(1, 21))
+
+
+def test_csv_fallback_and_newer_csv_wins(stage, tmp_path):
+    csv_path = str(tmp_path / 'cleaned.csv')
+    stage.to_csv(csv_path, index=False)
+    assert find_stage_file(str(tmp_path / 'cleaned')) == (csv_path, 'csv')
+    assert read_stage_columns(csv_path) == list(stage.columns)
+    assert read_stage(csv_path, columns=['Week'])['Week'].tolist() == list(range(1, 21))
+
+    feather_path = write_stage(stage, csv_path)
+    assert find_stage_file(csv_path) == (feather_path, 'feather')
+
+    # A CSV rewritten after the columnar copy (e.g. by a notebook) is read instead
+    later = time.time() + 10
+    os.utime(csv_path, (later, later))
+    assert find_stage_file(csv_path) == (csv_path, 'csv')
+
+    with pytest.raises(FileNotFoundError):
+        find_stage_file(str(tmp_path / 'missing'))
+
+
+def test_convert_csv_stages(stage, tmp_path):
+    os.makedirs(tmp_path / 'final')
+    stage.to_csv(tmp_path / 'all_seasons.csv', index=False)
+    stage.head(5).to_csv(tmp_path / 'final' / 'cleaned.csv', index=False)
+    (tmp_path / 'notes.txt').write_text('not a stage')
+
+    written = convert_csv_stages(str(tmp_path), fmt='parquet')
+    assert sorted(written) == sorted([str(tmp_path / 'all_seasons.parquet'),
+                                      str(tmp_path / 'final' / 'cleaned.parquet')])
+    assert len(read_stage(str(tmp_path / 'final' / 'cleaned'))) == 5
+    assert os.path.isfile(tmp_path / 'final' / 'cleaned.schema.json')
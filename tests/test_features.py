@@ -0,0 +1,162 @@
+# tests/test_features.py
+
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from src.features.incremental import IncrementalFormEngine, update_featured_season
+from src.features.form import (compute_form_features, create_features_for_season, form_feature_names, match_points,
+                               parse_match_dates)
+from src.features.player_join import attach_player_attributes, build_player_table, process_season
+
+
+PROCESSED_PATH = os.path.join('data', 'processed', 'all_season', '23_24_processed.csv')
+FEATURED_PATH = os.path.join('data', 'processed', 'featured', '23_24_featured.csv')
+RAW_DIR = os.path.join('data', 'raw')
+
+
+def test_match_points():
+    points = match_points(np.array([2, 1, 0]), np.array([0, 1, 3]))
+    assert points.tolist() == [3, 1, 0]
+
+
+def test_form_window_includes_current_match():
+    df = pd.DataFrame({
+        'Match Date': ['01/08/23', '08/08/23', '15/08/23'],
+        'Home Team': ['a', 'b', 'a'],
+        'Away Team': ['b', 'a', 'b'],
+        'Home Goals': [2, 1, 0],
+        'Away Goals': [0, 1, 0],
+        'Home_AvgAge': [25.0, 26.0, np.nan],
+        'Away_AvgAge': [27.0, 24.0, 28.0],
+        'Home_AvgValue': [1.0, 2.0, 3.0],
+        'Away_AvgValue': [4.0, 5.0, 6.0],
+        'Home_AvgRating': [7.0, 7.0, 7.0],
+        'Away_AvgRating': [6.0, 6.0, 6.0],
+    })
+    form = compute_form_features(df)
+    # Team a: win, draw, draw -> 3, 4, 5 points; team b: loss, draw, draw -> 0, 1, 2 points
+    assert form['Home_Points_Last5'].tolist() == [3, 1, 5]
+    assert form['Away_Points_Last5'].tolist() == [0, 4, 2]
+    # NaN ages are skipped by the rolling mean, as in pandas
+    assert form.loc[2, 'Home_AvgAge_Last5'] == pytest.approx((25.0 + 24.0) / 2)
+
+
+@pytest.mark.skipif(not os.path.exists(PROCESSED_PATH), reason="processed season data not available")
+def test_matches_notebook_output():
+    result = create_features_for_season(pd.read_csv(PROCESSED_PATH))
+    expected = pd.read_csv(FEATURED_PATH)
+    assert len(result) == len(expected)
+    columns = form_feature_names('Home') + form_feature_names('Away') + ['Home_AvgAge', 'Value_Diff', 'Rating_Diff']
+    np.testing.assert_allclose(result[columns].to_numpy(), expected[columns].to_numpy(), rtol=1e-9, atol=1e-9)
+    assert not any(column.endswith(('_x', '_y')) for column in result.columns)
+
+
+@pytest.mark.skipif(not os.path.exists(PROCESSED_PATH), reason="processed season data not available")
+def test_incremental_engine_matches_full_recompute():
+    processed = pd.read_csv(PROCESSED_PATH)
+    expected = create_features_for_season(processed)
+
+    # Feed the matches in the order they were played, about one round (9 matches) at a time;
+    # postponed matches arrive with the round in which they were actually played
+    engine = IncrementalFormEngine()
+    played = processed.iloc[np.argsort(parse_match_dates(processed['Match Date']).to_numpy(), kind='stable')]
+    parts = [engine.ingest(played.iloc[start:start + 9]) for start in range(0, len(played), 9)]
+    result = pd.concat(parts).loc[expected.index]
+
+    assert list(result.columns) == list(expected.columns)
+    columns = form_feature_names('Home') + form_feature_names('Away')
+    np.testing.assert_allclose(result[columns].to_numpy(), expected[columns].to_numpy(), rtol=1e-9)
+
+
+@pytest.mark.skipif(not os.path.exists(PROCESSED_PATH), reason="processed season data not available")
+def test_update_featured_season_appends_recomputed_rows(tmp_path):
+    from src.pipeline.backtest import round_steps
+    from src.pipeline.stages import combine_seasons
+
+    processed = pd.read_csv(PROCESSED_PATH)
+    expected = create_features_for_season(processed)
+    # The five matches played last arrive after the featured files were written
+    order = np.argsort(parse_match_dates(processed['Match Date']).to_numpy(), kind='stable')
+    new, history = processed.iloc[order[-5:]], processed.iloc[order[:-5]]
+    columns = form_feature_names('Home') + form_feature_names('Away')
+
+    # A featured file built by the pipeline and one written by the notebooks (with merge columns)
+    pipeline_path = tmp_path / 'pipeline_featured.csv'
+    create_features_for_season(history).to_csv(pipeline_path, index=False)
+    notebook_path = tmp_path / 'notebook_featured.csv'
+    notebook = pd.read_csv(FEATURED_PATH)
+    keys = list(zip(new['Week'], new['Home Team']))
+    notebook[[key not in keys for key in zip(notebook['Week'], notebook['Home Team'])]].to_csv(notebook_path,
+                                                                                                 index=False)
+    final_path = tmp_path / 'all_seasons_final.csv'
+    combine_seasons([str(notebook_path)], [str(final_path)])
+
+    for path, final in ((pipeline_path, None), (notebook_path, final_path)):
+        appended = update_featured_season(new, str(path), str(tmp_path / f'{path.stem}.pkl'), history=history,
+                                          final_path=None if final is None else str(final))
+        np.testing.assert_allclose(appended[columns].to_numpy(), expected.loc[new.index, columns].to_numpy(),
+                                   rtol=1e-9)
+        rows = pd.read_csv(path).tail(5)
+        np.testing.assert_allclose(rows[columns].to_numpy(), expected.loc[new.index, columns].to_numpy(), rtol=1e-9)
+        assert list(rows['Season']) == list(new['Season'])
+
+    rows = pd.read_csv(notebook_path).tail(5)
+    assert list(rows['Season_x']) == list(rows['Season_y']) == list(new['Season'])
+    assert list(rows['Match Date_x']) == list(new['Match Date'])
+    assert list(rows['Match Date_y']) == list(rows['Match Date'])
+    assert list(rows['Match Date']) == list(parse_match_dates(new['Match Date']).dt.strftime('%Y-%m-%d'))
+
+    final = pd.read_csv(final_path)
+    assert len(final) == len(processed) and final['Season'].notna().all()
+    assert list(final.tail(5)['MatchOutcome']) == ['H' if home > away else 'A' if home < away else 'D'
+                                                   for home, away in zip(new['Home Goals'], new['Away Goals'])]
+    assert len(np.unique(round_steps(final))) == final['Week'].nunique()
+
+
+def test_incremental_engine_rejects_older_matches():
+    engine = IncrementalFormEngine()
+    engine._push('a', pd.Timestamp('2023-08-10'), (1, 3, 25.0, 1.0, 7.0))
+    with pytest.raises(ValueError):
+        engine._push('a', pd.Timestamp('2023-08-01'), (0, 0, 25.0, 1.0, 7.0))
+
+
+def test_player_join_resolves_every_slot():
+    teams_and_players = pd.DataFrame({
+        'Season': ['23/24'] * 3,
+        'Team Name': ['Galatasaray', 'Galatasaray', 'Karagümrük'],
+        'Player Name': ['Dries Mertens', 'Mauro Icardi', 'Ahmed Touba'],
+        'Player Rating': [7.6, 7.5, 6.9],
+    })
+    marketvalue_and_age = pd.DataFrame({
+        'Team Name': ['Galatasaray', 'Galatasaray', 'Karagümrük'],
+        'Player Name': ['Dries Mertens', 'Mauro Icardi', 'Ahmed Touba'],
+        'Age': ['37', '31', '-'],
+        'Market Value': ['1.80 mil. €', '13.00 mil. €', '900 bin €'],
+    })
+    matches = pd.DataFrame({
+        'Home Team': ['Galatasaray'], 'Away Team': ['Karagümrük'],
+        'Home Players': ['D. Mertens; (c) M. Icardi'], 'Away Players': ['A. Touba; X. Unknown'],
+    })
+    table = build_player_table(teams_and_players, marketvalue_and_age)
+    result = attach_player_attributes(matches, table, max_players=3)
+
+    assert result[['Home Team', 'Away Team']].iloc[0].tolist() == ['gala', 'fati']
+    # Same scale as the notebook's convert_market_value ('1.80 mil. €' -> 180e6)
+    assert result['Home_Player_1_TeamPlayer_MarketValue'][0] == 180e6
+    assert result['Home_Player_2_TeamPlayer_Rating'][0] == 7.5
+    # A '-' marks the entry unknown, so the age falls back to the team mean (of one unknown player: NaN)
+    assert np.isnan(result['Away_Player_1_TeamPlayer_Age'][0])
+    assert result['Away_Player_1_TeamPlayer_Rating'][0] == 6.9
+    assert np.isnan(result['Away_Player_2_TeamPlayer_Rating'][0])
+    assert np.isnan(result['Home_Player_3_TeamPlayer_Age'][0])
+
+
+@pytest.mark.skipif(not os.path.isdir(os.path.join(RAW_DIR, '23_24')), reason="raw season data not available")
+def test_player_join_matches_processed_season():
+    result = process_season(RAW_DIR, '23_24')
+    expected = pd.read_csv(PROCESSED_PATH)
+    assert list(result.columns) == list(expected.columns)
+    assert result['Home Team'].tolist() == expected['Home Team'].tolist()
+    numeric = expected.select_dtypes('number').columns
+    np.testing.assert_allclose(result[numeric].to_numpy(float), expected[numeric].to_numpy(float), rtol=1e-7)
@@ -0,0 +1,83 @@
+# tests/test_folds.py
+
+import os
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.exceptions import FitFailedWarning
+from sklearn.neighbors import KNeighborsClassifier
+from src.models.base_model import BaseModel
+from src.models.folds import FoldManager
+from src.models.search import run_search
+from src.pipeline.scheduler import TrainingScheduler
+
+
+PARAM_GRID = {
+    'n_neighbors': [3, 5, 7, 9],
+    'weights': ['uniform', 'distance'],
+}
+
+
+@pytest.fixture
+def data():
+    X, y = make_classification(n_samples=300, n_features=6, n_informative=4, n_classes=3, random_state=0)
+    return X, y
+
+
+def test_fold_manager_materialises_folds_once(data, tmp_path):
+    X, y = data
+    manager = FoldManager(cache_dir=str(tmp_path))
+    folds = manager.get(X, y)
+    X_train, y_train, X_val, y_val = folds.fold(0)
+    train_idx, val_idx = folds.splits[0]
+    np.testing.assert_array_equal(X_train, X[train_idx])
+    np.testing.assert_array_equal(y_val, y[val_idx])
+    assert isinstance(X_train, np.memmap) and X_train.flags['C_CONTIGUOUS']
+
+    # A new manager (e.g. a later run) reads the stored folds back instead of recomputing them
+    reloaded = FoldManager(cache_dir=str(tmp_path)).get(X, y)
+    assert reloaded.directory == folds.directory
+    assert all(np.array_equal(a[1], b[1]) for a, b in zip(reloaded.splits, folds.splits))
+
+
+def test_fold_grid_search_matches_grid_search_cv(data, tmp_path):
+    from sklearn.model_selection import GridSearchCV
+    X, y = data
+    folds = FoldManager(cache_dir=str(tmp_path)).get(X, y)
+    search = run_search('grid', KNeighborsClassifier(), PARAM_GRID, X, y, cv=folds, n_jobs=1, verbose=0)
+    reference = GridSearchCV(KNeighborsClassifier(), PARAM_GRID, cv=5, scoring='accuracy').fit(X, y)
+    assert search.best_params_ == reference.best_params_
+    np.testing.assert_allclose(search.cv_results_['mean_test_score'], reference.cv_results_['mean_test_score'])
+
+
+def test_fold_arrays_are_temporary_unless_cached(data, tmp_path, monkeypatch):
+    X, y = data
+    monkeypatch.chdir(tmp_path)
+    manager = FoldManager()
+    BaseModel(KNeighborsClassifier(), {'n_neighbors': [3]}, 'knn', fold_manager=manager).train(X, y)
+    assert not os.path.exists('models')
+    directory = manager.get(X, y).directory
+    assert os.path.isdir(directory)
+    del manager
+    assert not os.path.exists(directory)
+
+
+@pytest.mark.parametrize('use_scheduler', [False, True])
+def test_failed_fits_warn_and_raise_when_all_fail(data, tmp_path, monkeypatch, use_scheduler):
+    X, y = data
+    monkeypatch.chdir(tmp_path)
+
+    def train(param_grid):
+        model = BaseModel(KNeighborsClassifier(), param_grid, 'knn', fold_manager=FoldManager())
+        if use_scheduler:
+            TrainingScheduler(n_workers=1, fold_manager=model.fold_manager).run([model], X, y)
+        else:
+            model.train(X, y)
+        return model
+
+    # n_neighbors=0 cannot be fitted
+    with pytest.warns(FitFailedWarning, match='5 fits failed out of a total of 10'):
+        model = train({'n_neighbors': [0, 5]})
+    assert model.grid_search.best_params_ == {'n_neighbors': 5}
+    with pytest.raises(ValueError, match='All the 5 fits failed'):
+        train({'n_neighbors': [0]})
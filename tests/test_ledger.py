@@ -0,0 +1,85 @@
+# tests/test_ledger.py
+
+import time
+import pandas as pd
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.neighbors import KNeighborsClassifier
+from src.models.base_model import BaseModel
+from src.models.folds import FoldManager
+from src.models.ledger import LEDGER_COLUMNS, CVLedger, run_warm_start_search
+from src.models.search import run_search
+
+
+@pytest.fixture
+def data():
+    X, y = make_classification(n_samples=300, n_features=6, n_informative=4, n_classes=3, random_state=0)
+    return X, y
+
+
+def test_warm_start_only_scores_new_candidates(data, tmp_path, monkeypatch):
+    X, y = data
+    monkeypatch.chdir(tmp_path)
+    BaseModel(KNeighborsClassifier(), {'n_neighbors': [3, 5]}, 'knn').train(X, y, warm_start=True)
+
+    grown = BaseModel(KNeighborsClassifier(), {'n_neighbors': [3, 5, 7]}, 'knn')
+    grown.train(X, y, warm_start=True)
+    reference = run_search('grid', KNeighborsClassifier(), {'n_neighbors': [3, 5, 7]}, X, y, n_jobs=1, verbose=0)
+
+    ledger = CVLedger('knn').load()
+    assert ledger['params_key'].nunique() == 3 and len(ledger) == 3 * 5
+    assert grown.grid_search.best_params_ == reference.best_params_
+    assert list(grown.grid_search.cv_results_['mean_test_score']) == pytest.approx(
+        list(reference.cv_results_['mean_test_score']))
+
+
+def test_ledger_keeps_one_layout_across_grids_and_folds(data, tmp_path, monkeypatch):
+    X, y = data
+    monkeypatch.chdir(tmp_path)
+    BaseModel(KNeighborsClassifier(), {'n_neighbors': [3, 5]}, 'knn').train(X, y, warm_start=True)
+    # Another grid on three folds appends to the same file without shifting its columns
+    three_folds = BaseModel(KNeighborsClassifier(), {'n_neighbors': [3], 'weights': ['uniform', 'distance']}, 'knn',
+                            fold_manager=FoldManager(cv=3))
+    three_folds.train(X, y, warm_start=True)
+
+    ledger = CVLedger('knn')
+    raw = pd.read_csv(ledger.path)
+    assert raw.columns.tolist() == LEDGER_COLUMNS and len(raw) == 2 * 5 + 2 * 3
+    assert sorted(raw.groupby('split_hash')['fold'].max()) == [2, 4]
+    rerun = BaseModel(KNeighborsClassifier(), {'n_neighbors': [3], 'weights': ['uniform', 'distance']}, 'knn',
+                      fold_manager=FoldManager(cv=3))
+    rerun.train(X, y, warm_start=True)
+    assert len(pd.read_csv(ledger.path)) == len(raw)
+    assert rerun.grid_search.best_params_ == three_folds.grid_search.best_params_
+
+
+class SlowDistanceKNN(KNeighborsClassifier):
+    """
+    KNN whose distance-weighted fits are slow, so the default-parameter probe fit underestimates them.
+    """
+
+    def fit(self, X, y):
+        if self.weights == 'distance':
+            time.sleep(0.1)
+        return super().fit(X, y)
+
+
+@pytest.mark.parametrize('precomputed_folds', [False, True])
+def test_warm_start_respects_the_time_budget(data, tmp_path, monkeypatch, precomputed_folds):
+    X, y = data
+    monkeypatch.chdir(tmp_path)
+    grid = {'n_neighbors': [3, 5, 7], 'weights': ['distance']}
+    cv = FoldManager(cache_dir=str(tmp_path)).get(X, y) if precomputed_folds else 5
+    model = BaseModel(SlowDistanceKNN(), grid, 'knn', time_budget=0.2)
+    start = time.perf_counter()
+    search = run_warm_start_search(model, X, y, cv=cv, n_jobs=1, verbose=0)
+    # Every candidate takes 0.5s over 5 folds; only the first one starts before the deadline
+    assert time.perf_counter() - start < 1.2
+    assert len(search.cv_results_['params']) == 1
+    assert CVLedger('knn').load()['params_key'].nunique() == 1
+
+    # The next run without a budget scores the remaining candidates
+    model.time_budget = None
+    search = run_warm_start_search(model, X, y, cv=cv, n_jobs=1, verbose=0)
+    assert len(search.cv_results_['params']) == 3
+    assert len(CVLedger('knn').load()) == 3 * 5
@@ -0,0 +1,70 @@
+# tests/test_locators.py
+
+import time
+import pytest
+from selenium.common.exceptions import TimeoutException
+from src.data.locators import READ_FIELDS_SCRIPT, Locator, PageMetrics, get_locator
+
+
+FIELDS = {'home_team': ('./div[1]/bdi', 'text'), 'away_team': ('./div[2]/bdi', 'text')}
+
+
+class ScriptedDriver:
+    """
+    Answers execute_script with the result the page would have `after` seconds after the call
+    that started the wait: nothing at first, then the complete rows.
+    """
+
+    def __init__(self, ready_after):
+        self.ready_after = ready_after
+        self.calls = []
+        self.started = None
+
+    def execute_script(self, script, rows_xpath, fields, context):
+        assert script == READ_FIELDS_SCRIPT
+        self.calls.append((rows_xpath, fields, context))
+        if self.started is None:
+            self.started = time.perf_counter()
+        if time.perf_counter() - self.started < self.ready_after:
+            return []
+        return [{'home_team': 'Galatasaray', 'away_team': 'Kasımpaşa'}]
+
+
+def test_rows_are_read_in_one_round_trip_per_poll():
+    driver = ScriptedDriver(ready_after=0.0)
+    metrics = PageMetrics()
+    locator = Locator(driver, metrics=metrics)
+    with metrics.page('Round 1'):
+        rows = locator.wait_rows('//table/a', FIELDS, label='match rows')
+    assert rows == [{'home_team': 'Galatasaray', 'away_team': 'Kasımpaşa'}]
+    # Fields are sent as JSON arrays, relative to every row
+    assert driver.calls == [('//table/a', {name: list(spec) for name, spec in FIELDS.items()}, None)]
+    page = metrics.pages[0]
+    assert (page['page'], page['round_trips']) == ('Round 1', 1)
+    assert page['reads']['match rows']['calls'] == 1
+    assert metrics.summary()['round_trips_per_page'] == 1
+
+
+def test_polling_interval_adapts_to_the_label():
+    metrics = PageMetrics()
+    locator = Locator(ScriptedDriver(ready_after=0.3), metrics=metrics, min_poll=0.01, max_poll=0.05)
+    with metrics.page('first'):
+        locator.wait_rows('//table/a', FIELDS, label='match rows')
+    first = metrics.pages[0]['round_trips']
+    assert first > 3
+
+    # The next wait starts polling after half the time this label took before
+    locator.driver = ScriptedDriver(ready_after=0.3)
+    with metrics.page('second'):
+        locator.wait_rows('//table/a', FIELDS, label='match rows')
+    assert metrics.pages[1]['round_trips'] < first
+
+
+def test_wait_times_out_and_locators_are_shared_per_driver():
+    locator = Locator(ScriptedDriver(ready_after=60), timeout=0.1, min_poll=0.01)
+    with pytest.raises(TimeoutException):
+        locator.wait_rows('//table/a', FIELDS, label='match rows')
+
+    driver = ScriptedDriver(ready_after=0)
+    assert get_locator(driver) is get_locator(driver)
+    assert get_locator(driver) is not get_locator(ScriptedDriver(ready_after=0))
@@ -0,0 +1,45 @@
+# tests/test_neighbors.py
+
+import numpy as np
+import pytest
+from sklearn.neighbors import KNeighborsClassifier
+from src.models import registry
+from src.models.artifacts import load_artifact, save_artifact
+from src.models.neighbors import IndexedKNeighborsClassifier
+
+
+@pytest.fixture
+def data():
+    # Low-rank features plus noise, like the correlated form and market value features
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(3000, 6)) @ rng.normal(size=(6, 30)) + rng.normal(scale=0.1, size=(3000, 30))
+    y = (X[:, 0] + X[:, 1] > 0).astype(int) + (X[:, 2] > 1)
+    return X[:2500], y[:2500], X[2500:]
+
+
+@pytest.mark.parametrize('metric', ['euclidean', 'manhattan'])
+@pytest.mark.parametrize('weights', ['uniform', 'distance'])
+def test_exact_index_matches_sklearn(data, metric, weights):
+    X, y, X_test = data
+    expected = KNeighborsClassifier(7, weights=weights, metric=metric, algorithm='brute').fit(X, y)
+    model = IndexedKNeighborsClassifier(7, weights=weights, metric=metric, batch_size=128).fit(X, y)
+    np.testing.assert_allclose(model.predict_proba(X_test), expected.predict_proba(X_test), atol=1e-12)
+    np.testing.assert_array_equal(model.kneighbors(X_test)[1], expected.kneighbors(X_test)[1])
+
+
+def test_projected_index_recall_and_persistence(data, tmp_path):
+    X, y, X_test = data
+    _, exact = KNeighborsClassifier(7, algorithm='brute').fit(X, y).kneighbors(X_test)
+    model = IndexedKNeighborsClassifier(7, n_components=8, candidates=8).fit(X, y)
+    assert model.projection_.shape == (30, 8)
+    _, found = model.kneighbors(X_test)
+    recall = np.mean([len(np.intersect1d(row, truth)) / 7 for row, truth in zip(found, exact)])
+    assert recall > 0.95
+
+    # The index is saved with the model and not rebuilt on load
+    save_artifact(model, 'knn_index', str(tmp_path))
+    loaded = load_artifact('knn_index', str(tmp_path))
+    np.testing.assert_array_equal(loaded.predict_proba(X_test), model.predict_proba(X_test))
+
+    assert IndexedKNeighborsClassifier(n_components='auto').fit(X, y).projection_ is None
+    assert 'knn_index' in registry.available_models()
@@ -0,0 +1,102 @@
+# tests/test_pipeline.py
+
+import os
+import shutil
+import pandas as pd
+import pytest
+from src.pipeline.stages import build_pipeline, build_stages, combine_seasons, discover_seasons, run_stages
+
+
+RAW_SEASON_DIR = os.path.join('data', 'raw', '23_24')
+
+pytestmark = pytest.mark.skipif(not os.path.isdir(RAW_SEASON_DIR), reason="raw season data not available")
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    shutil.copytree(RAW_SEASON_DIR, tmp_path / 'raw' / '23_24')
+    return str(tmp_path)
+
+
+def test_stage_graph_order(data_dir):
+    raw_dir = os.path.join(data_dir, 'raw')
+    # Files next to the season directories (e.g. the scrape checkpoint) are not seasons
+    with open(os.path.join(raw_dir, '.scrape_checkpoint.json'), 'w') as file:
+        file.write('{}')
+    os.makedirs(os.path.join(raw_dir, '24_25'))
+    shutil.copy(os.path.join(RAW_SEASON_DIR, '23_24_teams_and_players.csv'),
+                os.path.join(raw_dir, '24_25', '24_25_teams_and_players.csv'))
+    assert discover_seasons(raw_dir) == ['23_24']
+    assert discover_seasons(raw_dir, files=('{season}_teams_and_players.csv',)) == ['23_24', '24_25']
+    shutil.rmtree(os.path.join(raw_dir, '24_25'))
+    stages = build_stages(data_dir, until='preprocess')
+    assert [stage.key for stage in stages] == ['ingest:23_24', 'player-join:23_24', 'feature:23_24', 'combine',
+                                               'preprocess']
+
+
+def test_build_skips_up_to_date_stages(data_dir):
+    first = build_pipeline(data_dir, until='combine', n_jobs=1)
+    assert set(first.values()) == {'ran'}
+    final = pd.read_csv(os.path.join(data_dir, 'processed', 'final', 'all_seasons_final.csv'))
+    assert list(final.columns[:8]) == ["Season", "Week", "Match Date", "Home Team", "Away Team", "Home Goals",
+                                       "Away Goals", "MatchOutcome"]
+    assert set(final['MatchOutcome']) == {'H', 'D', 'A'}
+
+    assert set(build_pipeline(data_dir, until='combine', n_jobs=1).values()) == {'skipped'}
+
+    # A touched but unchanged raw file is recognised by its hash
+    raw_matches = os.path.join(data_dir, 'raw', '23_24', '23_24.csv')
+    os.utime(raw_matches)
+    assert set(build_pipeline(data_dir, until='combine', n_jobs=1).values()) == {'skipped'}
+
+
+def test_build_reruns_changed_season(data_dir):
+    build_pipeline(data_dir, until='combine', n_jobs=1)
+    raw_matches = os.path.join(data_dir, 'raw', '23_24', '23_24.csv')
+    matches = pd.read_csv(raw_matches)
+    matches.iloc[:-9].to_csv(raw_matches, index=False)
+
+    results = build_pipeline(data_dir, until='combine', n_jobs=1)
+    assert set(results.values()) == {'ran'}
+    final = pd.read_csv(os.path.join(data_dir, 'processed', 'final', 'all_seasons_final.csv'))
+    assert len(final) == len(matches) - 9
+
+
+def test_build_reruns_train_when_options_change(data_dir, monkeypatch):
+    monkeypatch.chdir(data_dir)
+    state_path = os.path.join(data_dir, 'state.json')
+    trained = []
+
+    def train(inputs, outputs, **options):
+        # Stands in for train_stage: records the options and writes the model manifests
+        trained.append(options)
+        for path in outputs:
+            with open(path, 'w') as file:
+                file.write('{}')
+
+    def build(training_options):
+        stages = build_stages(data_dir, until='train', training_options=training_options)
+        stages[-1].func = train
+        return run_stages(stages, state_path=state_path, n_jobs=1)
+
+    options = {'models': ['naive_bayes'], 'search_strategy': 'grid'}
+    assert build(options)['train'] == 'ran'
+    assert build(options)['train'] == 'skipped'
+    results = build({**options, 'search_strategy': 'optuna'})
+    assert results['train'] == 'ran' and results['preprocess'] == 'skipped'
+    assert [run['search_strategy'] for run in trained] == ['grid', 'optuna']
+
+
+def test_combine_drops_notebook_merge_columns(tmp_path):
+    # Featured files written by the notebooks hold Season and Match Date three times each
+    featured = pd.DataFrame({
+        'Season_x': ['23/24'], 'Week': ['Round 1'], 'Match Date_x': ['18/08/23'], 'Home Team': ['Galatasaray'],
+        'Away Team': ['Kasımpaşa'], 'Home Goals': [2], 'Away Goals': [1], 'Match Date_y': ['2023-08-18'],
+        'Season_y': ['23/24'], 'Match Date': ['2023-08-18'], 'Season': ['23/24'],
+    })
+    featured.to_csv(tmp_path / 'featured.csv', index=False)
+    combine_seasons([str(tmp_path / 'featured.csv')], [str(tmp_path / 'final.csv')])
+    final = pd.read_csv(tmp_path / 'final.csv')
+    assert list(final.columns) == ["Season", "Week", "Match Date", "Home Team", "Away Team", "Home Goals",
+                                   "Away Goals", "MatchOutcome"]
+    assert final.iloc[0]['Season'] == '23/24'
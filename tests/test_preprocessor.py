@@ -0,0 +1,92 @@
+# tests/test_preprocessor.py
+
+import os
+import tracemalloc
+import numpy as np
+import pandas as pd
+import pytest
+from src.utils.preprocess import Preprocessor, fit_preprocessing, preprocess_data, preprocess_data_fast, split_data
+
+
+FINAL_PATH = os.path.join('data', 'processed', 'final', 'all_seasons_final.csv')
+
+
+@pytest.fixture
+def matches():
+    return pd.DataFrame({
+        'Season': ['20/21'] * 6,
+        'Home Team': ['gala', 'fene', 'besi', 'gala', 'trab', None],
+        'Away Team': ['fene', 'besi', 'gala', 'trab', 'gala', 'fene'],
+        'Home Formation': ['4-2-3-1'] * 6,
+        'Away Formation': ['4-4-2', '4-3-3', '4-4-2', None, '4-4-2', '4-3-3'],
+        'Home_AvgAge': [27.0, np.nan, 25.5, 26.0, 28.0, 24.5],
+        'Home_Advantage': [1] * 6,
+        'MatchOutcome': ['H', 'D', 'A', 'H', 'H', 'A'],
+    })
+
+
+def test_fit_on_all_rows_matches_preprocess_data(matches):
+    expected = preprocess_data(matches.copy()).drop(columns='MatchOutcome')
+    result = Preprocessor().set_output(transform='pandas').fit(matches).transform(matches)
+    assert list(result.columns) == list(expected.columns)
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(float))
+
+
+def test_fast_path_matches_preprocess_data(matches):
+    expected = preprocess_data(matches.copy())
+    result = preprocess_data_fast(matches, report_memory=True)
+    assert list(result.columns) == list(expected.columns)
+    np.testing.assert_allclose(result.to_numpy(float), expected.to_numpy(float), atol=1e-6)
+    assert (result.drop(columns='MatchOutcome').dtypes == np.float32).all()
+    assert result.attrs['peak_memory_mb'] > 0
+    # The input frame is left untouched
+    assert matches['Home_AvgAge'].isna().sum() == 1
+
+
+def test_memory_report_leaves_the_callers_trace_running(matches):
+    tracemalloc.start()
+    try:
+        result = preprocess_data_fast(matches, report_memory=True)
+        assert tracemalloc.is_tracing()
+        assert result.attrs['peak_memory_mb'] > 0
+    finally:
+        tracemalloc.stop()
+    preprocess_data_fast(matches, report_memory=True)
+    assert not tracemalloc.is_tracing()
+
+
+def test_transform_does_not_refit(matches):
+    preprocessor = Preprocessor().fit(matches)
+    full = preprocessor.transform(matches)
+    # A single row (and an unseen team) is transformed with the statistics learned in fit
+    single = preprocessor.transform(matches.iloc[[2]])
+    np.testing.assert_array_equal(single, full[[2]])
+    unseen = preprocessor.transform(matches.iloc[[0]].assign(**{'Home Team': 'newc'}))
+    home_team = list(preprocessor.get_feature_names_out()).index('Home Team')
+    assert unseen[0, home_team] == list(preprocessor.categories_['Home Team']).index(preprocessor.modes_['Home Team'])
+
+
+def test_chunked_transform(matches):
+    preprocessor = Preprocessor().fit(matches)
+    expected = preprocessor.transform(matches)
+    np.testing.assert_array_equal(Preprocessor(chunk_size=4).fit(matches).transform(matches), expected)
+    chunks = [matches.iloc[:4], matches.iloc[4:]]
+    np.testing.assert_array_equal(pd.concat(preprocessor.iter_transform(chunks)).to_numpy(), expected)
+
+
+def test_save_and_load(matches, tmp_path):
+    preprocessor = Preprocessor().fit(matches)
+    path = str(tmp_path / 'preprocessor.pkl')
+    preprocessor.save(path)
+    np.testing.assert_array_equal(Preprocessor.load(path).transform(matches), preprocessor.transform(matches))
+
+
+@pytest.mark.skipif(not os.path.exists(FINAL_PATH), reason="final data not available")
+def test_fit_preprocessing_uses_training_split(tmp_path):
+    df_raw = pd.read_csv(FINAL_PATH)
+    df_cleaned = fit_preprocessing(df_raw, preprocessor_path=str(tmp_path / 'preprocessor.pkl'))
+    X_train, _, _, _ = split_data(df_cleaned)
+    # The scaled columns have zero mean on the training rows only
+    assert abs(X_train['Home_AvgRating'].mean()) < 1e-9
+    assert abs(df_cleaned['Home_AvgRating'].mean()) > 1e-9
+    assert set(df_cleaned['MatchOutcome']) == {0, 1, 2}
@@ -0,0 +1,46 @@
+# tests/test_registry.py
+
+import importlib.util
+import os
+import pytest
+from main import parse_args
+from src.models import registry
+from src.pipeline.stages import build_stages
+
+
+def test_discovers_every_factory():
+    names = registry.available_models()
+    for name in ('gradient_boosting', 'xgboost', 'lightgbm', 'sgd_logistic_regression', *registry.DEFAULT_MODELS):
+        assert name in names
+    assert registry.resolve_model_names(['all']) == names
+    assert registry.resolve_model_names() == list(registry.DEFAULT_MODELS)
+    with pytest.raises(ValueError, match='Unknown models'):
+        registry.resolve_model_names(['naive_bayes', 'not_a_model'])
+
+
+def test_selection_and_time_budgets():
+    models = registry.get_models(['naive_bayes', 'knn'], time_budgets={'knn': 30})
+    assert [model.model_name for model in models] == ['naive_bayes', 'knn']
+    assert models[1].time_budget == 30 and models[0].time_budget is None
+    with pytest.raises(ValueError):
+        registry.get_models(['knn'], time_budgets={'not_a_model': 30})
+
+
+@pytest.mark.skipif(importlib.util.find_spec('xgboost') is not None, reason="xgboost is installed")
+def test_missing_library_only_fails_when_selected(monkeypatch):
+    with pytest.raises(ImportError):
+        registry.get_models(['xgboost'])
+    monkeypatch.setattr(registry, 'DEFAULT_MODELS', ('xgboost', 'naive_bayes'))
+    assert [model.model_name for model in registry.get_models()] == ['naive_bayes']
+
+
+def test_cli_selects_models_for_every_stage(tmp_path):
+    args = parse_args(['build', '--models', 'naive_bayes', '--time-budgets', 'naive_bayes=12.5'])
+    assert args.models == ['naive_bayes'] and dict(args.time_budgets) == {'naive_bayes': 12.5}
+    with pytest.raises(SystemExit):
+        parse_args(['--time-budgets', 'naive_bayes'])
+
+    stages = build_stages(str(tmp_path), seasons=[], training_options={'models': args.models})
+    train, evaluate = stages[-2:]
+    assert train.outputs == [os.path.join('models', 'naive_bayes.json')]
+    assert evaluate.options['model_names'] == ['naive_bayes']
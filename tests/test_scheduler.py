@@ -0,0 +1,101 @@
+# tests/test_scheduler.py
+
+import time
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.neighbors import KNeighborsClassifier
+from src.models.base_model import BaseModel
+from src.models.folds import FoldManager
+from src.models.search import run_search
+from src.pipeline.scheduler import TrainingScheduler, allocate_search_threads, limit_estimator_threads
+
+
+PARAM_GRID = {
+    'n_neighbors': [3, 5, 7, 9],
+    'weights': ['uniform', 'distance'],
+}
+
+
+@pytest.fixture
+def data():
+    X, y = make_classification(n_samples=300, n_features=6, n_informative=4, n_classes=3, random_state=0)
+    return X, y
+
+
+class CatBoostClassifier:
+    """
+    Stand-in for CatBoost's estimator: get_params() only returns the parameters passed explicitly.
+    """
+
+    def __init__(self, **params):
+        self.params = params
+
+    def get_params(self, deep=True):
+        return dict(self.params)
+
+    def set_params(self, **params):
+        self.params.update(params)
+        return self
+
+
+def test_thread_count_is_capped_when_not_passed_explicitly():
+    model = limit_estimator_threads(CatBoostClassifier(random_state=42, verbose=0), 2)
+    assert model.get_params()['thread_count'] == 2
+    # Other estimators only get the thread parameters they have
+    knn = limit_estimator_threads(KNeighborsClassifier(), 2)
+    assert knn.n_jobs == 2 and 'thread_count' not in knn.get_params()
+
+
+def test_scheduler_matches_grid_search(data, tmp_path, monkeypatch):
+    X, y = data
+    monkeypatch.chdir(tmp_path)
+    model = BaseModel(KNeighborsClassifier(), PARAM_GRID, 'knn')
+    report = TrainingScheduler(n_workers=1).run([model], X, y)
+    reference = run_search('grid', KNeighborsClassifier(), PARAM_GRID, X, y, n_jobs=1, verbose=0)
+    assert model.grid_search.best_params_ == reference.best_params_
+    assert model.grid_search.best_score_ == pytest.approx(reference.best_score_)
+    assert report.loc[0, 'Tasks'] == 8 * 5
+
+
+class SlowDistanceKNN(KNeighborsClassifier):
+    """
+    KNN whose distance-weighted fits are slow, so the default-parameter probe fit underestimates them.
+    """
+
+    def fit(self, X, y):
+        if self.weights == 'distance':
+            time.sleep(0.1)
+        return super().fit(X, y)
+
+
+@pytest.mark.parametrize('n_workers', [1, 2])
+def test_time_budget_stops_dispatching_fold_tasks(data, tmp_path, monkeypatch, n_workers):
+    X, y = data
+    monkeypatch.chdir(tmp_path)
+    grid = {'n_neighbors': [3, 5, 7, 9], 'weights': ['distance']}
+    model = BaseModel(SlowDistanceKNN(), grid, 'knn', time_budget=0.3)
+    start = time.perf_counter()
+    report = TrainingScheduler(n_workers=n_workers, fold_manager=FoldManager(cache_dir=str(tmp_path))).run(
+        [model], X, y)
+    if n_workers == 1:
+        # Every candidate takes 0.5s over 5 folds; the full grid would take 2s (with more workers the
+        # start-up of the worker processes dominates the timing)
+        assert time.perf_counter() - start < 1.8
+    n_scored = len(model.grid_search.cv_results_['params'])
+    assert 1 <= n_scored < 4
+    assert report.loc[0, 'Tasks'] == n_scored * 5
+    assert model.grid_search.best_params_ in model.grid_search.cv_results_['params']
+
+
+def test_adaptive_searches_get_a_share_of_the_workers(data, tmp_path, monkeypatch):
+    # Proportional to cost, at least one each, never more than the budget
+    assert allocate_search_threads([6.0, 2.0], 0.0, 8) == [6, 2]
+    assert allocate_search_threads([10.0, 0.1, 0.1], 0.0, 4) == [2, 1, 1]
+    assert allocate_search_threads([1.0, 1.0, 1.0], 1.0, 2) == [1, 1, 1]
+
+    X, y = data
+    monkeypatch.chdir(tmp_path)
+    model = BaseModel(KNeighborsClassifier(), PARAM_GRID, 'knn', search_strategy='halving_grid')
+    report = TrainingScheduler(n_workers=4, fold_manager=FoldManager(cache_dir=str(tmp_path))).run([model], X, y)
+    assert report.loc[0, 'SearchThreads'] == 4
+    assert set(model.grid_search.best_params_) == set(PARAM_GRID)
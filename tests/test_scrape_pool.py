@@ -0,0 +1,139 @@
+# tests/test_scrape_pool.py
+
+import functools
+import json
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import pandas as pd
+import pytest
+from benchmarks.snapshots import StaticPageDriver, save_round_snapshots, snapshot_round_scraper
+from src.data.scrape_pool import MATCH_HEADERS, ScrapeWorkerPool, WorkUnit
+from src.data.sinks import ScraperSink
+
+
+TEAMS = ['Galatasaray', 'Fenerbahçe', 'Beşiktaş', 'Trabzonspor', 'Kasımpaşa', 'Sivasspor']
+
+
+def season_rows(season_name, n_rounds):
+    rows = []
+    for number in range(1, n_rounds + 1):
+        for i in range(0, len(TEAMS), 2):
+            home, away = TEAMS[(i + number) % len(TEAMS)], TEAMS[(i + number + 1) % len(TEAMS)]
+            rows.append([season_name, f"Round {number}", f"{number:02d}/09/23", home, away, number % 3, i % 2,
+                         6.8, 7.1, '4-2-3-1', '4-4-2', f"(c) {home} Captain; A. Player", "B. Player"])
+    return rows
+
+
+@pytest.fixture
+def snapshots(tmp_path):
+    """
+    Serves the snapshots of a six-round season on localhost.
+    """
+    season_csv = tmp_path / 'season.csv'
+    pd.DataFrame(season_rows('23/24', 6), columns=MATCH_HEADERS).to_csv(season_csv, index=False)
+    units = save_round_snapshots(str(season_csv), str(tmp_path / 'snapshots'))
+
+    class Handler(SimpleHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(Handler, directory=str(tmp_path / 'snapshots')))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", units, season_csv
+    server.shutdown()
+    server.server_close()
+
+
+def crashing_once(scrape, crash_rounds):
+    """
+    Wraps a unit scraper so its first attempt at each of crash_rounds raises, like a browser crash.
+    """
+    crashed = set()
+
+    def scrape_unit(driver, unit):
+        if unit.round in crash_rounds and unit.round not in crashed:
+            crashed.add(unit.round)
+            raise RuntimeError("chrome not reachable")
+        return scrape(driver, unit)
+    return scrape_unit
+
+
+def test_pool_scrapes_every_round_and_restarts_crashed_workers(snapshots, tmp_path):
+    base_url, units, season_csv = snapshots
+    assert units == [WorkUnit('23/24', number) for number in range(1, 7)]
+    drivers = []
+
+    def driver_factory():
+        drivers.append(StaticPageDriver())
+        return drivers[-1]
+
+    pool = ScrapeWorkerPool(driver_factory, crashing_once(snapshot_round_scraper(base_url), {2, 5}), n_workers=3,
+                            output_dir=str(tmp_path / 'raw'))
+    stats = pool.run(units)
+    assert (stats['units'], stats['rows'], stats['restarts'], stats['failed']) == (6, 18, 2, [])
+    # One driver per worker plus one per crash
+    assert len(drivers) == 5
+
+    expected = pd.read_csv(season_csv).sort_values(['Week', 'Home Team']).reset_index(drop=True)
+    scraped = pd.read_csv(tmp_path / 'raw' / '23_24' / '23_24.csv').sort_values(['Week', 'Home Team'])
+    pd.testing.assert_frame_equal(scraped.reset_index(drop=True), expected)
+    checkpoint = json.loads((tmp_path / 'raw' / '.scrape_checkpoint.json').read_text(encoding='utf-8'))
+    assert sorted(checkpoint) == [f"23/24|{number}" for number in range(1, 7)]
+
+
+def test_pool_resumes_from_checkpoint_without_duplicates(snapshots, tmp_path):
+    base_url, units, _ = snapshots
+    output_dir = tmp_path / 'raw'
+    first = ScrapeWorkerPool(StaticPageDriver, snapshot_round_scraper(base_url), n_workers=2,
+                             output_dir=str(output_dir)).run(units[:4])
+    assert first['units'] == 4
+
+    # A resumed run only scrapes the missing rounds
+    resumed = ScrapeWorkerPool(StaticPageDriver, snapshot_round_scraper(base_url), n_workers=2,
+                               output_dir=str(output_dir)).run(units)
+    assert (resumed['skipped'], resumed['units'], resumed['rows']) == (4, 2, 6)
+
+    # Rounds rescraped without their checkpoint (e.g. a crash before it was written) add no rows
+    (output_dir / '.scrape_checkpoint.json').unlink()
+    rerun = ScrapeWorkerPool(StaticPageDriver, snapshot_round_scraper(base_url), n_workers=2,
+                             output_dir=str(output_dir)).run(units[:3])
+    assert (rerun['rows'], rerun['duplicates']) == (0, 9)
+    assert len(pd.read_csv(output_dir / '23_24' / '23_24.csv')) == 18
+
+
+def test_pool_gives_up_after_max_attempts(snapshots, tmp_path):
+    base_url, units, _ = snapshots
+    missing = WorkUnit('23/24', 40)
+    pool = ScrapeWorkerPool(StaticPageDriver, snapshot_round_scraper(base_url), n_workers=2,
+                            output_dir=str(tmp_path / 'raw'), max_attempts=2)
+    stats = pool.run(units[:2] + [missing])
+    assert (stats['units'], stats['failed'], stats['restarts']) == (2, [missing], 2)
+    assert not pool.checkpoint.is_done(missing)
+
+
+@pytest.mark.parametrize('reaches_disk', [False, True])
+def test_failed_flush_is_retried_without_losing_or_duplicating_rows(snapshots, tmp_path, monkeypatch, reaches_disk):
+    base_url, units, _ = snapshots
+    append_csv = ScraperSink._append_csv
+    failures = []
+
+    def fail_once(sink, path, rows):
+        # The first flush fails before writing, or after the rows reached the file (e.g. in fsync)
+        if reaches_disk:
+            append_csv(sink, path, rows)
+        if not failures:
+            failures.append(len(rows))
+            raise OSError("disk full")
+        if not reaches_disk:
+            append_csv(sink, path, rows)
+
+    monkeypatch.setattr(ScraperSink, '_append_csv', fail_once)
+    output_dir = tmp_path / 'raw'
+    stats = ScrapeWorkerPool(StaticPageDriver, snapshot_round_scraper(base_url), n_workers=2,
+                             output_dir=str(output_dir)).run(units)
+    assert failures == [3]
+    assert (stats['units'], stats['restarts'], stats['failed']) == (6, 1, [])
+    # The retried round writes the rows that did not reach the file, and only those
+    assert (stats['rows'], stats['duplicates']) == ((15, 3) if reaches_disk else (18, 0))
+    scraped = pd.read_csv(output_dir / '23_24' / '23_24.csv')
+    assert len(scraped) == 18 and not scraped.duplicated(['Week', 'Home Team', 'Away Team']).any()
@@ -0,0 +1,121 @@
+# tests/test_search.py
+
+import time
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.neighbors import KNeighborsClassifier
+from src.models.base_model import BaseModel
+from src.models.cache import TrainingCache, hash_dataset
+from src.models.folds import FoldManager
+from src.models.search import run_search, count_candidates, SearchResult
+
+
+PARAM_GRID = {
+    'n_neighbors': [3, 5, 7, 9],
+    'weights': ['uniform', 'distance'],
+}
+
+
+@pytest.fixture
+def data():
+    X, y = make_classification(n_samples=300, n_features=6, n_informative=4, n_classes=3, random_state=0)
+    return X, y
+
+
+def test_count_candidates():
+    assert count_candidates(PARAM_GRID) == 8
+
+
+def test_grid_respects_fit_budget(data):
+    X, y = data
+    search = run_search('grid', KNeighborsClassifier(), PARAM_GRID, X, y, n_jobs=1, verbose=0, max_fits=15)
+    # 15 fits with 5 folds leaves room for 3 candidates
+    assert len(search.cv_results_['params']) == 3
+
+
+@pytest.mark.parametrize('strategy', ['halving_grid', 'halving_random', 'optuna'])
+def test_strategies_return_fitted_best_estimator(data, strategy):
+    X, y = data
+    search = run_search(strategy, KNeighborsClassifier(), PARAM_GRID, X, y, n_jobs=1, verbose=0, max_fits=30)
+    assert set(search.best_params_) == set(PARAM_GRID)
+    assert search.best_estimator_.predict(X).shape == y.shape
+    assert 0 <= search.best_score_ <= 1
+
+
+def test_optuna_time_budget_does_not_repeat_candidates(data):
+    X, y = data
+    grid = {'n_neighbors': [3, 5]}
+    start = time.perf_counter()
+    search = run_search('optuna', KNeighborsClassifier(), grid, X, y, n_jobs=1, verbose=0, time_budget=3)
+    assert len(search.study_.trials) <= count_candidates(grid)
+    assert len(search.cv_results_['params']) <= count_candidates(grid)
+    assert time.perf_counter() - start < 3
+
+
+class SlowDistanceKNN(KNeighborsClassifier):
+    """
+    KNN whose distance-weighted fits are slow, so the default-parameter probe fit underestimates them.
+    """
+
+    def fit(self, X, y):
+        if self.weights == 'distance':
+            time.sleep(0.1)
+        return super().fit(X, y)
+
+
+@pytest.mark.parametrize('strategy, precomputed_folds', [('grid', False), ('grid', True), ('halving_grid', False)])
+def test_time_budget_stops_dispatching_candidates(data, tmp_path, strategy, precomputed_folds):
+    X, y = data
+    cv = FoldManager(cache_dir=str(tmp_path)).get(X, y) if precomputed_folds else 5
+    start = time.perf_counter()
+    search = run_search(strategy, SlowDistanceKNN(), PARAM_GRID, X, y, cv=cv, n_jobs=1, verbose=0, time_budget=0.3)
+    # Every distance-weighted candidate takes 0.5s over 5 folds; the full search would take 2s
+    assert time.perf_counter() - start < 1.5
+    assert len(search.cv_results_['params']) < 8
+    assert search.best_estimator_.predict(X).shape == y.shape
+
+
+def test_halving_falls_back_to_grid_for_small_budgets(data):
+    X, y = data
+    # 10 fits over 5 folds cannot start halving with its 3 candidates
+    search = run_search('halving_grid', KNeighborsClassifier(), PARAM_GRID, X, y, n_jobs=1, verbose=0, max_fits=10)
+    assert len(search.cv_results_['params']) * 5 <= 10
+
+
+def test_base_model_uses_configured_strategy(data):
+    X, y = data
+    model = BaseModel(KNeighborsClassifier(), PARAM_GRID, 'knn')
+    model.configure_search('optuna', max_fits=20)
+    model.train(X, y)
+    assert model.search_strategy == 'optuna'
+    assert len(model.grid_search.cv_results_['params']) <= 4
+
+
+def test_unknown_strategy_raises(data):
+    X, y = data
+    with pytest.raises(ValueError):
+        run_search('exhaustive', KNeighborsClassifier(), PARAM_GRID, X, y)
+
+
+def test_training_cache_skips_refit(data, tmp_path):
+    X, y = data
+    cache = TrainingCache(str(tmp_path))
+    first = BaseModel(KNeighborsClassifier(), PARAM_GRID, 'knn')
+    first.train(X, y, cache=cache)
+
+    second = BaseModel(KNeighborsClassifier(), PARAM_GRID, 'knn')
+    second.train(X, y, cache=cache)
+    assert isinstance(second.grid_search, SearchResult)
+    assert second.grid_search.best_params_ == first.grid_search.best_params_
+
+    # A different grid must not hit the same entry
+    third = BaseModel(KNeighborsClassifier(), {'n_neighbors': [3]}, 'knn')
+    assert cache.make_key(third, X, y) != cache.make_key(second, X, y)
+
+
+def test_hash_dataset_depends_on_content(data):
+    X, y = data
+    changed = X.copy()
+    changed[0, 0] += 1
+    assert hash_dataset(X, y) == hash_dataset(X.copy(), y.copy())
+    assert hash_dataset(X, y) != hash_dataset(changed, y)
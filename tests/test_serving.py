@@ -0,0 +1,101 @@
+# tests/test_serving.py
+
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+import joblib
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.naive_bayes import GaussianNB
+from src.serving.predictor import REFERENCE_DATA_PATH, ModelPredictor, PredictionService, load_raw_data
+from src.serving.server import make_server
+from src.utils.preprocess import fit_preprocessing
+
+
+pytestmark = pytest.mark.skipif(not os.path.exists(REFERENCE_DATA_PATH), reason="final data not available")
+
+
+@pytest.fixture(scope='module')
+def reference():
+    return load_raw_data(REFERENCE_DATA_PATH)
+
+
+@pytest.fixture(scope='module')
+def predictor(reference, tmp_path_factory):
+    models_dir = tmp_path_factory.mktemp('models')
+    df = fit_preprocessing(reference, preprocessor_path=str(models_dir / 'preprocessor.pkl'))
+    X, y = df.drop(columns='MatchOutcome'), df['MatchOutcome']
+    joblib.dump(LogisticRegression(max_iter=500).fit(X, y), models_dir / 'logistic_regression.pkl')
+    joblib.dump(GaussianNB().fit(X, y), models_dir / 'naive_bayes.pkl')
+    return ModelPredictor(models_dir=str(models_dir))
+
+
+def test_batched_predictions_match_direct(reference, predictor):
+    records = reference.iloc[:9].to_dict('records')
+    service = PredictionService(predictor, max_wait_ms=5.0)
+    try:
+        results = [None] * len(records)
+
+        def score(index):
+            results[index] = service.predict([records[index]])[0]
+
+        threads = [threading.Thread(target=score, args=(index,)) for index in range(len(records))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        direct = predictor.predict_proba(reference.iloc[:9])
+        for index, result in enumerate(results):
+            probabilities = result['probabilities']['logistic_regression']
+            np.testing.assert_allclose([probabilities[label] for label in 'HDA'],
+                                       direct['logistic_regression'][index], atol=1e-6)
+        assert service.metrics()['requests']['count'] == len(records)
+    finally:
+        service.close()
+
+
+def post(url, payload):
+    request = urllib.request.Request(f"{url}/predict", data=json.dumps(payload, default=str).encode('utf-8'),
+                                     headers={'Content-Type': 'application/json'})
+    with pytest.raises(urllib.error.HTTPError) as error:
+        urllib.request.urlopen(request)
+    return error.value.code, json.load(error.value)
+
+
+def test_http_server(reference, predictor, monkeypatch):
+    service = PredictionService(predictor)
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        body = json.dumps({'fixtures': reference.iloc[:3].to_dict('records'), 'models': ['naive_bayes']},
+                          default=str).encode('utf-8')
+        request = urllib.request.Request(f"{url}/predict", data=body, headers={'Content-Type': 'application/json'})
+        predictions = json.load(urllib.request.urlopen(request))['predictions']
+        assert len(predictions) == 3
+        assert list(predictions[0]['probabilities']) == ['naive_bayes']
+        assert sum(predictions[0]['probabilities']['naive_bayes'].values()) == pytest.approx(1.0, abs=1e-5)
+
+        metrics = json.load(urllib.request.urlopen(f"{url}/metrics"))
+        assert metrics['requests']['count'] == 1 and metrics['requests']['p99_ms'] is not None
+
+        # Malformed fixtures are answered with a 400, and the connection and server stay up
+        record = reference.iloc[0].to_dict()
+        no_away_team = {column: value for column, value in record.items() if column != 'Away Team'}
+        for fixtures in ('xyz', [1, 2], [no_away_team], [{**record, 'Home_AvgAge': 'old'}]):
+            status, body = post(url, {'fixtures': fixtures})
+            assert status == 400 and body['error'].startswith('Invalid fixtures')
+        assert json.load(urllib.request.urlopen(f"{url}/health")) == {'status': 'ok'}
+
+        # A valid request failing inside a model is a server error
+        monkeypatch.setitem(predictor.models, 'broken', object())
+        status, body = post(url, {'fixtures': [record], 'models': ['broken']})
+        assert status == 500 and body['error'].startswith('Prediction failed')
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
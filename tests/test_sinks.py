@@ -0,0 +1,79 @@
+# tests/test_sinks.py
+
+import os
+import signal
+import subprocess
+import sys
+import pandas as pd
+import pytest
+from src.data.sinks import ScraperSink
+from src.utils.feature_store import pyarrow_available, read_stage
+
+
+HEADERS = ["Season", "Team Name", "Player Name", "Player Rating"]
+
+
+def rows(start, stop):
+    return [["23/24", f"Team {i % 3}", f"Player {i}", str(6 + i / 10)] for i in range(start, stop)]
+
+
+def test_csv_rows_are_written_in_batches(tmp_path):
+    path = tmp_path / '23_24' / 'players.csv'
+    sink = ScraperSink(batch_size=4)
+    for row in rows(0, 6):
+        sink.write(str(tmp_path / '23_24'), 'players.csv', HEADERS, row)
+    assert len(pd.read_csv(path)) == 4
+    sink.close()
+
+    # A later run appends to the file without repeating the header
+    with ScraperSink(batch_size=100) as sink:
+        for row in rows(6, 9):
+            sink.write(str(tmp_path / '23_24'), 'players.csv', HEADERS, row)
+    df = pd.read_csv(path)
+    assert list(df.columns) == HEADERS
+    assert list(df['Player Name']) == [f"Player {i}" for i in range(9)]
+
+
+@pytest.mark.skipif(not pyarrow_available(), reason="pyarrow is not installed")
+def test_columnar_sink_rewrites_atomically(tmp_path):
+    with ScraperSink(batch_size=3, fmt='feather') as sink:
+        for row in rows(0, 7):
+            sink.write(str(tmp_path), 'players.csv', HEADERS, row)
+    with ScraperSink(batch_size=3, fmt='feather') as sink:
+        for row in rows(7, 8):
+            sink.write(str(tmp_path), 'players.csv', HEADERS, row)
+    df = read_stage(str(tmp_path / 'players'))
+    assert list(df['Player Name']) == [f"Player {i}" for i in range(8)]
+    assert sorted(os.listdir(tmp_path)) == ['players.feather', 'players.schema.json']
+
+
+def test_flush_reentering_during_a_write_does_not_repeat_rows(tmp_path, monkeypatch):
+    sink = ScraperSink(batch_size=100)
+    append_csv = sink._append_csv
+
+    def interrupted(path, batch):
+        # What a signal handler arriving in the middle of the write does
+        monkeypatch.setattr(sink, '_append_csv', append_csv)
+        sink.flush()
+        append_csv(path, batch)
+
+    for row in rows(0, 3):
+        sink.write(str(tmp_path), 'players.csv', HEADERS, row)
+    monkeypatch.setattr(sink, '_append_csv', interrupted)
+    sink.flush()
+    sink.close()
+    assert list(pd.read_csv(tmp_path / 'players.csv')['Player Name']) == [f"Player {i}" for i in range(3)]
+    assert sink.rows_written == 3
+
+
+def test_buffered_rows_are_flushed_on_sigterm(tmp_path):
+    code = (
+        "import os, signal\n"
+        "from src.data.sinks import ScraperSink\n"
+        "sink = ScraperSink(batch_size=1000)\n"
+        f"for i in range(5): sink.write({str(tmp_path)!r}, 'week.csv', ['Week', 'Match'], ['Round 1', i])\n"
+        "os.kill(os.getpid(), signal.SIGTERM)\n"
+    )
+    result = subprocess.run([sys.executable, '-c', code], env={**os.environ, 'PYTHONPATH': '.'})
+    assert result.returncode == -signal.SIGTERM
+    assert len(pd.read_csv(tmp_path / 'week.csv')) == 5
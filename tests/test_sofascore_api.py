@@ -0,0 +1,108 @@
+# tests/test_sofascore_api.py
+
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pandas as pd
+import pytest
+import requests
+from src.data.http_client import RateLimiter
+from src.data.sofascore_api import MATCH_HEADERS, SofascoreClient, ingest_season
+
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures', 'sofascore', 'responses.json')
+
+
+@pytest.fixture
+def stub_api():
+    """
+    Serves the recorded responses on localhost; paths listed in `failures` answer with the given
+    status codes first.
+    """
+    with open(FIXTURES, encoding='utf-8') as file:
+        responses = json.load(file)
+    state = {'failures': {}, 'requests': [], 'in_flight': 0, 'max_in_flight': 0, 'delay': 0.0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with lock:
+                state['requests'].append(self.path)
+                state['in_flight'] += 1
+                state['max_in_flight'] = max(state['max_in_flight'], state['in_flight'])
+                failures = state['failures'].get(self.path)
+                status = failures.pop(0) if failures else 200
+            time.sleep(state['delay'])
+            if status == 200 and self.path not in responses:
+                status = 404
+            body = json.dumps(responses[self.path]).encode('utf-8') if status == 200 else b'{}'
+            self.send_response(status)
+            if status == 429:
+                self.send_header('Retry-After', '0')
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            with lock:
+                state['in_flight'] -= 1
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", state
+    server.shutdown()
+    server.server_close()
+
+
+def test_ingest_season_writes_the_scraped_layout(stub_api, tmp_path):
+    url, state = stub_api
+    state['failures'] = {'/event/11352001/lineups': [503, 429]}
+    with SofascoreClient(url, max_workers=4, rate_limit=0, backoff=0.01) as client:
+        counts = ingest_season(client, '23/24', raw_dir=str(tmp_path))
+    assert counts == {'matches': 2, 'players': 3}
+    assert state['requests'].count('/event/11352001/lineups') == 3
+
+    matches = pd.read_csv(tmp_path / '23_24' / '23_24.csv')
+    assert list(matches.columns) == MATCH_HEADERS
+    first = matches.iloc[0]
+    assert (first['Week'], first['Match Date'], first['Home Team'], first['Home Goals']) == \
+        ('Round 1', '18/08/23', 'Galatasaray', 2)
+    # Starters only, captain marked; the performance averages every rated player
+    assert first['Home Players'] == '(c) F. Muslera; M. Icardi'
+    assert first['Home Performance'] == pytest.approx(7.33)
+    assert matches.iloc[1]['Home Team'] == 'Karagümrük'
+
+    players = pd.read_csv(tmp_path / '23_24' / '23_24_teams_and_players.csv')
+    assert list(players['Player Name']) == ['Mauro Icardi', 'Emre Bilgin', 'Jakub Szumski']
+
+    # A second run replaces the files instead of appending to them
+    with SofascoreClient(url, rate_limit=0) as client:
+        ingest_season(client, '23/24', raw_dir=str(tmp_path))
+    assert len(pd.read_csv(tmp_path / '23_24' / '23_24.csv')) == 2
+
+
+def test_client_bounds_concurrency_and_gives_up(stub_api):
+    url, state = stub_api
+    state['delay'] = 0.05
+    with SofascoreClient(url, max_workers=8, max_concurrency=2, rate_limit=0) as client:
+        client.map(lambda _: client.get_json('/unique-tournament/52/seasons'), range(8))
+        assert state['max_in_flight'] <= 2
+        assert client.get_json('/event/1/lineups') is None
+
+        state['failures'] = {'/unique-tournament/52/seasons': [500] * 3}
+        client.retries, client.backoff = 2, 0.01
+        with pytest.raises(requests.HTTPError):
+            client.get_json('/unique-tournament/52/seasons')
+
+
+def test_rate_limiter_spaces_requests():
+    limiter = RateLimiter(rate=50, burst=1)
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+    assert time.monotonic() - start >= 5 / 50 * 0.9
@@ -0,0 +1,65 @@
+# tests/test_streaming.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import accuracy_score, log_loss
+from src.models.naive_bayes import get_naive_bayes_model
+from src.models.sgd_logistic_regression import get_sgd_logistic_regression_model
+from src.models.streaming import holdout_mask, iter_labelled_chunks
+from src.utils.feature_store import iter_stage_chunks, write_stage
+
+
+@pytest.fixture
+def cleaned(tmp_path):
+    rng = np.random.default_rng(0)
+    y = rng.integers(0, 3, 3000)
+    X = rng.normal(size=(3000, 4)) * [1.0, 5.0, 0.1, 2.0] + y[:, None] * [1.0, 3.0, 0.0, -1.0]
+    df = pd.DataFrame(X, columns=['Home_AvgAge', 'Home_MarketValue', 'Away_AvgAge', 'Away_MarketValue'])
+    df['MatchOutcome'] = y
+    return df, write_stage(df, str(tmp_path / 'cleaned'), fmt='parquet', downcast=False)
+
+
+def test_holdout_does_not_depend_on_chunk_size():
+    whole = holdout_mask(0, 1000, 0.2)
+    chunked = np.concatenate([holdout_mask(start, 300, 0.2)[:min(300, 1000 - start)] for start in range(0, 1000, 300)])
+    np.testing.assert_array_equal(whole, chunked)
+    assert 0.15 < whole.mean() < 0.25
+
+
+@pytest.mark.parametrize('fmt', ['parquet', 'csv'])
+def test_stage_chunks_cover_all_rows(cleaned, tmp_path, fmt):
+    df, _ = cleaned
+    path = write_stage(df, str(tmp_path / fmt / 'cleaned'), fmt=fmt, downcast=False)
+    chunks = list(iter_stage_chunks(path, chunk_size=700))
+    assert [len(chunk) for chunk in chunks] == [700, 700, 700, 700, 200]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), df, check_dtype=False)
+
+
+def test_streamed_naive_bayes_matches_in_memory_fit(cleaned):
+    df, path = cleaned
+    model = get_naive_bayes_model()
+    metrics = model.train_streaming(path, chunk_size=500)
+    streamed = model.grid_search.best_estimator_
+
+    train_mask = ~holdout_mask(0, len(df), 0.2)
+    X_train, y_train = df.drop(columns='MatchOutcome')[train_mask], df['MatchOutcome'][train_mask]
+    scaled = (X_train - X_train.mean()) / X_train.std(ddof=0)
+    reference = get_naive_bayes_model().model.fit(scaled.to_numpy(), y_train)
+    np.testing.assert_allclose(streamed.named_steps['model'].theta_, reference.theta_, atol=1e-8)
+
+    X_test, y_test = df.drop(columns='MatchOutcome')[~train_mask], df['MatchOutcome'][~train_mask]
+    probabilities = streamed.predict_proba(X_test)
+    assert metrics['n_samples'] == len(y_test)
+    assert metrics['accuracy'] == pytest.approx(accuracy_score(y_test, probabilities.argmax(axis=1)))
+    assert metrics['log_loss'] == pytest.approx(log_loss(y_test, probabilities, labels=[0, 1, 2]), rel=1e-6)
+
+
+def test_streamed_sgd_logistic_regression_learns(cleaned):
+    df, path = cleaned
+    model = get_sgd_logistic_regression_model()
+    metrics = model.train_streaming(lambda: iter_stage_chunks(path, chunk_size=256), epochs=3)
+    assert metrics['accuracy'] > 0.6
+    assert sum(map(sum, metrics['confusion_matrix'])) == sum(len(y) for _, y in
+                                                           iter_labelled_chunks(lambda: [df], 'MatchOutcome', 0.2, True))
+    assert set(model.grid_search.best_params_) == {'alpha', 'penalty'}
@@ -0,0 +1,108 @@
+# tests/test_transfermarkt_lookup.py
+
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import pandas as pd
+import pytest
+from src.data.transfermarkt_lookup import (PlayerCache, lookup_players, normalize_name, parse_search_results,
+                                           transfermarkt_client)
+
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures', 'transfermarkt')
+
+
+def fixture_page(name):
+    with open(os.path.join(FIXTURES, name), 'rb') as file:
+        return file.read()
+
+
+@pytest.fixture
+def result_pages():
+    """
+    Serves the saved quick-search result pages on localhost: a query gets the page named after the
+    normalized player name, or the page without results. Queries listed in `failing` answer 500.
+    """
+    state = {'queries': [], 'failing': set()}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            query = parse_qs(urlparse(self.path).query)['query'][0]
+            with lock:
+                state['queries'].append(query)
+            name = f"{normalize_name(query).replace(' ', '_')}.html"
+            body = fixture_page(name if os.path.isfile(os.path.join(FIXTURES, name)) else 'no_results.html')
+            status = 500 if query in state['failing'] else 200
+            self.send_response(status)
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", state
+    server.shutdown()
+    server.server_close()
+
+
+def players(rows):
+    return pd.DataFrame(rows, columns=['Team Name', 'Player Name'])
+
+
+def test_parse_search_results_reads_the_first_player():
+    assert parse_search_results(fixture_page('dries_mertens.html')) == ('37', '1,80 mil. €')
+    assert parse_search_results(fixture_page('emre_akbaba.html')) == ('31', '800 bin €')
+    assert parse_search_results(fixture_page('no_results.html')) is None
+    assert normalize_name('  Beşiktaş  JK ') == normalize_name('besiktas jk') == 'besiktas jk'
+
+
+def test_repeat_players_are_served_from_the_disk_cache(result_pages, tmp_path):
+    url, state = result_pages
+    cache_path = str(tmp_path / 'players.json')
+    first_season = players([('Galatasaray', 'Dries Mertens'), ('Fenerbahçe', 'Sebastian Szymański'),
+                            ('Galatasaray', 'Unknown Player'), ('Galatasaray', 'Dries Mertens')])
+    with transfermarkt_client(url, max_workers=4, rate_limit=0) as client:
+        result = lookup_players(first_season, client, PlayerCache(cache_path))
+    assert result.values.tolist() == [
+        ['Galatasaray', 'Dries Mertens', '37', '1,80 mil. €'],
+        ['Fenerbahçe', 'Sebastian Szymański', '25', '17,00 mil. €'],
+        ['Galatasaray', 'Unknown Player', 'N/A', 'N/A'],
+        ['Galatasaray', 'Dries Mertens', '37', '1,80 mil. €'],
+    ]
+    assert sorted(state['queries']) == ['Dries Mertens', 'Sebastian Szymański', 'Unknown Player']
+
+    # The next season (and run) only searches players it has not seen, whatever their spelling
+    state['queries'].clear()
+    cache = PlayerCache(cache_path)
+    second_season = players([('GALATASARAY', 'Dries  Mertens'), ('Fenerbahce', 'Sebastian Szymanski'),
+                             ('Adana Demirspor', 'Emre Akbaba'), ('Galatasaray', 'Unknown Player')])
+    with transfermarkt_client(url, rate_limit=0) as client:
+        result = lookup_players(second_season, client, cache)
+    assert state['queries'] == ['Emre Akbaba']
+    assert (cache.hits, cache.misses) == (3, 1)
+    assert list(result['Age']) == ['37', '25', '31', 'N/A']
+
+
+def test_expired_and_failed_lookups_are_searched_again(result_pages, tmp_path):
+    url, state = result_pages
+    cache_path = str(tmp_path / 'players.json')
+    state['failing'] = {'Emre Akbaba'}
+    with transfermarkt_client(url, rate_limit=0, retries=1) as client:
+        client.backoff = 0.01
+        result = lookup_players(players([('Galatasaray', 'Dries Mertens'), ('Adana Demirspor', 'Emre Akbaba')]),
+                                client, PlayerCache(cache_path))
+    assert list(result['Market Value']) == ['1,80 mil. €', 'N/A']
+    assert len(PlayerCache(cache_path)) == 1
+
+    state['queries'].clear()
+    state['failing'] = set()
+    with transfermarkt_client(url, rate_limit=0) as client:
+        lookup_players(players([('Galatasaray', 'Dries Mertens'), ('Adana Demirspor', 'Emre Akbaba')]),
+                       client, PlayerCache(cache_path, ttl_days=0))
+    assert sorted(state['queries']) == ['Dries Mertens', 'Emre Akbaba']